@@ -1,55 +1,275 @@
 """
 Vercel Function: Audio File Server
-Serves podcast audio files directly from deployed files
+Serves podcast audio files directly from deployed files, with HTTP Range
+(single and multipart byte ranges), ETag revalidation and HEAD support so
+podcast apps can seek without re-downloading the episode. File bodies go
+out through os.sendfile where the platform supports it, else from an mmap.
 """
 
+import errno
+import hashlib
+import mmap
 import os
+import secrets
+import threading
 from http.server import BaseHTTPRequestHandler
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import unquote
 
+AUDIO_DIR = os.getenv("AUDIO_DIR", "daily_digests")
+CACHE_CONTROL = "public, max-age=86400"  # Cache for 24 hours
+MAX_RANGES = 16  # more than this in one request is abuse, not seeking
+SENDFILE_CHUNK = 1024 * 1024
+# sendfile errors that mean "not possible here" rather than a dead client
+_SENDFILE_UNSUPPORTED = {
+    errno.EAGAIN,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTSOCK,
+    errno.EOPNOTSUPP,
+}
+
+# (path, size, mtime_ns) -> content hash, so each file is hashed once
+_etag_cache: Dict[Tuple[str, int, int], str] = {}
+_etag_lock = threading.Lock()
+
+
+class RangeNotSatisfiable(ValueError):
+    """None of the requested byte ranges overlap the file"""
+
+
+def file_etag(path: str, stat: os.stat_result) -> str:
+    """Strong ETag from the file content hash and its mtime"""
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    with _etag_lock:
+        digest = _etag_cache.get(key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(SENDFILE_CHUNK), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()[:16]
+        with _etag_lock:
+            _etag_cache[key] = digest
+    return f'"{digest}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """Inclusive (start, end) byte ranges for a Range header, merged and sorted
+
+    Returns None when the header is absent or malformed (serve the whole
+    file, as RFC 9110 allows) and raises RangeNotSatisfiable when it is
+    valid but no range overlaps the file.
+    """
+    if not header or not header.strip().lower().startswith("bytes="):
+        return None
+
+    ranges = []
+    for spec in header.split("=", 1)[1].split(","):
+        start_text, sep, end_text = spec.strip().partition("-")
+        if not sep:
+            return None
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else max(start, size - 1)
+            else:
+                suffix = int(end_text)  # "-500": the last 500 bytes
+                start, end = max(0, size - suffix), size - 1
+                if suffix == 0:
+                    continue
+        except ValueError:
+            return None
+        if start < 0 or end < start:
+            return None
+        if start < size:
+            ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return None
+    if not ranges:
+        raise RangeNotSatisfiable(header)
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Serve audio files for podcast episodes"""
+        self._serve_audio(include_body=True)
+
+    def do_HEAD(self):
+        """Headers for an audio file without its body"""
+        self._serve_audio(include_body=False)
+
+    def _serve_audio(self, include_body: bool):
         try:
             # Extract episode filename from URL path
-            path_parts = self.path.split("/")
+            path_parts = self.path.split("?")[0].split("/")
             if len(path_parts) < 3:
                 self.send_error(404, "Audio file not found")
                 return
 
-            episode_filename = unquote(path_parts[-1])
+            episode_filename = os.path.basename(unquote(path_parts[-1]))
 
             # Look for audio file in deployed directory structure
-            audio_path = f"daily_digests/{episode_filename}"
+            audio_path = os.path.join(AUDIO_DIR, episode_filename)
 
-            if not os.path.exists(audio_path):
+            if not episode_filename or not os.path.isfile(audio_path):
                 self.send_error(404, f"Audio file not found: {episode_filename}")
                 return
 
-            # Get file size
-            file_size = os.path.getsize(audio_path)
-
-            # Set headers for audio streaming
-            self.send_response(200)
-            self.send_header("Content-Type", "audio/mpeg")
-            self.send_header("Content-Length", str(file_size))
-            self.send_header("Accept-Ranges", "bytes")
-            self.send_header(
-                "Cache-Control", "public, max-age=86400"
-            )  # Cache for 24 hours
-            self.send_header(
-                "Content-Disposition", f'inline; filename="{episode_filename}"'
-            )
-            self.end_headers()
-
-            # Stream the file
             with open(audio_path, "rb") as f:
-                while True:
-                    chunk = f.read(8192)
-                    if not chunk:
-                        break
-                    self.wfile.write(chunk)
+                stat = os.fstat(f.fileno())
+                etag = file_etag(audio_path, stat)
+                file_size = stat.st_size
+
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    self.send_response(304)
+                    self._send_common_headers(episode_filename, etag, stat)
+                    self.end_headers()
+                    return
+
+                ranges = None
+                if_range = self.headers.get("If-Range")
+                if not if_range or if_range.strip() == etag:
+                    try:
+                        ranges = parse_range(self.headers.get("Range"), file_size)
+                    except RangeNotSatisfiable:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{file_size}")
+                        self.send_header("Content-Length", "0")
+                        self._send_common_headers(episode_filename, etag, stat)
+                        self.end_headers()
+                        return
+
+                if not ranges:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "audio/mpeg")
+                    self.send_header("Content-Length", str(file_size))
+                    self._send_common_headers(episode_filename, etag, stat)
+                    self.end_headers()
+                    if include_body:
+                        self._send_file_range(f, 0, file_size)
+                elif len(ranges) == 1:
+                    start, end = ranges[0]
+                    self.send_response(206)
+                    self.send_header("Content-Type", "audio/mpeg")
+                    self.send_header("Content-Length", str(end - start + 1))
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{end}/{file_size}"
+                    )
+                    self._send_common_headers(episode_filename, etag, stat)
+                    self.end_headers()
+                    if include_body:
+                        self._send_file_range(f, start, end - start + 1)
+                else:
+                    self._send_multipart(
+                        f, ranges, stat, episode_filename, etag, include_body
+                    )
 
         except Exception as e:
             self.send_error(500, f"Error serving audio: {str(e)}")
+
+    def _send_common_headers(
+        self, episode_filename: str, etag: str, stat: os.stat_result
+    ):
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(int(stat.st_mtime)))
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header(
+            "Content-Disposition", f'inline; filename="{episode_filename}"'
+        )
+
+    def _send_multipart(
+        self,
+        f,
+        ranges: List[Tuple[int, int]],
+        stat: os.stat_result,
+        episode_filename: str,
+        etag: str,
+        include_body: bool,
+    ):
+        """206 multipart/byteranges response for several disjoint ranges"""
+        boundary = secrets.token_hex(16)
+        file_size = stat.st_size
+        part_headers = [
+            (
+                f"\r\n--{boundary}\r\n"
+                "Content-Type: audio/mpeg\r\n"
+                f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+            ).encode("ascii")
+            for start, end in ranges
+        ]
+        closing = f"\r\n--{boundary}--\r\n".encode("ascii")
+        length = sum(len(head) for head in part_headers) + len(closing)
+        length += sum(end - start + 1 for start, end in ranges)
+
+        self.send_response(206)
+        self.send_header("Content-Type", f"multipart/byteranges; boundary={boundary}")
+        self.send_header("Content-Length", str(length))
+        self._send_common_headers(episode_filename, etag, stat)
+        self.end_headers()
+        if not include_body:
+            return
+        for head, (start, end) in zip(part_headers, ranges):
+            self.wfile.write(head)
+            self._send_file_range(f, start, end - start + 1)
+        self.wfile.write(closing)
+
+    def _send_file_range(self, f, offset: int, count: int):
+        """Zero-copy send of count bytes at offset, falling back to an mmap"""
+        if count <= 0:
+            return
+        self.wfile.flush()
+        sent = 0
+        try:
+            out_fd = self.connection.fileno()
+        except (AttributeError, OSError, ValueError):
+            out_fd = None  # not a plain socket (TLS, test harness)
+
+        if out_fd is not None and hasattr(os, "sendfile"):
+            try:
+                while sent < count:
+                    n = os.sendfile(
+                        out_fd,
+                        f.fileno(),
+                        offset + sent,
+                        min(SENDFILE_CHUNK, count - sent),
+                    )
+                    if n == 0:
+                        break
+                    sent += n
+                if sent == count:
+                    return
+            except OSError as e:
+                if e.errno not in _SENDFILE_UNSUPPORTED:
+                    raise
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                position = offset + sent
+                end = offset + count
+                while position < end:
+                    chunk_end = min(position + SENDFILE_CHUNK, end)
+                    self.wfile.write(view[position:chunk_end])
+                    position = chunk_end
+            finally:
+                view.release()
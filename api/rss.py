@@ -7,19 +7,48 @@ Fixed dependencies for proper module loading - debug version
 
 import hashlib
 import json
+import logging
 import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
 from http.server import BaseHTTPRequestHandler
-from xml.dom import minidom
-from xml.etree.ElementTree import Element, SubElement, tostring
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.etree.ElementTree import Element, SubElement
 
 from utils.datetime_utils import now_utc
+from utils.mp3_info import Mp3MetadataIndex
+
+logger = logging.getLogger(__name__)
+
+# Written by the pipeline at deploy time; lets the feed report exact durations
+MP3_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "mp3_metadata_index.json",
+)
+
+GITHUB_RELEASES_URL = os.getenv(
+    "GITHUB_RELEASES_URL",
+    "https://api.github.com/repos/McSchnizzle/podcast-scraper/releases",
+)
+UPSTREAM_TIMEOUT_SECONDS = float(os.getenv("RSS_UPSTREAM_TIMEOUT", "5"))
+FEED_TTL_SECONDS = float(os.getenv("RSS_CACHE_TTL", "300"))
+FEED_STALE_SECONDS = float(os.getenv("RSS_STALE_WHILE_REVALIDATE", "3600"))
+CACHE_CONTROL = (
+    f"public, max-age={int(FEED_TTL_SECONDS)}, "
+    f"stale-while-revalidate={int(FEED_STALE_SECONDS)}"
+)
 
 
 class PodcastRSSAPI:
-    def __init__(self):
+    def __init__(self, releases_url: str = GITHUB_RELEASES_URL):
         # Use stable podcast subdomain
         self.base_url = "https://podcast.paulrbrown.org"
+        self.releases_url = releases_url
 
         self.podcast_info = {
             "title": "Daily Tech Digest",
@@ -32,90 +61,130 @@ class PodcastRSSAPI:
             "website": f"{self.base_url}/daily-digest",
             "copyright": f"© {now_utc().year} Paul Brown",
         }
+        self.mp3_index = Mp3MetadataIndex(MP3_INDEX_PATH)
+
+    def _asset_duration(self, asset: Dict) -> int:
+        """Exact duration from the MP3 metadata index, else a size estimate"""
+        info = self.mp3_index.lookup_name(asset["name"])
+        if info:
+            return int(round(info["duration_seconds"]))
+        return max(300, asset["size"] // 15000)  # Estimate ~15KB per second
+
+    def fetch_releases(
+        self, etag: Optional[str] = None, last_modified: Optional[str] = None
+    ) -> Tuple[Optional[List[Dict]], Dict[str, Optional[str]]]:
+        """Conditional GET of the GitHub releases list
+
+        Returns (None, validators) when GitHub answers 304 Not Modified, which
+        does not count against the API rate limit.
+        """
+        request = urllib.request.Request(
+            self.releases_url,
+            headers={
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "podcast-scraper-rss",
+            },
+        )
+        if etag:
+            request.add_header("If-None-Match", etag)
+        if last_modified:
+            request.add_header("If-Modified-Since", last_modified)
+        if os.getenv("GITHUB_TOKEN"):
+            request.add_header("Authorization", f"Bearer {os.getenv('GITHUB_TOKEN')}")
 
-    def get_episode_metadata(self):
-        """Get episode metadata from GitHub releases API"""
-        import json as json_module
-        import urllib.request
+        try:
+            with urllib.request.urlopen(
+                request, timeout=UPSTREAM_TIMEOUT_SECONDS
+            ) as response:
+                releases = json.loads(response.read().decode("utf-8"))
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            releases, headers = None, e.headers
+
+        return releases, {
+            "etag": headers.get("ETag") or etag,
+            "last_modified": headers.get("Last-Modified") or last_modified,
+        }
 
+    def episodes_from_releases(self, releases: List[Dict]) -> List[Dict]:
+        """Episode metadata for the MP3 assets of the most recent releases"""
+        episodes = []
+
+        for release in releases[:7]:  # Last 7 releases (7-day retention)
+            if not release.get("assets"):
+                continue
+
+            # Look for MP3 assets in this release
+            for asset in release["assets"]:
+                if (
+                    asset["name"].endswith(".mp3")
+                    and "complete_topic_digest" in asset["name"]
+                ):
+                    # Extract date from filename
+                    filename = asset["name"]
+                    date_str = (
+                        filename.split("_")[-2]
+                        + "_"
+                        + filename.split("_")[-1].replace(".mp3", "")
+                    )
+
+                    try:
+                        episode_date = datetime.strptime(date_str, "%Y%m%d_%H%M%S")
+                        episode_date = episode_date.replace(tzinfo=timezone.utc)
+                    except:
+                        pub_date = release["published_at"]
+                        if isinstance(pub_date, str):
+                            episode_date = datetime.fromisoformat(
+                                pub_date.replace("Z", "+00:00")
+                            )
+                        else:
+                            episode_date = datetime.now(timezone.utc)
+
+                    episodes.append(
+                        {
+                            "title": release.get(
+                                "name",
+                                f"Daily Tech Digest - {episode_date.strftime('%B %d, %Y')}",
+                            ),
+                            "description": release.get(
+                                "body",
+                                f"AI-generated daily digest of tech news and insights from leading podcasts and creators. Generated on {episode_date.strftime('%B %d, %Y')} from multiple verified sources.",
+                            ),
+                            "date": episode_date,
+                            "filename": filename,
+                            "size": asset["size"],
+                            "duration": self._asset_duration(asset),
+                            "guid": hashlib.md5(filename.encode()).hexdigest(),
+                            "url": asset[
+                                "browser_download_url"
+                            ],  # Direct GitHub download URL
+                        }
+                    )
+
+        # Sort by date (newest first)
+        episodes.sort(key=lambda x: x["date"], reverse=True)
+        return episodes[:10]  # Return max 10 episodes
+
+    def local_episode_metadata(self) -> List[Dict]:
+        """Fallback to local metadata when the GitHub API is unavailable"""
         try:
-            # Fetch releases from GitHub API using urllib (standard library)
-            api_url = (
-                "https://api.github.com/repos/McSchnizzle/podcast-scraper/releases"
-            )
-            with urllib.request.urlopen(api_url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}")
-                releases = json_module.loads(response.read().decode("utf-8"))
-
-            episodes = []
-
-            for release in releases[:7]:  # Last 7 releases (7-day retention)
-                if not release.get("assets"):
-                    continue
-
-                # Look for MP3 assets in this release
-                for asset in release["assets"]:
-                    if (
-                        asset["name"].endswith(".mp3")
-                        and "complete_topic_digest" in asset["name"]
-                    ):
-                        # Extract date from filename
-                        filename = asset["name"]
-                        date_str = (
-                            filename.split("_")[-2]
-                            + "_"
-                            + filename.split("_")[-1].replace(".mp3", "")
-                        )
-
-                        try:
-                            episode_date = datetime.strptime(date_str, "%Y%m%d_%H%M%S")
-                            episode_date = episode_date.replace(tzinfo=timezone.utc)
-                        except:
-                            pub_date = release["published_at"]
-                            if isinstance(pub_date, str):
-                                episode_date = datetime.fromisoformat(
-                                    pub_date.replace("Z", "+00:00")
-                                )
-                            else:
-                                episode_date = datetime.now(timezone.utc)
-
-                        episodes.append(
-                            {
-                                "title": release.get(
-                                    "name",
-                                    f"Daily Tech Digest - {episode_date.strftime('%B %d, %Y')}",
-                                ),
-                                "description": release.get(
-                                    "body",
-                                    f"AI-generated daily digest of tech news and insights from leading podcasts and creators. Generated on {episode_date.strftime('%B %d, %Y')} from multiple verified sources.",
-                                ),
-                                "date": episode_date,
-                                "filename": filename,
-                                "size": asset["size"],
-                                "duration": max(
-                                    300, asset["size"] // 15000
-                                ),  # Estimate ~15KB per second
-                                "guid": hashlib.md5(filename.encode()).hexdigest(),
-                                "url": asset[
-                                    "browser_download_url"
-                                ],  # Direct GitHub download URL
-                            }
-                        )
-
-            # Sort by date (newest first)
-            episodes.sort(key=lambda x: x["date"], reverse=True)
-            return episodes[:10]  # Return max 10 episodes
+            with open("episode_metadata.json", "r") as f:
+                metadata = json.load(f)
+                return metadata.get("episodes", [])
+        except:
+            # Last resort: return empty list
+            return []
 
+    def get_episode_metadata(self):
+        """Get episode metadata from GitHub releases API"""
+        try:
+            releases, _ = self.fetch_releases()
+            return self.episodes_from_releases(releases)
         except Exception as e:
-            # Fallback to local metadata if GitHub API fails
-            try:
-                with open("episode_metadata.json", "r") as f:
-                    metadata = json.load(f)
-                    return metadata.get("episodes", [])
-            except:
-                # Last resort: return empty list
-                return []
+            logger.warning(f"⚠️ GitHub releases unavailable, using local data: {e}")
+            return self.local_episode_metadata()
 
     def format_duration(self, seconds):
         """Format duration as HH:MM:SS for iTunes"""
@@ -124,9 +193,10 @@ class PodcastRSSAPI:
         secs = seconds % 60
         return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-    def generate_rss_xml(self):
+    def generate_rss_xml(self, episodes: Optional[List[Dict]] = None):
         """Generate RSS XML feed"""
-        episodes = self.get_episode_metadata()
+        if episodes is None:
+            episodes = self.get_episode_metadata()
 
         # Create RSS root - simplified for Android/Spotify
         rss = Element("rss")
@@ -204,32 +274,195 @@ class PodcastRSSAPI:
 
         return rss
 
+    def render_feed(self, episodes: List[Dict]) -> bytes:
+        """Serialized feed document"""
+        rss = self.generate_rss_xml(episodes)
+        ET.indent(rss, space="  ")
+        xml = ET.tostring(rss, encoding="unicode")
+        return f'<?xml version="1.0" encoding="utf-8"?>\n{xml}\n'.encode("utf-8")
+
+
+class FeedCache:
+    """Module-level feed cache shared by the requests a warm instance serves
+
+    The rendered feed is fresh for `ttl` seconds. For `stale` seconds after
+    that it is still served immediately while a single background thread
+    revalidates it with a conditional GET against GitHub; past that window
+    the request revalidates synchronously. Concurrent refreshes collapse
+    into one upstream call, and upstream failures keep the last good feed.
+    """
+
+    def __init__(
+        self,
+        api_factory: Callable[[], PodcastRSSAPI] = PodcastRSSAPI,
+        ttl: float = FEED_TTL_SECONDS,
+        stale: float = FEED_STALE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.api_factory = api_factory
+        self.ttl = ttl
+        self.stale = stale
+        self.clock = clock
+        self.entry: Optional[Dict] = None
+        self.metrics = {
+            "hit": 0,
+            "stale": 0,
+            "miss": 0,
+            "client_not_modified": 0,
+            "upstream_not_modified": 0,
+            "upstream_changed": 0,
+            "upstream_errors": 0,
+        }
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def get(self) -> Tuple[Dict, str]:
+        """(entry, cache status) where status is HIT, STALE or MISS"""
+        with self._lock:
+            entry = self.entry
+            age = self.clock() - entry["fetched_at"] if entry else None
+            if entry and age < self.ttl:
+                self.metrics["hit"] += 1
+                return entry, "HIT"
+            if entry and age < self.ttl + self.stale:
+                self.metrics["stale"] += 1
+                if not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._background_refresh, daemon=True
+                    ).start()
+                return entry, "STALE"
+            self.metrics["miss"] += 1
+        return self.refresh(), "MISS"
+
+    def record(self, metric: str):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def _background_refresh(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error(f"❌ Background feed refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> Dict:
+        """Revalidate against GitHub and re-render only if the releases changed"""
+        with self._refresh_lock:
+            entry = self.entry
+            if entry and self.clock() - entry["fetched_at"] < self.ttl:
+                return entry  # refreshed while this request waited
+
+            api = self.api_factory()
+            try:
+                releases, upstream = api.fetch_releases(
+                    entry["upstream_etag"] if entry else None,
+                    entry["upstream_last_modified"] if entry else None,
+                )
+            except Exception as e:
+                self.record("upstream_errors")
+                logger.warning(f"⚠️ GitHub releases request failed: {e}")
+                if entry:
+                    entry = {**entry, "fetched_at": self.clock()}
+                else:
+                    entry = self._build(api, api.local_episode_metadata(), {}, None)
+            else:
+                if releases is None and entry:
+                    self.record("upstream_not_modified")
+                    entry = {**entry, "fetched_at": self.clock()}
+                else:
+                    self.record("upstream_changed")
+                    episodes = api.episodes_from_releases(releases or [])
+                    entry = self._build(api, episodes, upstream, entry)
+
+            with self._lock:
+                self.entry = entry
+            return entry
+
+    def _build(
+        self,
+        api: PodcastRSSAPI,
+        episodes: List[Dict],
+        upstream: Dict,
+        previous: Optional[Dict],
+    ) -> Dict:
+        body = api.render_feed(episodes)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if previous and previous["etag"] == etag:
+            last_modified = previous["last_modified"]
+        else:
+            last_modified = upstream.get("last_modified") or formatdate(usegmt=True)
+        return {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": self.clock(),
+            "upstream_etag": upstream.get("etag"),
+            "upstream_last_modified": upstream.get("last_modified"),
+        }
 
-class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        """Handle GET request for RSS feed"""
+
+FEED_CACHE = FeedCache()
+
+
+def is_not_modified(headers, entry: Dict) -> bool:
+    """Whether the client's validators match the cached feed"""
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry["etag"] in tags or f"W/{entry['etag']}" in tags
+
+    if_modified_since = headers.get("If-Modified-Since")
+    if if_modified_since:
         try:
-            rss_generator = PodcastRSSAPI()
-            rss_xml = rss_generator.generate_rss_xml()
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(
+                entry["last_modified"]
+            )
+        except (TypeError, ValueError):
+            return False
+    return False
 
-            # Convert to string
-            xml_str = minidom.parseString(tostring(rss_xml)).toprettyxml(indent="  ")
-            xml_lines = [line for line in xml_str.split("\n") if line.strip()]
-            xml_content = "\n".join(xml_lines)
 
-            # Set headers
-            self.send_response(200)
-            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
-            self.send_header(
-                "Cache-Control", "public, max-age=300"
-            )  # Cache for 5 minutes
-            self.end_headers()
+class handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        """Handle GET request for RSS feed"""
+        self._serve_feed(include_body=True)
 
-            # Send XML
-            self.wfile.write(xml_content.encode("utf-8"))
+    def do_HEAD(self):
+        """Handle HEAD request for RSS feed"""
+        self._serve_feed(include_body=False)
 
+    def _serve_feed(self, include_body: bool):
+        try:
+            entry, cache_status = FEED_CACHE.get()
         except Exception as e:
             self.send_response(500)
             self.send_header("Content-Type", "text/plain")
             self.end_headers()
             self.wfile.write(f"Error generating RSS feed: {str(e)}".encode("utf-8"))
+            return
+
+        not_modified = is_not_modified(self.headers, entry)
+        if not_modified:
+            FEED_CACHE.record("client_not_modified")
+            self.send_response(304)
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(entry["body"])))
+        self.send_header("ETag", entry["etag"])
+        self.send_header("Last-Modified", entry["last_modified"])
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("X-Cache", cache_status)
+        self.end_headers()
+
+        if include_body and not not_modified:
+            self.wfile.write(entry["body"])
+
+        logger.info(
+            f"📊 RSS {self.command} {304 if not_modified else 200} "
+            f"cache={cache_status} metrics={FEED_CACHE.metrics}"
+        )
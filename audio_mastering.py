@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Audio Mastering Stage
+Builds one ffmpeg filter graph per episode (intro/outro crossfades, EBU R128
+loudnorm and the final MP3 encode) with the TTS stream piped in on stdin
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from music_asset_bank import PCM_FORMAT
+from utils.logging_setup import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# loudnorm prints its measurement block as the last JSON object on stderr
+LOUDNORM_JSON = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.DOTALL)
+
+
+def build_filter_graph(settings: Dict, with_music: bool) -> str:
+    """Filter graph for one episode; narration is [1:a] with music, [0:a] without"""
+    loudnorm = (
+        f"loudnorm=I={settings['target_lufs']}:TP={settings['true_peak_db']}"
+        f":LRA={settings['loudness_range']}:print_format=json"
+    )
+    if not with_music:
+        return f"[0:a]{loudnorm}[out]"
+
+    volume = settings["music_volume"]
+    crossfade = settings["crossfade_seconds"]
+    return (
+        f"[0:a]volume={volume}[intro];"
+        f"[2:a]volume={volume}[outro];"
+        f"[intro][1:a]acrossfade=d={crossfade}:c1=tri:c2=tri[intro_tts];"
+        f"[intro_tts][outro]acrossfade=d={crossfade}:c1=tri:c2=tri[mix];"
+        f"[mix]{loudnorm}[out]"
+    )
+
+
+def parse_loudnorm_stats(stderr: str) -> Dict[str, float]:
+    """Extract measured input/output loudness from loudnorm's JSON report"""
+    matches = LOUDNORM_JSON.findall(stderr)
+    if not matches:
+        return {}
+
+    try:
+        report = json.loads(matches[-1])
+    except json.JSONDecodeError:
+        return {}
+
+    stats = {}
+    for key, name in [
+        ("input_i", "input_lufs"),
+        ("output_i", "integrated_lufs"),
+        ("output_tp", "true_peak_db"),
+        ("output_lra", "loudness_range"),
+    ]:
+        try:
+            stats[name] = float(report[key])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return stats
+
+
+class AudioMasteringStage:
+    """Masters an episode in a single ffmpeg pass, falling back to raw TTS frames"""
+
+    def __init__(self, settings: Dict):
+        self.settings = settings
+        self.ffmpeg = settings["ffmpeg_binary"]
+
+    def _input_args(self, path: str) -> List[str]:
+        """ffmpeg input options; decoded PCM needs its raw format spelled out"""
+        if path == "pipe:0":
+            return ["-f", "mp3", "-i", path]
+        if path.endswith(".pcm"):
+            return [
+                "-f",
+                PCM_FORMAT,
+                "-ar",
+                str(self.settings["sample_rate"]),
+                "-ac",
+                str(self.settings["music_channels"]),
+                "-i",
+                path,
+            ]
+        return ["-i", path]
+
+    def build_command(
+        self,
+        tts_input: str,
+        output_file: str,
+        intro_music: Optional[str] = None,
+        outro_music: Optional[str] = None,
+    ) -> List[str]:
+        """ffmpeg command; tts_input is a path or "pipe:0" for stdin
+
+        Music inputs may be mp3 files or decoded .pcm assets from the bank.
+        """
+        with_music = bool(intro_music and outro_music)
+        cmd = [self.ffmpeg, "-hide_banner", "-nostdin", "-y"]
+        if with_music:
+            cmd += self._input_args(intro_music)
+        cmd += self._input_args(tts_input)
+        if with_music:
+            cmd += self._input_args(outro_music)
+        cmd += [
+            "-filter_complex",
+            build_filter_graph(self.settings, with_music),
+            "-map",
+            "[out]",
+            "-ar",
+            str(self.settings["sample_rate"]),
+            "-c:a",
+            "libmp3lame",
+            "-b:a",
+            self.settings["bitrate"],
+            "-f",
+            "mp3",
+            output_file,
+        ]
+        return cmd
+
+    def master(
+        self,
+        tts_audio: Union[bytes, str],
+        output_path: Path,
+        intro_music: Optional[str] = None,
+        outro_music: Optional[str] = None,
+    ) -> Dict:
+        """Master TTS audio (bytes or a file path) into output_path
+
+        Returns stats with mastering_ms and measured loudness. If ffmpeg is
+        unavailable or fails, the TTS frames are written unchanged so the
+        episode still ships (mastered=False).
+        """
+        start_time = time.time()
+        output_path = Path(output_path)
+        piped = isinstance(tts_audio, bytes)
+        tmp_path = output_path.with_suffix(".mastering")
+        cmd = self.build_command(
+            "pipe:0" if piped else str(tts_audio),
+            str(tmp_path),
+            intro_music,
+            outro_music,
+        )
+
+        error = None
+        try:
+            result = subprocess.run(
+                cmd,
+                input=tts_audio if piped else None,
+                capture_output=True,
+                timeout=self.settings["timeout_seconds"],
+            )
+            stderr = result.stderr.decode("utf-8", errors="replace")
+            if result.returncode == 0:
+                os.replace(tmp_path, output_path)
+                stats = {
+                    "mastered": True,
+                    "with_music": bool(intro_music and outro_music),
+                    "mastering_ms": int((time.time() - start_time) * 1000),
+                    **parse_loudnorm_stats(stderr),
+                }
+                logger.info(
+                    f"🎚️  Mastered {output_path.name} in {stats['mastering_ms']}ms "
+                    f"({stats.get('integrated_lufs', 'n/a')} LUFS integrated)"
+                )
+                return stats
+            error = stderr.strip().splitlines()[-1] if stderr.strip() else "no output"
+        except FileNotFoundError:
+            error = f"{self.ffmpeg} not found"
+        except subprocess.TimeoutExpired:
+            error = f"timed out after {self.settings['timeout_seconds']}s"
+
+        logger.error(f"❌ Mastering failed for {output_path.name}: {error}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        # Fallback: ship the narration frames as-is (no re-encode)
+        if piped:
+            output_path.write_bytes(tts_audio)
+        elif Path(tts_audio) != output_path:
+            output_path.write_bytes(Path(tts_audio).read_bytes())
+        logger.info(f"📄 Fallback: wrote unmastered TTS audio to {output_path.name}")
+        return {
+            "mastered": False,
+            "with_music": False,
+            "mastering_ms": int((time.time() - start_time) * 1000),
+            "error": error,
+        }
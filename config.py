@@ -104,10 +104,36 @@ class Config:
 
         # TTS settings
         self.TTS_SETTINGS = {
-            "base_url": "https://api.elevenlabs.io/v1",
+            "base_url": os.getenv(
+                "ELEVENLABS_BASE_URL", "https://api.elevenlabs.io/v1"
+            ),
             "model_id": "eleven_multilingual_v2",
             "timeout_seconds": 120,
             "max_text_length": 50000,
+            "segment_max_chars": int(os.getenv("TTS_SEGMENT_MAX_CHARS", "2500")),
+            "max_parallel_segments": int(os.getenv("TTS_MAX_PARALLEL", "3")),
+            "requests_per_second": float(os.getenv("TTS_REQUESTS_PER_SECOND", "2")),
+            "segment_retries": 3,
+            "segment_cache_dir": os.getenv("TTS_SEGMENT_CACHE_DIR", "tts_cache"),
+            "segment_cache_max_mb": int(os.getenv("TTS_SEGMENT_CACHE_MAX_MB", "500")),
+            # Topics produced concurrently (TTS + mastering + metadata) per run
+            "max_parallel_topics": int(os.getenv("AUDIO_PRODUCTION_WORKERS", "3")),
+        }
+        # Single-pass episode mastering: music crossfades + EBU R128 loudnorm + encode
+        self.MASTERING_SETTINGS = {
+            "enabled": os.getenv("AUDIO_MASTERING", "1") == "1",
+            "ffmpeg_binary": os.getenv("FFMPEG_BINARY", "ffmpeg"),
+            "target_lufs": float(os.getenv("MASTERING_TARGET_LUFS", "-16")),
+            "true_peak_db": float(os.getenv("MASTERING_TRUE_PEAK_DB", "-1.5")),
+            "loudness_range": float(os.getenv("MASTERING_LRA", "11")),
+            "crossfade_seconds": 2,
+            "music_volume": 0.15,
+            "bitrate": "128k",
+            "sample_rate": 44100,
+            "timeout_seconds": int(os.getenv("MASTERING_TIMEOUT_SECONDS", "300")),
+            # Intro/outro/transition music decoded once to raw PCM (music_asset_bank)
+            "music_pcm_dir": os.getenv("MUSIC_PCM_DIR", "music_cache/pcm"),
+            "music_channels": 2,
         }
 
         # OpenAI GPT-5 Configuration (Phase 2 Enhanced)
@@ -174,6 +200,11 @@ class Config:
             "max_episodes_per_topic": 6,
             "max_episode_summary_tokens": 450,
             "max_reduce_tokens": 6000,
+            "reduce_mode": os.getenv("REDUCE_MODE", "tree"),
+            "reduce_fan_in": int(os.getenv("REDUCE_FAN_IN", "4")),
+            "reduce_max_depth": int(os.getenv("REDUCE_MAX_DEPTH", "2")),
+            "incremental_digest": os.getenv("INCREMENTAL_DIGEST", "0") == "1",
+            "reuse_reduce_output": os.getenv("REUSE_REDUCE_OUTPUT", "0") == "1",
             "max_retries": self.EXECUTION_SETTINGS["max_retries"],
             "backoff_base_delay": self.EXECUTION_SETTINGS["backoff_base_delay"],
             "topics": {
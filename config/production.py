@@ -91,6 +91,37 @@ class ProductionConfig:
                 _env("ITEM_SEEN_RETENTION_DAYS", "30")
             ),  # Cleanup old item_seen records
         }
+        # ElevenLabs TTS settings (digests are synthesized in paragraph segments)
+        self.TTS_SETTINGS = {
+            "base_url": _env("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io/v1"),
+            "model_id": _env("TTS_MODEL_ID", "eleven_multilingual_v2"),
+            "timeout_seconds": int(_env("TTS_TIMEOUT_SECONDS", "120")),
+            "max_text_length": 50000,
+            "segment_max_chars": int(_env("TTS_SEGMENT_MAX_CHARS", "2500")),
+            "max_parallel_segments": int(_env("TTS_MAX_PARALLEL", "3")),
+            "requests_per_second": float(_env("TTS_REQUESTS_PER_SECOND", "2")),
+            "segment_retries": int(_env("TTS_SEGMENT_RETRIES", "3")),
+            "segment_cache_dir": _env("TTS_SEGMENT_CACHE_DIR", "tts_cache"),
+            "segment_cache_max_mb": int(_env("TTS_SEGMENT_CACHE_MAX_MB", "500")),
+            # Topics produced concurrently (TTS + mastering + metadata) per run
+            "max_parallel_topics": int(_env("AUDIO_PRODUCTION_WORKERS", "3")),
+        }
+        # Single-pass episode mastering: music crossfades + EBU R128 loudnorm + encode
+        self.MASTERING_SETTINGS = {
+            "enabled": _env("AUDIO_MASTERING", "1") == "1",
+            "ffmpeg_binary": _env("FFMPEG_BINARY", "ffmpeg"),
+            "target_lufs": float(_env("MASTERING_TARGET_LUFS", "-16")),
+            "true_peak_db": float(_env("MASTERING_TRUE_PEAK_DB", "-1.5")),
+            "loudness_range": float(_env("MASTERING_LRA", "11")),
+            "crossfade_seconds": 2,
+            "music_volume": 0.15,
+            "bitrate": "128k",
+            "sample_rate": 44100,
+            "timeout_seconds": int(_env("MASTERING_TIMEOUT_SECONDS", "300")),
+            # Intro/outro/transition music decoded once to raw PCM (music_asset_bank)
+            "music_pcm_dir": _env("MUSIC_PCM_DIR", "music_cache/pcm"),
+            "music_channels": 2,
+        }
         # Provide complete OPENAI_SETTINGS structure expected by the codebase
         self.OPENAI_SETTINGS = {
             # Model configuration - using actual OpenAI model names
@@ -117,6 +148,15 @@ class ProductionConfig:
             "max_episodes_per_topic": 6,  # Top-N cap per topic
             "max_episode_summary_tokens": 450,  # Per-episode summary token limit
             "max_reduce_tokens": 6000,  # Total tokens for final digest prompt
+            # Over-budget reduce: "tree" condenses batches, "drop" trims lowest scores
+            "reduce_mode": _env("REDUCE_MODE", "tree"),
+            "reduce_fan_in": int(_env("REDUCE_FAN_IN", "4")),  # Summaries per batch
+            "reduce_max_depth": int(
+                _env("REDUCE_MAX_DEPTH", "2")
+            ),  # Intermediate levels
+            # Opt-in: same-day reruns reuse persisted map output and only map new episodes
+            "incremental_digest": _env("INCREMENTAL_DIGEST", "0") == "1",
+            "reuse_reduce_output": _env("REUSE_REDUCE_OUTPUT", "0") == "1",
             "max_retries": 4,  # Exponential backoff retries
             "backoff_base_delay": 0.5,  # Starting delay for exponential backoff
             # Legacy keys for backward compatibility
@@ -183,6 +223,21 @@ class ProductionConfig:
             "validator": _env("REASONING_VALIDATOR", "minimal"),
         }
 
+        # Quality thresholds and guardrails
+        self.QUALITY_THRESHOLDS = {
+            "relevance_threshold": float(_env("RELEVANCE_THRESHOLD", "0.65")),
+            "min_chunks_ok": int(_env("MIN_CHUNKS_OK", "2")),
+            "min_coverage_pct": float(_env("MIN_COVERAGE_PCT", "0.6")),
+        }
+
+        # Execution settings (max_parallel_requests caps in-flight map-phase calls)
+        self.EXECUTION_SETTINGS = {
+            "max_parallel_requests": int(_env("MAX_PARALLEL_REQUESTS", "4")),
+            "timeout_seconds": int(_env("OPENAI_TIMEOUT_SECONDS", "60")),
+            "max_retries": 4,
+            "backoff_base_delay": 0.75,
+        }
+
         # Feature flags for staged rollout
         self.FEATURE_FLAGS = {
             "use_gpt5_summaries": _env("USE_GPT5_SUMMARIES", "1") == "1",
@@ -15,6 +15,7 @@ import re
 import sqlite3
 import subprocess
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -22,8 +23,12 @@ import requests
 from youtube_transcript_api import YouTubeTranscriptApi
 
 from openai_scorer import OpenAITopicScorer
+from telemetry_manager import telemetry
 from utils.db import get_connection
 from utils.episode_failures import FailureManager
+from utils.profiling import PROFILE_MODES, profile_run
+from utils.tracing import tracer
+from utils.work_queue import QueueWorker, WorkQueue, default_worker_id
 
 # Parakeet MLX for Apple Silicon (local development)
 try:
@@ -192,8 +197,10 @@ class ContentProcessor:
             print("Cannot proceed without Faster-Whisper ASR")
             raise RuntimeError(f"Failed to initialize Faster-Whisper: {e}")
 
+    @tracer.traced("transcribe.episode")
     def process_episode(self, episode_id):
         """Process a single episode: download audio, extract transcript, analyze content"""
+        tracer.annotate(episode_id=episode_id)
         conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
@@ -337,6 +344,7 @@ class ContentProcessor:
         finally:
             conn.close()
 
+    @tracer.traced("transcribe.youtube")
     def _process_youtube_episode(self, video_url, episode_id):
         """Extract transcript from YouTube video with GitHub Actions fallback"""
         video_id = self._extract_youtube_video_id(video_url)
@@ -466,6 +474,7 @@ class ContentProcessor:
             self._log_episode_failure(video_url, f"YouTube: {error_msg}", category)
             return None
 
+    @tracer.traced("transcribe.rss")
     def _process_rss_episode(self, audio_url, episode_id):
         """Download RSS audio and convert to transcript using Parakeet MLX ASR"""
         if not audio_url:
@@ -541,6 +550,7 @@ class ContentProcessor:
         except Exception as e:
             print(f"Error updating episode status: {e}")
 
+    @tracer.traced("transcribe.download")
     def _download_audio(self, audio_url, episode_id):
         """Download audio file from RSS feed or use local file if path provided"""
         try:
@@ -591,8 +601,10 @@ class ContentProcessor:
             print(f"Error downloading audio: {e}")
             return None
 
+    @tracer.traced("transcribe.asr")
     def _audio_to_transcript(self, audio_file):
         """Convert audio to transcript using available ASR backend"""
+        tracer.annotate(backend=self.asr_backend)
         if self.asr_model is None:
             raise RuntimeError("ASR model not initialized")
 
@@ -809,6 +821,10 @@ class ContentProcessor:
             # Final summary matching Parakeet style
             total_time = time.time() - overall_start
             overall_rtf = total_time / duration if duration > 0 else 0
+            if duration > 0:
+                telemetry.record_metric(
+                    "transcribe.rtf.ratio", overall_rtf, backend=self.asr_backend
+                )
 
             print(f"\n🏁 Faster-Whisper Transcription Complete!")
             print(f"{'='*60}")
@@ -1064,6 +1080,7 @@ class ContentProcessor:
         except Exception as log_error:
             print(f"⚠️ Error in failure logging: {log_error}")
 
+    @tracer.traced("transcribe.retry_queue")
     def process_retry_queue(self, max_retries_per_run=5):
         """Process episodes eligible for retry"""
         try:
@@ -1185,6 +1202,7 @@ class ContentProcessor:
 
         return str(transcript_path)
 
+    @tracer.traced("transcribe.analyze")
     def _analyze_content(self, transcript, topic_category):
         """Analyze transcript content for news extraction and priority scoring"""
         # Basic content analysis (will be enhanced with LLM integration)
@@ -1261,20 +1279,59 @@ class ContentProcessor:
 
         return analysis
 
-    def process_all_pending(self):
-        """Process all episodes awaiting transcription (pending/pre-download status)"""
-        conn = get_connection(self.db_path)
-        cursor = conn.cursor()
+    @tracer.traced("transcribe.pending")
+    def process_all_pending(self, stage=None):
+        """Process all episodes awaiting transcription (pending/pre-download status)
 
-        cursor.execute(
-            "SELECT id FROM episodes WHERE status IN ('pending', 'pre-download')"
+        Episodes are taken from the work queue in weighted-fair priority order
+        (see utils.work_queue). stage is an optional utils.scheduler.StageBudget;
+        episodes it does not admit stay queued for the next run.
+        """
+        queue = WorkQueue(self.db_path)
+        queue.sync()
+        episodes_to_process = queue.plan()
+        if episodes_to_process:
+            feeds = len({item.feed_id for item in episodes_to_process})
+            print(
+                f"📋 Work queue: {len(episodes_to_process)} episodes across "
+                f"{feeds} feeds"
+            )
+        telemetry.record_metric(
+            "work_queue.depth.gauge", len(episodes_to_process), stage="transcribe"
         )
-        episodes_to_process = cursor.fetchall()
-        conn.close()
+
+        if stage is not None:
+            episodes_to_process = stage.order(
+                episodes_to_process, key=lambda item: item.episode_pk
+            )
 
         results = []
-        for (episode_id,) in episodes_to_process:
-            result = self.process_episode(episode_id)
+        worker = default_worker_id()
+        for item in episodes_to_process:
+            episode_id = item.episode_pk
+            # Feeds with recorded history get their own cost estimate
+            if stage is not None and not stage.admit(episode_id, item.cost_seconds):
+                continue
+            # Skips episodes a --worker process has leased meanwhile
+            if not queue.claim(episode_id, worker):
+                continue
+            started = time.time()
+            try:
+                with queue.lease(episode_id, worker) as lost:
+                    result = self.process_episode(episode_id)
+            except Exception:
+                # Back to the queue now rather than when the lease runs out
+                queue.release(episode_id, worker)
+                raise
+            seconds = time.time() - started
+            if stage is not None:
+                stage.done(episode_id, seconds)
+            completed = not lost.is_set() and queue.complete(
+                episode_id, seconds, succeeded=bool(result), worker=worker
+            )
+            if not completed:
+                print(f"⚠️ Lost the claim on episode {episode_id}, dropping the result")
+                continue
             if result:
                 results.append(result)
 
@@ -1344,6 +1401,27 @@ class ContentProcessor:
 
 def main():
     """CLI interface for content processing"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Process pending episodes")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile the run into telemetry/profiles/ (default: PODCAST_PROFILE)",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Lease episodes from the shared work queue alongside other workers",
+    )
+    parser.add_argument("--worker-id", help="Worker name (default: host:pid)")
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="With --worker, keep polling for new episodes instead of exiting",
+    )
+    args = parser.parse_args()
+
     processor = ContentProcessor()
 
     print("Daily Podcast Digest - Content Processor")
@@ -1376,9 +1454,21 @@ def main():
         print("   Install Parakeet MLX with: pip install parakeet-mlx")
         return
 
+    if args.worker:
+        worker = QueueWorker(
+            WorkQueue(processor.db_path), processor.process_episode, args.worker_id
+        )
+        print(f"\nWorking the episode queue as {worker.worker_id}...")
+        with profile_run("content_processor", args.profile, stage_depth=3):
+            processed = worker.run(follow=args.follow)
+        print(f"\n✅ Worker processed {processed} episodes")
+        return
+
     # Process pending episodes
     print("\nProcessing all pending episodes...")
-    results = processor.process_all_pending()
+    # transcribe.pending > episode > rss/youtube > download/asr
+    with profile_run("content_processor", args.profile, stage_depth=3):
+        results = processor.process_all_pending()
 
     if results:
         print(f"\n✅ Processed {len(results)} episodes")
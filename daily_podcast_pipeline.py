@@ -14,6 +14,7 @@ import tempfile
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from utils.db import get_connection
 
@@ -29,11 +30,21 @@ from content_processor import ContentProcessor
 
 # Import existing modules
 from feed_monitor import FeedMonitor
-from openai_digest_integration import OpenAIDigestIntegration
+from openai_digest_integration import (
+    DIGEST_TOPICS,
+    OpenAIDigestIntegration,
+    TopicDigestRun,
+)
 from retention_cleanup import RetentionCleanup
 from telemetry_manager import telemetry
 from utils.datetime_utils import now_utc
 from utils.episode_failures import FailureManager, ensure_failures_table_exists
+from utils.profiling import PROFILE_MODES, start_profiling
+from utils.run_journal import RunJournal, latest_unfinished
+from utils.run_journal import prune as prune_journal
+from utils.scheduler import RunScheduler
+from utils.task_graph import TaskGraph
+from utils.tracing import tracer
 
 # Configuration
 CONFIG = {
@@ -52,6 +63,9 @@ CONFIG = {
     "DAILY_DIGESTS_DIR": "daily_digests",
 }
 
+# Publish gates in order; episodes are marked digested only after all of them
+PUBLISH_TASKS = ("publish.audio", "publish.rss", "publish.mark_digested")
+
 # Logging will be configured in main() based on --verbose flag
 logger = None
 
@@ -67,6 +81,10 @@ class DailyPodcastPipeline:
             db_path=self.db_path, transcripts_dir=CONFIG["TRANSCRIPTS_DIR"]
         )
         self.hours_back = hours_back
+        # Time budget for the work-queue stages (PIPELINE_TIME_BUDGET/--timeout)
+        self.scheduler = RunScheduler()
+        # Step checkpoints of the current workflow run (see run_daily_workflow)
+        self.journal: Optional[RunJournal] = None
 
     def _get_display_weekday(self):
         """Get weekday in display timezone for human-facing labels"""
@@ -93,15 +111,35 @@ class DailyPodcastPipeline:
             return now_utc().strftime("%A")
 
     def run_daily_workflow(self):
-        """Execute complete daily workflow with weekday logic"""
+        """Execute complete daily workflow with weekday logic
+
+        Steps are checkpointed in the run journal under the telemetry run ID;
+        after telemetry.resume_run() the original run's weekday and digest
+        date are kept and completed steps are skipped.
+        """
         # Use UTC for all logic/comparisons, display timezone for user-facing labels
-        utc_weekday = now_utc().strftime("%A")
-        display_weekday = self._get_display_weekday()
-        logger.info(f"🚀 Starting Daily Tech Digest Pipeline - {display_weekday}")
+        self.journal = RunJournal(telemetry.current_run_id)
+        run_inputs = self.journal.begin(
+            "daily_workflow",
+            {
+                "weekday": now_utc().strftime("%A"),
+                "display_weekday": self._get_display_weekday(),
+                "today": now_utc().date().isoformat(),
+                "hours_back": self.hours_back,
+            },
+        )
+        utc_weekday = run_inputs["weekday"]
+        display_weekday = run_inputs["display_weekday"]
+        resumed = " (resumed)" if self.journal.resumed else ""
+        logger.info(
+            f"🚀 Starting Daily Tech Digest Pipeline - {display_weekday}{resumed}"
+        )
         logger.info("=" * 50)
 
         # Initialize telemetry for this run
         pipeline_start_time = time.time()
+        run_status = "failed"
+        self.scheduler.start()
         if utc_weekday == "Friday":
             telemetry.set_pipeline_type("weekly")
         elif utc_weekday == "Monday":
@@ -109,109 +147,269 @@ class DailyPodcastPipeline:
         else:
             telemetry.set_pipeline_type("daily")
 
-        # Self-healing: Backfill missing topic scores from previous runs
-        from openai_scorer import run_backfill_scoring
-
-        run_backfill_scoring()  # Keep an early pass for any leftovers
-
-        # Ensure failure tracking tables exist
-        ensure_failures_table_exists(CONFIG["DB_PATH"])
-        ensure_failures_table_exists("youtube_transcripts.db")
+        # Root span: every step below is a child of it in the run's trace
+        trace_root = tracer.start_span(
+            "pipeline.daily_workflow",
+            weekday=utc_weekday,
+            pipeline_type=telemetry.current_run.pipeline_type,
+        )
 
         try:
-            # Step 0: Process retry queue for failed episodes
-            self._process_retry_queue()
+            # Ensure failure tracking tables exist
+            ensure_failures_table_exists(CONFIG["DB_PATH"])
+            ensure_failures_table_exists("youtube_transcripts.db")
 
-            # Step 1: Monitor RSS feeds for new episodes
-            self._monitor_rss_feeds()
-
-            # Step 2: Process audio_cache files (transcribe to 'transcribed')
-            self._process_audio_cache_files()
-
-            # Step 3: Process pending episodes
-            self._process_pending_episodes()
-
-            # Step 4: CRITICAL - Re-score after new transcripts are created
-            from openai_scorer import score_pending_in_db
-
-            scored_rss = score_pending_in_db(
-                "podcast_monitor.db", source="rss", max_to_score=200
-            )
-            scored_yt = score_pending_in_db(
-                "youtube_transcripts.db", source="youtube", max_to_score=200
-            )
-            logger.info(
-                f"Post-transcription scoring complete: RSS={scored_rss}, YT={scored_yt}"
+            graph = self.build_workflow_graph(
+                utc_weekday, display_weekday, today=run_inputs["today"]
             )
-
-            # Step 5: Generate digest based on weekday logic
-            if utc_weekday == "Friday":
-                logger.info(
-                    f"📅 {display_weekday} detected - generating daily + weekly digests"
-                )
-                digest_success = self._generate_weekly_digest()
-            elif utc_weekday == "Monday":
-                logger.info(
-                    f"📅 {display_weekday} detected - generating catch-up digest"
-                )
-                digest_success = self._generate_catchup_digest()
-            else:
-                logger.info(f"📅 {display_weekday} - generating standard daily digest")
-                digest_success = self._generate_daily_digest()
-
-            if digest_success:
-                # Transactional Publishing: Strict order with hard gates
-                logger.info("🔒 Starting transactional publishing process...")
-
-                # Step 6: Create TTS audio for today only
-                today = now_utc().date().isoformat()
-                mp3_files_created = self._create_tts_audio_today_only(today)
-
-                if not mp3_files_created:
-                    logger.info(f"RSS not updated: no new MP3s for {today}")
+            logger.info(graph.describe())
+            graph.run(journal=self.journal)
+            logger.info(graph.describe())
+
+            if graph.tasks["digest"].status == "done":
+                stopped = [
+                    name for name in PUBLISH_TASKS if graph.tasks[name].status != "done"
+                ]
+                if stopped:
+                    logger.error(f"❌ Transactional publishing failed at {stopped[0]}")
                     return False  # Exit without marking episodes as digested
-
-                # Step 7: Deploy to GitHub releases (MUST succeed)
-                deploy_success = self._deploy_to_github()
-                if not deploy_success:
-                    logger.error(
-                        "❌ Transactional publishing failed: deployment failed"
-                    )
-                    return False  # Exit without marking episodes as digested
-
-                # Step 8: Update RSS feed (MUST succeed)
-                rss_success = self._update_rss_feed()
-                if not rss_success:
-                    logger.error(
-                        "❌ Transactional publishing failed: RSS update failed"
-                    )
-                    return False  # Exit without marking episodes as digested
-
-                # Step 9: ONLY NOW mark processed episodes as 'digested'
-                self._mark_episodes_digested()
                 logger.info("✅ Transactional publishing completed successfully")
 
-            # Step 10: Cleanup old files and transcripts
+            # Cleanup old files and transcripts
             self._cleanup_old_files()
 
             logger.info("✅ Daily workflow completed successfully")
-
-            # Finalize telemetry
-            total_time = time.time() - pipeline_start_time
-            telemetry.finalize_run(total_time)
-
+            run_status = "completed"
             return True
 
         except Exception as e:
             logger.error(f"❌ Daily workflow failed: {e}")
             telemetry.record_error(f"Pipeline failed: {e}")
+            trace_root.record_exception(e)
+            return False
 
-            # Still finalize telemetry for failed runs
+        finally:
+            # Finalize telemetry for every outcome, publish gates included,
+            # so each run leaves its run file and trace
+            self.journal.finish(run_status)
+            trace_root.end()
             total_time = time.time() - pipeline_start_time
             telemetry.finalize_run(total_time)
 
+    def build_workflow_graph(
+        self,
+        utc_weekday: str,
+        display_weekday: Optional[str] = None,
+        today: Optional[str] = None,
+    ) -> TaskGraph:
+        """The daily workflow as a task graph
+
+        Ingest steps overlap (RSS feeds and YouTube transcripts on the network,
+        retries and the audio cache on the transcriber, backfill scoring on the
+        LLM quota); scoring waits for every new transcript. Each topic's digest
+        is its own task after scoring, chained in topic order because an
+        episode belongs to the first topic that digests it; a failed topic
+        doesn't stop the next one. The digest gate then applies the weekday
+        logic. Publishing is a chain of gates: audio (TTS, deploying each topic
+        as it is ready), then RSS, then marking episodes digested. A closed
+        gate leaves the episodes 'transcribed' for the next run. today pins the
+        digest and audio date (a resumed run keeps its original one).
+        """
+        display_weekday = display_weekday or utc_weekday
+        today = today or now_utc().date().isoformat()
+        graph = TaskGraph("daily_workflow")
+        graph.add("backfill_scoring", self._backfill_scoring, resource="llm")
+        graph.add("retry_queue", self._process_retry_queue, resource="cpu")
+        graph.add(
+            "feed_monitor",
+            self._monitor_rss_feeds,
+            resource="network",
+            inputs={"hours_back": self.hours_back},
+        )
+        graph.add(
+            "youtube_transcripts",
+            self._fetch_youtube_transcripts,
+            resource="network",
+            inputs={"hours_back": self.hours_back},
+        )
+        graph.add(
+            "audio_cache",
+            self._process_audio_cache_files,
+            deps=("retry_queue",),
+            resource="cpu",
+        )
+        graph.add(
+            "pending_episodes",
+            self._process_pending_episodes,
+            deps=("feed_monitor", "audio_cache"),
+            resource="cpu",
+        )
+        graph.add(
+            "scoring",
+            self._score_new_transcripts,
+            deps=("backfill_scoring", "youtube_transcripts", "pending_episodes"),
+            resource="llm",
+        )
+        digest_run = TopicDigestRun(self.openai_integration, today)
+        topic_tasks = []
+        for topic in sorted(DIGEST_TOPICS):
+            topic_tasks.append(f"digest.topic:{topic}")
+            graph.add(
+                topic_tasks[-1],
+                lambda topic=topic: self._generate_topic_digest(digest_run, topic),
+                deps=("scoring",) + tuple(topic_tasks[-2:-1]),
+                resource="llm",
+                inputs={"digest_date": today},
+                optional=True,
+            )
+        graph.add(
+            "digest",
+            lambda: self._generate_weekday_digest(
+                utc_weekday,
+                display_weekday,
+                self._collect_topic_digests(graph, digest_run),
+            ),
+            deps=tuple(topic_tasks),
+            gate=True,
+            inputs={"weekday": utc_weekday, "digest_date": today},
+        )
+        # Transactional publishing: strict order with hard gates
+        graph.add(
+            "publish.audio",
+            lambda: self._publish_audio_gate(today),
+            deps=("digest",),
+            resource="network",
+            gate=True,
+            inputs={"date": today},
+        )
+        graph.add(
+            "publish.rss",
+            self._update_rss_feed,
+            deps=("publish.audio",),
+            resource="network",
+            gate=True,
+        )
+        graph.add(
+            "publish.mark_digested",
+            self._mark_episodes_digested,
+            deps=("publish.rss",),
+        )
+        return graph
+
+    @tracer.traced("pipeline.backfill_scoring")
+    def _backfill_scoring(self):
+        """Self-healing: backfill missing topic scores from previous runs"""
+        from openai_scorer import run_backfill_scoring
+
+        run_backfill_scoring()
+
+    @tracer.traced("pipeline.scoring")
+    def _score_new_transcripts(self):
+        """CRITICAL - re-score after new transcripts are created"""
+        from openai_scorer import score_pending_in_db
+
+        with self.scheduler.stage("scoring") as stage:
+            scored_rss = score_pending_in_db(
+                "podcast_monitor.db",
+                source="rss",
+                max_to_score=200,
+                stage=stage,
+            )
+            scored_yt = score_pending_in_db(
+                "youtube_transcripts.db",
+                source="youtube",
+                max_to_score=200,
+                stage=stage,
+            )
+        tracer.annotate(scored_rss=scored_rss, scored_youtube=scored_yt)
+        logger.info(
+            f"Post-transcription scoring complete: RSS={scored_rss}, YT={scored_yt}"
+        )
+        return {"rss": scored_rss, "youtube": scored_yt}
+
+    @tracer.traced("pipeline.youtube_transcripts")
+    def _fetch_youtube_transcripts(self):
+        """Fetch transcripts for new YouTube episodes (local runs only)
+
+        In GitHub Actions the YouTube transcripts arrive through the repo,
+        pushed by the local YouTube cron job.
+        """
+        if os.getenv("GITHUB_ACTIONS") == "true":
+            logger.info("⏭️  YouTube transcripts come from the local cron job")
+            return {"processed": 0}
+
+        from youtube_processor import YouTubeProcessor
+
+        processor = YouTubeProcessor()
+        processor.sync_youtube_feeds()
+        processor.check_new_youtube_episodes(self.hours_back or 168)
+        processed = processor.process_pending_youtube_episodes()
+        tracer.annotate(processed=processed)
+        logger.info(f"🎬 Fetched {processed} YouTube transcripts")
+        return {"processed": processed}
+
+    def _generate_topic_digest(self, digest_run: TopicDigestRun, topic: str):
+        """One topic's digest; raises if it fails (the task is optional)"""
+        if topic not in digest_run.available_topics():
+            logger.info(f"⏭️  No {topic} episodes ready for digest")
+            return None
+
+        logger.info(f"📝 Processing topic: {topic}")
+        success, path, error = digest_run.digest(topic)
+        if not success:
+            raise RuntimeError(f"{topic} digest failed: {error}")
+        logger.info(f"✅ {topic} digest completed: {path}")
+        return {"path": str(path)}
+
+    def _collect_topic_digests(
+        self, graph: TaskGraph, digest_run: TopicDigestRun
+    ) -> Dict[str, str]:
+        """topic -> digest path for the topic tasks that produced a digest"""
+        digest_run.report()
+        digests = {}
+        for name, task in graph.tasks.items():
+            if name.startswith("digest.topic:") and task.status == "done":
+                if task.result:
+                    digests[name.split(":", 1)[1]] = task.result["path"]
+        return digests
+
+    def _generate_weekday_digest(
+        self,
+        utc_weekday: str,
+        display_weekday: str,
+        topic_digests: Optional[Dict[str, str]] = None,
+    ):
+        """Generate the digest based on weekday logic
+
+        topic_digests holds the digests the workflow graph already generated
+        per topic; without it the topic digests are generated here.
+        """
+        if utc_weekday == "Friday":
+            logger.info(
+                f"📅 {display_weekday} detected - generating daily + weekly digests"
+            )
+            return self._generate_weekly_digest(topic_digests)
+        if utc_weekday == "Monday":
+            logger.info(f"📅 {display_weekday} detected - generating catch-up digest")
+            return self._generate_catchup_digest(topic_digests)
+        logger.info(f"📅 {display_weekday} - generating standard daily digest")
+        return self._generate_daily_digest(topic_digests)
+
+    def _publish_audio_gate(self, today: str) -> bool:
+        """Produce and deploy the day's audio; True only if both succeeded"""
+        logger.info("🔒 Starting transactional publishing process...")
+        mp3_files_created, deploy_success = self._produce_and_publish_audio(today)
+
+        if not mp3_files_created:
+            logger.info(f"RSS not updated: no new MP3s for {today}")
             return False
+        # Deployment MUST succeed
+        if not deploy_success:
+            logger.error("❌ Transactional publishing failed: deployment failed")
+            return False
+        return True
 
+    @tracer.traced("pipeline.retry_queue")
     def _process_retry_queue(self):
         """Process failed episodes eligible for retry"""
         logger.info("🔄 Processing retry queue for failed episodes...")
@@ -254,7 +452,9 @@ class DailyPodcastPipeline:
             logger.info(
                 f"🔄 Total retry results: {retry_results['total_succeeded']}/{retry_results['total_processed']} succeeded"
             )
+        return retry_results
 
+    @tracer.traced("pipeline.feed_monitor")
     def _monitor_rss_feeds(self):
         """Check RSS feeds for new episodes"""
         logger.info("📡 Checking RSS feeds for new episodes...")
@@ -267,6 +467,7 @@ class DailyPodcastPipeline:
             self._update_new_episodes_status(new_episodes)
         else:
             logger.info("No new episodes found")
+        return {"new_episodes": len(new_episodes or [])}
 
     def _update_new_episodes_status(self, new_episodes):
         """Episodes are already created with 'pre-download' status by feed_monitor"""
@@ -275,6 +476,7 @@ class DailyPodcastPipeline:
             "Episodes already created with 'pre-download' status by feed monitor"
         )
 
+    @tracer.traced("pipeline.audio_cache")
     def _process_audio_cache_files(self):
         """Process existing audio files in audio_cache with progress monitoring and time estimation"""
         logger.info("🎵 Processing audio cache files...")
@@ -321,6 +523,10 @@ class DailyPodcastPipeline:
             f"📊 Estimated total processing time: {total_estimated_time/60:.1f} minutes"
         )
 
+        # Carried-over files first; the rest only while they fit the budget
+        stage = self.scheduler.stage("audio_cache")
+        file_estimates = stage.order(file_estimates, key=lambda item: item[0].stem)
+
         conn = get_connection(self.db_path)
         cursor = conn.cursor()
 
@@ -342,6 +548,12 @@ class DailyPodcastPipeline:
                 )
                 result = cursor.fetchone()
 
+                already_transcribed = result is not None and result[1] == "transcribed"
+                estimate = est_time if transcriber else None
+                if not already_transcribed and not stage.admit(episode_id, estimate):
+                    logger.info(f"⏳ Deferring {audio_file.name} to the next run")
+                    continue
+
                 if result:
                     db_id, current_status = result
                     if current_status == "transcribed":
@@ -484,6 +696,7 @@ class DailyPodcastPipeline:
                     )
 
                 file_processing_time = time.time() - file_start_time
+                stage.done(episode_id, file_processing_time)
 
                 if transcript:
                     # Save transcript
@@ -531,26 +744,32 @@ class DailyPodcastPipeline:
 
         conn.commit()
         conn.close()
+        stage.close()
 
         total_time = time.time() - start_time
         logger.info(
             f"🏁 Audio cache processing complete: {processed_files} files in {total_time/60:.1f} minutes"
         )
+        return {"processed": processed_files, "deferred": len(stage.deferred)}
 
+    @tracer.traced("pipeline.pending_episodes")
     def _process_pending_episodes(self):
         """Process episodes awaiting transcription"""
         logger.info(
             "⚙️ Processing episodes awaiting transcription (pending/pre-download)..."
         )
 
-        results = self.content_processor.process_all_pending()
+        with self.scheduler.stage("pending_episodes") as stage:
+            results = self.content_processor.process_all_pending(stage=stage)
 
         if results:
             logger.info(f"✅ Processed {len(results)} pending episodes")
         else:
             logger.info("No pending episodes to process")
+        return {"processed": len(results or []), "deferred": len(stage.deferred)}
 
-    def _generate_daily_digest(self):
+    @tracer.traced("pipeline.digest")
+    def _generate_daily_digest(self, topic_digests: Optional[Dict[str, str]] = None):
         """Generate daily digest from BOTH RSS and YouTube 'transcribed' episodes"""
         logger.info("📝 Generating daily digest from RSS + YouTube transcripts...")
 
@@ -599,13 +818,27 @@ class DailyPodcastPipeline:
             f"📋 Total transcripts for digest: {rss_transcribed_count} RSS + {youtube_transcribed_count} YouTube = {total_transcribed}"
         )
 
-        if total_transcribed == 0:
+        if topic_digests is not None:
+            # The workflow graph generated each topic's digest as its own task
+            if not topic_digests:
+                logger.warning("No topic digests were generated")
+                return False
+            for topic, path in topic_digests.items():
+                logger.info(f"✅ Daily digest generated: {topic}: {path}")
+            return True
+
+        # Topics finished before an interruption already marked their
+        # episodes digested; a resumed run still reports them
+        finished_topics = (
+            self.journal.completed_steps("digest.topic:") if self.journal else {}
+        )
+        if total_transcribed == 0 and not finished_topics:
             logger.warning("No 'transcribed' episodes available from either database")
             return False
 
         # Generate OpenAI GPT-5 powered digest (reads from both databases automatically)
-        success, digest_path, cross_refs_path = (
-            self.openai_integration.generate_digest()
+        success, digest_path, cross_refs_path = self.openai_integration.generate_digest(
+            journal=self.journal
         )
 
         if success:
@@ -615,12 +848,13 @@ class DailyPodcastPipeline:
             logger.error("❌ Failed to generate daily digest")
             return False
 
-    def _generate_weekly_digest(self):
+    @tracer.traced("pipeline.digest")
+    def _generate_weekly_digest(self, topic_digests: Optional[Dict[str, str]] = None):
         """Generate Friday digest with weekly summary (7-day window)"""
         logger.info("📅 Generating FRIDAY digest with weekly overview...")
 
         # First generate regular daily digest
-        daily_success = self._generate_daily_digest()
+        daily_success = self._generate_daily_digest(topic_digests)
         if not daily_success:
             logger.error("❌ Failed to generate daily digest component")
             return False
@@ -670,7 +904,8 @@ class DailyPodcastPipeline:
 
         return True
 
-    def _generate_catchup_digest(self):
+    @tracer.traced("pipeline.digest")
+    def _generate_catchup_digest(self, topic_digests: Optional[Dict[str, str]] = None):
         """Generate Monday catch-up digest (Friday 06:00 → Monday run)"""
         logger.info("📅 Generating MONDAY catch-up digest...")
 
@@ -740,180 +975,80 @@ class DailyPodcastPipeline:
             return True
 
         # Generate digest from available transcribed episodes
-        return self._generate_daily_digest()
-
-    def _create_tts_audio(self):
-        """Create TTS audio for the daily digest - CRITICAL FUNCTION"""
-        logger.info("🎙️ Creating TTS audio...")
-        logger.info("========================================")
-        logger.info("🔥 TTS GENERATION - CRITICAL DEBUG INFO")
-        logger.info("========================================")
-
-        # Check environment variables
-        elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
-        if elevenlabs_key:
-            logger.info(f"✅ ELEVENLABS_API_KEY found (length: {len(elevenlabs_key)})")
-        else:
+        return self._generate_daily_digest(topic_digests)
+
+    @tracer.traced("pipeline.audio_production")
+    def _produce_and_publish_audio(
+        self, today: Optional[str] = None
+    ) -> Tuple[bool, bool]:
+        """Produce topic episodes in-process and publish each as soon as it is ready
+
+        Topics run concurrently (TTS, mastering, metadata) in the TTS generator;
+        every finished topic is handed straight to the deployer instead of
+        waiting for the slowest one. Returns (mp3_files_created, deploy_success).
+        """
+        from deploy_multi_topic import MultiTopicDeployer
+        from multi_topic_tts_generator import MultiTopicTTSGenerator
+
+        scope = f" for {today}" if today else ""
+        logger.info(f"🎙️ Producing topic audio{scope}")
+        if not os.getenv("ELEVENLABS_API_KEY"):
             logger.error("❌ ELEVENLABS_API_KEY is missing or empty!")
 
-        # Check for existing digest files
-        digest_files = list(Path("daily_digests").glob("daily_digest_*.md"))
-        logger.info(
-            f"📄 Found {len(digest_files)} digest files: {[f.name for f in digest_files]}"
-        )
-
-        # Check current directory contents
-        logger.info("📁 Current directory contents:")
-        for item in Path(".").iterdir():
-            if item.is_file():
-                logger.info(f"   📄 {item.name}")
-
         try:
-            logger.info("🚀 Running multi-topic TTS generation subprocess...")
-            logger.info("Command: python3 multi_topic_tts_generator.py")
-
-            # Run TTS generation with enhanced logging
-            result = subprocess.run(
-                ["python3", "multi_topic_tts_generator.py"],
-                capture_output=True,
-                text=True,
-                timeout=600,
-            )
-
-            logger.info(f"🔍 TTS subprocess return code: {result.returncode}")
-            logger.info(f"🔍 TTS subprocess stdout length: {len(result.stdout)}")
-            logger.info(f"🔍 TTS subprocess stderr length: {len(result.stderr)}")
-
-            if result.stdout:
-                logger.info("📝 TTS subprocess STDOUT:")
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        logger.info(f"   STDOUT: {line}")
-
-            if result.stderr:
-                logger.error("📝 TTS subprocess STDERR:")
-                for line in result.stderr.split("\n"):
-                    if line.strip():
-                        logger.error(f"   STDERR: {line}")
-
-            # Check what files were created after TTS
-            logger.info("📁 Post-TTS daily_digests directory:")
-            if Path("daily_digests").exists():
-                for item in Path("daily_digests").iterdir():
-                    logger.info(f"   📄 {item.name} ({item.stat().st_size} bytes)")
+            deployer = MultiTopicDeployer()
+        except (SystemExit, ValueError) as e:
+            logger.error(f"❌ Deployment unavailable: {e}")
+            deployer = None
+
+        published, unpublished = [], []
+
+        def publish(digest_info: Dict):
+            name = f"{digest_info['topic']}_{digest_info['timestamp']}"
+            step = f"publish.topic:{name}"
+            if self.journal and self.journal.is_done(step):
+                published.append(name)
+                return
+            if deployer and deployer.publish_digest(digest_info):
+                published.append(name)
+                if self.journal:
+                    self.journal.step_finished(step, outputs=digest_info)
             else:
-                logger.error("❌ daily_digests directory does not exist!")
+                unpublished.append(name)
 
-            # Look for expected audio files
-            audio_files = list(
-                Path("daily_digests").glob("complete_topic_digest_*.mp3")
-            )
-            logger.info(
-                f"🎵 Found {len(audio_files)} audio files: {[f.name for f in audio_files]}"
+        since_date = datetime.strptime(today, "%Y-%m-%d").date() if today else None
+        try:
+            generator = MultiTopicTTSGenerator()
+            produced, failed = generator.process_all_unprocessed(
+                since_date=since_date, on_ready=publish
             )
-
-            if result.returncode == 0:
-                if audio_files:
-                    logger.info("✅ TTS audio generated successfully with audio files!")
-                    return True
-                else:
-                    logger.error(
-                        "❌ TTS subprocess succeeded but NO AUDIO FILES found!"
-                    )
-                    return False
-            else:
-                logger.error(
-                    f"❌ TTS generation failed with return code {result.returncode}"
-                )
-                return False
-
-        except subprocess.TimeoutExpired:
-            logger.error("❌ TTS generation timed out after 600 seconds")
-            return False
         except Exception as e:
-            logger.error(f"❌ Exception during TTS generation: {e}")
-            import traceback
+            logger.error(f"❌ Audio production error: {e}")
+            return False, False
 
-            logger.error(f"❌ Full traceback: {traceback.format_exc()}")
-            return False
-        finally:
-            logger.info("========================================")
-
-    def _create_tts_audio_today_only(self, today: str) -> bool:
-        """Create TTS audio for today's digests only - Transactional version"""
-        logger.info(f"🎙️ Creating TTS audio for today only: {today}")
-
-        # Check environment variables
-        elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
-        if elevenlabs_key:
-            logger.info(f"✅ ELEVENLABS_API_KEY found (length: {len(elevenlabs_key)})")
-        else:
-            logger.error("❌ ELEVENLABS_API_KEY is missing or empty!")
+        # Episodes produced by an earlier run today still count as today's audio
+        pattern = f"*_digest_{today.replace('-', '')}_*.mp3" if today else "*.mp3"
+        existing_mp3s = list(Path(CONFIG["DAILY_DIGESTS_DIR"]).glob(pattern))
+        if not produced and not existing_mp3s:
+            logger.info(f"ℹ️  No MP3 files generated{scope}")
+            return False, False
 
-        # Check for existing digest files
-        digest_files = list(Path("daily_digests").glob("*_digest_*.md"))
         logger.info(
-            f"📄 Found {len(digest_files)} total digest files: {[f.name for f in digest_files]}"
+            f"✅ Audio production: {produced} produced, {failed} failed, "
+            f"{len(published)} published as ready"
         )
-
-        try:
-            logger.info(f"🚀 Running TTS generation with --since {today}")
-
-            # Run TTS generation with date filter
-            result = subprocess.run(
-                ["python3", "multi_topic_tts_generator.py", "--since", today],
-                capture_output=True,
-                text=True,
-                timeout=600,
-            )
-
-            logger.info(f"🔍 TTS subprocess return code: {result.returncode}")
-
-            if result.stdout:
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        logger.info(f"   {line}")
-
-            if result.stderr:
-                for line in result.stderr.split("\n"):
-                    if line.strip():
-                        logger.warning(f"   {line}")
-
-            if result.returncode != 0:
-                logger.error(
-                    f"❌ TTS generation failed with return code {result.returncode}"
-                )
-                return False
-
-            # Check if any MP3 files were generated today
-            today_mp3s = []
-            for mp3_file in Path("daily_digests").glob("*_digest_*.mp3"):
-                # Extract timestamp from filename
-                import re
-
-                match = re.search(r"_digest_(\d{8})_", mp3_file.name)
-                if match:
-                    file_date = match.group(1)
-                    expected_date = today.replace("-", "")
-                    if file_date == expected_date:
-                        today_mp3s.append(mp3_file)
-
-            if today_mp3s:
-                logger.info(f"✅ Generated {len(today_mp3s)} MP3 files for today:")
-                for mp3 in sorted(today_mp3s):
-                    logger.info(f"   🎵 {mp3.name}")
-                return True
-            else:
-                logger.info(f"ℹ️  No MP3 files generated for today ({today})")
-                return False
-
-        except subprocess.TimeoutExpired:
-            logger.error("❌ TTS generation timed out after 10 minutes")
-            return False
-        except Exception as e:
-            logger.error(f"❌ TTS generation error: {e}")
-            return False
-
+        if not deployer:
+            return True, False
+        if unpublished:
+            logger.error(f"❌ Could not publish: {', '.join(sorted(unpublished))}")
+            return True, False
+
+        # Sweep anything produced earlier but not yet deployed
+        deploy_success = deployer.deploy_new_episodes()
+        telemetry.record_processing_stats(deployed=len(published))
+        return True, deploy_success
+
+    @tracer.traced("pipeline.deploy")
     def _deploy_to_github(self):
         """Deploy latest episode to GitHub releases"""
         logger.info("🚀 Deploying to GitHub...")
@@ -937,6 +1072,7 @@ class DailyPodcastPipeline:
             logger.error(f"Error deploying to GitHub: {e}")
             return False
 
+    @tracer.traced("pipeline.rss")
     def _update_rss_feed(self):
         """Update RSS feed with latest episode"""
         logger.info("📡 Updating RSS feed...")
@@ -960,6 +1096,7 @@ class DailyPodcastPipeline:
             logger.error(f"Error updating RSS feed: {e}")
             return False
 
+    @tracer.traced("pipeline.mark_digested")
     def _mark_episodes_digested(self):
         """Mark all 'transcribed' episodes as 'digested' in BOTH databases"""
         logger.info(
@@ -1001,6 +1138,7 @@ class DailyPodcastPipeline:
             f"✅ Marked episodes as digested: {rss_updated_count} RSS + {youtube_updated_count} YouTube = {total_updated} total"
         )
 
+    @tracer.traced("pipeline.cleanup")
     def _cleanup_old_files(self):
         """Clean up old files and transcripts using configured retention system"""
         retention_days = CONFIG["RETENTION_DAYS"]
@@ -1027,6 +1165,13 @@ class DailyPodcastPipeline:
         except Exception as e:
             logger.warning(f"⚠️  Retention cleanup failed: {e}")
 
+        try:
+            pruned = prune_journal(retention_days)
+            if pruned:
+                logger.info(f"🧹 Pruned {pruned} old runs from the run journal")
+        except Exception as e:
+            logger.warning(f"⚠️  Run journal cleanup failed: {e}")
+
     def get_status_summary(self):
         """Get current system status summary including failure statistics"""
         status_summary = {}
@@ -1114,6 +1259,26 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=0, help="Timeout in seconds (0 = no timeout)"
     )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile the run into telemetry/profiles/ (default: PODCAST_PROFILE)",
+    )
+    parser.add_argument(
+        "--graph",
+        nargs="?",
+        const="text",
+        choices=["text", "dot"],
+        help="Show today's workflow task graph without running it",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="RUN_ID",
+        help="Resume an interrupted --run, skipping completed steps "
+        "(default: the latest unfinished run)",
+    )
     args = parser.parse_args()
 
     # Set up dry-run and mock mode environment variables
@@ -1226,7 +1391,34 @@ def main():
         )
         return
 
-    if args.run:
+    if args.graph:
+        graph = pipeline.build_workflow_graph(now_utc().strftime("%A"))
+        print(graph.to_dot() if args.graph == "dot" else graph.describe())
+        return
+
+    # The outer timeout doubles as the stage time budget unless set explicitly
+    if args.timeout > 0 and not os.getenv("PIPELINE_TIME_BUDGET"):
+        pipeline.scheduler.budget_seconds = args.timeout
+
+    # A resumed run keeps the interrupted run's ID: journal, trace and profile
+    if args.resume:
+        run_id = args.resume
+        if run_id == "latest":
+            run_id = latest_unfinished("daily_workflow")
+        if run_id:
+            telemetry.resume_run(run_id)
+        else:
+            logger.info("📓 No unfinished run to resume, starting a new run")
+
+    # Written at exit, so every exit() below still saves the profile
+    start_profiling(
+        "daily_podcast_pipeline",
+        args.profile,
+        run_id=telemetry.current_run_id,
+        stage_depth=1,
+    )
+
+    if args.run or args.resume:
         # Run the complete daily workflow
         success = pipeline.run_daily_workflow()
         exit(0 if success else 1)
@@ -1264,11 +1456,8 @@ def main():
             digest_success = pipeline._generate_daily_digest()
 
             if digest_success:
-                # Step 5: Create TTS audio
-                pipeline._create_tts_audio()
-
-                # Step 6: Deploy to GitHub releases
-                pipeline._deploy_to_github()
+                # Step 5+6: Create TTS audio, deploying each topic when ready
+                pipeline._produce_and_publish_audio()
 
                 # Step 7: Update RSS feed
                 pipeline._update_rss_feed()
@@ -1343,6 +1532,11 @@ def main():
                 dry_run_summary["estimated_actions"].append("Deploy to GitHub releases")
                 dry_run_summary["estimated_actions"].append("Update RSS feed")
 
+            # Execution plan: which steps would overlap, and the publish gates
+            graph = pipeline.build_workflow_graph(now_utc().strftime("%A"))
+            dry_run_summary["task_graph"] = graph.levels()
+            logger.info(graph.describe())
+
             # Configuration check
             dry_run_summary["configuration"]["openai_mock"] = (
                 os.getenv("MOCK_OPENAI") == "1"
@@ -14,7 +14,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from utils.datetime_utils import now_utc
-from utils.sanitization import create_topic_mp3_filename, create_topic_pattern
+from utils.digest_catalog import DigestCatalog
+from utils.mp3_info import get_mp3_info
 
 # Load environment variables from .env file
 try:
@@ -32,6 +33,7 @@ class MultiTopicDeployer:
             "PODCAST_BASE_URL", "https://podcast.paulrbrown.org"
         )
         self.digests_dir = Path("daily_digests")
+        self.catalog = DigestCatalog(self.digests_dir)
         self.deployed_marker_file = "deployed_episodes.json"
 
         # Validate base URL is set
@@ -45,6 +47,7 @@ class MultiTopicDeployer:
 
         # Load previously deployed episodes
         self.deployed_episodes = self._load_deployed_episodes()
+        self._known_releases = set()  # release tags created/seen this run
 
     def _validate_github_environment(self):
         """Validate GitHub token and repository settings upfront"""
@@ -90,8 +93,14 @@ class MultiTopicDeployer:
         except Exception as e:
             print(f"⚠️  Could not save deployed episodes marker: {e}")
 
-    def _save_deployment_metadata(self, digests: List[Dict], release_tag: str):
-        """Save deployment metadata for RSS generator consumption"""
+    def _save_deployment_metadata(
+        self, digests: List[Dict], release_tag: str, merge: bool = False
+    ):
+        """Save deployment metadata for RSS generator consumption
+
+        With merge=True, episodes already recorded for the same release are
+        kept (topics published one at a time).
+        """
         metadata = {
             "deployment_timestamp": now_utc().isoformat(),
             "release_tag": release_tag,
@@ -99,6 +108,20 @@ class MultiTopicDeployer:
             "episodes": [],
         }
 
+        if merge and Path("deployment_metadata.json").exists():
+            try:
+                with open("deployment_metadata.json", "r") as f:
+                    previous = json.load(f)
+                if previous.get("release_tag") == release_tag:
+                    new_keys = {digest["file_key"] for digest in digests}
+                    metadata["episodes"] = [
+                        episode
+                        for episode in previous.get("episodes", [])
+                        if episode.get("file_key") not in new_keys
+                    ]
+            except Exception as e:
+                print(f"⚠️ Could not merge deployment metadata: {e}")
+
         for digest in digests:
             file_size, duration = self._get_file_info(digest["mp3_file"])
 
@@ -114,6 +137,7 @@ class MultiTopicDeployer:
                     "public_url": asset_url,
                     "file_size": file_size,
                     "duration_estimate": duration,
+                    "duration_seconds": self._get_duration_seconds(digest["mp3_file"]),
                     "is_enhanced": "_enhanced" in digest["mp3_file"].name,
                     "file_key": digest["file_key"],
                 }
@@ -135,77 +159,58 @@ class MultiTopicDeployer:
         if not self.digests_dir.exists():
             return []
 
-        # Pattern for topic-specific digests: {topic}_digest_{timestamp}.md
-        # Support both hyphens and underscores in topic names for back-compatibility
-        topic_pattern = create_topic_pattern()
-
-        for md_file in self.digests_dir.glob("*_digest_*.md"):
-            match = topic_pattern.match(md_file.name)
-            if not match:
-                continue
-
-            topic, timestamp_str = match.groups()
+        for entry in self.catalog.entries(require_md=True, undeployed=True):
+            file_key = entry["file_key"]
 
-            # Check if already deployed
-            file_key = f"{topic}_{timestamp_str}"
+            # deployed_episodes.json stays authoritative; catch the catalog up
             if file_key in self.deployed_episodes:
+                self.catalog.mark_deployed(file_key, self.deployed_episodes[file_key])
                 continue
 
-            # Check if we have a corresponding MP3 file (prioritize enhanced versions)
-            mp3_candidates = [
-                self.digests_dir
-                / create_topic_mp3_filename(
-                    topic, timestamp_str, enhanced=True
-                ),  # Preferred with music
-                self.digests_dir
-                / create_topic_mp3_filename(topic, timestamp_str),  # Standard TTS
-                self.digests_dir
-                / f"complete_topic_digest_{timestamp_str}.mp3",  # Legacy naming
-            ]
-
-            mp3_file = None
-            for candidate in mp3_candidates:
-                if candidate.exists():
-                    mp3_file = candidate
-                    break
-
+            # Enhanced (with music) preferred, then standard TTS, then legacy naming
+            mp3_file = entry["audio_file"]
             if not mp3_file:
-                print(f"⚠️  No MP3 file found for {md_file.name}")
-                continue
-
-            # Parse timestamp
-            try:
-                file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-            except ValueError:
-                print(f"⚠️  Invalid timestamp format in {md_file.name}")
+                print(f"⚠️  No MP3 file found for {entry['md_file'].name}")
                 continue
 
             new_digests.append(
                 {
-                    "topic": topic,
-                    "timestamp": timestamp_str,
-                    "date": file_date,
-                    "md_file": md_file,
+                    "topic": entry["topic"],
+                    "timestamp": entry["timestamp"],
+                    "date": entry["date"],
+                    "md_file": entry["md_file"],
                     "mp3_file": mp3_file,
                     "file_key": file_key,
                 }
             )
 
-        # Sort by date (oldest first for deployment order)
-        new_digests.sort(key=lambda x: x["date"])
+        # Catalog entries come oldest first (deployment order)
         return new_digests
 
+    def _mark_deployed(self, file_key: str, release_tag: str):
+        """Record a deployment in deployed_episodes and the digest catalog"""
+        self.deployed_episodes[file_key] = release_tag
+        self.catalog.mark_deployed(file_key, release_tag)
+
+    def _get_duration_seconds(self, file_path: Path) -> Optional[float]:
+        """Exact duration from the MP3 frame headers (cached in the metadata index)"""
+        info = get_mp3_info(file_path)
+        return info["duration_seconds"] if info else None
+
     def _get_file_info(self, file_path: Path) -> Tuple[int, str]:
-        """Get file size and duration estimate"""
+        """Get file size and duration"""
         try:
             file_size = file_path.stat().st_size
-            # Rough estimate: 1MB ≈ 1 minute for speech MP3
-            duration_minutes = max(1, file_size // (1024 * 1024))
-            duration_str = f"~{duration_minutes} minutes"
-            return file_size, duration_str
-        except:
+        except OSError:
             return 0, "Unknown duration"
 
+        seconds = self._get_duration_seconds(file_path)
+        if seconds is None:
+            # Unparseable MP3: rough estimate, 1MB ≈ 1 minute for speech
+            return file_size, f"~{max(1, file_size // (1024 * 1024))} minutes"
+        minutes, secs = divmod(int(round(seconds)), 60)
+        return file_size, f"{minutes}:{secs:02d}"
+
     def _generate_release_info(self, digests: List[Dict]) -> Tuple[str, str, str]:
         """Generate release tag, title, and description from digest list"""
         if not digests:
@@ -224,13 +229,17 @@ class MultiTopicDeployer:
 
         # Generate description with topic summary
         topic_counts = {}
-        total_duration = 0
+        total_seconds = 0.0
 
         for digest in digests:
             topic = digest["topic"].replace("_", " ").title()
             topic_counts[topic] = topic_counts.get(topic, 0) + 1
-            file_size, _ = self._get_file_info(digest["mp3_file"])
-            total_duration += max(1, file_size // (1024 * 1024))  # rough minutes
+            seconds = self._get_duration_seconds(digest["mp3_file"])
+            if seconds is None:
+                file_size, _ = self._get_file_info(digest["mp3_file"])
+                seconds = max(1, file_size // (1024 * 1024)) * 60  # rough
+            total_seconds += seconds
+        total_duration = max(1, round(total_seconds / 60))
 
         topic_summary = ", ".join(
             [f"{topic} ({count})" for topic, count in topic_counts.items()]
@@ -263,7 +272,7 @@ AI-generated digest from leading podcasts and creators, organized by topic for f
                 f"✅ Release {release_tag} already exists - marking episodes as deployed"
             )
             for digest in digests:
-                self.deployed_episodes[digest["file_key"]] = release_tag
+                self._mark_deployed(digest["file_key"], release_tag)
             self._save_deployed_episodes()
             return True
 
@@ -307,7 +316,7 @@ AI-generated digest from leading podcasts and creators, organized by topic for f
 
                 # Mark episodes as deployed
                 for digest in digests:
-                    self.deployed_episodes[digest["file_key"]] = release_tag
+                    self._mark_deployed(digest["file_key"], release_tag)
                     print(f"  ✓ Marked as deployed: {digest['file_key']}")
 
                 self._save_deployed_episodes()
@@ -329,6 +338,61 @@ AI-generated digest from leading podcasts and creators, organized by topic for f
             print(f"📄 CMD: {' '.join(cmd)}")
             return False
 
+    def publish_digest(self, digest: Dict) -> bool:
+        """Publish one finished digest right away, creating or extending its release"""
+        digest = {
+            **digest,
+            "file_key": digest.get("file_key")
+            or f"{digest['topic']}_{digest['timestamp']}",
+        }
+        if digest["file_key"] in self.deployed_episodes:
+            return True
+        if not digest["mp3_file"].exists():
+            print(f"❌ MP3 file missing: {digest['mp3_file']}")
+            return False
+
+        release_tag, release_title, description = self._generate_release_info([digest])
+        if release_tag in self._known_releases or self._release_exists(release_tag):
+            cmd = [
+                "gh",
+                "release",
+                "upload",
+                release_tag,
+                str(digest["mp3_file"]),
+                "--clobber",
+            ]
+        else:
+            cmd = [
+                "gh",
+                "release",
+                "create",
+                release_tag,
+                "--title",
+                release_title,
+                "--notes",
+                description,
+                "--target",
+                "main",
+                str(digest["mp3_file"]),
+            ]
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        except subprocess.TimeoutExpired:
+            print(f"❌ Publishing {digest['mp3_file'].name} timed out after 5 minutes")
+            return False
+
+        if result.returncode != 0:
+            print(f"❌ Publishing {digest['mp3_file'].name} failed: {result.stderr}")
+            return False
+
+        self._known_releases.add(release_tag)
+        self._mark_deployed(digest["file_key"], release_tag)
+        self._save_deployed_episodes()
+        self._save_deployment_metadata([digest], release_tag, merge=True)
+        print(f"✅ Published {digest['mp3_file'].name} to {release_tag}")
+        return True
+
     def _release_exists(self, release_tag: str) -> bool:
         """Check if a GitHub release already exists"""
         try:
@@ -392,6 +456,7 @@ AI-generated digest from leading podcasts and creators, organized by topic for f
 
         for key in keys_to_remove:
             del self.deployed_episodes[key]
+            self.catalog.mark_deployed(key, None)
             print(f"  🗑️  Cleared deployment status: {key}")
 
         self._save_deployed_episodes()
@@ -11,9 +11,10 @@ import logging
 import os
 import sqlite3
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from utils.datetime_utils import now_utc
 from utils.db import get_connection
@@ -33,14 +34,55 @@ from utils.openai_helpers import (
     generate_idempotency_key,
     get_json_schema,
 )
+from utils.tokenizer import count_tokens
+from utils.tracing import tracer
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
 
-def approx_tokens(text: str) -> int:
-    """Estimate token count using simple heuristic"""
-    return (len(text) + 3) // 4
+# Chunk summaries are topic-agnostic so one map result can serve every topic in a run
+SUMMARY_PROMPT_VERSION = "2.0"
+
+
+class SharedMapResults:
+    """Run-scoped store of episode map results shared across topic digests"""
+
+    def __init__(self):
+        self._results: Dict[str, Dict] = {}
+        self.episodes_mapped = 0
+        self.episodes_reused = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+
+    def get(self, episode_id: str) -> Optional[Dict]:
+        """Return a previously mapped episode result and account for the work avoided"""
+        result = self._results.get(episode_id)
+        if result is None:
+            return None
+
+        self.episodes_reused += 1
+        self.seconds_saved += result["wall_ms"] / 1000
+        self.tokens_saved += sum(
+            (chunk.get("tokens_in") or 0) + (chunk.get("tokens_used") or 0)
+            for chunk in result["chunk_summaries"]
+            if not chunk.get("cached")
+        )
+        return result
+
+    def put(self, episode_id: str, result: Dict):
+        """Store a freshly mapped episode result for later topics"""
+        self._results[episode_id] = result
+        self.episodes_mapped += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize map sharing for run telemetry"""
+        return {
+            "episodes_mapped": self.episodes_mapped,
+            "episodes_reused": self.episodes_reused,
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 1),
+        }
 
 
 class EpisodeSummaryGenerator:
@@ -90,6 +132,11 @@ class EpisodeSummaryGenerator:
         self.chunk_size = 2200  # Characters per chunk
         self.chunk_overlap = 200  # Character overlap between chunks
 
+        # Global cap on in-flight chunk requests across all episodes in the map phase
+        self.max_parallel_requests = max(
+            1, config.EXECUTION_SETTINGS["max_parallel_requests"]
+        )
+
         # Initialize cache database
         self._init_cache_db()
 
@@ -119,11 +166,24 @@ class EpisodeSummaryGenerator:
                         model TEXT NOT NULL,
                         prompt_version TEXT NOT NULL DEFAULT '1.0',
                         created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                        word_count INTEGER
+                        word_count INTEGER,
+                        summary_tokens INTEGER
                     )
                 """
                 )
 
+                # Older caches predate precomputed token counts
+                summary_columns = {
+                    row[1]
+                    for row in conn.execute(
+                        "PRAGMA table_info(episode_summaries)"
+                    ).fetchall()
+                }
+                if "summary_tokens" not in summary_columns:
+                    conn.execute(
+                        "ALTER TABLE episode_summaries ADD COLUMN summary_tokens INTEGER"
+                    )
+
                 # Idempotency constraint for summaries
                 conn.execute(
                     """
@@ -147,7 +207,52 @@ class EpisodeSummaryGenerator:
                         chunk_count INTEGER,
                         failures INTEGER DEFAULT 0,
                         wall_ms INTEGER,
-                        prompt_version TEXT DEFAULT '1.0'
+                        prompt_version TEXT DEFAULT '1.0',
+                        episode_id TEXT,
+                        topic TEXT
+                    )
+                """
+                )
+
+                # Older caches predate per-episode run headers
+                existing_columns = {
+                    row[1]
+                    for row in conn.execute("PRAGMA table_info(run_headers)").fetchall()
+                }
+                for column in ("episode_id", "topic"):
+                    if column not in existing_columns:
+                        conn.execute(
+                            f"ALTER TABLE run_headers ADD COLUMN {column} TEXT"
+                        )
+
+                # Per-topic, per-day map output for incremental digest reruns
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS topic_map_outputs (
+                        topic TEXT NOT NULL,
+                        digest_date TEXT NOT NULL,
+                        episode_id TEXT NOT NULL,
+                        content_hash TEXT NOT NULL,
+                        model TEXT NOT NULL,
+                        prompt_version TEXT NOT NULL,
+                        summary_json TEXT NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (topic, digest_date, episode_id)
+                    )
+                """
+                )
+
+                # Reduce output keyed by the hash of its input episode set
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS topic_reduce_outputs (
+                        topic TEXT NOT NULL,
+                        digest_date TEXT NOT NULL,
+                        input_hash TEXT NOT NULL,
+                        episode_ids TEXT NOT NULL,
+                        digest_content TEXT NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (topic, digest_date)
                     )
                 """
                 )
@@ -215,11 +320,12 @@ class EpisodeSummaryGenerator:
             with get_connection(self.cache_db_path) as conn:
                 cursor = conn.execute(
                     """
-                    SELECT summary, tokens_used, model, char_start, char_end
+                    SELECT summary, tokens_used, model, char_start, char_end,
+                           summary_tokens
                     FROM episode_summaries
-                    WHERE episode_id = ? AND chunk_index = ? AND model = ? AND prompt_version = '1.0'
+                    WHERE episode_id = ? AND chunk_index = ? AND model = ? AND prompt_version = ?
                 """,
-                    (episode_id, chunk_index, self.model),
+                    (episode_id, chunk_index, self.model, SUMMARY_PROMPT_VERSION),
                 )
                 row = cursor.fetchone()
 
@@ -232,6 +338,9 @@ class EpisodeSummaryGenerator:
                         "summary": row[0],
                         "tokens_used": row[1],
                         "model": row[2],
+                        "summary_tokens": (
+                            row[5] if row[5] is not None else count_tokens(row[0])
+                        ),
                         "cached": True,
                     }
         except Exception as e:
@@ -252,8 +361,9 @@ class EpisodeSummaryGenerator:
                     """
                     INSERT OR REPLACE INTO episode_summaries
                     (content_hash, episode_id, chunk_index, char_start, char_end, topic,
-                     timestamp, summary, tokens_used, model, prompt_version, word_count)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     timestamp, summary, tokens_used, model, prompt_version, word_count,
+                     summary_tokens)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         content_hash,
@@ -266,8 +376,9 @@ class EpisodeSummaryGenerator:
                         summary_data["summary"],
                         summary_data["tokens_used"],
                         summary_data["model"],
-                        "1.0",
+                        SUMMARY_PROMPT_VERSION,
                         len(summary_data["summary"].split()),
+                        summary_data.get("summary_tokens"),
                     ),
                 )
                 conn.commit()
@@ -282,6 +393,9 @@ class EpisodeSummaryGenerator:
         chunk_count: int,
         failures: int,
         wall_ms: int,
+        topic: Optional[str] = None,
+        started_at: Optional[str] = None,
+        tokens_out: Optional[int] = None,
     ):
         """Record run header for observability"""
         try:
@@ -290,26 +404,142 @@ class EpisodeSummaryGenerator:
                     """
                     INSERT OR REPLACE INTO run_headers
                     (run_id, component, started_at, finished_at, model, reasoning_effort,
-                     chunk_count, failures, wall_ms, prompt_version)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     tokens_out, chunk_count, failures, wall_ms, prompt_version, episode_id, topic)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                     (
                         run_id,
                         "summary",
-                        now_utc().isoformat(),
+                        started_at or now_utc().isoformat(),
                         now_utc().isoformat(),
                         self.model,
                         self.reasoning_effort,
+                        tokens_out,
                         chunk_count,
                         failures,
                         wall_ms,
-                        "1.0",
+                        SUMMARY_PROMPT_VERSION,
+                        episode_id,
+                        topic,
                     ),
                 )
                 conn.commit()
         except Exception as e:
             logger.warning(f"Failed to record run header: {e}")
 
+    def load_topic_map_outputs(self, topic: str, digest_date: str) -> Dict[str, Dict]:
+        """Load persisted episode summaries for a topic and day, keyed by episode_id"""
+        outputs = {}
+        try:
+            with get_connection(self.cache_db_path) as conn:
+                rows = conn.execute(
+                    """
+                    SELECT episode_id, summary_json FROM topic_map_outputs
+                    WHERE topic = ? AND digest_date = ? AND model = ? AND prompt_version = ?
+                """,
+                    (topic, digest_date, self.model, SUMMARY_PROMPT_VERSION),
+                ).fetchall()
+            for episode_id, summary_json in rows:
+                outputs[episode_id] = json.loads(summary_json)
+        except Exception as e:
+            logger.warning(f"Failed to load map outputs for {topic} {digest_date}: {e}")
+        return outputs
+
+    def save_topic_map_output(self, topic: str, digest_date: str, summary: Dict):
+        """Persist one episode summary as part of the topic's map output for the day"""
+        try:
+            with get_connection(self.cache_db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO topic_map_outputs
+                    (topic, digest_date, episode_id, content_hash, model, prompt_version, summary_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        topic,
+                        digest_date,
+                        summary["episode_id"],
+                        summary["content_hash"],
+                        self.model,
+                        SUMMARY_PROMPT_VERSION,
+                        json.dumps(summary, ensure_ascii=False),
+                    ),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(
+                f"Failed to persist map output for {summary['episode_id']}: {e}"
+            )
+
+    def get_reduce_output(
+        self, topic: str, digest_date: str, input_hash: str
+    ) -> Optional[str]:
+        """Return the stored digest for a topic and day if its input set is unchanged"""
+        try:
+            with get_connection(self.cache_db_path) as conn:
+                row = conn.execute(
+                    """
+                    SELECT digest_content FROM topic_reduce_outputs
+                    WHERE topic = ? AND digest_date = ? AND input_hash = ?
+                """,
+                    (topic, digest_date, input_hash),
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.warning(
+                f"Failed to load reduce output for {topic} {digest_date}: {e}"
+            )
+            return None
+
+    def get_reduce_episode_ids(
+        self, topic: str, digest_date: str, input_hash: str
+    ) -> Optional[Set[str]]:
+        """Episode IDs that went into a stored reduce output"""
+        try:
+            with get_connection(self.cache_db_path) as conn:
+                row = conn.execute(
+                    """
+                    SELECT episode_ids FROM topic_reduce_outputs
+                    WHERE topic = ? AND digest_date = ? AND input_hash = ?
+                """,
+                    (topic, digest_date, input_hash),
+                ).fetchone()
+            return set(json.loads(row[0])) if row else None
+        except Exception as e:
+            logger.warning(
+                f"Failed to load reduce episode IDs for {topic} {digest_date}: {e}"
+            )
+            return None
+
+    def save_reduce_output(
+        self,
+        topic: str,
+        digest_date: str,
+        input_hash: str,
+        episode_ids: List[str],
+        digest_content: str,
+    ):
+        """Persist the reduce output for a topic and day (latest run wins)"""
+        try:
+            with get_connection(self.cache_db_path) as conn:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO topic_reduce_outputs
+                    (topic, digest_date, input_hash, episode_ids, digest_content)
+                    VALUES (?, ?, ?, ?, ?)
+                """,
+                    (
+                        topic,
+                        digest_date,
+                        input_hash,
+                        json.dumps(sorted(episode_ids)),
+                        digest_content,
+                    ),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist reduce output for {topic}: {e}")
+
     def _clean_content_for_summary(self, content: str, max_words: int = 1500) -> str:
         """Clean and truncate content for summary generation"""
         # Remove excessive whitespace and normalize
@@ -339,6 +569,7 @@ class EpisodeSummaryGenerator:
             "char_start": 0,
             "char_end": len(content),
             "summary": summary[:400],  # Limit length
+            "summary_tokens": count_tokens(summary[:400]),
             "tokens_used": 0,
             "model": "fallback",
             "fallback": True,
@@ -351,7 +582,7 @@ class EpisodeSummaryGenerator:
         """Generate mock summary for CI smoke tests"""
         # Create deterministic but realistic mock summary
         content_hash = hashlib.md5(content.encode()).hexdigest()[:8]
-        mock_summary = f"Mock summary for {topic.replace('_', ' ').title()} chunk {chunk_index + 1}. Content hash: {content_hash}. Generated for testing purposes."
+        mock_summary = f"Mock summary for chunk {chunk_index + 1}. Content hash: {content_hash}. Generated for testing purposes."
 
         return {
             "episode_id": episode_id,
@@ -359,7 +590,9 @@ class EpisodeSummaryGenerator:
             "char_start": 0,
             "char_end": len(content),
             "summary": mock_summary,
+            "summary_tokens": count_tokens(mock_summary),
             "tokens_used": 50,  # Mock token count
+            "tokens_in": count_tokens(content),
             "model": f"mock-{self.model}",
             "mock": True,
             "timestamp": now_utc().isoformat(),
@@ -417,7 +650,7 @@ class EpisodeSummaryGenerator:
             # Prepare system prompt
             system_prompt = """You are an expert podcast content summarizer. Create concise, informative summaries of podcast transcript chunks that capture the key points and insights discussed."""
 
-            user_prompt = f"""Summarize this podcast transcript chunk for a {topic.replace('_', ' ').title()} digest.
+            user_prompt = f"""Summarize this podcast transcript chunk for a daily podcast digest.
 
 Focus on:
 - Key topics and main points discussed
@@ -435,7 +668,7 @@ Provide a structured summary with the essential information from this segment.""
             )
 
             idempotency_key = generate_idempotency_key(
-                episode_id, chunk_index, self.model, "1.0"
+                episode_id, chunk_index, self.model, SUMMARY_PROMPT_VERSION
             )
 
             result = call_openai_with_backoff(
@@ -464,6 +697,9 @@ Provide a structured summary with the essential information from this segment.""
                     "char_start": char_start,
                     "char_end": char_end,
                     "tokens_used": result.metadata.get("tokens_out", 0),
+                    "tokens_in": result.metadata.get("tokens_in")
+                    or result.metadata["tokens_in_estimated"],
+                    "summary_tokens": count_tokens(summary_data.get("summary", "")),
                     "model": self.model,
                     "timestamp": now_utc().isoformat(),
                 }
@@ -485,34 +721,19 @@ Provide a structured summary with the essential information from this segment.""
                 episode_id, chunk_index, content, topic
             )
 
-    def generate_episode_summary(
+    def _submit_chunks(
         self,
+        executor: ThreadPoolExecutor,
         episode_id: str,
-        content: str,
+        chunks: List[Tuple[int, int, int, str]],
         topic: str,
-        title: str = "",
-        run_id: Optional[str] = None,
-    ) -> Dict:
-        """
-        Generate complete episode summary with chunking and map-reduce approach
-
-        Returns:
-            Dictionary with summary data and chunk information
-        """
-        if run_id is None:
-            run_id = generate_idempotency_key(episode_id, topic, str(now_utc()))
-
-        start_time = time.time()
-
-        # Create chunks
-        chunks = self.create_chunks(content, episode_id, title)
-
-        # Process each chunk
-        chunk_summaries = []
-        failures = 0
-
-        for chunk_index, char_start, char_end, chunk_text in chunks:
-            chunk_summary = self.generate_chunk_summary(
+        title: str,
+        run_id: str,
+    ) -> List[Future]:
+        """Submit every chunk of an episode to the shared map-phase executor"""
+        return [
+            executor.submit(
+                tracer.wrap(self.generate_chunk_summary),
                 episode_id=episode_id,
                 chunk_index=chunk_index,
                 char_start=char_start,
@@ -522,14 +743,25 @@ Provide a structured summary with the essential information from this segment.""
                 title=title,
                 run_id=run_id,
             )
+            for chunk_index, char_start, char_end, chunk_text in chunks
+        ]
 
-            if chunk_summary:
-                chunk_summaries.append(chunk_summary)
-            else:
-                failures += 1
+    def _finalize_episode_summary(
+        self,
+        episode_id: str,
+        topic: str,
+        run_id: str,
+        chunk_count: int,
+        chunk_summaries: List[Dict],
+        failures: int,
+        start_time: float,
+        started_at: str,
+    ) -> Dict:
+        """Apply coverage rules, record the run header and build the episode result"""
+        chunk_summaries = sorted(chunk_summaries, key=lambda c: c["chunk_index"])
 
         # Check coverage quality
-        coverage_pct = len(chunk_summaries) / len(chunks) if chunks else 0
+        coverage_pct = len(chunk_summaries) / chunk_count if chunk_count else 0
         min_chunks = config.QUALITY_THRESHOLDS["min_chunks_ok"]
         min_coverage = config.QUALITY_THRESHOLDS["min_coverage_pct"]
 
@@ -537,7 +769,7 @@ Provide a structured summary with the essential information from this segment.""
         if len(chunk_summaries) < min_chunks or coverage_pct < min_coverage:
             status = "PARTIAL"
             logger.warning(
-                f"⚠️ Low coverage for {episode_id}: {len(chunk_summaries)}/{len(chunks)} chunks "
+                f"⚠️ Low coverage for {episode_id}: {len(chunk_summaries)}/{chunk_count} chunks "
                 f"({coverage_pct:.1%} coverage, {failures} failures)"
             )
 
@@ -546,9 +778,12 @@ Provide a structured summary with the essential information from this segment.""
         self._record_run_header(
             run_id=run_id,
             episode_id=episode_id,
-            chunk_count=len(chunks),
+            chunk_count=chunk_count,
             failures=failures,
             wall_ms=wall_ms,
+            topic=topic,
+            started_at=started_at,
+            tokens_out=sum(c.get("tokens_used") or 0 for c in chunk_summaries),
         )
 
         result = {
@@ -556,7 +791,7 @@ Provide a structured summary with the essential information from this segment.""
             "topic": topic,
             "status": status,
             "chunk_summaries": chunk_summaries,
-            "chunk_count": len(chunks),
+            "chunk_count": chunk_count,
             "success_count": len(chunk_summaries),
             "failure_count": failures,
             "coverage_pct": coverage_pct,
@@ -567,11 +802,292 @@ Provide a structured summary with the essential information from this segment.""
 
         logger.info(
             f"📊 Episode summary complete: {episode_id} status={status} "
-            f"chunks={len(chunk_summaries)}/{len(chunks)} coverage={coverage_pct:.1%} wall_ms={wall_ms}"
+            f"chunks={len(chunk_summaries)}/{chunk_count} coverage={coverage_pct:.1%} wall_ms={wall_ms}"
         )
 
         return result
 
+    def generate_episode_summary(
+        self,
+        episode_id: str,
+        content: str,
+        topic: str,
+        title: str = "",
+        run_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Generate complete episode summary with chunking and map-reduce approach
+
+        Chunks are summarized concurrently, capped at max_parallel_requests.
+
+        Returns:
+            Dictionary with summary data and chunk information
+        """
+        if run_id is None:
+            run_id = generate_idempotency_key(episode_id, topic, str(now_utc()))
+
+        start_time = time.time()
+        started_at = now_utc().isoformat()
+
+        # Create chunks
+        chunks = self.create_chunks(content, episode_id, title)
+
+        # Process chunks concurrently
+        chunk_summaries = []
+        failures = 0
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_parallel_requests, thread_name_prefix="map-chunk"
+        ) as executor:
+            futures = self._submit_chunks(
+                executor, episode_id, chunks, topic, title, run_id
+            )
+            for future in as_completed(futures):
+                try:
+                    chunk_summary = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Chunk task failed for {episode_id}: {e}")
+                    chunk_summary = None
+
+                if chunk_summary:
+                    chunk_summaries.append(chunk_summary)
+                else:
+                    failures += 1
+
+        return self._finalize_episode_summary(
+            episode_id=episode_id,
+            topic=topic,
+            run_id=run_id,
+            chunk_count=len(chunks),
+            chunk_summaries=chunk_summaries,
+            failures=failures,
+            start_time=start_time,
+            started_at=started_at,
+        )
+
+    def select_top_episodes_for_topic(
+        self,
+        transcripts: List[Dict],
+        topic: str,
+        threshold: float = None,
+        max_episodes: int = None,
+    ) -> List[Dict]:
+        """Select top episodes for a topic based on relevance scores"""
+        if threshold is None:
+            threshold = config.OPENAI_SETTINGS["relevance_threshold"]
+        if max_episodes is None:
+            max_episodes = config.OPENAI_SETTINGS["max_episodes_per_topic"]
+
+        relevant_episodes = []
+        for episode in transcripts:
+            topic_score = episode.get("topic_scores", {}).get(topic, 0.0)
+            if topic_score >= threshold:
+                relevant_episodes.append({**episode, "topic_score": topic_score})
+
+        # Sort by relevance score (highest first) and take top N
+        relevant_episodes.sort(key=lambda x: x["topic_score"], reverse=True)
+        selected_episodes = relevant_episodes[:max_episodes]
+
+        logger.info(
+            f"Topic '{topic}': {len(relevant_episodes)} candidates, "
+            f"{len(selected_episodes)} selected (threshold: {threshold})"
+        )
+
+        return selected_episodes
+
+    def generate_topic_summaries(
+        self,
+        transcripts: List[Dict],
+        topic: str,
+        on_summary: Optional[Callable[[Dict], None]] = None,
+        shared_map: Optional[SharedMapResults] = None,
+        digest_date: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        Generate summaries for all selected episodes for a topic (Map phase)
+
+        Every chunk of every selected episode is submitted to one executor, so
+        max_parallel_requests is a global cap for the whole map phase. Each
+        episode is finalized as soon as its last chunk completes and handed to
+        on_summary, letting the reduce stage budget results as they stream in.
+        Episodes already mapped earlier in the run (shared_map) are reused as-is.
+        With digest_date set, summaries are persisted per topic and day and an
+        episode whose transcript is unchanged since an earlier run is not remapped.
+
+        Returns:
+            Episode summaries sorted by topic score (highest first)
+        """
+        selected_episodes = self.select_top_episodes_for_topic(transcripts, topic)
+
+        if not selected_episodes:
+            logger.warning(f"No episodes selected for topic '{topic}'")
+            return []
+
+        summaries = []
+        phase_start = time.time()
+        persisted = (
+            self.load_topic_map_outputs(topic, digest_date) if digest_date else {}
+        )
+        persisted_reused = 0
+
+        def emit(summary: Dict, persist: bool = True):
+            summaries.append(summary)
+            if digest_date and persist:
+                self.save_topic_map_output(topic, digest_date, summary)
+            if on_summary:
+                on_summary(summary)
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_parallel_requests, thread_name_prefix="map-chunk"
+        ) as executor:
+            # Per-episode bookkeeping, keyed by episode_id
+            pending: Dict[str, Dict[str, Any]] = {}
+            future_owner: Dict[Future, str] = {}
+
+            for episode in selected_episodes:
+                episode_id = episode["episode_id"]
+                content_hash = self._episode_content_hash(episode)
+
+                previous = persisted.get(episode_id)
+                if previous and previous.get("content_hash") == content_hash:
+                    logger.info(
+                        f"📦 Reusing persisted map output for {episode_id} from an earlier run"
+                    )
+                    persisted_reused += 1
+                    emit(
+                        {**previous, "topic_score": episode["topic_score"]},
+                        persist=False,
+                    )
+                    continue
+
+                shared_result = shared_map.get(episode_id) if shared_map else None
+                if shared_result is not None:
+                    logger.info(
+                        f"♻️ Reusing map result for {episode_id} (score: {episode['topic_score']:.3f})"
+                    )
+                    summary = self._build_topic_summary(episode, shared_result)
+                    if summary is not None:
+                        emit(summary)
+                    continue
+
+                logger.info(
+                    f"Generating summary for {episode_id} (score: {episode['topic_score']:.3f})"
+                )
+                run_id = generate_idempotency_key(episode_id, topic, str(now_utc()))
+                chunks = self.create_chunks(
+                    episode["content"], episode_id, episode.get("title", "")
+                )
+                pending[episode_id] = {
+                    "episode": episode,
+                    "run_id": run_id,
+                    "chunk_count": len(chunks),
+                    "remaining": len(chunks),
+                    "chunk_summaries": [],
+                    "failures": 0,
+                    "start_time": time.time(),
+                    "started_at": now_utc().isoformat(),
+                }
+                for future in self._submit_chunks(
+                    executor,
+                    episode_id,
+                    chunks,
+                    topic,
+                    episode.get("title", ""),
+                    run_id,
+                ):
+                    future_owner[future] = episode_id
+
+            for future in as_completed(future_owner):
+                episode_id = future_owner[future]
+                state = pending[episode_id]
+
+                try:
+                    chunk_summary = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Chunk task failed for {episode_id}: {e}")
+                    chunk_summary = None
+
+                if chunk_summary:
+                    state["chunk_summaries"].append(chunk_summary)
+                else:
+                    state["failures"] += 1
+
+                state["remaining"] -= 1
+                if state["remaining"] > 0:
+                    continue
+
+                episode_result = self._finalize_episode_summary(
+                    episode_id=episode_id,
+                    topic=topic,
+                    run_id=state["run_id"],
+                    chunk_count=state["chunk_count"],
+                    chunk_summaries=state["chunk_summaries"],
+                    failures=state["failures"],
+                    start_time=state["start_time"],
+                    started_at=state["started_at"],
+                )
+                if shared_map is not None:
+                    shared_map.put(episode_id, episode_result)
+
+                summary = self._build_topic_summary(state["episode"], episode_result)
+                if summary is not None:
+                    emit(summary)
+
+        summaries.sort(key=lambda x: x["topic_score"], reverse=True)
+        total_tokens = sum(s["tokens"] for s in summaries)
+        logger.info(
+            f"Generated {len(summaries)} summaries for '{topic}': {total_tokens} total tokens "
+            f"wall_ms={int((time.time() - phase_start) * 1000)} "
+            f"max_parallel={self.max_parallel_requests}"
+        )
+        if digest_date:
+            logger.info(
+                f"Incremental map for '{topic}' ({digest_date}): {persisted_reused} reused, "
+                f"{len(summaries) - persisted_reused} newly mapped"
+            )
+
+        return summaries
+
+    def _episode_content_hash(self, episode: Dict) -> str:
+        """Hash of the transcript text, so map reuse survives chunking changes"""
+        return hashlib.sha256(episode.get("content", "").encode("utf-8")).hexdigest()
+
+    def _build_topic_summary(
+        self, episode: Dict, episode_result: Dict
+    ) -> Optional[Dict]:
+        """Collapse an episode result into the shape consumed by the reduce phase"""
+        chunk_texts = [
+            c["summary"] for c in episode_result["chunk_summaries"] if c.get("summary")
+        ]
+        if not chunk_texts:
+            logger.warning(
+                f"No chunk summaries produced for {episode['episode_id']}, skipping"
+            )
+            return None
+
+        summary_text = "\n\n".join(chunk_texts)
+        # Chunk summaries carry precomputed counts; each separator adds ~1 token
+        tokens = sum(
+            c.get("summary_tokens") or count_tokens(c["summary"])
+            for c in episode_result["chunk_summaries"]
+            if c.get("summary")
+        ) + (len(chunk_texts) - 1)
+        return {
+            "episode_id": episode["episode_id"],
+            "title": episode.get("title", ""),
+            "published_date": episode.get("published_date"),
+            "source": episode.get("source", "rss"),
+            "transcript_path": episode.get("transcript_path"),
+            "topic_score": episode["topic_score"],
+            "content_hash": self._episode_content_hash(episode),
+            "summary": summary_text,
+            "tokens": tokens,
+            "status": episode_result["status"],
+            "coverage_pct": episode_result["coverage_pct"],
+            "failure_count": episode_result["failure_count"],
+            "wall_ms": episode_result["wall_ms"],
+        }
+
 
 def main():
     """CLI interface for testing"""
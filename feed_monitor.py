@@ -50,6 +50,8 @@ from utils.feed_helpers import (
 
 # Set up logging
 from utils.logging_setup import configure_logging, format_feed_stats
+from utils.profiling import PROFILE_MODES, profile_run
+from utils.tracing import tracer
 
 configure_logging()
 logger = logging.getLogger(__name__)
@@ -305,6 +307,7 @@ class FeedMonitor:
         print("Please provide the channel ID manually or use the full channel URL")
         return None
 
+    @tracer.traced("ingest.check_feeds")
     def check_new_episodes(self, hours_back=None, feed_types=None):
         """Check feeds for new episodes with Phase 4 enhanced robustness
 
@@ -441,6 +444,7 @@ class FeedMonitor:
 
         return cursor.fetchall()
 
+    @tracer.traced("ingest.feed")
     def _process_single_feed(
         self,
         cursor: sqlite3.Cursor,
@@ -574,6 +578,7 @@ class FeedMonitor:
             stats["errors"] += 1
             raise
 
+    @tracer.traced("ingest.entries")
     def _process_feed_entries(
         self,
         cursor: sqlite3.Cursor,
@@ -939,6 +944,16 @@ class FeedMonitor:
 
 def main():
     """CLI interface for feed management"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check feeds for new episodes")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile the run into telemetry/profiles/ (default: PODCAST_PROFILE)",
+    )
+    args = parser.parse_args()
+
     monitor = FeedMonitor()
 
     print("Daily Podcast Digest - Feed Monitor")
@@ -962,7 +977,9 @@ def main():
 
     # Check for new episodes
     print(f"\nChecking for new episodes in last 24 hours...")
-    new_episodes = monitor.check_new_episodes()
+    # ingest.check_feeds > feed (fetch) > entries (parse, dedupe, insert)
+    with profile_run("feed_monitor", args.profile, stage_depth=2):
+        new_episodes = monitor.check_new_episodes()
 
     if new_episodes:
         print(f"Found {len(new_episodes)} new episodes:")
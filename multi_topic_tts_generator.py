@@ -8,15 +8,17 @@ import json
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-
-import requests
+from typing import Callable, Dict, List, Optional, Tuple
 
 from utils.datetime_utils import now_utc
-from utils.sanitization import create_topic_mp3_filename, create_topic_pattern
+from utils.digest_catalog import DigestCatalog
+from utils.sanitization import create_topic_mp3_filename
+from utils.tracing import tracer
 
 # Import music integration
 try:
@@ -34,6 +36,10 @@ try:
 except ImportError:
     pass
 
+from audio_mastering import AudioMasteringStage
+from config import config
+from telemetry_manager import telemetry
+from tts_segment_synthesizer import SegmentedTTSSynthesizer, TTSSegmentCache
 from utils.logging_setup import configure_logging
 
 configure_logging()
@@ -44,6 +50,7 @@ class MultiTopicTTSGenerator:
     def __init__(self, output_dir: str = "daily_digests"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.catalog = DigestCatalog(self.output_dir)
 
         # ElevenLabs configuration
         self.elevenlabs_api_key = os.getenv("ELEVENLABS_API_KEY")
@@ -55,7 +62,22 @@ class MultiTopicTTSGenerator:
         else:
             self.api_available = True
 
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = config.TTS_SETTINGS["base_url"]
+
+        # Segment audio cache, consulted before every ElevenLabs request
+        self.tts_cache = TTSSegmentCache(
+            config.TTS_SETTINGS["segment_cache_dir"],
+            config.TTS_SETTINGS["segment_cache_max_mb"] * 1_048_576,
+        )
+        self.synthesizer = (
+            SegmentedTTSSynthesizer(
+                self.elevenlabs_api_key, config.TTS_SETTINGS, cache=self.tts_cache
+            )
+            if self.api_available
+            else None
+        )
+        self.tts_usage = {"characters": 0, "hit_characters": 0, "billed_characters": 0}
+        self._usage_lock = threading.Lock()
 
         # Default voice for unknown topics (must be defined before loading config)
         self.default_voice = {
@@ -77,6 +99,14 @@ class MultiTopicTTSGenerator:
         else:
             logger.info("🎵 Music integration disabled - TTS only")
 
+        # Single-pass mastering (music crossfades + loudnorm + encode)
+        self.mastering = (
+            AudioMasteringStage(config.MASTERING_SETTINGS)
+            if config.MASTERING_SETTINGS["enabled"]
+            else None
+        )
+        self.mastering_reports: Dict[str, Dict] = {}
+
     def _load_topic_config(self) -> Dict:
         """Load topic configuration from topics.json"""
         try:
@@ -160,71 +190,29 @@ class MultiTopicTTSGenerator:
 
     def find_unprocessed_digests(self, since_date=None) -> List[Dict]:
         """Find topic digest MD files that don't have corresponding MP3s"""
-        unprocessed = []
-        all_md_files = []
-        matched_files = []
-
-        # Pattern for topic-specific digests: {topic}_digest_{timestamp}.md
-        # Support both hyphens and underscores in topic names for back-compatibility
-        topic_pattern = create_topic_pattern()
-
-        # Collect all MD files for logging
-        for md_file in self.output_dir.glob("*_digest_*.md"):
-            all_md_files.append(md_file.name)
-
-            match = topic_pattern.match(md_file.name)
-            if not match:
-                continue
-
-            matched_files.append(md_file.name)
-            topic, timestamp_str = match.groups()
-
-            # Parse timestamp
-            try:
-                file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-            except ValueError:
-                logger.warning(f"Invalid timestamp format in {md_file.name}")
-                continue
-
-            # Filter by since_date if provided
-            if since_date and file_date.date() < since_date:
-                logger.debug(
-                    f"Skipping {md_file.name}: {file_date.date()} < {since_date}"
-                )
-                continue
-
-            # Check if MP3 already exists
-            mp3_filename = create_topic_mp3_filename(topic, timestamp_str)
-            mp3_file = self.output_dir / mp3_filename
-            if mp3_file.exists():
-                logger.debug(f"Skipping {md_file.name}: MP3 already exists")
-                continue
-
-            unprocessed.append(
-                {
-                    "topic": topic,
-                    "timestamp": timestamp_str,
-                    "date": file_date,
-                    "md_file": md_file,
-                    "mp3_file": mp3_file,
-                }
-            )
-
-        # Enhanced logging for visibility
-        logger.info(
-            f"📄 Found {len(all_md_files)} total digest files: {sorted(all_md_files)}"
+        since = (
+            datetime.combine(since_date, datetime.min.time()) if since_date else None
         )
+        entries = self.catalog.entries(since=since, require_md=True, missing_mp3=True)
+
+        unprocessed = [
+            {
+                "topic": entry["topic"],
+                "timestamp": entry["timestamp"],
+                "date": entry["date"],
+                "md_file": entry["md_file"],
+                "mp3_file": self.output_dir
+                / create_topic_mp3_filename(entry["topic"], entry["timestamp"]),
+            }
+            for entry in entries
+        ]
+
+        if since_date:
+            logger.info(f"🗓️  Unprocessed since {since_date}: {len(unprocessed)} files")
         logger.info(
-            f"✅ Regex matched {len(matched_files)} files: {sorted(matched_files)}"
+            f"🎯 Final unprocessed count: {len(unprocessed)} files: "
+            f"{[digest['md_file'].name for digest in unprocessed]}"
         )
-        if since_date:
-            logger.info(
-                f"🗓️  After date filtering (>= {since_date}): {len(unprocessed)} files"
-            )
-        logger.info(f"🎯 Final unprocessed count: {len(unprocessed)} files")
-
-        # Sort by date (oldest first)
-        unprocessed.sort(key=lambda x: x["date"])
         return unprocessed
 
     def _optimize_for_tts(self, text: str) -> str:
@@ -248,9 +236,15 @@ class MultiTopicTTSGenerator:
         return text.strip()
 
     def generate_tts_audio(
-        self, text: str, voice_config: Dict, filename: str
+        self, text: str, voice_config: Dict, filename: str, topic: Optional[str] = None
     ) -> Optional[str]:
-        """Generate TTS audio using ElevenLabs API"""
+        """Generate TTS audio using ElevenLabs API
+
+        The script is synthesized in paragraph segments (concurrently, rate
+        limited, retried and cached per segment) and concatenated in order.
+        The narration is then piped straight into the mastering graph, so the
+        episode is encoded exactly once.
+        """
         if not self.api_available:
             logger.warning(
                 f"⚠️  ElevenLabs API not available - skipping TTS for {filename}"
@@ -260,49 +254,72 @@ class MultiTopicTTSGenerator:
         try:
             logger.info(f"🎙️  Generating TTS audio: {filename}")
 
-            headers = {
-                "xi-api-key": self.elevenlabs_api_key,
-                "Content-Type": "application/json",
-            }
-
-            data = {
-                "text": text,
-                "model_id": "eleven_multilingual_v2",
-                "voice_settings": {
-                    "stability": voice_config.get("stability", 0.75),
-                    "similarity_boost": voice_config.get("similarity_boost", 0.75),
-                    "style": voice_config.get("style", 0.20),
-                    "use_speaker_boost": True,
-                },
-            }
-
-            url = f"{self.base_url}/text-to-speech/{voice_config['voice_id']}/stream"
-
-            response = requests.post(
-                url, headers=headers, json=data, stream=True, timeout=60
+            audio_path = self.output_dir / f"{filename}.mp3"
+            rendered = self.synthesizer.synthesize_audio(
+                text, voice_config, audio_path.name
             )
-            response.raise_for_status()
+            if not rendered:
+                logger.error(f"❌ TTS generation failed for {filename}")
+                return None
 
-            # Save audio to file
-            audio_path = self.output_dir / f"{filename}.mp3"
-            with open(audio_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            audio, stats = rendered
+            with self._usage_lock:
+                for field in self.tts_usage:
+                    self.tts_usage[field] += stats[field]
+
+            if self.mastering:
+                self._master_audio(audio, audio_path, topic)
+            else:
+                tmp_path = audio_path.with_suffix(".partial")
+                tmp_path.write_bytes(audio)
+                os.replace(tmp_path, audio_path)
+                if self.music_integrator and topic:
+                    self._add_music(audio_path, topic)
 
             file_size = audio_path.stat().st_size
-            logger.info(f"✅ TTS audio generated: {filename}.mp3 ({file_size:,} bytes)")
+            logger.info(
+                f"✅ TTS audio generated: {filename}.mp3 ({file_size:,} bytes, "
+                f"{stats['segments']} segments, {stats['synthesized_segments']} synthesized, "
+                f"{stats['wall_ms']}ms)"
+            )
             return str(audio_path)
 
-        except requests.exceptions.Timeout:
-            logger.error(f"❌ TTS generation timeout for {filename}")
-            return None
-        except requests.exceptions.RequestException as e:
-            logger.error(f"❌ TTS API error for {filename}: {e}")
-            return None
         except Exception as e:
             logger.error(f"❌ Unexpected error generating TTS for {filename}: {e}")
             return None
 
+    def _add_music(self, audio_path: Path, topic: str):
+        """Add intro/outro music to unmastered narration (mastering disabled)"""
+        try:
+            logger.info(f"🎵 Adding music enhancement for {topic}")
+            enhanced_audio = self.music_integrator.enhance_tts_with_music(
+                str(audio_path), topic
+            )
+            if enhanced_audio != str(audio_path):
+                # Replace original with enhanced version
+                os.replace(enhanced_audio, audio_path)
+                logger.info("✅ Audio enhanced with music")
+        except Exception as e:
+            logger.warning(f"⚠️  Music enhancement failed: {e}, using TTS-only audio")
+
+    def _master_audio(self, audio: bytes, audio_path: Path, topic: Optional[str]):
+        """Master narration bytes into audio_path and report time and loudness"""
+        intro_music, outro_music = None, None
+        if self.music_integrator and topic:
+            try:
+                intro_music, outro_music = self.music_integrator.get_intro_outro(topic)
+            except Exception as e:
+                logger.warning(f"⚠️  Music lookup failed: {e}, mastering without music")
+
+        report = self.mastering.master(audio, audio_path, intro_music, outro_music)
+        self.mastering_reports[audio_path.stem] = report
+        telemetry.record_mastering(
+            audio_path.stem,
+            mastering_ms=report["mastering_ms"],
+            integrated_lufs=report.get("integrated_lufs"),
+            mastered=report["mastered"],
+        )
+
     def process_digest(self, digest_info: Dict) -> bool:
         """Process a single digest file to generate TTS audio"""
         topic = digest_info["topic"]
@@ -328,6 +345,7 @@ class MultiTopicTTSGenerator:
             tts_script_path = self.output_dir / f"{topic}_digest_tts_{timestamp}.txt"
             with open(tts_script_path, "w", encoding="utf-8") as f:
                 f.write(tts_optimized)
+            self.catalog.record_artifact(tts_script_path)
 
             logger.info(f"📝 TTS-optimized script saved: {tts_script_path.name}")
 
@@ -339,29 +357,11 @@ class MultiTopicTTSGenerator:
             # Generate audio
             audio_filename = f"{topic}_digest_{timestamp}"
             generated_audio = self.generate_tts_audio(
-                tts_optimized, voice_config, audio_filename
+                tts_optimized, voice_config, audio_filename, topic=topic
             )
 
             if generated_audio:
-                # Enhance with music if available
-                final_audio_path = generated_audio
-                if self.music_integrator:
-                    try:
-                        logger.info(f"🎵 Adding music enhancement for {topic}")
-                        enhanced_audio = self.music_integrator.enhance_tts_with_music(
-                            generated_audio, topic
-                        )
-                        if enhanced_audio != generated_audio:
-                            # Replace original with enhanced version
-                            enhanced_path = Path(enhanced_audio)
-                            original_path = Path(generated_audio)
-                            enhanced_path.rename(original_path)
-                            logger.info(f"✅ Audio enhanced with music")
-                        final_audio_path = generated_audio
-                    except Exception as e:
-                        logger.warning(
-                            f"⚠️  Music enhancement failed: {e}, using TTS-only audio"
-                        )
+                mastering = self.mastering_reports.get(audio_filename, {})
 
                 # Generate metadata
                 topic_display = voice_config.get(
@@ -381,11 +381,14 @@ class MultiTopicTTSGenerator:
                     "audio_file": f"{audio_filename}.mp3",
                     "markdown_file": md_file.name,
                     "tts_script_file": tts_script_path.name,
-                    "music_enhanced": self.music_integrator is not None,
+                    "music_enhanced": mastering.get("with_music", False),
+                    "mastering": mastering,
                 }
 
                 with open(metadata_path, "w", encoding="utf-8") as f:
                     json.dump(metadata, f, indent=2)
+                self.catalog.record_artifact(generated_audio)
+                self.catalog.record_artifact(metadata_path)
 
                 logger.info(f"📄 Metadata saved: {metadata_path.name}")
                 logger.info(f"✅ Successfully processed {topic} digest")
@@ -398,8 +401,26 @@ class MultiTopicTTSGenerator:
             logger.error(f"❌ Error processing {topic} digest: {e}")
             return False
 
-    def process_all_unprocessed(self, since_date=None) -> Tuple[int, int]:
-        """Process all unprocessed digest files"""
+    @tracer.traced("audio.topic")
+    def _produce_topic(self, digest_info: Dict) -> Tuple[bool, float]:
+        """Produce one topic episode (TTS, mastering, metadata) and time it"""
+        tracer.annotate(topic=digest_info["topic"])
+        start_time = time.time()
+        success = self.process_digest(digest_info)
+        return success, time.time() - start_time
+
+    def process_all_unprocessed(
+        self,
+        since_date=None,
+        on_ready: Optional[Callable[[Dict], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[int, int]:
+        """Process all unprocessed digest files, topics concurrently
+
+        on_ready is called (from the calling thread) with each digest_info as
+        soon as its audio and metadata are written, so deployment can start
+        before the slowest topic finishes.
+        """
         unprocessed = self.find_unprocessed_digests(since_date=since_date)
 
         if not unprocessed:
@@ -411,27 +432,100 @@ class MultiTopicTTSGenerator:
                 logger.info("✅ No unprocessed digest files found")
             return 0, 0
 
-        logger.info(f"🎯 Found {len(unprocessed)} unprocessed digest files")
+        workers = max(
+            1,
+            min(
+                max_workers or config.TTS_SETTINGS["max_parallel_topics"],
+                len(unprocessed),
+            ),
+        )
+        logger.info(
+            f"🎯 Found {len(unprocessed)} unprocessed digest files "
+            f"({workers} produced concurrently)"
+        )
 
         success_count = 0
         failed_count = 0
+        latencies: Dict[str, float] = {}
+        stage_start = time.time()
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="audio-topic"
+        ) as executor:
+            futures = {
+                executor.submit(tracer.wrap(self._produce_topic), digest_info): (
+                    digest_info
+                )
+                for digest_info in unprocessed
+            }
+            for future in as_completed(futures):
+                digest_info = futures[future]
+                name = f"{digest_info['topic']}_{digest_info['timestamp']}"
+                success, latency = future.result()
+                latencies[name] = latency
+                if not success:
+                    failed_count += 1
+                    continue
 
-        for digest_info in unprocessed:
-            success = self.process_digest(digest_info)
-            if success:
                 success_count += 1
-            else:
-                failed_count += 1
-
-            # Add delay between requests to respect API limits
-            if self.api_available and digest_info != unprocessed[-1]:
-                time.sleep(1)
+                logger.info(f"🎧 {name} ready after {latency:.1f}s")
+                if on_ready:
+                    try:
+                        on_ready(digest_info)
+                    except Exception as e:
+                        logger.error(f"❌ Publishing {name} failed: {e}")
 
+        wall_seconds = time.time() - stage_start
         logger.info(
             f"📊 Processing complete: {success_count} successful, {failed_count} failed"
         )
+        self._report_production(latencies, wall_seconds)
+        self._report_tts_usage()
+        self._report_mastering()
         return success_count, failed_count
 
+    def _report_production(self, latencies: Dict[str, float], wall_seconds: float):
+        """Log per-topic production latency against the stage wall time"""
+        if not latencies:
+            return
+
+        for name, latency in sorted(latencies.items(), key=lambda item: -item[1]):
+            logger.info(f"⏱️  {name}: {latency:.1f}s")
+        logger.info(
+            f"⏱️  Audio production: {wall_seconds:.1f}s wall, slowest topic "
+            f"{max(latencies.values()):.1f}s, sum of topics "
+            f"{sum(latencies.values()):.1f}s"
+        )
+        telemetry.record_audio_production(latencies, wall_seconds)
+
+    def _report_mastering(self):
+        """Log per-episode mastering time and integrated loudness for this run"""
+        for name, report in sorted(self.mastering_reports.items()):
+            if report["mastered"]:
+                logger.info(
+                    f"🎚️  {name}: mastered in {report['mastering_ms']}ms, "
+                    f"{report.get('integrated_lufs', 'n/a')} LUFS "
+                    f"(input {report.get('input_lufs', 'n/a')} LUFS)"
+                )
+            else:
+                logger.info(f"🎚️  {name}: not mastered ({report.get('error')})")
+
+    def _report_tts_usage(self):
+        """Log and record cache-hit vs billed TTS characters for this run"""
+        usage = self.tts_usage
+        if not usage["characters"]:
+            return
+
+        hit_pct = usage["hit_characters"] / usage["characters"]
+        logger.info(
+            f"💾 TTS cache: {usage['hit_characters']:,} characters from cache, "
+            f"{usage['billed_characters']:,} billed ({hit_pct:.1%} hit rate)"
+        )
+        telemetry.record_tts_usage(
+            hit_characters=usage["hit_characters"],
+            billed_characters=usage["billed_characters"],
+        )
+
 
 def main():
     """Process all unprocessed topic digest files"""
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Music Asset Bank
+Decodes each topic's intro, outro and transition music once into raw PCM
+(s16le) files tracked by a manifest of source hashes. The mastering graph reads
+these directly and they can be memory-mapped with numpy, so episode mixes no
+longer re-decode the same mp3s.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from utils.logging_setup import configure_logging
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+PCM_FORMAT = "s16le"
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+
+
+class MusicAssetBank:
+    """Decoded PCM cache for music assets, invalidated when the source changes"""
+
+    def __init__(self, settings: Dict):
+        self.pcm_dir = Path(settings["music_pcm_dir"])
+        self.sample_rate = settings["sample_rate"]
+        self.channels = settings["music_channels"]
+        self.ffmpeg = settings["ffmpeg_binary"]
+        self.manifest_path = self.pcm_dir / "manifest.json"
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, str] = {}  # asset name -> pcm path, this process
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if (
+                manifest.get("version") == MANIFEST_VERSION
+                and manifest.get("sample_rate") == self.sample_rate
+                and manifest.get("channels") == self.channels
+            ):
+                return manifest
+            logger.info("🎼 PCM asset manifest format changed - rebuilding bank")
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️  Unreadable PCM asset manifest, rebuilding: {e}")
+
+        return {
+            "version": MANIFEST_VERSION,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "format": PCM_FORMAT,
+            "assets": {},
+        }
+
+    def _save_manifest(self):
+        self.pcm_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _is_current(self, entry: Optional[Dict], source: Path) -> bool:
+        """True when the decoded PCM still matches the source file"""
+        if not entry or not (self.pcm_dir / entry["pcm_file"]).exists():
+            return False
+
+        source_stat = source.stat()
+        if (
+            entry["source_size"] == source_stat.st_size
+            and entry["source_mtime"] == source_stat.st_mtime
+        ):
+            return True
+
+        # Touched but possibly unchanged: fall back to the content hash
+        if entry["source_sha256"] != self._hash_file(source):
+            return False
+        entry["source_mtime"] = source_stat.st_mtime
+        self._save_manifest()
+        return True
+
+    def _decode(self, source: Path, pcm_path: Path) -> bool:
+        cmd = [
+            self.ffmpeg,
+            "-hide_banner",
+            "-nostdin",
+            "-y",
+            "-i",
+            str(source),
+            "-f",
+            PCM_FORMAT,
+            "-ar",
+            str(self.sample_rate),
+            "-ac",
+            str(self.channels),
+            str(pcm_path),
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, timeout=60)
+        except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+            logger.error(f"❌ Could not decode {source.name} to PCM: {e}")
+            return False
+
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            logger.error(f"❌ Could not decode {source.name} to PCM: {stderr[-300:]}")
+            return False
+        return True
+
+    def pcm_path(self, name: str, source: str) -> Optional[str]:
+        """Path of the decoded PCM for a music source, decoding it on first use"""
+        source_path = Path(source)
+        with self._lock:
+            if name in self._resolved:
+                return self._resolved[name]
+            if not source_path.exists():
+                return None
+
+            entry = self.manifest["assets"].get(name)
+            if entry and entry["source"] == str(source_path):
+                if self._is_current(entry, source_path):
+                    pcm_path = str(self.pcm_dir / entry["pcm_file"])
+                    self._resolved[name] = pcm_path
+                    return pcm_path
+
+            self.pcm_dir.mkdir(parents=True, exist_ok=True)
+            pcm_file = f"{_safe_name(name)}.pcm"
+            pcm_path = self.pcm_dir / pcm_file
+            tmp_path = pcm_path.with_suffix(".partial")
+            if not self._decode(source_path, tmp_path):
+                if tmp_path.exists():
+                    tmp_path.unlink()
+                return None
+            os.replace(tmp_path, pcm_path)
+
+            source_stat = source_path.stat()
+            frame_bytes = 2 * self.channels
+            self.manifest["assets"][name] = {
+                "source": str(source_path),
+                "source_sha256": self._hash_file(source_path),
+                "source_size": source_stat.st_size,
+                "source_mtime": source_stat.st_mtime,
+                "pcm_file": pcm_file,
+                "frames": pcm_path.stat().st_size // frame_bytes,
+            }
+            self._save_manifest()
+            self._resolved[name] = str(pcm_path)
+
+        logger.info(
+            f"🎼 Decoded {source_path.name} to PCM bank "
+            f"({self.manifest['assets'][name]['frames'] / self.sample_rate:.1f}s)"
+        )
+        return str(pcm_path)
+
+    def load(self, name: str) -> Optional[np.memmap]:
+        """Memory-mapped (frames, channels) int16 samples for a decoded asset"""
+        entry = self.manifest["assets"].get(name)
+        if not entry:
+            return None
+
+        pcm_path = self.pcm_dir / entry["pcm_file"]
+        if not pcm_path.exists() or not entry["frames"]:
+            return None
+        return np.memmap(
+            pcm_path,
+            dtype="<i2",
+            mode="r",
+            shape=(entry["frames"], self.channels),
+        )
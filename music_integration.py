@@ -14,6 +14,9 @@ from typing import Dict, Optional, Tuple
 
 import requests
 
+from audio_mastering import AudioMasteringStage
+from config import config
+from music_asset_bank import MusicAssetBank
 from utils.logging_setup import configure_logging
 
 # Load environment variables from .env file
@@ -45,6 +48,8 @@ class MusicIntegrator:
             "fade_in_duration": 2,
             "fade_out_duration": 2,
         }
+        self.mastering = AudioMasteringStage(config.MASTERING_SETTINGS)
+        self.asset_bank = MusicAssetBank(config.MASTERING_SETTINGS)
 
     def _load_topics_config(self) -> Dict:
         """Load topic configuration from topics.json"""
@@ -270,128 +275,58 @@ class MusicIntegrator:
                 except Exception as e:
                     logger.error(f"❌ Error creating static {music_type} music: {e}")
 
-    def mix_audio_with_music(
-        self, audio_file: str, topic: str, output_file: str
-    ) -> bool:
-        """Mix TTS audio with intro and outro music using crossfade transitions"""
-        logger.info(f"🎧 Adding intro/outro music with crossfade for {topic}")
+    def get_intro_outro(self, topic: str) -> Tuple[Optional[str], Optional[str]]:
+        """Intro and outro music for a topic, falling back to static tones
 
-        # Get music files
+        Returns decoded PCM from the asset bank when available so the mix does
+        not decode the same mp3s for every episode.
+        """
         intro_music = self.generate_music(topic, "intro")
         outro_music = self.generate_music(topic, "outro")
 
         # Fallback to static files if generation failed
+        if not intro_music or not outro_music:
+            self.create_static_music_files()
         if not intro_music:
             intro_music = str(self.music_cache_dir / "static_intro.mp3")
         if not outro_music:
             outro_music = str(self.music_cache_dir / "static_outro.mp3")
 
-        # Ensure static files exist
-        self.create_static_music_files()
-
-        try:
-            settings = self.default_music_settings
-            crossfade_duration = 2  # 2 seconds of crossfade overlap
-
-            # Create crossfade filter complex:
-            # - Intro music fades out as TTS begins
-            # - TTS audio plays at full volume in the middle
-            # - Outro music fades in as TTS ends
-            filter_complex = (
-                f"[0]volume={settings['background_volume']}[intro_low];"
-                f"[2]volume={settings['background_volume']}[outro_low];"
-                f"[intro_low][1]acrossfade=d={crossfade_duration}:c1=tri:c2=tri[intro_tts];"
-                f"[intro_tts][outro_low]acrossfade=d={crossfade_duration}:c1=tri:c2=tri[final]"
+        if not (Path(intro_music).exists() and Path(outro_music).exists()):
+            logger.warning(f"⚠️  No intro/outro music available for {topic}")
+            return None, None
+
+        intro_pcm = self.asset_bank.pcm_path(f"{topic}_intro", intro_music)
+        outro_pcm = self.asset_bank.pcm_path(f"{topic}_outro", outro_music)
+        return intro_pcm or intro_music, outro_pcm or outro_music
+
+    def prepare_topic_assets(self, topic: str) -> Dict[str, Optional[str]]:
+        """Decode a topic's intro, outro and transitions into the PCM asset bank"""
+        assets = dict(zip(["intro", "outro"], self.get_intro_outro(topic)))
+        for transition_type in ["soft", "hard"]:
+            name = f"transition_{transition_type}"
+            transition = self.add_segment_transition(topic, transition_type)
+            assets[name] = (
+                self.asset_bank.pcm_path(f"{topic}_{name}", transition)
+                if transition
+                else None
             )
+        return assets
 
-            cmd = [
-                "ffmpeg",
-                "-i",
-                intro_music,  # Input 0: Intro music (8 seconds)
-                "-i",
-                audio_file,  # Input 1: Main narration
-                "-i",
-                outro_music,  # Input 2: Outro music (8 seconds)
-                "-filter_complex",
-                filter_complex,
-                "-map",
-                "[final]",
-                "-c:a",
-                "libmp3lame",
-                "-b:a",
-                "128k",
-                "-y",
-                output_file,
-            ]
-
-            logger.info(f"🔄 Adding crossfade intro/outro music...")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-
-            if result.returncode == 0:
-                logger.info(
-                    f"✅ Audio enhanced with crossfade transitions: {output_file}"
-                )
-                return True
-            else:
-                logger.error(f"❌ Crossfade enhancement failed: {result.stderr}")
-                logger.info("🔄 Trying fallback with simple overlay...")
-
-                # Fallback: Use overlay with fade filters instead of acrossfade
-                fallback_filter = (
-                    f"[0]volume={settings['background_volume']},afade=t=out:st=6:d=2[intro_fade];"
-                    f"[2]volume={settings['background_volume']},afade=t=in:st=0:d=2[outro_fade];"
-                    f"[intro_fade][1]concat=n=2:v=0:a=1[intro_tts];"
-                    f"[intro_tts][outro_fade]concat=n=2:v=0:a=1[final]"
-                )
-
-                fallback_cmd = [
-                    "ffmpeg",
-                    "-i",
-                    intro_music,
-                    "-i",
-                    audio_file,
-                    "-i",
-                    outro_music,
-                    "-filter_complex",
-                    fallback_filter,
-                    "-map",
-                    "[final]",
-                    "-c:a",
-                    "libmp3lame",
-                    "-b:a",
-                    "128k",
-                    "-y",
-                    output_file,
-                ]
-
-                fallback_result = subprocess.run(
-                    fallback_cmd, capture_output=True, text=True, timeout=300
-                )
+    def mix_audio_with_music(
+        self, audio_file: str, topic: str, output_file: str
+    ) -> bool:
+        """Mix TTS audio with intro and outro music using crossfade transitions
 
-                if fallback_result.returncode == 0:
-                    logger.info(f"✅ Audio enhanced with fade fallback: {output_file}")
-                    return True
-                else:
-                    logger.error(f"❌ Fallback also failed: {fallback_result.stderr}")
-                    # Final fallback: just copy the original file
-                    subprocess.run(["cp", audio_file, output_file])
-                    logger.info(
-                        f"📄 Final fallback: copied original audio to {output_file}"
-                    )
-                    return False
+        Runs the single-pass mastering graph (crossfades, loudnorm, encode).
+        """
+        logger.info(f"🎧 Adding intro/outro music with crossfade for {topic}")
+        intro_music, outro_music = self.get_intro_outro(topic)
 
-        except subprocess.TimeoutExpired:
-            logger.error("❌ Audio enhancement timed out")
-            return False
-        except Exception as e:
-            logger.error(f"❌ Error enhancing audio: {e}")
-            # Fallback: just copy the original file
-            try:
-                subprocess.run(["cp", audio_file, output_file], check=True)
-                logger.info(f"📄 Fallback: copied original audio to {output_file}")
-            except Exception as copy_error:
-                logger.error(f"❌ Fallback copy also failed: {copy_error}")
-            return False
+        stats = self.mastering.master(
+            audio_file, Path(output_file), intro_music, outro_music
+        )
+        return stats["mastered"]
 
     def add_segment_transition(
         self, topic: str, transition_type: str = "soft"
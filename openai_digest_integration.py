@@ -9,10 +9,12 @@ import logging
 import os
 import re
 import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 import openai
 
@@ -27,7 +29,7 @@ try:
 except ImportError:
     pass
 from config import config
-from episode_summary_generator import EpisodeSummaryGenerator
+from episode_summary_generator import EpisodeSummaryGenerator, SharedMapResults
 from prose_validator import ProseValidator
 from telemetry_manager import telemetry
 from utils.logging_setup import configure_logging
@@ -37,14 +39,120 @@ from utils.openai_helpers import (
     get_json_schema,
 )
 from utils.sanitization import safe_digest_filename, scrub_secrets_from_text
+from utils.tokenizer import count_tokens
+from utils.tracing import tracer
 
 configure_logging()
 logger = logging.getLogger(__name__)
 
+# Topics episodes are scored against (from OpenAI scorer)
+DIGEST_TOPICS = [
+    "AI News",
+    "Tech Product Releases",
+    "Tech News and Tech Culture",
+    "Community Organizing",
+    "Social Justice",
+    "Societal Culture Change",
+]
+
+
+class ReduceTokenBudgeter:
+    """Tracks map-phase summaries as they stream in against the reduce token budget"""
+
+    def __init__(self, topic: str, max_reduce_tokens: int, headroom: float = 0.8):
+        self.topic = topic
+        self.budget = int(max_reduce_tokens * headroom)  # Leave room for system prompt
+        self.summaries: List[Dict] = []
+        self.total_tokens = 0
+        self._lock = threading.Lock()
+        self._over_budget_logged = False
+
+    def add(self, summary: Dict):
+        """Account for one completed episode summary (safe to call from worker threads)"""
+        with self._lock:
+            self.summaries.append(summary)
+            self.total_tokens += summary["tokens"]
+            if self.total_tokens > self.budget and not self._over_budget_logged:
+                self._over_budget_logged = True
+                logger.info(
+                    f"Reduce budget for {self.topic} exceeded while mapping "
+                    f"({self.total_tokens} > {self.budget}) after {len(self.summaries)} episodes"
+                )
+
+    def fit(self) -> Tuple[List[Dict], List[Dict]]:
+        """Drop lowest-scored episodes until the reduce prompt fits; returns (kept, dropped)"""
+        with self._lock:
+            kept = list(self.summaries)
+            total_tokens = self.total_tokens
 
-def approx_tokens(text: str) -> int:
-    """Estimate token count using simple heuristic"""
-    return (len(text) + 3) // 4
+        dropped = []
+        if total_tokens > self.budget:
+            logger.warning(
+                f"Token budget tight ({total_tokens} > {self.budget}), reducing episodes"
+            )
+            kept.sort(key=lambda x: x["topic_score"], reverse=True)
+            while total_tokens > self.budget and len(kept) > 2:
+                removed = kept.pop()
+                total_tokens -= removed["tokens"]
+                dropped.append(removed)
+                logger.info(
+                    f"Dropped episode {removed['episode_id']} (score: {removed['topic_score']:.3f})"
+                )
+
+        return kept, dropped
+
+
+class TopicDigestRun:
+    """Run-scoped state shared by the topic digests of one run
+
+    Candidate transcripts are read once (on the first digest), each episode is
+    mapped once no matter how many topics it is relevant to, and an episode
+    belongs to the first topic that digests it, as when each topic reloaded
+    transcripts after the previous one marked its episodes. Topics must be
+    digested one after another, in a fixed order.
+    """
+
+    def __init__(self, integration: "OpenAIDigestIntegration", digest_date=None):
+        self.integration = integration
+        self.digest_date = digest_date
+        self.shared_map = SharedMapResults()
+        self.consumed: Set[str] = set()
+        self._transcripts: Optional[List[Dict]] = None
+        self._available: Optional[List[str]] = None
+
+    def available_topics(self) -> List[str]:
+        """Topics with episodes ready for digest (checked once per run)"""
+        if self._available is None:
+            self._available = self.integration.get_available_topics()
+        return self._available
+
+    def digest(self, topic: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Generate one topic's digest from the episodes no earlier topic used"""
+        if self._transcripts is None:
+            self._transcripts = self.integration.get_transcripts_for_analysis(
+                include_youtube=True
+            )
+        return self.integration.generate_topic_digest(
+            topic,
+            transcripts=[
+                t for t in self._transcripts if t["episode_id"] not in self.consumed
+            ],
+            shared_map=self.shared_map,
+            digest_date=self.digest_date,
+            consumed=self.consumed,
+        )
+
+    def report(self):
+        """Record and log how much map work the topics shared"""
+        if self._transcripts is None:
+            return
+        sharing = self.shared_map.report()
+        telemetry.record_map_sharing(**sharing)
+        logger.info(
+            f"♻️ Map sharing: {sharing['episodes_mapped']} episodes mapped, "
+            f"{sharing['episodes_reused']} reused, ~{sharing['tokens_saved']} tokens "
+            f"and {sharing['seconds_saved']}s saved"
+        )
 
 
 class OpenAIDigestIntegration:
@@ -516,16 +624,6 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
         """Get list of topics that have episodes ready for digest based on relevance scores"""
         topics_with_episodes = set()
 
-        # Define available topics (from OpenAI scorer)
-        all_topics = [
-            "AI News",
-            "Tech Product Releases",
-            "Tech News and Tech Culture",
-            "Community Organizing",
-            "Social Justice",
-            "Societal Culture Change",
-        ]
-
         # Check RSS database
         try:
             conn = get_connection(self.db_path)
@@ -544,7 +642,7 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
             for (scores_json,) in cursor.fetchall():
                 try:
                     scores = json.loads(scores_json)
-                    for topic in all_topics:
+                    for topic in DIGEST_TOPICS:
                         if scores.get(topic, 0.0) >= threshold:
                             topics_with_episodes.add(topic)
                 except (json.JSONDecodeError, TypeError):
@@ -573,7 +671,7 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
                 for (scores_json,) in cursor.fetchall():
                     try:
                         scores = json.loads(scores_json)
-                        for topic in all_topics:
+                        for topic in DIGEST_TOPICS:
                             if scores.get(topic, 0.0) >= threshold:
                                 topics_with_episodes.add(topic)
                     except (json.JSONDecodeError, TypeError):
@@ -584,12 +682,26 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
 
         return sorted(list(topics_with_episodes))
 
+    @tracer.traced("digest.topic")
     def generate_topic_digest(
-        self, topic: str
+        self,
+        topic: str,
+        transcripts: Optional[List[Dict]] = None,
+        shared_map: Optional[SharedMapResults] = None,
+        digest_date: Optional[str] = None,
+        consumed: Optional[Set[str]] = None,
     ) -> Tuple[bool, Optional[str], Optional[str]]:
-        """Generate digest for a specific topic using map-reduce approach with OpenAI models"""
+        """Generate digest for a specific topic using map-reduce approach with OpenAI models
+
+        transcripts and shared_map let a multi-topic run load transcripts once and
+        reuse episode map results across topics; both default to a standalone run.
+        digest_date (default today) keys the persisted map outputs, so a resumed
+        run picks up the map results of the day it started. The episode IDs this
+        topic marks digested are added to consumed.
+        """
 
         logger.info(f"🧠 Starting {topic} digest generation with OpenAI (map-reduce)")
+        tracer.annotate(topic=topic)
         start_time = time.time()
         retry_count = 0
 
@@ -599,7 +711,9 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
             return False, None, None
 
         # Get all transcripts and use map-reduce approach
-        all_transcripts = self.get_transcripts_for_analysis(include_youtube=True)
+        if transcripts is None:
+            transcripts = self.get_transcripts_for_analysis(include_youtube=True)
+        all_transcripts = transcripts
         if not all_transcripts:
             logger.warning(f"No transcripts available for any topics")
             telemetry.record_warning(f"No transcripts available for {topic}")
@@ -618,54 +732,118 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
         ]
 
         try:
-            # MAP PHASE: Generate episode summaries using cost-effective model
-            episode_summaries = self.summary_generator.generate_topic_summaries(
-                all_transcripts, topic
-            )
+            # MAP PHASE: Generate episode summaries using cost-effective model.
+            # Summaries stream into the reduce budgeter as each episode completes.
+            max_reduce_tokens = config.OPENAI_SETTINGS["max_reduce_tokens"]
+            budgeter = ReduceTokenBudgeter(topic, max_reduce_tokens)
+            incremental = config.OPENAI_SETTINGS.get("incremental_digest", False)
+            if incremental:
+                digest_date = digest_date or now_utc().strftime("%Y-%m-%d")
+            else:
+                digest_date = None
+            with tracer.span("digest.map", topic=topic) as span:
+                self.summary_generator.generate_topic_summaries(
+                    all_transcripts,
+                    topic,
+                    on_summary=budgeter.add,
+                    shared_map=shared_map,
+                    digest_date=digest_date,
+                )
+                span.set_attributes(
+                    summaries=len(budgeter.summaries), tokens=budgeter.total_tokens
+                )
 
-            if not episode_summaries:
+            if incremental:
+                # Episodes digested by an earlier run today are no longer pending
+                # but still belong in today's digest for this topic
+                mapped_ids = {s["episode_id"] for s in budgeter.summaries}
+                earlier = self.summary_generator.load_topic_map_outputs(
+                    topic, digest_date
+                )
+                for episode_id, summary in earlier.items():
+                    if episode_id not in mapped_ids:
+                        budgeter.add(summary)
+
+            if not budgeter.summaries:
                 logger.warning(f"No relevant episodes found for topic: {topic}")
                 return False, None, f"No episodes meet relevance threshold for {topic}"
 
-            # Check token budget for REDUCE phase
-            total_summary_tokens = sum(s["tokens"] for s in episode_summaries)
-            max_reduce_tokens = config.OPENAI_SETTINGS["max_reduce_tokens"]
-
             logger.info(
-                f"Map phase complete: {len(episode_summaries)} summaries, {total_summary_tokens} tokens"
+                f"Map phase complete: {len(budgeter.summaries)} summaries, {budgeter.total_tokens} tokens"
             )
 
-            # Progressive token reduction if needed
-            if (
-                total_summary_tokens > max_reduce_tokens * 0.8
-            ):  # Leave room for system prompt
-                logger.warning(
-                    f"Token budget tight ({total_summary_tokens} > {int(max_reduce_tokens * 0.8)}), reducing episodes"
-                )
-                # Drop lowest-scored episodes until we fit
-                episode_summaries.sort(key=lambda x: x["topic_score"], reverse=True)
-                while (
-                    total_summary_tokens > max_reduce_tokens * 0.8
-                    and len(episode_summaries) > 2
-                ):
-                    removed = episode_summaries.pop()
-                    total_summary_tokens -= removed["tokens"]
-                    logger.info(
-                        f"Dropped episode {removed['episode_id']} (score: {removed['topic_score']:.3f})"
+            digest_content = None
+            input_hash = None
+            used_ids = None
+            if incremental:
+                input_hash = self._reduce_input_hash(topic, budgeter.summaries)
+                if config.OPENAI_SETTINGS.get("reuse_reduce_output", False):
+                    digest_content = self.summary_generator.get_reduce_output(
+                        topic, digest_date, input_hash
                     )
+                    if digest_content:
+                        used_ids = self.summary_generator.get_reduce_episode_ids(
+                            topic, digest_date, input_hash
+                        )
+                        logger.info(
+                            f"♻️ Input set for {topic} unchanged since the last run today, "
+                            f"reusing its reduce output"
+                        )
 
-            # REDUCE PHASE: Generate final digest using primary model
-            digest_content = self._generate_final_digest(episode_summaries, topic)
+            reduce_mode = config.OPENAI_SETTINGS.get("reduce_mode", "drop")
+            use_tree = reduce_mode == "tree" and budgeter.total_tokens > budgeter.budget
+            if use_tree:
+                # Hierarchical reduce keeps every relevant episode
+                episode_summaries = sorted(
+                    budgeter.summaries, key=lambda x: x["topic_score"], reverse=True
+                )
+            else:
+                # Progressive token reduction if needed
+                episode_summaries, _ = budgeter.fit()
+
+            if digest_content is None:
+                reduce_inputs = (
+                    self._tree_reduce(episode_summaries, topic, budgeter.budget)
+                    if use_tree
+                    else episode_summaries
+                )
+
+                # Tree reduce can still fall back to dropping inputs; only the
+                # episodes behind the final reduce inputs are in the digest
+                used_ids = {
+                    member
+                    for s in reduce_inputs
+                    for member in s.get("member_ids", [s["episode_id"]])
+                }
+
+                # REDUCE PHASE: Generate final digest using primary model
+                digest_content = self._generate_final_digest(reduce_inputs, topic)
+
+                if digest_content and incremental:
+                    self.summary_generator.save_reduce_output(
+                        topic,
+                        digest_date,
+                        input_hash,
+                        list(used_ids),
+                        digest_content,
+                    )
 
             if not digest_content:
                 logger.error(f"Failed to generate final digest for {topic}")
                 return False, None, "Digest generation failed in reduce phase"
 
+            if used_ids is not None:
+                # Dropped episodes stay pending for a later digest
+                episode_summaries = [
+                    s for s in episode_summaries if s["episode_id"] in used_ids
+                ]
+
             # Validate and ensure prose quality
             logger.info(f"🔍 Validating prose quality for {topic} digest")
-            success, final_content, issues = self.prose_validator.ensure_prose_quality(
-                digest_content
-            )
+            with tracer.span("digest.prose_validation", topic=topic):
+                success, final_content, issues = (
+                    self.prose_validator.ensure_prose_quality(digest_content)
+                )
 
             if not success:
                 logger.error(
@@ -692,6 +870,8 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
             # Update databases - mark episodes as digested and stamp with topic/date
             episode_ids = [s["episode_id"] for s in episode_summaries]
             self._mark_episodes_as_digested_by_ids(episode_ids, topic, timestamp)
+            if consumed is not None:
+                consumed.update(episode_ids)
 
             # Move transcripts to digested folder
             transcript_paths = [
@@ -725,8 +905,7 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
                 selected_count=len(episode_summaries),
                 threshold_used=threshold,
                 map_phase_tokens=sum(s["tokens"] for s in episode_summaries),
-                reduce_phase_tokens=len(final_content.split())
-                * 4,  # Estimate output tokens
+                reduce_phase_tokens=count_tokens(final_content),
                 retry_count=retry_count,
                 processing_time=processing_time,
                 episode_ids_included=episode_ids,
@@ -759,6 +938,194 @@ Format the output as clean Markdown suitable for publication. Focus on accuracy,
 
             return False, None, str(e)
 
+    def _reduce_input_hash(self, topic: str, summaries: List[Dict]) -> str:
+        """Identify a reduce input set by its episodes, transcripts and settings"""
+        episodes = sorted(
+            (s["episode_id"], s.get("content_hash", "")) for s in summaries
+        )
+        return generate_idempotency_key(
+            topic,
+            episodes,
+            self.model,
+            config.OPENAI_SETTINGS.get("reduce_mode", "drop"),
+            config.OPENAI_SETTINGS["max_reduce_tokens"],
+        )
+
+    @tracer.traced("digest.tree_reduce")
+    def _tree_reduce(
+        self, episode_summaries: List[Dict], topic: str, budget: int
+    ) -> List[Dict]:
+        """Condense summaries level by level until the final reduce prompt fits budget"""
+        fan_in = max(2, config.OPENAI_SETTINGS.get("reduce_fan_in", 4))
+        max_depth = max(1, config.OPENAI_SETTINGS.get("reduce_max_depth", 2))
+        max_workers = max(1, config.EXECUTION_SETTINGS["max_parallel_requests"])
+
+        level_inputs = episode_summaries
+        depth = 0
+        batch_counts = []
+        while (
+            sum(s["tokens"] for s in level_inputs) > budget
+            and len(level_inputs) > 1
+            and depth < max_depth
+        ):
+            depth += 1
+            batches = self._make_reduce_batches(level_inputs, fan_in, budget)
+            # Size each intermediate so the next level fits the budget
+            target_tokens = max(100, budget // len(batches))
+            batch_counts.append(len(batches))
+            logger.info(
+                f"🌲 Tree reduce level {depth} for {topic}: {len(level_inputs)} inputs "
+                f"-> {len(batches)} batches (~{target_tokens} tokens each)"
+            )
+
+            reduced: List[Optional[Dict]] = [None] * len(batches)
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(batches))
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        tracer.wrap(self._reduce_batch),
+                        batch,
+                        topic,
+                        depth,
+                        index,
+                        target_tokens,
+                    ): index
+                    for index, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    reduced[futures[future]] = future.result()
+            level_inputs = reduced
+
+        total_tokens = sum(s["tokens"] for s in level_inputs)
+        if total_tokens > budget:
+            logger.warning(
+                f"Tree reduce for {topic} still over budget after {depth} levels "
+                f"({total_tokens} > {budget}), falling back to dropping"
+            )
+            fallback = ReduceTokenBudgeter(topic, budget, headroom=1.0)
+            for summary in level_inputs:
+                fallback.add(summary)
+            level_inputs, _ = fallback.fit()
+
+        telemetry.record_metric("digest.tree_reduce.depth.gauge", depth, topic=topic)
+        telemetry.record_metric(
+            "digest.tree_reduce.batches.count", sum(batch_counts), topic=topic
+        )
+        logger.info(
+            f"Tree reduce complete for {topic}: {len(episode_summaries)} episodes -> "
+            f"{len(level_inputs)} reduce inputs, depth={depth}, batches={batch_counts}"
+        )
+        return level_inputs
+
+    def _make_reduce_batches(
+        self, summaries: List[Dict], fan_in: int, budget: int
+    ) -> List[List[Dict]]:
+        """Group summaries into batches of at most fan_in members and budget tokens"""
+        batches = []
+        current: List[Dict] = []
+        current_tokens = 0
+        for summary in summaries:
+            if current and (
+                len(current) >= fan_in or current_tokens + summary["tokens"] > budget
+            ):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(summary)
+            current_tokens += summary["tokens"]
+        if current:
+            batches.append(current)
+        return batches
+
+    def _reduce_batch(
+        self,
+        batch: List[Dict],
+        topic: str,
+        level: int,
+        index: int,
+        target_tokens: int,
+    ) -> Dict:
+        """Reduce one batch of summaries into a single intermediate summary"""
+        if len(batch) == 1 and batch[0]["tokens"] <= target_tokens:
+            return batch[0]
+
+        member_ids = []
+        for summary in batch:
+            member_ids.extend(summary.get("member_ids", [summary["episode_id"]]))
+
+        if self.mock_mode:
+            condensed = self._condense_extractively(batch, target_tokens)
+        else:
+            try:
+                condensed = self._call_batch_reduce(batch, topic, target_tokens)
+            except Exception as e:
+                logger.warning(
+                    f"Batch reduce {level}-{index} failed for {topic}, "
+                    f"using extractive fallback: {e}"
+                )
+                condensed = self._condense_extractively(batch, target_tokens)
+
+        return {
+            "episode_id": f"reduce-L{level}-{index}",
+            "title": "Combined: " + "; ".join(s["title"] for s in batch),
+            "source": "/".join(sorted({s["source"] for s in batch})),
+            "topic_score": max(s["topic_score"] for s in batch),
+            "summary": condensed,
+            "tokens": count_tokens(condensed),
+            "member_ids": member_ids,
+        }
+
+    def _call_batch_reduce(
+        self, batch: List[Dict], topic: str, target_tokens: int
+    ) -> str:
+        """Condense a batch with the summary model (intermediate reduce call)"""
+        system_prompt = (
+            f"You condense podcast episode summaries about {topic}. "
+            f"Merge them into one summary of at most {target_tokens} tokens. "
+            "Keep concrete facts, names and numbers from every episode and note "
+            "which episode each point came from."
+        )
+        sections = [
+            f"Episode {s['episode_id']}: {s['title']} ({s['source']})\n{s['summary']}"
+            for s in batch
+        ]
+        run_id = generate_idempotency_key(
+            topic, [s["episode_id"] for s in batch], target_tokens
+        )
+
+        result = call_openai_with_backoff(
+            client=self.client,
+            component="reduce",
+            run_id=run_id,
+            idempotency_key=run_id,
+            model=config.GPT5_MODELS["summary"],
+            input=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": "\n\n".join(sections)},
+            ],
+            reasoning={"effort": config.REASONING_EFFORT["summary"]},
+            max_output_tokens=config.OPENAI_TOKENS["summary"],
+            text={"format": get_json_schema("reduce_batch")},
+        )
+        return result.to_json()["summary"].strip()
+
+    def _condense_extractively(self, batch: List[Dict], target_tokens: int) -> str:
+        """Deterministic condensation: trim each member to an equal share of the target"""
+        # Convert the token target to characters at the batch's observed density
+        chars_per_token = sum(len(s["summary"]) for s in batch) / max(
+            1, sum(s["tokens"] for s in batch)
+        )
+        share_chars = int(target_tokens * chars_per_token) // len(batch)
+        parts = []
+        for summary in batch:
+            text = summary["summary"].strip()
+            limit = max(40, share_chars - len(summary["title"]) - 4)
+            if len(text) > limit:
+                text = text[:limit].rsplit(" ", 1)[0] + "..."
+            parts.append(f"{summary['title']}: {text}")
+        return "\n\n".join(parts)
+
+    @tracer.traced("digest.reduce")
     def _generate_final_digest(
         self, episode_summaries: List[Dict], topic: str
     ) -> Optional[str]:
@@ -798,27 +1165,26 @@ Aim for 2000-3000 words in flowing, conversational prose."""
 Create a flowing, conversational digest that synthesizes these insights."""
 
         # Estimate tokens for logging
-        total_tokens = approx_tokens(system_prompt + user_prompt)
+        total_tokens = count_tokens(system_prompt) + count_tokens(user_prompt)
         logger.info(f"Reduce phase prompt: {total_tokens} tokens")
 
         try:
             # Check if feature is enabled
             if not self.feature_enabled:
                 logger.warning("GPT-5 digest generation disabled by feature flag")
-                return False, None, "Feature disabled"
+                return None
 
             # Mock mode handling
             if self.mock_mode:
                 logger.info("🧪 MOCK: Generating mock digest")
-                mock_digest = self._generate_mock_digest(topic, episode_summaries)
-                return True, mock_digest, None
+                return self._generate_mock_digest(topic, episode_summaries)
 
             # Generate run ID for idempotency and observability
             run_id = generate_idempotency_key(topic, str(now_utc()), self.model)
 
             # Call GPT-5 via Responses API with structured output
             logger.info(
-                f"🤖 Generating digest: {topic} ({len(episode_summaries)} summaries, ~{approx_tokens(user_prompt)} tokens)"
+                f"🤖 Generating digest: {topic} ({len(episode_summaries)} summaries, ~{count_tokens(user_prompt)} tokens)"
             )
 
             result = call_openai_with_backoff(
@@ -848,7 +1214,7 @@ Create a flowing, conversational digest that synthesizes these insights."""
             items = digest_data.get("items", [])
             if not items:
                 logger.error(f"❌ No digest items generated for {topic}")
-                return False, None, "No digest items generated"
+                return None
 
             # Format the digest content from structured data
             digest_content = self._format_digest_from_structured_data(
@@ -856,7 +1222,7 @@ Create a flowing, conversational digest that synthesizes these insights."""
             )
 
             logger.info(
-                f"✅ Generated final digest for {topic}: {len(items)} items, {approx_tokens(digest_content)} tokens"
+                f"✅ Generated final digest for {topic}: {len(items)} items, {count_tokens(digest_content)} tokens"
             )
             return digest_content
 
@@ -938,12 +1304,23 @@ Create a flowing, conversational digest that synthesizes these insights."""
                 except Exception as e:
                     logger.error(f"Error moving transcript {transcript_path}: {e}")
 
+    @tracer.traced("digest.all_topics")
     def generate_all_topic_digests(
-        self,
+        self, journal=None
     ) -> Dict[str, Tuple[bool, Optional[str], Optional[str]]]:
-        """Generate digests for all available topics"""
-
-        available_topics = self.get_available_topics()
+        """Generate digests for all available topics
+
+        With a run journal each topic is checkpointed as digest.topic:<topic>;
+        topics a resumed run already finished are reported, not regenerated.
+        """
+        finished = journal.completed_steps("digest.topic:") if journal else {}
+        digest_date = journal.inputs.get("today") if journal else None
+        digest_run = TopicDigestRun(self, digest_date)
+
+        available_topics = sorted(
+            set(digest_run.available_topics())
+            | {step.split(":", 1)[1] for step in finished}
+        )
         if not available_topics:
             logger.warning("No topics with episodes ready for digest")
             return {}
@@ -955,16 +1332,34 @@ Create a flowing, conversational digest that synthesizes these insights."""
 
         results = {}
         for topic in available_topics:
+            step = f"digest.topic:{topic}"
+            if step in finished:
+                path = finished[step]["path"]
+                logger.info(f"⏭️  {topic} digest already completed: {path}")
+                results[topic] = (True, path, None)
+                continue
+
             logger.info(f"\n📝 Processing topic: {topic}")
-            result = self.generate_topic_digest(topic)
+            if journal:
+                journal.step_started(step, {"digest_date": digest_date})
+            result = digest_run.digest(topic)
             results[topic] = result
 
             success, path, error = result
+            if journal:
+                journal.step_finished(
+                    step,
+                    "done" if success else "failed",
+                    {"path": path and str(path)},
+                    error,
+                )
             if success:
                 logger.info(f"✅ {topic} digest completed: {path}")
             else:
                 logger.error(f"❌ {topic} digest failed: {error}")
 
+        digest_run.report()
+
         # Summary
         successful = sum(1 for _, (success, _, _) in results.items() if success)
         logger.info(
@@ -974,7 +1369,7 @@ Create a flowing, conversational digest that synthesizes these insights."""
         return results
 
     def generate_digest(
-        self, topic: str = None
+        self, topic: str = None, journal=None
     ) -> Tuple[bool, Optional[str], Optional[str]]:
         """Generate digest using OpenAI GPT-4 - supports single topic or all topics"""
 
@@ -985,7 +1380,7 @@ Create a flowing, conversational digest that synthesizes these insights."""
         else:
             # Generate all topic digests (new default behavior)
             logger.info("🧠 Starting multi-topic digest generation")
-            results = self.generate_all_topic_digests()
+            results = self.generate_all_topic_digests(journal=journal)
 
             if not results:
                 logger.error("No topics available for digest generation")
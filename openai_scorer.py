@@ -404,7 +404,11 @@ Provide scores as requested in the system prompt."""
             return 0
 
     def score_pending_in_db(
-        self, db_path: str, source: str = "rss", max_to_score: int = None
+        self,
+        db_path: str,
+        source: str = "rss",
+        max_to_score: int = None,
+        stage=None,
     ) -> int:
         """
         Score transcribed episodes idempotently with rate limiting and cost guards
@@ -413,6 +417,7 @@ Provide scores as requested in the system prompt."""
             db_path: Path to database
             source: Source identifier for logging (rss/youtube)
             max_to_score: Maximum number of episodes to score (cost control)
+            stage: Optional utils.scheduler.StageBudget gating each episode
 
         Returns:
             Number of episodes successfully scored
@@ -465,6 +470,9 @@ Provide scores as requested in the system prompt."""
                 f"Found {len(episodes)} unscored episodes in {source} database (limit: {max_to_score})"
             )
 
+            if stage is not None:
+                episodes = stage.order(episodes, key=lambda row: f"{source}:{row[1]}")
+
             for episode_data in episodes:
                 db_id, episode_id, title, transcript_path = episode_data
 
@@ -485,9 +493,15 @@ Provide scores as requested in the system prompt."""
                         logger.debug(f"Transcript too short for scoring: {episode_id}")
                         continue
 
+                    if stage is not None and not stage.admit(f"{source}:{episode_id}"):
+                        continue
+
                     # Score the transcript with OpenAI
                     logger.info(f"Scoring {source} episode: {title[:60]}...")
+                    score_start = time.time()
                     scores = self.score_transcript(transcript_text, episode_id)
+                    if stage is not None:
+                        stage.done(f"{source}:{episode_id}", time.time() - score_start)
 
                     # Idempotent DB update - only updates if still unscored
                     cursor.execute(
@@ -598,14 +612,14 @@ Provide scores as requested in the system prompt."""
 
 # Standalone functions for pipeline integration
 def score_pending_in_db(
-    db_path: str, source: str = "rss", max_to_score: int = None
+    db_path: str, source: str = "rss", max_to_score: int = None, stage=None
 ) -> int:
     """
     Standalone function to score pending transcribed episodes
     Used by daily_podcast_pipeline.py for post-transcription scoring
     """
     scorer = OpenAITopicScorer()
-    return scorer.score_pending_in_db(db_path, source, max_to_score)
+    return scorer.score_pending_in_db(db_path, source, max_to_score, stage=stage)
 
 
 def run_backfill_scoring(
@@ -9,12 +9,14 @@ import json
 import os
 import sqlite3
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from xml.dom import minidom
-from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.etree.ElementTree import Element, SubElement
 
 from utils.datetime_utils import now_utc
 from utils.db import get_connection
+from utils.mp3_info import get_mp3_info
+from utils.rss_feed_builder import IncrementalFeedBuilder
 
 
 class PodcastRSSGenerator:
@@ -58,7 +60,12 @@ class PodcastRSSGenerator:
 
                         if age_days <= days:
                             file_size = file.stat().st_size
-                            duration = self.estimate_duration_from_size(file_size)
+                            info = get_mp3_info(file)
+                            duration = (
+                                int(round(info["duration_seconds"]))
+                                if info
+                                else self.estimate_duration_from_size(file_size)
+                            )
 
                             digests.append(
                                 {
@@ -110,8 +117,14 @@ This episode features cross-episode synthesis with topic-based organization, mul
 
     def generate_rss_xml(self):
         """Generate complete RSS feed XML with iTunes compatibility"""
-        episodes = self.get_recent_episodes()
+        rss = self.generate_channel_xml()
+        channel = rss.find("channel")
+        for episode in self.get_recent_episodes():
+            channel.append(self.generate_item(episode))
+        return rss
 
+    def generate_channel_xml(self):
+        """RSS root and channel metadata, without items"""
         # Create RSS root element
         rss = Element("rss")
         rss.set("version", "2.0")
@@ -173,59 +186,66 @@ This episode features cross-episode synthesis with topic-based organization, mul
             "%a, %d %b %Y %H:%M:%S +0000"
         )
 
-        # Add episodes
-        for episode in episodes:
-            item = SubElement(channel, "item")
-
-            item_title = SubElement(item, "title")
-            item_title.text = episode["title"]
-
-            item_description = SubElement(item, "description")
-            item_description.text = episode["description"]
-
-            item_pub_date = SubElement(item, "pubDate")
-            item_pub_date.text = episode["date"].strftime("%a, %d %b %Y %H:%M:%S +0000")
+        return rss
 
-            # Enclosure (audio file)
-            enclosure = SubElement(item, "enclosure")
-            enclosure.set("url", episode["url"])
-            enclosure.set("type", "audio/mpeg")
-            enclosure.set("length", str(episode["size"]))
+    def generate_item(self, episode):
+        """Build the <item> element for one episode"""
+        item = Element("item")
 
-            # GUID
-            guid = SubElement(item, "guid")
-            guid.text = episode["guid"]
-            guid.set("isPermaLink", "false")
+        item_title = SubElement(item, "title")
+        item_title.text = episode["title"]
 
-            # iTunes episode tags
-            itunes_title = SubElement(item, "itunes:title")
-            itunes_title.text = episode["title"]
+        item_description = SubElement(item, "description")
+        item_description.text = episode["description"]
 
-            itunes_summary = SubElement(item, "itunes:summary")
-            itunes_summary.text = episode["description"]
+        item_pub_date = SubElement(item, "pubDate")
+        item_pub_date.text = episode["date"].strftime("%a, %d %b %Y %H:%M:%S +0000")
 
-            itunes_duration = SubElement(item, "itunes:duration")
-            itunes_duration.text = self.format_duration(episode["duration"])
+        # Enclosure (audio file)
+        enclosure = SubElement(item, "enclosure")
+        enclosure.set("url", episode["url"])
+        enclosure.set("type", "audio/mpeg")
+        enclosure.set("length", str(episode["size"]))
 
-            itunes_episode_type = SubElement(item, "itunes:episodeType")
-            itunes_episode_type.text = "full"
+        # GUID
+        guid = SubElement(item, "guid")
+        guid.text = episode["guid"]
+        guid.set("isPermaLink", "false")
 
-        return rss
+        # iTunes episode tags
+        itunes_title = SubElement(item, "itunes:title")
+        itunes_title.text = episode["title"]
 
-    def generate_feed_file(self, output_path="daily-digest.xml"):
-        """Generate RSS feed file"""
-        rss_xml = self.generate_rss_xml()
+        itunes_summary = SubElement(item, "itunes:summary")
+        itunes_summary.text = episode["description"]
 
-        # Pretty print XML
-        xml_str = minidom.parseString(tostring(rss_xml)).toprettyxml(indent="  ")
+        itunes_duration = SubElement(item, "itunes:duration")
+        itunes_duration.text = self.format_duration(episode["duration"])
 
-        # Remove empty lines
-        xml_lines = [line for line in xml_str.split("\n") if line.strip()]
-        xml_content = "\n".join(xml_lines)
+        itunes_episode_type = SubElement(item, "itunes:episodeType")
+        itunes_episode_type.text = "full"
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(xml_content)
+        return item
 
+    def generate_feed_file(self, output_path="daily-digest.xml"):
+        """Generate RSS feed file, reusing cached fragments for unchanged episodes"""
+        rss_xml = self.generate_channel_xml()
+
+        builder = IncrementalFeedBuilder(output_path)
+        items = []
+        for episode in self.get_recent_episodes():
+            fingerprint = {
+                key: episode[key]
+                for key in ("title", "description", "date", "size", "duration", "url")
+            }
+            items.append(
+                builder.item(
+                    episode["guid"], fingerprint, partial(self.generate_item, episode)
+                )
+            )
+
+        # The channel pubDate is the build time; kept when no item changed
+        builder.write(rss_xml, items, build_date_tag="pubDate")
         return output_path
 
     def validate_feed(self, xml_path):
@@ -10,19 +10,17 @@ import os
 import re
 import sqlite3
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from xml.dom import minidom
-from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.etree.ElementTree import Element, SubElement
 
 from episode_summary_generator import EpisodeSummaryGenerator
 from utils.datetime_utils import now_utc
-from utils.sanitization import (
-    create_topic_mp3_patterns,
-    create_topic_pattern,
-    safe_log_message,
-    sanitize_xml_content,
-)
+from utils.digest_catalog import LEGACY_TOPIC, DigestCatalog
+from utils.mp3_info import get_mp3_info
+from utils.rss_feed_builder import IncrementalFeedBuilder
+from utils.sanitization import safe_log_message, sanitize_xml_content
 
 
 class MultiTopicRSSGenerator:
@@ -30,6 +28,7 @@ class MultiTopicRSSGenerator:
         self.db_path = db_path
         self.base_url = base_url
         self.audio_base_url = f"{base_url}/audio"
+        self.catalog = DigestCatalog("daily_digests")
 
         # Initialize AI summary generator
         self.summary_generator = EpisodeSummaryGenerator()
@@ -151,6 +150,7 @@ class MultiTopicRSSGenerator:
                             episode["topic"], file_date
                         ),
                         "is_enhanced": episode.get("is_enhanced", False),
+                        "duration_seconds": episode.get("duration_seconds"),
                     }
                 )
             except Exception as e:
@@ -176,57 +176,18 @@ class MultiTopicRSSGenerator:
 
         # Track processed files to avoid duplicates
         processed_timestamps = set()
+        entries = self.catalog.entries(
+            since=datetime.fromtimestamp(cutoff_timestamp), require_audio=True
+        )
 
-        # First pass: Process MD files with corresponding MP3s
-        topic_pattern = create_topic_pattern()
-
-        for md_file in digest_dir.glob("*_digest_*.md"):
-            match = topic_pattern.match(md_file.name)
-            if not match:
-                continue
-
-            topic, timestamp_str = match.groups()
-
-            # Check if we have a corresponding MP3 file (prefer enhanced version)
-            mp3_file = digest_dir / f"{topic}_digest_{timestamp_str}_enhanced.mp3"
-            if not mp3_file.exists():
-                mp3_file = digest_dir / f"{topic}_digest_{timestamp_str}.mp3"
-                if not mp3_file.exists():
-                    # Also check for old naming convention
-                    mp3_file = (
-                        digest_dir
-                        / f"complete_topic_digest_{timestamp_str}_enhanced.mp3"
-                    )
-                    if not mp3_file.exists():
-                        mp3_file = (
-                            digest_dir / f"complete_topic_digest_{timestamp_str}.mp3"
-                        )
-                        if not mp3_file.exists():
-                            continue
-
-            # Parse timestamp and filter by date
-            try:
-                file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                if file_date.timestamp() < cutoff_timestamp:
-                    continue
-            except ValueError:
+        # First pass: Process MD files with corresponding MP3s (enhanced preferred)
+        for entry in entries:
+            md_file = entry["md_file"]
+            if not md_file:
                 continue
-
-            # Read content for AI-powered description
-            try:
-                with open(md_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    # Generate AI-powered summary
-                    fallback_desc = self._extract_fallback_description(content, topic)
-                    description = self.summary_generator.generate_summary(
-                        content=content,
-                        topic=topic,
-                        timestamp=timestamp_str,
-                        fallback_desc=fallback_desc,
-                    )
-            except Exception as e:
-                print(f"⚠️ Error reading content for {md_file.name}: {e}")
-                description = f"Daily digest for {self.topic_config.get(topic, {}).get('display_name', topic)}"
+            topic, timestamp_str = entry["topic"], entry["timestamp"]
+            file_date = entry["date"]
+            mp3_file = entry["audio_file"]
 
             digest_files.append(
                 {
@@ -235,53 +196,23 @@ class MultiTopicRSSGenerator:
                     "date": file_date,
                     "md_file": md_file,
                     "mp3_file": mp3_file,
-                    "content": content if "content" in locals() else "",
-                    "description": description,
+                    "duration_seconds": entry["duration_seconds"],
+                    "content": "",
+                    "description": None,  # summarized when the item is rendered
                     "title": self._generate_episode_title(topic, file_date),
                 }
             )
             processed_timestamps.add(timestamp_str)
 
         # Second pass: Process MP3-only files (without MD files)
-        topic_mp3_pattern, legacy_mp3_pattern = create_topic_mp3_patterns()
-        mp3_patterns = [topic_mp3_pattern, legacy_mp3_pattern]
-
-        for mp3_file in digest_dir.glob("*.mp3"):
-            # Prioritize enhanced versions (skip non-enhanced if enhanced exists)
-            if "_enhanced" not in mp3_file.name:
-                # Check if enhanced version exists
-                enhanced_path = mp3_file.parent / (
-                    mp3_file.stem + "_enhanced" + mp3_file.suffix
-                )
-                if enhanced_path.exists():
-                    continue  # Skip non-enhanced if enhanced version exists
-
-            timestamp_str = None
-            topic = "general"  # default topic for complete_topic_digest files
-
-            # Try to match patterns
-            for i, pattern in enumerate(mp3_patterns):
-                match = pattern.match(mp3_file.name)
-                if match:
-                    if i == 0:  # topic_digest pattern
-                        topic, timestamp_str = match.groups()[
-                            :2
-                        ]  # Ignore _enhanced group
-                    else:  # complete_topic_digest pattern
-                        timestamp_str = match.groups()[0]
-                        topic = "general"
-                    break
-
-            if not timestamp_str or timestamp_str in processed_timestamps:
-                continue
-
-            # Parse timestamp and filter by date
-            try:
-                file_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                if file_date.timestamp() < cutoff_timestamp:
-                    continue
-            except ValueError:
+        for entry in entries:
+            if entry["md_file"] or entry["timestamp"] in processed_timestamps:
                 continue
+            timestamp_str = entry["timestamp"]
+            file_date = entry["date"]
+            mp3_file = entry["audio_file"]
+            # default topic for complete_topic_digest files
+            topic = "general" if entry["topic"] == LEGACY_TOPIC else entry["topic"]
 
             # Generate enhanced description for MP3-only files
             topic_info = self.topic_config.get(topic, {})
@@ -298,6 +229,7 @@ class MultiTopicRSSGenerator:
                     "date": file_date,
                     "md_file": None,
                     "mp3_file": mp3_file,
+                    "duration_seconds": entry["duration_seconds"],
                     "content": "",
                     "description": description,
                     "title": self._generate_episode_title(topic, file_date),
@@ -309,6 +241,24 @@ class MultiTopicRSSGenerator:
         digest_files.sort(key=lambda x: x["date"], reverse=True)
         return digest_files
 
+    def _describe_digest(self, digest_info: Dict) -> str:
+        """AI-powered description from the digest markdown"""
+        topic = digest_info["topic"]
+        md_file = digest_info["md_file"]
+        try:
+            with open(md_file, "r", encoding="utf-8") as f:
+                content = f.read()
+            fallback_desc = self._extract_fallback_description(content, topic)
+            return self.summary_generator.generate_summary(
+                content=content,
+                topic=topic,
+                timestamp=digest_info["timestamp"],
+                fallback_desc=fallback_desc,
+            )
+        except Exception as e:
+            print(f"⚠️ Error reading content for {md_file.name}: {e}")
+            return f"Daily digest for {self.topic_config.get(topic, {}).get('display_name', topic)}"
+
     def _extract_fallback_description(self, content: str, topic: str) -> str:
         """Extract a meaningful fallback description from digest content (used when AI generation fails)"""
         # Get first meaningful sentence, limit to ~200 chars
@@ -401,6 +351,16 @@ class MultiTopicRSSGenerator:
 
         return stable_guid
 
+    def _get_duration(self, digest_info: Dict, file_size: int) -> int:
+        """Exact duration in seconds from deploy metadata or the MP3 index"""
+        seconds = digest_info.get("duration_seconds")
+        if seconds is None and digest_info.get("mp3_file"):
+            info = get_mp3_info(digest_info["mp3_file"])
+            seconds = info["duration_seconds"] if info else None
+        if seconds is None:
+            return self._estimate_duration(file_size)
+        return max(1, int(round(seconds)))
+
     def _estimate_duration(self, file_size: int) -> int:
         """Estimate audio duration in seconds from file size (rough approximation)"""
         # Rough estimate: 1MB ≈ 1 minute for speech MP3
@@ -443,6 +403,82 @@ class MultiTopicRSSGenerator:
             )
             return False
 
+    def _item_fingerprint(self, digest_info: Dict) -> Dict:
+        """Cheap inputs an item's XML depends on (fragment cache key)"""
+        fingerprint = {
+            key: digest_info.get(key)
+            for key in (
+                "title",
+                "description",
+                "timestamp",
+                "public_url",
+                "file_size",
+                "duration_seconds",
+            )
+        }
+        fingerprint["audio_base_url"] = self.audio_base_url
+        fingerprint["keywords"] = self.topic_config.get(digest_info["topic"], {}).get(
+            "category"
+        )
+        for key in ("md_file", "mp3_file"):
+            path = digest_info.get(key)
+            if path and Path(path).exists():
+                stat = Path(path).stat()
+                fingerprint[key] = [Path(path).name, stat.st_size, stat.st_mtime_ns]
+        return fingerprint
+
+    def _render_item(self, digest_info: Dict, stable_guid: str) -> Element:
+        """Build the <item> element for one digest"""
+        description = digest_info["description"]
+        if description is None:
+            description = self._describe_digest(digest_info)
+
+        item = Element("item")
+
+        # Basic item info
+        SubElement(item, "title").text = sanitize_xml_content(digest_info["title"])
+        SubElement(item, "description").text = sanitize_xml_content(description)
+
+        # Permalink and stable GUID
+        permalink = f"{self.podcast_info['website']}/{digest_info['timestamp']}"
+        SubElement(item, "link").text = permalink
+        SubElement(item, "guid").text = stable_guid
+
+        # Publication date
+        pub_date = digest_info["date"].replace(tzinfo=timezone.utc)
+        SubElement(item, "pubDate").text = pub_date.strftime("%a, %d %b %Y %H:%M:%S %z")
+
+        # Audio enclosure - use deployment metadata URL if available
+        if "public_url" in digest_info and digest_info["public_url"]:
+            # Use GitHub release URL from deployment metadata
+            audio_url = digest_info["public_url"]
+            file_size = digest_info.get("file_size", 0)
+        else:
+            # Fallback to audio base URL construction
+            file_size = self._get_file_size(digest_info["mp3_file"])
+            audio_url = f"{self.audio_base_url}/{digest_info['mp3_file'].name}"
+
+        enclosure = SubElement(item, "enclosure")
+        enclosure.set("url", audio_url)
+        enclosure.set("length", str(file_size))
+        enclosure.set("type", "audio/mpeg")
+
+        # iTunes episode info
+        SubElement(item, "itunes:title").text = sanitize_xml_content(
+            digest_info["title"]
+        )
+        SubElement(item, "itunes:summary").text = sanitize_xml_content(description)
+        SubElement(item, "itunes:duration").text = str(
+            self._get_duration(digest_info, file_size)
+        )
+
+        # Topic-specific category
+        topic_info = self.topic_config.get(digest_info["topic"], {})
+        if "category" in topic_info:
+            SubElement(item, "itunes:keywords").text = topic_info["category"]
+
+        return item
+
     def generate_rss(self, output_file="daily-digest.xml", max_items=100) -> bool:
         """Generate complete RSS feed with all recent topic-specific episodes"""
         try:
@@ -515,87 +551,31 @@ class MultiTopicRSSGenerator:
             SubElement(channel, "itunes:category", text=self.podcast_info["category"])
             SubElement(channel, "itunes:explicit").text = "no"
 
-            # Add items for each digest file (with validation)
-            items_added = 0
+            # Add items for each digest file (with validation); unchanged items
+            # come straight from the fragment cache
+            builder = IncrementalFeedBuilder(output_file)
+            items = []
             for digest_info in digest_files:
                 # Skip items with invalid MP3s
                 if not self._validate_mp3_file(digest_info):
                     continue
 
-                item = SubElement(channel, "item")
-
-                # Basic item info
-                SubElement(item, "title").text = sanitize_xml_content(
-                    digest_info["title"]
-                )
-                SubElement(item, "description").text = sanitize_xml_content(
-                    digest_info["description"]
-                )
-
-                # Generate permalink and stable GUID
-                permalink = f"{self.podcast_info['website']}/{digest_info['timestamp']}"
                 stable_guid = self._generate_stable_guid(
                     digest_info["topic"], digest_info["timestamp"], digest_info["date"]
                 )
-
-                SubElement(item, "link").text = permalink
-                SubElement(item, "guid").text = stable_guid
-
-                # Publication date
-                pub_date = digest_info["date"].replace(tzinfo=timezone.utc)
-                SubElement(item, "pubDate").text = pub_date.strftime(
-                    "%a, %d %b %Y %H:%M:%S %z"
-                )
-
-                # Audio enclosure - use deployment metadata URL if available
-                if "public_url" in digest_info and digest_info["public_url"]:
-                    # Use GitHub release URL from deployment metadata
-                    audio_url = digest_info["public_url"]
-                    file_size = digest_info.get("file_size", 0)
-                else:
-                    # Fallback to audio base URL construction
-                    file_size = self._get_file_size(digest_info["mp3_file"])
-                    audio_url = f"{self.audio_base_url}/{digest_info['mp3_file'].name}"
-
-                enclosure = SubElement(item, "enclosure")
-                enclosure.set("url", audio_url)
-                enclosure.set("length", str(file_size))
-                enclosure.set("type", "audio/mpeg")
-
-                items_added += 1
-
-                # iTunes episode info
-                SubElement(item, "itunes:title").text = sanitize_xml_content(
-                    digest_info["title"]
-                )
-                SubElement(item, "itunes:summary").text = sanitize_xml_content(
-                    digest_info["description"]
+                item = builder.item(
+                    stable_guid,
+                    self._item_fingerprint(digest_info),
+                    partial(self._render_item, digest_info, stable_guid),
                 )
-                SubElement(item, "itunes:duration").text = str(
-                    self._estimate_duration(file_size)
-                )
-
-                # Topic-specific category
-                topic_info = self.topic_config.get(digest_info["topic"], {})
-                if "category" in topic_info:
-                    SubElement(item, "itunes:keywords").text = topic_info["category"]
-
-            # Pretty-print XML
-            rough_string = tostring(rss, "utf-8")
-            reparsed = minidom.parseString(rough_string)
-            pretty_xml = reparsed.toprettyxml(indent="  ")
-
-            # Remove extra blank lines
-            pretty_xml = "\n".join(
-                [line for line in pretty_xml.split("\n") if line.strip()]
-            )
-
-            # Write to file
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(pretty_xml)
+                if item:
+                    items.append(item)
 
+            builder.write(rss, items)
+            counts = builder.stats
             print(
-                f"✅ RSS feed generated: {output_file} with {items_added} valid items"
+                f"✅ RSS feed generated: {output_file} with {len(items)} valid items "
+                f"({counts['rendered']} rendered, {counts['reused']} cached)"
             )
 
             # Show summary generation statistics
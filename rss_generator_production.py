@@ -16,6 +16,7 @@ import re
 import sqlite3
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -27,11 +28,10 @@ from config.production import (
     production_config,
 )
 from utils.db import get_connection
-from utils.sanitization import (
-    create_topic_file_pattern,
-    sanitize_filename,
-    sanitize_xml_content,
-)
+from utils.digest_catalog import DigestCatalog
+from utils.mp3_info import get_mp3_info
+from utils.rss_feed_builder import IncrementalFeedBuilder
+from utils.sanitization import sanitize_filename, sanitize_xml_content
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +49,7 @@ class ProductionRSSGenerator:
     def __init__(self, db_path: str = "podcast_monitor.db"):
         self.db_path = db_path
         self.config = production_config
+        self.catalog = DigestCatalog("daily_digests")
 
         # Initialize episode summary generator if available
         if EpisodeSummaryGenerator:
@@ -81,24 +82,24 @@ class ProductionRSSGenerator:
             # Add channel metadata
             self._add_channel_metadata(channel)
 
-            # Add episodes to RSS
-            episodes_added = 0
+            # Add episodes to RSS; unchanged items come from the fragment cache
+            builder = IncrementalFeedBuilder(output_file)
+            items = []
             for episode_info in digest_episodes:
-                try:
-                    if self._add_episode_to_rss(channel, episode_info):
-                        episodes_added += 1
-                except Exception as e:
-                    logger.error(
-                        f"❌ Failed to add episode {episode_info.get('topic', 'unknown')}: {e}"
-                    )
-                    continue
+                item = builder.item(
+                    episode_info["guid"],
+                    self._episode_fingerprint(episode_info),
+                    partial(self._render_episode_item, episode_info),
+                )
+                if item:
+                    items.append(item)
 
-            if episodes_added == 0:
+            if not items:
                 logger.error("❌ No episodes successfully added to RSS feed")
                 return False
 
             # Write RSS file atomically
-            return self._write_rss_file(rss_root, output_file)
+            return self._write_rss_file(builder, rss_root, items)
 
         except Exception as e:
             logger.error(f"❌ RSS generation failed: {e}")
@@ -115,30 +116,22 @@ class ProductionRSSGenerator:
             logger.warning("⚠️ daily_digests directory not found")
             return []
 
-        # Get all digest files (both .md and .mp3)
+        # Digest files (.md, .mp3, .json) from the artifact catalog, last 30 days
+        cutoff_date = get_utc_now() - timedelta(days=30)
         digest_files = {}
-        for file_path in daily_digests_dir.iterdir():
-            if file_path.is_file():
-                # Extract topic and timestamp from filename
-                topic_file_pattern = create_topic_file_pattern()
-                match = topic_file_pattern.match(file_path.name)
-                if match:
-                    topic, timestamp_str, file_type = match.groups()
-
-                    # Create unique key for this digest
-                    digest_key = f"{topic}_{timestamp_str}"
-
-                    if digest_key not in digest_files:
-                        digest_files[digest_key] = {
-                            "topic": topic.replace("_", " ").title(),
-                            "timestamp": timestamp_str,
-                            "files": {},
-                        }
-
-                    digest_files[digest_key]["files"][file_type] = file_path
-
-        # Process digest files and create episode info
-        cutoff_date = get_utc_now() - timedelta(days=30)  # Last 30 days
+        for entry in self.catalog.entries(since=cutoff_date.replace(tzinfo=None)):
+            files = {
+                "md": entry["md_file"],
+                "mp3": entry["mp3_file"],
+                "json": entry["metadata_file"],
+            }
+            if not any(files.values()):
+                continue  # only a TTS script or enhanced MP3 so far
+            digest_files[entry["file_key"]] = {
+                "topic": entry["topic"].replace("_", " ").title(),
+                "timestamp": entry["timestamp"],
+                "files": {kind: path for kind, path in files.items() if path},
+            }
 
         for digest_key, digest_data in digest_files.items():
             try:
@@ -170,9 +163,6 @@ class ProductionRSSGenerator:
                     digest_data["topic"], episode_ids, file_date
                 )
 
-                # Generate episode summary
-                episode_summary = self._generate_episode_summary(digest_data, mp3_file)
-
                 # Create episode info
                 episode_info = {
                     "topic": digest_data["topic"],
@@ -184,10 +174,11 @@ class ProductionRSSGenerator:
                     "title": self._generate_episode_title(
                         digest_data["topic"], file_date
                     ),
-                    "description": episode_summary,
+                    "description": None,  # summarized when the item is rendered
+                    "digest_data": digest_data,
                     "link": self.config.get_episode_link(digest_data["timestamp"]),
                     "audio_url": self.config.get_audio_url(mp3_file.name),
-                    "duration": self._estimate_duration(file_size),
+                    "duration": self._get_duration(mp3_file, file_size),
                     "keywords": self._get_episode_keywords(digest_data["topic"]),
                 }
 
@@ -312,13 +303,40 @@ class ProductionRSSGenerator:
         atom_link.set("type", "application/rss+xml")
         atom_link.set("href", channel_info["feed_url"])
 
-    def _add_episode_to_rss(
-        self, channel: ET.Element, episode_info: Dict[str, Any]
-    ) -> bool:
-        """Add single episode to RSS feed"""
+    def _episode_fingerprint(self, episode_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Cheap inputs an episode's <item> depends on (fragment cache key)"""
+        fingerprint = {
+            key: episode_info[key]
+            for key in (
+                "title",
+                "timestamp",
+                "link",
+                "audio_url",
+                "file_size",
+                "duration",
+                "keywords",
+            )
+        }
+        md_file = episode_info["digest_data"]["files"].get("md")
+        if md_file and md_file.exists():
+            stat = md_file.stat()
+            fingerprint["md_file"] = [md_file.name, stat.st_size, stat.st_mtime_ns]
+        fingerprint["max_description"] = self.config.MAX_XML_CONTENT_LENGTH
+        return fingerprint
+
+    def _render_episode_item(
+        self, episode_info: Dict[str, Any]
+    ) -> Optional[ET.Element]:
+        """Build the <item> element for a single episode"""
 
         try:
-            item = ET.SubElement(channel, "item")
+            description = episode_info["description"]
+            if description is None:
+                description = self._generate_episode_summary(
+                    episode_info["digest_data"], episode_info["mp3_file"]
+                )
+
+            item = ET.Element("item")
 
             # Title with XML safety
             title_text = sanitize_xml_content(episode_info["title"])
@@ -326,7 +344,7 @@ class ProductionRSSGenerator:
 
             # Description with length limits
             description_text = sanitize_xml_content(
-                episode_info["description"][: self.config.MAX_XML_CONTENT_LENGTH]
+                description[: self.config.MAX_XML_CONTENT_LENGTH]
             )
             ET.SubElement(item, "description").text = description_text
 
@@ -361,11 +379,11 @@ class ProductionRSSGenerator:
                 item, "{http://www.itunes.com/dtds/podcast-1.0.dtd}keywords"
             ).text = episode_info["keywords"]
 
-            return True
+            return item
 
         except Exception as e:
             logger.error(f"❌ Error adding episode to RSS: {e}")
-            return False
+            return None
 
     def _generate_episode_title(self, topic: str, date: datetime) -> str:
         """Generate episode title with weekday awareness"""
@@ -401,6 +419,13 @@ class ProductionRSSGenerator:
         # Fallback to generic summary
         return f"In this episode, we explore {digest_data['topic'].lower()} including key developments, insights, and analysis from leading voices in the field."
 
+    def _get_duration(self, mp3_file: Path, file_size: int) -> int:
+        """Exact duration in seconds from MP3 headers, estimated if unparseable"""
+        info = get_mp3_info(mp3_file)
+        if info:
+            return max(1, int(round(info["duration_seconds"])))
+        return self._estimate_duration(file_size)
+
     def _estimate_duration(self, file_size: int) -> int:
         """Estimate audio duration from file size"""
 
@@ -422,52 +447,25 @@ class ProductionRSSGenerator:
 
         return keyword_map.get(topic, "Technology/General")
 
-    def _write_rss_file(self, rss_root: ET.Element, output_file: str) -> bool:
-        """Write RSS file atomically"""
+    def _write_rss_file(
+        self, builder: IncrementalFeedBuilder, rss_root: ET.Element, items: List[str]
+    ) -> bool:
+        """Write RSS file atomically (kept as-is when nothing changed)"""
 
         try:
-            # Create temporary file first
-            temp_file = f"{output_file}.tmp"
-
-            # Format XML with proper indentation
-            self._indent_xml(rss_root)
-
-            # Create XML tree and write to temp file
-            tree = ET.ElementTree(rss_root)
-            tree.write(temp_file, encoding="utf-8", xml_declaration=True)
-
-            # Atomic move to final location
-            Path(temp_file).rename(output_file)
-
-            logger.info(f"✅ RSS feed generated: {output_file}")
+            builder.write(rss_root, items)
+            logger.info(f"✅ RSS feed generated: {builder.output_file}")
             return True
 
         except Exception as e:
             logger.error(f"❌ Failed to write RSS file: {e}")
             # Clean up temp file
             try:
-                Path(f"{output_file}.tmp").unlink(missing_ok=True)
+                Path(f"{builder.output_file}.tmp").unlink(missing_ok=True)
             except:
                 pass
             return False
 
-    def _indent_xml(self, elem: ET.Element, level: int = 0):
-        """Add proper indentation to XML"""
-
-        indent = "  " * level
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = f"\n{indent}  "
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = f"\n{indent}"
-            for subelem in elem:
-                self._indent_xml(subelem, level + 1)
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = f"\n{indent}"
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = f"\n{indent}"
-
 
 def main():
     """Test RSS generation"""
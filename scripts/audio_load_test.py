@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Audio Endpoint Load Test
+Serves daily_digests/ through the audio endpoint handler on a local port (or
+targets --url) and measures time-to-first-byte and throughput for full
+downloads and seek-style Range requests from concurrent clients.
+
+    python scripts/audio_load_test.py --clients 8 --requests 50
+    python scripts/audio_load_test.py --url http://localhost:3000/audio --range 0-65535
+"""
+
+import argparse
+import http.client
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlsplit
+
+AUDIO_MODULE = Path(__file__).parent.parent / "api" / "audio" / "[episode].py"
+
+
+def start_local_server(audio_dir: str) -> ThreadingHTTPServer:
+    """Run the Vercel audio handler in-process against audio_dir"""
+    spec = importlib.util.spec_from_file_location("audio_api", AUDIO_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.AUDIO_DIR = audio_dir
+
+    class QuietHandler(module.handler):
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), QuietHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def timed_request(base_url: str, filename: str, byte_range: Optional[str]) -> Dict:
+    """One GET: status, bytes received, time to first byte and total time"""
+    parts = urlsplit(base_url)
+    conn_class = (
+        http.client.HTTPSConnection
+        if parts.scheme == "https"
+        else http.client.HTTPConnection
+    )
+    conn = conn_class(parts.netloc, timeout=60)
+    headers = {"Range": f"bytes={byte_range}"} if byte_range else {}
+    started = time.perf_counter()
+    try:
+        conn.request("GET", f"{parts.path}/{quote(filename)}", headers=headers)
+        response = conn.getresponse()
+        first = response.read(1)
+        ttfb = time.perf_counter() - started
+        received = len(first)
+        while True:
+            chunk = response.read(256 * 1024)
+            if not chunk:
+                break
+            received += len(chunk)
+        return {
+            "status": response.status,
+            "bytes": received,
+            "ttfb": ttfb,
+            "elapsed": time.perf_counter() - started,
+        }
+    finally:
+        conn.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(label: str, results: List[Dict], wall_time: float):
+    statuses = {}
+    for result in results:
+        statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+    ttfb_ms = [result["ttfb"] * 1000 for result in results]
+    total_bytes = sum(result["bytes"] for result in results)
+
+    print(f"\n{label}: {len(results)} requests in {wall_time:.2f}s")
+    print(f"  Status codes: {statuses}")
+    print(
+        f"  TTFB ms: p50={statistics.median(ttfb_ms):.1f} "
+        f"p95={percentile(ttfb_ms, 95):.1f} max={max(ttfb_ms):.1f}"
+    )
+    print(
+        f"  Throughput: {total_bytes / wall_time / 1024 / 1024:.1f} MiB/s, "
+        f"{len(results) / wall_time:.1f} req/s"
+    )
+
+
+def run(base_url: str, files: List[str], args) -> List[Dict]:
+    def one(_):
+        filename = random.choice(files)
+        byte_range = args.range
+        if args.random_seek:
+            size = os.path.getsize(os.path.join(args.audio_dir, filename))
+            start = random.randrange(max(1, size - args.seek_bytes))
+            byte_range = f"{start}-{start + args.seek_bytes - 1}"
+        return timed_request(base_url, filename, byte_range)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    label = "Random seeks" if args.random_seek else f"Range {args.range or 'full'}"
+    report(label, results, time.perf_counter() - started)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the audio endpoint")
+    parser.add_argument("--url", help="Endpoint base URL (default: local server)")
+    parser.add_argument("--audio-dir", default="daily_digests")
+    parser.add_argument("--files", nargs="*", help="Episode filenames to request")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--range", help="Byte range for every request, e.g. 0-65535")
+    parser.add_argument(
+        "--random-seek", action="store_true", help="Random Range per request"
+    )
+    parser.add_argument("--seek-bytes", type=int, default=256 * 1024)
+    args = parser.parse_args()
+
+    files = args.files or sorted(
+        name for name in os.listdir(args.audio_dir) if name.endswith(".mp3")
+    )
+    if not files:
+        print(f"❌ No MP3 files found in {args.audio_dir}")
+        return 1
+    if args.random_seek and args.url and not args.files:
+        print("❌ --random-seek against --url needs local copies in --audio-dir")
+        return 1
+
+    httpd = None
+    base_url = args.url
+    if not base_url:
+        httpd = start_local_server(args.audio_dir)
+        base_url = f"http://127.0.0.1:{httpd.server_address[1]}/audio"
+    print(f"🎧 {base_url}: {len(files)} files, {args.clients} clients")
+
+    try:
+        results = run(base_url, files, args)
+    finally:
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
+
+    return 0 if all(result["status"] in (200, 206) for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
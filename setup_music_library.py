@@ -72,6 +72,11 @@ def setup_static_music_library():
                     logger.info(f"  ✅ {music_type.capitalize()}: Ready")
                 else:
                     logger.warning(f"  ❌ {music_type.capitalize()}: Failed")
+
+            # Decode intro/outro/transitions once so episode mixes read PCM
+            pcm_assets = integrator.prepare_topic_assets(topic)
+            decoded = sum(1 for path in pcm_assets.values() if path)
+            logger.info(f"  🎼 PCM assets: {decoded}/{len(pcm_assets)} in bank")
         else:
             logger.error(f"  ❌ Failed to generate master music for {topic}")
 
@@ -7,13 +7,20 @@ Tracks per-topic metrics, token usage, retry counts, and operational statistics
 import json
 import logging
 import os
+import shutil
+import threading
 import time
-from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Final, List, Optional
 
 from utils.datetime_utils import now_utc
+from utils.metrics import MetricsRegistry
+from utils.telemetry_store import TelemetryStore, days_ago
+from utils.tracing import Tracer
+from utils.tracing import tracer as default_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +29,22 @@ SUFFIX_TO_KIND: Final[Dict[str, str]] = {
     ".count": "counter",
     ".ms": "histogram",
     ".seconds": "histogram",
+    ".ratio": "histogram",
     ".gauge": "gauge",
     "_total": "counter",
     "_duration": "histogram",
 }
 
 
+@lru_cache(maxsize=1024)
+def _metric_kind(name: str) -> str:
+    """Metric kind from the name suffix (counter when none matches)"""
+    for suffix, kind in SUFFIX_TO_KIND.items():
+        if name.endswith(suffix):
+            return kind
+    return "counter"
+
+
 @dataclass
 class TopicMetrics:
     """Per-topic operational metrics"""
@@ -67,12 +84,26 @@ class RunMetrics:
     total_cost_estimate: float
     errors: List[str]
     warnings: List[str]
+    map_sharing: Dict[str, Any] = field(default_factory=dict)
+    token_calibration: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    tts_usage: Dict[str, int] = field(default_factory=dict)
+    mastering: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    audio_production: Dict[str, Any] = field(default_factory=dict)
+    metrics: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 class TelemetryManager:
     """Centralized telemetry collection and persistence"""
 
-    def __init__(self, telemetry_dir: str = "telemetry", retention_days: int = 14):
+    def __init__(
+        self,
+        telemetry_dir: str = "telemetry",
+        retention_days: int = 14,
+        metrics_enabled: Optional[bool] = None,
+        metrics_export_path: Optional[str] = None,
+        tracer: Optional[Tracer] = None,
+        history_days: Optional[int] = None,
+    ):
         self.telemetry_dir = Path(telemetry_dir)
         self.telemetry_dir.mkdir(exist_ok=True)
 
@@ -80,8 +111,38 @@ class TelemetryManager:
         self.map_summaries_dir = self.telemetry_dir / "map_summaries"
         self.map_summaries_dir.mkdir(exist_ok=True)
 
+        # Chrome-trace files of each run's spans, same retention as run files
+        self.traces_dir = self.telemetry_dir / "traces"
+        self.tracer = tracer or default_tracer
+
+        # utils.profiling output, one directory per profiled run
+        self.profiles_dir = self.telemetry_dir / "profiles"
+
         self.retention_days = retention_days
+
+        # Indexed run history for reports and trend queries; it outlives the
+        # per-run JSON files (retention_days) so trends span months
+        self.store = TelemetryStore(self.telemetry_dir / "telemetry.db")
+        self.history_days = history_days or int(
+            os.getenv("TELEMETRY_HISTORY_DAYS", "365")
+        )
+        self._history_synced = False
         self.current_run_id = self._generate_run_id()
+        self._lock = threading.Lock()
+
+        # In-process aggregation of record_metric() and friends; prefixes in
+        # TELEMETRY_METRICS_DISABLED (comma separated) are dropped at the door
+        if metrics_enabled is None:
+            metrics_enabled = os.getenv("TELEMETRY_METRICS", "1") == "1"
+        self.metrics = MetricsRegistry(
+            enabled=metrics_enabled,
+            disabled=os.getenv("TELEMETRY_METRICS_DISABLED", "").split(","),
+        )
+        self.metrics_export_path = Path(
+            metrics_export_path
+            or os.getenv("TELEMETRY_METRICS_EXPORT")
+            or self.telemetry_dir / "metrics.prom"
+        )
 
         # Initialize current run metrics
         self.current_run = RunMetrics(
@@ -108,6 +169,16 @@ class TelemetryManager:
         """Generate unique run identifier"""
         return f"run_{now_utc().strftime('%Y%m%d_%H%M%S')}"
 
+    def resume_run(self, run_id: str):
+        """Continue an interrupted run under its original run ID
+
+        The resumed attempt's run file, trace and history row replace the
+        interrupted attempt's.
+        """
+        self.current_run_id = run_id
+        self.current_run.run_id = run_id
+        logger.info(f"📊 Telemetry resuming Run ID: {run_id}")
+
     def set_pipeline_type(self, pipeline_type: str):
         """Set the type of pipeline run (daily/weekly/catchup)"""
         self.current_run.pipeline_type = pipeline_type
@@ -189,6 +260,77 @@ class TelemetryManager:
         if error_message:
             logger.info(f"    Error: {error_message}")
 
+    def record_map_sharing(
+        self,
+        episodes_mapped: int,
+        episodes_reused: int,
+        tokens_saved: int,
+        seconds_saved: float,
+    ):
+        """Record map-phase work avoided by sharing episode summaries across topics"""
+        sharing = self.current_run.map_sharing
+        sharing["episodes_mapped"] = sharing.get("episodes_mapped", 0) + episodes_mapped
+        sharing["episodes_reused"] = sharing.get("episodes_reused", 0) + episodes_reused
+        sharing["tokens_saved"] = sharing.get("tokens_saved", 0) + tokens_saved
+        sharing["seconds_saved"] = round(
+            sharing.get("seconds_saved", 0.0) + seconds_saved, 1
+        )
+
+    def record_token_estimate(self, component: str, estimated: int, actual: int):
+        """Record estimated vs actual tokens_in for one OpenAI call (calibration)"""
+        with self._lock:
+            calibration = self.current_run.token_calibration.setdefault(
+                component,
+                {"calls": 0, "estimated_tokens_in": 0, "actual_tokens_in": 0},
+            )
+            calibration["calls"] += 1
+            calibration["estimated_tokens_in"] += estimated
+            calibration["actual_tokens_in"] += actual
+            calibration["ratio"] = round(
+                calibration["actual_tokens_in"]
+                / max(1, calibration["estimated_tokens_in"]),
+                3,
+            )
+
+    def record_tts_usage(self, hit_characters: int, billed_characters: int):
+        """Record TTS characters served from the segment cache vs billed ones"""
+        with self._lock:
+            usage = self.current_run.tts_usage
+            usage["hit_characters"] = usage.get("hit_characters", 0) + hit_characters
+            usage["billed_characters"] = (
+                usage.get("billed_characters", 0) + billed_characters
+            )
+
+    def record_mastering(
+        self,
+        episode: str,
+        mastering_ms: int,
+        integrated_lufs: Optional[float] = None,
+        mastered: bool = True,
+    ):
+        """Record mastering wall time and integrated loudness for one episode"""
+        with self._lock:
+            self.current_run.mastering[episode] = {
+                "mastered": mastered,
+                "mastering_ms": mastering_ms,
+                "integrated_lufs": integrated_lufs,
+            }
+
+    def record_audio_production(self, latencies: Dict[str, float], wall_seconds: float):
+        """Record per-topic audio production latency and the stage wall time"""
+        with self._lock:
+            production = self.current_run.audio_production
+            production.setdefault("topic_seconds", {}).update(
+                {name: round(latency, 2) for name, latency in latencies.items()}
+            )
+            production["wall_seconds"] = round(
+                production.get("wall_seconds", 0.0) + wall_seconds, 2
+            )
+        for name, latency in latencies.items():
+            self.record_histogram(
+                "audio.production.seconds", latency, labels={"episode": name}
+            )
+
     def record_processing_stats(
         self,
         transcribed: int = 0,
@@ -228,21 +370,25 @@ class TelemetryManager:
             record_metric('openai.tokens.count', 500, component='scorer')
             record_metric('processing.duration.ms', 1500, stage='transcription')
         """
-        # Detect metric type from suffix
-        metric_kind = "counter"  # default
-        for suffix, kind in SUFFIX_TO_KIND.items():
-            if name.endswith(suffix):
-                metric_kind = kind
-                break
+        # Update internal counters for backward compatibility
+        self._update_run_metrics(name, value)
 
-        # Add run_id to labels
-        labels["run_id"] = self.current_run_id
+        if not self.metrics.is_enabled(name):
+            return
 
-        # Emit structured metric log
-        self._emit_metric(metric_kind, name, value, labels)
+        # Detect metric type from suffix
+        metric_kind = _metric_kind(name)
+        if metric_kind == "histogram":
+            self.metrics.observe(name, value, labels)
+        elif metric_kind == "gauge":
+            self.metrics.set(name, value, labels)
+        else:
+            self.metrics.inc(name, value, labels)
 
-        # Update internal counters for backward compatibility
-        self._update_run_metrics(name, value)
+        # Structured log only when someone is listening at DEBUG
+        if logger.isEnabledFor(logging.DEBUG):
+            labels["run_id"] = self.current_run_id
+            self._emit_metric(metric_kind, name, value, labels)
 
     def _emit_metric(
         self, kind: str, name: str, value: float, labels: Dict[str, str]
@@ -306,8 +452,9 @@ class TelemetryManager:
         self, name: str, value: float, labels: Optional[Dict[str, str]] = None
     ) -> None:
         """Record a histogram metric (for distributions like latency)"""
+        units = (".ms", ".seconds", ".ratio")
         self.record_metric(
-            f"{name}.ms" if not name.endswith((".ms", ".seconds")) else name,
+            f"{name}.ms" if not name.endswith(units) else name,
             value,
             **(labels or {}),
         )
@@ -316,29 +463,22 @@ class TelemetryManager:
         self, episode_id: str, topic: str, summary_content: str, token_count: int
     ):
         """Save episode map summary for 14-day retention"""
-        summary_data = {
-            "episode_id": episode_id,
-            "topic": topic,
-            "timestamp": now_utc().isoformat(),
-            "summary": summary_content,
-            "token_count": token_count,
-            "run_id": self.current_run_id,
-        }
-
-        # Save with timestamp for retention management
-        timestamp = now_utc().strftime("%Y%m%d_%H%M%S")
-        summary_file = self.map_summaries_dir / f"{episode_id}_{topic}_{timestamp}.json"
-
         try:
-            with open(summary_file, "w") as f:
-                json.dump(summary_data, f, indent=2)
-            logger.debug(f"📊 Saved map summary: {summary_file.name}")
+            self.store.record_map_summary(
+                episode_id,
+                topic,
+                summary_content,
+                token_count,
+                run_id=self.current_run_id,
+            )
+            logger.debug(f"📊 Saved map summary: {episode_id} / {topic}")
         except Exception as e:
             logger.error(f"Failed to save map summary for {episode_id}: {e}")
 
     def finalize_run(self, total_time: float):
         """Finalize and save the current run metrics"""
         self.current_run.total_processing_time = total_time
+        self.current_run.metrics = self.metrics.snapshot()
 
         # Save run telemetry
         telemetry_file = self.telemetry_dir / f"{self.current_run_id}.json"
@@ -350,12 +490,57 @@ class TelemetryManager:
             logger.info(f"📊 Run telemetry saved: {telemetry_file}")
             self._log_run_summary()
 
+            if self.metrics.enabled:
+                self.metrics.export_prometheus(self.metrics_export_path)
+                logger.info(f"📊 Metrics exported: {self.metrics_export_path}")
+
+            self._record_history()
+            self._export_trace()
+
             # Clean up old telemetry files
             self._cleanup_old_telemetry()
 
         except Exception as e:
             logger.error(f"Failed to save run telemetry: {e}")
 
+    def _record_history(self):
+        """Append the run (and its per-stage span totals) to the history store"""
+        try:
+            self.store.record_run(
+                asdict(self.current_run), stages=self.tracer.summary(limit=None)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️  Could not record run history: {e}")
+
+    def history(self) -> TelemetryStore:
+        """The history store, with any JSON-only runs imported first"""
+        if not self._history_synced:
+            self._history_synced = True
+            try:
+                self.store.migrate_json(self.telemetry_dir)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not import JSON telemetry: {e}")
+        return self.store
+
+    def _export_trace(self):
+        """Write the run's spans as a Chrome trace and start a fresh trace"""
+        if not self.tracer.spans:
+            return
+        trace_file = self.tracer.export_chrome_trace(
+            self.traces_dir / f"{self.current_run_id}.json",
+            metadata={
+                "run_id": self.current_run_id,
+                "pipeline_type": self.current_run.pipeline_type,
+            },
+        )
+        logger.info(f"📊 Trace saved: {trace_file} (open in ui.perfetto.dev)")
+        for entry in self.tracer.summary(limit=5):
+            logger.info(
+                f"    {entry['name']}: {entry['total_ms'] / 1000:.1f}s "
+                f"over {entry['count']} spans"
+            )
+        self.tracer.reset()
+
     def _log_run_summary(self):
         """Log comprehensive run summary"""
         run = self.current_run
@@ -376,6 +561,52 @@ class TelemetryManager:
                 f"  {status} {topic_metrics.topic}: {topic_metrics.selected_count}/{topic_metrics.total_candidates} episodes, {topic_metrics.total_tokens} tokens"
             )
 
+        if run.map_sharing:
+            logger.info(
+                f"Map sharing: {run.map_sharing.get('episodes_reused', 0)} episodes reused, "
+                f"~{run.map_sharing.get('tokens_saved', 0):,} tokens and "
+                f"{run.map_sharing.get('seconds_saved', 0.0)}s saved"
+            )
+
+        for component, calibration in sorted(run.token_calibration.items()):
+            logger.info(
+                f"Token estimate {component}: {calibration['calls']} calls, "
+                f"actual/estimated tokens_in = {calibration['ratio']:.3f}"
+            )
+
+        if run.tts_usage:
+            logger.info(
+                f"TTS characters: {run.tts_usage.get('hit_characters', 0):,} cached, "
+                f"{run.tts_usage.get('billed_characters', 0):,} billed"
+            )
+
+        if run.audio_production:
+            topic_seconds = run.audio_production["topic_seconds"]
+            logger.info(
+                f"Audio production: {run.audio_production['wall_seconds']:.1f}s wall, "
+                f"slowest {max(topic_seconds.values(), default=0):.1f}s, "
+                f"sum {sum(topic_seconds.values()):.1f}s "
+                f"over {len(topic_seconds)} episodes"
+            )
+
+        for episode, mastering in sorted(run.mastering.items()):
+            if not mastering["mastered"]:
+                loudness = "unmastered"
+            elif mastering["integrated_lufs"] is None:
+                loudness = "loudness n/a"
+            else:
+                loudness = f"{mastering['integrated_lufs']:.1f} LUFS"
+            logger.info(
+                f"Mastering {episode}: {mastering['mastering_ms']}ms, {loudness}"
+            )
+
+        for series, histogram in sorted(run.metrics.get("histograms", {}).items()):
+            if histogram["count"]:
+                logger.info(
+                    f"{series}: n={histogram['count']} p50={histogram['p50']} "
+                    f"p95={histogram['p95']} p99={histogram['p99']}"
+                )
+
         logger.info(f"API calls: {run.total_api_calls}")
         logger.info(f"Total tokens: {run.total_tokens_used:,}")
         logger.info(f"Estimated cost: ${run.total_cost_estimate:.4f}")
@@ -396,7 +627,10 @@ class TelemetryManager:
 
     def _cleanup_old_telemetry(self):
         """Clean up old telemetry files and map summaries"""
-        cutoff_date = now_utc() - timedelta(days=self.retention_days)
+        # File names carry naive UTC timestamps
+        cutoff_date = (now_utc() - timedelta(days=self.retention_days)).replace(
+            tzinfo=None
+        )
 
         # Clean up main telemetry files
         removed_count = 0
@@ -416,6 +650,25 @@ class TelemetryManager:
             except (ValueError, IndexError) as e:
                 logger.warning(f"Could not parse date from {telemetry_file}: {e}")
 
+        for trace_file in self.traces_dir.glob("run_*.json"):
+            try:
+                file_date = datetime.strptime(trace_file.stem[4:], "%Y%m%d_%H%M%S")
+                if file_date < cutoff_date:
+                    trace_file.unlink()
+                    removed_count += 1
+            except ValueError as e:
+                logger.warning(f"Could not parse date from {trace_file}: {e}")
+
+        # Profile directories are named run_<YYYYmmdd_HHMMSS>_<entry>
+        for profile_dir in self.profiles_dir.glob("run_*"):
+            try:
+                file_date = datetime.strptime(profile_dir.name[4:19], "%Y%m%d_%H%M%S")
+                if profile_dir.is_dir() and file_date < cutoff_date:
+                    shutil.rmtree(profile_dir)
+                    removed_count += 1
+            except (ValueError, OSError) as e:
+                logger.warning(f"Could not clean up {profile_dir}: {e}")
+
         # Clean up map summaries
         map_removed_count = 0
         for summary_file in self.map_summaries_dir.glob("*.json"):
@@ -432,51 +685,40 @@ class TelemetryManager:
             except (ValueError, IndexError) as e:
                 logger.warning(f"Could not parse date from {summary_file}: {e}")
 
+        try:
+            map_removed_count += self.store.prune(
+                runs_before=days_ago(self.history_days),
+                map_summaries_before=days_ago(self.retention_days),
+            )
+        except Exception as e:
+            logger.warning(f"Could not prune telemetry history: {e}")
+
         if removed_count > 0 or map_removed_count > 0:
             logger.info(
                 f"🧹 Cleaned up {removed_count} old telemetry files and {map_removed_count} old map summaries"
             )
 
     def get_recent_runs(self, days: int = 7) -> List[Dict]:
-        """Get telemetry data for recent runs"""
-        cutoff_date = now_utc() - timedelta(days=days)
-        recent_runs = []
-
-        for telemetry_file in self.telemetry_dir.glob("run_*.json"):
-            try:
-                with open(telemetry_file, "r") as f:
-                    run_data = json.load(f)
-
-                run_date = datetime.fromisoformat(run_data["timestamp"])
-                if run_date >= cutoff_date:
-                    recent_runs.append(run_data)
-            except Exception as e:
-                logger.warning(f"Could not load {telemetry_file}: {e}")
-
-        # Sort by timestamp (newest first)
-        recent_runs.sort(key=lambda x: x["timestamp"], reverse=True)
-        return recent_runs
+        """Get telemetry data for recent runs (newest first)"""
+        return self.history().runs_since(days_ago(days))
 
     def generate_summary_report(self, days: int = 7) -> str:
         """Generate a summary report for the last N days"""
-        recent_runs = self.get_recent_runs(days)
+        totals = self.history().run_totals(days_ago(days))
 
-        if not recent_runs:
+        if not totals["runs"]:
             return f"No runs found in the last {days} days"
 
         # Aggregate statistics
-        total_runs = len(recent_runs)
-        total_topics = sum(len(run.get("topics_processed", [])) for run in recent_runs)
-        total_episodes = sum(run.get("episodes_digested", 0) for run in recent_runs)
-        total_tokens = sum(run.get("total_tokens_used", 0) for run in recent_runs)
-        total_cost = sum(run.get("total_cost_estimate", 0) for run in recent_runs)
-        total_errors = sum(len(run.get("errors", [])) for run in recent_runs)
+        total_runs = totals["runs"]
+        total_topics = totals["topics"]
+        total_episodes = totals["episodes_digested"]
+        total_tokens = totals["total_tokens"]
+        total_cost = totals["total_cost"]
+        total_errors = totals["errors"]
 
         # Success rates
-        successful_topics = sum(
-            len([t for t in run.get("topics_processed", []) if t.get("success", False)])
-            for run in recent_runs
-        )
+        successful_topics = totals["successful_topics"]
         topic_success_rate = (
             (successful_topics / total_topics * 100) if total_topics > 0 else 0
         )
@@ -495,16 +737,14 @@ Total Errors: {total_errors}
 Recent Runs:
 """
 
-        for i, run in enumerate(recent_runs[:5]):  # Show last 5 runs
-            run_date = datetime.fromisoformat(run["timestamp"]).strftime(
-                "%Y-%m-%d %H:%M"
-            )
-            topics = len(run.get("topics_processed", []))
-            success = len(
-                [t for t in run.get("topics_processed", []) if t.get("success", False)]
-            )
+        # Show last 5 runs
+        for i, run in enumerate(self.store.recent_runs(days_ago(days), limit=5)):
+            started = datetime.fromtimestamp(run["started_at"], timezone.utc)
+            run_date = started.strftime("%Y-%m-%d %H:%M")
+            topics = run["topics"]
+            success = run["successful_topics"]
 
-            report += f"  {i+1}. {run_date} ({run.get('pipeline_type', 'unknown')}): {success}/{topics} topics successful\n"
+            report += f"  {i+1}. {run_date} ({run['pipeline_type'] or 'unknown'}): {success}/{topics} topics successful\n"
 
         return report
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Fake GitHub releases API for tests and local runs
+Serves a releases list with an ETag and answers conditional requests with 304,
+the way api.github.com does; can inject failures and latency.
+
+Run standalone and point the RSS endpoint at it:
+    python tests/fake_github_api.py --port 8766
+    GITHUB_RELEASES_URL=http://127.0.0.1:8766/repos/McSchnizzle/podcast-scraper/releases python -m http.server
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+RELEASES_PATH = "/repos/McSchnizzle/podcast-scraper/releases"
+
+
+def fake_release(date: str, size: int = 3_000_000) -> Dict:
+    """One daily release (date as YYYY-MM-DD) with a single digest MP3 asset"""
+    stamp = date.replace("-", "")
+    name = f"complete_topic_digest_{stamp}_060000.mp3"
+    return {
+        "tag_name": f"daily-{date}",
+        "name": f"Daily Tech Digest - {date}",
+        "body": f"Digest for {date}",
+        "published_at": f"{date}T06:00:00Z",
+        "assets": [
+            {
+                "name": name,
+                "size": size,
+                "browser_download_url": (
+                    f"https://github.com/McSchnizzle/podcast-scraper/releases/"
+                    f"download/daily-{date}/{name}"
+                ),
+            }
+        ],
+    }
+
+
+class FakeGitHubAPI:
+    """Threaded HTTP server mimicking GET /repos/{owner}/{repo}/releases"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.requests: List[Dict] = []
+        self.failures = 0
+        self._lock = threading.Lock()
+        self.set_releases([])
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(
+                        {
+                            "path": self.path,
+                            "if_none_match": self.headers.get("If-None-Match"),
+                            "if_modified_since": self.headers.get("If-Modified-Since"),
+                        }
+                    )
+                    fail = server.failures > 0
+                    if fail:
+                        server.failures -= 1
+                    body, etag, last_modified = (
+                        server._body,
+                        server._etag,
+                        server._last_modified,
+                    )
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if self.path.split("?")[0] != RELEASES_PATH:
+                    self.send_error(404)
+                elif fail:
+                    self.send_error(503)
+                elif self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                    self.end_headers()
+                else:
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", last_modified)
+                    self.end_headers()
+                    self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def releases_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}{RELEASES_PATH}"
+
+    def set_releases(self, releases: List[Dict]):
+        """Replace the releases list; the ETag changes with its content"""
+        body = json.dumps(releases).encode("utf-8")
+        with self._lock:
+            self._body = body
+            self._etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            self._last_modified = formatdate(usegmt=True)
+
+    def fail_next(self, times: int = 1):
+        """Answer 503 for the next `times` requests"""
+        with self._lock:
+            self.failures = times
+
+    def start(self) -> "FakeGitHubAPI":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake GitHub releases API")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--days", type=int, default=3, help="Releases to serve")
+    args = parser.parse_args()
+
+    server = FakeGitHubAPI(port=args.port, latency=args.latency).start()
+    server.set_releases(
+        [fake_release(f"2025-09-{day:02d}") for day in range(args.days, 0, -1)]
+    )
+    print(f"Fake GitHub API listening on {server.releases_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fake ElevenLabs TTS server for tests and local runs
+Serves deterministic MP3 frames per request text; can inject failures and latency.
+
+Run standalone and point the pipeline at it:
+    python tests/fake_tts_server.py --port 8765
+    ELEVENLABS_BASE_URL=http://127.0.0.1:8765/v1 ELEVENLABS_API_KEY=fake python multi_topic_tts_generator.py
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding -> 417-byte frames
+FRAME_HEADER = bytes([0xFF, 0xFB, 0x90, 0x64])
+FRAME_LENGTH = 417
+
+
+def fake_frame(text: str, index: int) -> bytes:
+    """One MPEG frame whose payload identifies the text it was made from"""
+    seed = hashlib.sha256(f"{text}|{index}".encode("utf-8")).digest()
+    payload = (seed * (FRAME_LENGTH // len(seed) + 1))[: FRAME_LENGTH - 4]
+    return FRAME_HEADER + payload
+
+
+def fake_audio(text: str, with_info_frame: bool = True) -> bytes:
+    """Deterministic MP3 bytes for text: optional Info frame plus one frame per 50 chars"""
+    frames = [fake_frame(text, i) for i in range(max(1, len(text) // 50))]
+    if with_info_frame:
+        info = FRAME_HEADER + bytes(32) + b"Info" + bytes(FRAME_LENGTH - 40)
+        frames.insert(0, info)
+    return b"".join(frames)
+
+
+class FakeTTSServer:
+    """Threaded HTTP server mimicking POST /v1/text-to-speech/{voice_id}/stream"""
+
+    def __init__(self, port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.requests: List[Dict] = []
+        self.failures: Dict[str, int] = {}  # text substring -> failures left
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests.append({"path": self.path, **body})
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                    fail = next(
+                        (
+                            key
+                            for key, left in server.failures.items()
+                            if left > 0 and key in body["text"]
+                        ),
+                        None,
+                    )
+                    if fail:
+                        server.failures[fail] -= 1
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    if not self.headers.get("xi-api-key"):
+                        self.send_error(401)
+                    elif fail:
+                        self.send_error(503)
+                    else:
+                        audio = fake_audio(body["text"])
+                        self.send_response(200)
+                        self.send_header("Content-Type", "audio/mpeg")
+                        self.send_header("Content-Length", str(len(audio)))
+                        self.end_headers()
+                        self.wfile.write(audio)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def fail_next(self, text_fragment: str, times: int = 1):
+        """Answer 503 for the next `times` requests whose text contains the fragment"""
+        with self._lock:
+            self.failures[text_fragment] = times
+
+    def start(self) -> "FakeTTSServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake ElevenLabs TTS server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeTTSServer(port=args.port, latency=args.latency).start()
+    print(f"Fake TTS server listening on {server.base_url}")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Tests for the audio endpoint: byte ranges, ETags, HEAD and zero-copy sends
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from email import message_from_bytes
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tests.fake_tts_server import fake_audio
+
+AUDIO_MODULE = Path(__file__).parent.parent / "api" / "audio" / "[episode].py"
+EPISODE = "complete_topic_digest_20250910_060000.mp3"
+
+
+def load_audio_api():
+    spec = importlib.util.spec_from_file_location("audio_api", AUDIO_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+audio_api = load_audio_api()
+
+
+@pytest.fixture
+def episode(temp_directory, monkeypatch):
+    monkeypatch.setattr(audio_api, "AUDIO_DIR", str(temp_directory))
+    data = fake_audio("x" * 5000)
+    (temp_directory / EPISODE).write_bytes(data)
+    return data
+
+
+@pytest.fixture
+def base_url(episode):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), audio_api.handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/audio"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(url: str, method: str = "GET", **headers):
+    """(status, headers, body) for a request to the endpoint"""
+    request = urllib.request.Request(url, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+class TestParseRange:
+    def test_single_and_open_ranges(self):
+        assert audio_api.parse_range("bytes=0-99", 1000) == [(0, 99)]
+        assert audio_api.parse_range("bytes=900-", 1000) == [(900, 999)]
+        assert audio_api.parse_range("bytes=-100", 1000) == [(900, 999)]
+        assert audio_api.parse_range("bytes=990-2000", 1000) == [(990, 999)]
+
+    def test_multiple_ranges_merged(self):
+        assert audio_api.parse_range("bytes=500-599, 0-99, 50-149", 1000) == [
+            (0, 149),
+            (500, 599),
+        ]
+
+    def test_malformed_ignored(self):
+        assert audio_api.parse_range(None, 1000) is None
+        assert audio_api.parse_range("items=0-1", 1000) is None
+        assert audio_api.parse_range("bytes=abc", 1000) is None
+        assert audio_api.parse_range("bytes=10-5", 1000) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(audio_api.RangeNotSatisfiable):
+            audio_api.parse_range("bytes=5000-", 1000)
+
+
+class TestAudioEndpoint:
+    def test_full_file(self, base_url, episode):
+        status, headers, body = fetch(f"{base_url}/{EPISODE}")
+
+        assert status == 200
+        assert body == episode
+        assert headers["Accept-Ranges"] == "bytes"
+        assert headers["ETag"]
+
+    def test_single_range(self, base_url, episode):
+        status, headers, body = fetch(f"{base_url}/{EPISODE}", Range="bytes=100-199")
+
+        assert status == 206
+        assert body == episode[100:200]
+        assert headers["Content-Range"] == f"bytes 100-199/{len(episode)}"
+
+    def test_multiple_ranges(self, base_url, episode):
+        status, headers, body = fetch(f"{base_url}/{EPISODE}", Range="bytes=0-9,-10")
+
+        assert status == 206
+        assert headers["Content-Type"].startswith("multipart/byteranges")
+        assert int(headers["Content-Length"]) == len(body)
+        message = message_from_bytes(
+            f"Content-Type: {headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        parts = message.get_payload()
+        assert [part["Content-Range"] for part in parts] == [
+            f"bytes 0-9/{len(episode)}",
+            f"bytes {len(episode) - 10}-{len(episode) - 1}/{len(episode)}",
+        ]
+        assert parts[0].get_payload(decode=True) == episode[:10]
+        assert parts[1].get_payload(decode=True) == episode[-10:]
+
+    def test_unsatisfiable_range(self, base_url, episode):
+        status, headers, _ = fetch(
+            f"{base_url}/{EPISODE}", Range=f"bytes={len(episode)}-"
+        )
+
+        assert status == 416
+        assert headers["Content-Range"] == f"bytes */{len(episode)}"
+
+    def test_etag_revalidation(self, base_url, episode, temp_directory):
+        _, headers, _ = fetch(f"{base_url}/{EPISODE}")
+        etag = headers["ETag"]
+
+        status, _, body = fetch(f"{base_url}/{EPISODE}", **{"If-None-Match": etag})
+        assert status == 304
+        assert body == b""
+
+        # A replaced file gets a new ETag and a stale If-Range gets the full file
+        path = temp_directory / EPISODE
+        path.write_bytes(episode[::-1])
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        status, headers, body = fetch(
+            f"{base_url}/{EPISODE}", Range="bytes=0-9", **{"If-Range": etag}
+        )
+        assert status == 200
+        assert headers["ETag"] != etag
+        assert body == episode[::-1]
+
+    def test_head(self, base_url, episode):
+        status, headers, body = fetch(f"{base_url}/{EPISODE}", method="HEAD")
+
+        assert status == 200
+        assert body == b""
+        assert headers["Content-Length"] == str(len(episode))
+
+    def test_mmap_fallback_without_sendfile(self, base_url, episode, monkeypatch):
+        monkeypatch.delattr(os, "sendfile", raising=False)
+
+        status, _, body = fetch(f"{base_url}/{EPISODE}", Range="bytes=10-")
+
+        assert status == 206
+        assert body == episode[10:]
+
+    def test_missing_and_traversal(self, base_url):
+        assert fetch(f"{base_url}/missing.mp3")[0] == 404
+        assert fetch(f"{base_url}/..%2F..%2Fetc%2Fpasswd")[0] == 404
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass audio mastering stage
+Uses a stand-in ffmpeg script so the graph, stdin piping and loudness report
+can be checked without a real ffmpeg install
+"""
+
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audio_mastering import (
+    AudioMasteringStage,
+    build_filter_graph,
+    parse_loudnorm_stats,
+)
+from telemetry_manager import TelemetryManager
+
+SETTINGS = {
+    "enabled": True,
+    "ffmpeg_binary": "ffmpeg",
+    "target_lufs": -16.0,
+    "true_peak_db": -1.5,
+    "loudness_range": 11.0,
+    "crossfade_seconds": 2,
+    "music_volume": 0.15,
+    "bitrate": "128k",
+    "sample_rate": 44100,
+    "timeout_seconds": 30,
+    "music_channels": 2,
+}
+
+LOUDNORM_STDERR = """size=     512kB time=00:00:32.00 bitrate= 131.1kbits/s
+[Parsed_loudnorm_4 @ 0x55d1c]
+{
+	"input_i" : "-23.41",
+	"input_tp" : "-4.02",
+	"input_lra" : "6.30",
+	"input_thresh" : "-33.80",
+	"output_i" : "-16.05",
+	"output_tp" : "-1.50",
+	"output_lra" : "5.10",
+	"output_thresh" : "-26.40",
+	"normalization_type" : "dynamic",
+	"target_offset" : "0.05"
+}
+"""
+
+# Copies stdin (or the narration input) to the output path and prints a report
+FAKE_FFMPEG = f"""#!{sys.executable}
+import sys
+args = sys.argv[1:]
+inputs = [args[i + 1] for i, a in enumerate(args) if a == "-i"]
+narration = inputs[1] if len(inputs) == 3 else inputs[0]
+data = sys.stdin.buffer.read() if narration == "pipe:0" else open(narration, "rb").read()
+with open(args[-1], "wb") as f:
+    f.write(b"MASTERED" + data)
+with open(args[-1] + ".args", "w") as f:
+    f.write("\\n".join(args))
+sys.stderr.write({LOUDNORM_STDERR!r})
+"""
+
+
+@pytest.fixture
+def fake_ffmpeg(temp_directory):
+    path = temp_directory / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    return str(path)
+
+
+class TestFilterGraph:
+    def test_music_graph_is_single_pass(self):
+        graph = build_filter_graph(SETTINGS, with_music=True)
+
+        assert graph.count("acrossfade") == 2
+        assert graph.count("loudnorm=I=-16.0:TP=-1.5:LRA=11.0") == 1
+        assert graph.endswith("[out]")
+
+    def test_speech_only_graph(self):
+        graph = build_filter_graph(SETTINGS, with_music=False)
+
+        assert graph.startswith("[0:a]loudnorm")
+        assert "acrossfade" not in graph
+
+    def test_parse_loudnorm_report(self):
+        stats = parse_loudnorm_stats(LOUDNORM_STDERR)
+
+        assert stats["integrated_lufs"] == -16.05
+        assert stats["input_lufs"] == -23.41
+        assert stats["true_peak_db"] == -1.5
+        assert parse_loudnorm_stats("no report here") == {}
+
+
+class TestMastering:
+    def test_pipes_tts_and_reports_loudness(self, fake_ffmpeg, temp_directory):
+        stage = AudioMasteringStage({**SETTINGS, "ffmpeg_binary": fake_ffmpeg})
+        output = temp_directory / "episode.mp3"
+
+        stats = stage.master(
+            b"tts-frames", output, intro_music="intro.mp3", outro_music="outro.mp3"
+        )
+
+        assert output.read_bytes() == b"MASTEREDtts-frames"
+        args = (temp_directory / "episode.mastering.args").read_text().splitlines()
+        assert args.count("-i") == 3
+        pipe_at = args.index("pipe:0")
+        assert args[pipe_at - 3 : pipe_at] == ["-f", "mp3", "-i"]
+        assert stats["mastered"] and stats["with_music"]
+        assert stats["integrated_lufs"] == -16.05
+        assert stats["mastering_ms"] >= 0
+
+    def test_missing_ffmpeg_ships_raw_tts(self, temp_directory):
+        stage = AudioMasteringStage({**SETTINGS, "ffmpeg_binary": "no-such-ffmpeg"})
+        output = temp_directory / "episode.mp3"
+
+        stats = stage.master(b"tts-frames", output)
+
+        assert output.read_bytes() == b"tts-frames"
+        assert not stats["mastered"]
+        assert "not found" in stats["error"]
+        assert not list(temp_directory.glob("*.mastering"))
+
+    def test_telemetry_records_mastering(self, temp_directory):
+        manager = TelemetryManager(telemetry_dir=str(temp_directory / "telemetry"))
+
+        manager.record_mastering("ai_news_digest", 1200, integrated_lufs=-16.1)
+        manager.record_mastering("tech_digest", 40, mastered=False)
+
+        assert manager.current_run.mastering["ai_news_digest"] == {
+            "mastered": True,
+            "mastering_ms": 1200,
+            "integrated_lufs": -16.1,
+        }
+        assert not manager.current_run.mastering["tech_digest"]["mastered"]
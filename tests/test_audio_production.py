@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent per-topic audio production stage
+Topics are synthesized against the local fake TTS server and handed to the
+publish callback as soon as each one is ready
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import multi_topic_tts_generator
+from multi_topic_tts_generator import MultiTopicTTSGenerator
+from telemetry_manager import TelemetryManager
+from tests.fake_tts_server import FakeTTSServer
+from tts_segment_synthesizer import SegmentedTTSSynthesizer
+from utils import mp3_info
+
+TOPICS = ["ai_news", "tech_product_releases", "social_justice"]
+
+
+@pytest.fixture
+def tts_server():
+    server = FakeTTSServer(latency=0.3).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def generator(tts_server, temp_directory, monkeypatch):
+    monkeypatch.setattr(
+        mp3_info,
+        "_default_index",
+        mp3_info.Mp3MetadataIndex(temp_directory / "tts_cache" / "mp3_index.json"),
+    )
+    for topic in TOPICS:
+        (temp_directory / f"{topic}_digest_20250910_060000.md").write_text(
+            f"# {topic}\n\nOne story for {topic} today.\n"
+        )
+
+    generator = MultiTopicTTSGenerator(output_dir=str(temp_directory))
+    generator.api_available = True
+    generator.synthesizer = SegmentedTTSSynthesizer(
+        "fake-key",
+        {
+            "base_url": tts_server.base_url,
+            "model_id": "eleven_multilingual_v2",
+            "timeout_seconds": 5,
+            "segment_max_chars": 2500,
+            "max_parallel_segments": 3,
+            "requests_per_second": 100,
+            "segment_retries": 1,
+            "segment_cache_dir": str(temp_directory / "tts_cache"),
+            "segment_cache_max_mb": 10,
+        },
+    )
+    generator.mastering = None
+    generator.music_integrator = None
+    return generator
+
+
+class TestAudioProduction:
+    def test_topics_published_as_ready(self, generator, temp_directory):
+        ready = []
+        ready_threads = set()
+
+        def on_ready(digest_info):
+            assert (temp_directory / f"{digest_info['md_file'].stem}.json").exists()
+            ready.append(digest_info["topic"])
+            ready_threads.add(threading.get_ident())
+
+        success, failed = generator.process_all_unprocessed(
+            on_ready=on_ready, max_workers=3
+        )
+
+        assert (success, failed) == (3, 0)
+        assert sorted(ready) == sorted(TOPICS)
+        assert ready_threads == {threading.get_ident()}
+        for topic in TOPICS:
+            assert (temp_directory / f"{topic}_digest_20250910_060000.mp3").exists()
+
+    def test_wall_time_tracks_slowest_topic(
+        self, generator, tts_server, temp_directory, monkeypatch
+    ):
+        run_telemetry = TelemetryManager(telemetry_dir=str(temp_directory / "t"))
+        monkeypatch.setattr(multi_topic_tts_generator, "telemetry", run_telemetry)
+
+        generator.process_all_unprocessed(max_workers=3)
+
+        production = run_telemetry.current_run.audio_production
+        topic_seconds = [
+            production["topic_seconds"][f"{topic}_20250910_060000"] for topic in TOPICS
+        ]
+        assert tts_server.peak_in_flight > 1
+        assert production["wall_seconds"] < sum(topic_seconds)
+
+    def test_failed_topic_not_published(self, generator, tts_server):
+        tts_server.fail_next("social_justice", times=5)
+        ready = []
+
+        success, failed = generator.process_all_unprocessed(
+            on_ready=lambda digest_info: ready.append(digest_info["topic"])
+        )
+
+        assert (success, failed) == (2, 1)
+        assert "social_justice" not in ready
+
+    def test_music_added_when_mastering_disabled(self, generator, temp_directory):
+        enhanced = []
+
+        class FakeMusicIntegrator:
+            def enhance_tts_with_music(self, tts_file, topic):
+                enhanced.append(topic)
+                output = Path(tts_file).with_name(f"{Path(tts_file).stem}_enhanced.mp3")
+                output.write_bytes(b"intro" + Path(tts_file).read_bytes() + b"outro")
+                return str(output)
+
+        generator.music_integrator = FakeMusicIntegrator()
+
+        success, failed = generator.process_all_unprocessed(max_workers=1)
+
+        assert (success, failed) == (3, 0)
+        assert sorted(enhanced) == sorted(TOPICS)
+        for topic in TOPICS:
+            audio = (
+                temp_directory / f"{topic}_digest_20250910_060000.mp3"
+            ).read_bytes()
+            assert audio.startswith(b"intro") and audio.endswith(b"outro")
+        assert not list(temp_directory.glob("*_enhanced.mp3"))
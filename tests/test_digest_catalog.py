@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the digest artifact catalog
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from tests.fake_tts_server import fake_audio
+from utils import digest_catalog, mp3_info
+from utils.digest_catalog import DigestCatalog, classify_artifact
+
+TIMESTAMP = "20250910_060000"
+
+
+@pytest.fixture(autouse=True)
+def mp3_index(temp_directory, monkeypatch):
+    """Keep scanned durations out of the shared on-disk index"""
+    monkeypatch.setattr(
+        mp3_info,
+        "_default_index",
+        mp3_info.Mp3MetadataIndex(temp_directory / "index" / "mp3.json"),
+    )
+
+
+def write_digest(directory: Path, topic: str, timestamp: str = TIMESTAMP):
+    path = directory / f"{topic}_digest_{timestamp}.md"
+    path.write_text(f"# {topic}\n")
+    return path
+
+
+class TestClassifyArtifact:
+    def test_artifact_kinds(self):
+        assert classify_artifact(f"ai_news_digest_{TIMESTAMP}.md") == (
+            "ai_news",
+            TIMESTAMP,
+            "md",
+        )
+        assert classify_artifact(f"ai_news_digest_tts_{TIMESTAMP}.txt")[2] == (
+            "tts_script"
+        )
+        assert classify_artifact(f"ai_news_digest_{TIMESTAMP}_enhanced.mp3")[2] == (
+            "enhanced_mp3"
+        )
+        assert classify_artifact(f"tech-news_digest_{TIMESTAMP}.json")[:1] == (
+            "tech-news",
+        )
+        assert classify_artifact(f"complete_topic_digest_{TIMESTAMP}.mp3")[0] == (
+            "complete_topic"
+        )
+
+    def test_unrelated_files_ignored(self):
+        assert classify_artifact("README.md") is None
+        assert classify_artifact(f"ai_news_digest_{TIMESTAMP}.txt") is None
+        assert classify_artifact(f"ai_news_digest_{TIMESTAMP}_enhanced.md") is None
+        assert classify_artifact("ai_news_digest_ERROR.md") is None
+
+
+class TestDigestCatalog:
+    def test_entries_group_artifacts(self, temp_directory):
+        write_digest(temp_directory, "ai_news")
+        (temp_directory / f"ai_news_digest_{TIMESTAMP}.mp3").write_bytes(
+            fake_audio("x" * 500)
+        )
+        (temp_directory / f"ai_news_digest_{TIMESTAMP}_enhanced.mp3").write_bytes(
+            fake_audio("x" * 1000)
+        )
+        write_digest(temp_directory, "social_justice")
+
+        entries = DigestCatalog(temp_directory).entries()
+
+        assert [entry["topic"] for entry in entries] == ["ai_news", "social_justice"]
+        ai_news = entries[0]
+        assert ai_news["date"] == datetime(2025, 9, 10, 6, 0, 0)
+        assert ai_news["audio_file"].name.endswith("_enhanced.mp3")
+        assert ai_news["mp3_size"] == ai_news["audio_file"].stat().st_size
+        assert ai_news["duration_seconds"] > 0
+        assert entries[1]["audio_file"] is None
+
+    def test_unchanged_directory_not_rescanned(self, temp_directory, monkeypatch):
+        write_digest(temp_directory, "ai_news")
+        catalog = DigestCatalog(temp_directory)
+        assert catalog.sync() == 1
+
+        classified = []
+        real_classify = digest_catalog.classify_artifact
+        monkeypatch.setattr(
+            digest_catalog,
+            "classify_artifact",
+            lambda name: classified.append(name) or real_classify(name),
+        )
+        assert catalog.sync() == 0
+        assert DigestCatalog(temp_directory).sync() == 0
+
+        # Only the new name is classified once the directory changes
+        write_digest(temp_directory, "ai_news", "20250911_060000")
+        assert catalog.sync() == 1
+        assert classified == ["ai_news_digest_20250911_060000.md"]
+
+    def test_removed_files_dropped(self, temp_directory):
+        md_file = write_digest(temp_directory, "ai_news")
+        catalog = DigestCatalog(temp_directory)
+        assert len(catalog.entries()) == 1
+
+        md_file.unlink()
+
+        assert catalog.entries() == []
+
+    def test_query_filters(self, temp_directory):
+        write_digest(temp_directory, "ai_news", "20250901_060000")
+        write_digest(temp_directory, "ai_news", "20250910_060000")
+        write_digest(temp_directory, "social_justice", "20250910_060000")
+        (temp_directory / "ai_news_digest_20250910_060000.mp3").write_bytes(
+            fake_audio("x" * 100)
+        )
+        catalog = DigestCatalog(temp_directory)
+
+        recent = catalog.entries(since=datetime(2025, 9, 5))
+        assert [entry["file_key"] for entry in recent] == [
+            "ai_news_20250910_060000",
+            "social_justice_20250910_060000",
+        ]
+        missing = catalog.entries(require_md=True, missing_mp3=True)
+        assert [entry["file_key"] for entry in missing] == [
+            "ai_news_20250901_060000",
+            "social_justice_20250910_060000",
+        ]
+
+        catalog.mark_deployed("ai_news_20250910_060000", "daily-2025-09-10")
+        assert catalog.entries(require_audio=True, undeployed=True) == []
+        catalog.mark_deployed("ai_news_20250910_060000", None)
+        assert len(catalog.entries(require_audio=True, undeployed=True)) == 1
+
+    def test_legacy_audio_matched_by_timestamp(self, temp_directory):
+        write_digest(temp_directory, "ai_news")
+        legacy = temp_directory / f"complete_topic_digest_{TIMESTAMP}.mp3"
+        legacy.write_bytes(fake_audio("x" * 100))
+
+        entries = DigestCatalog(temp_directory).entries(require_md=True)
+
+        assert entries[0]["audio_file"] == legacy
+
+    def test_recorded_artifact_visible_without_rescan(self, temp_directory):
+        write_digest(temp_directory, "ai_news")
+        catalog = DigestCatalog(temp_directory)
+        catalog.sync()
+
+        mp3_file = temp_directory / f"ai_news_digest_{TIMESTAMP}.mp3"
+        mp3_file.write_bytes(fake_audio("x" * 100))
+        assert catalog.record_artifact(mp3_file) == f"ai_news_{TIMESTAMP}"
+
+        assert catalog.sync() == 0
+        assert catalog.entries(missing_mp3=True) == []
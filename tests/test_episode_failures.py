@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for retry state columns, indexed candidate selection and concurrent retries
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.db import get_connection
+from utils.episode_failures import (
+    FailureManager,
+    RetryProcessor,
+    ensure_failures_table_exists,
+)
+
+
+@pytest.fixture
+def db_path(temp_directory):
+    path = str(temp_directory / "episodes.db")
+    conn = get_connection(path, validate_schema=False)
+    # Episodes as they were before the retry state columns
+    conn.execute(
+        """
+        CREATE TABLE episodes (
+            id INTEGER PRIMARY KEY,
+            episode_id TEXT UNIQUE,
+            title TEXT,
+            audio_url TEXT,
+            status TEXT,
+            failure_reason TEXT,
+            failure_timestamp TIMESTAMP,
+            retry_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    )
+    conn.commit()
+    conn.close()
+    ensure_failures_table_exists(path)
+    return path
+
+
+def add_episode(db_path, episode_id, status="pre-download", **failure):
+    conn = get_connection(db_path, validate_schema=False)
+    conn.execute(
+        "INSERT INTO episodes (episode_id, title, audio_url, status, failure_reason, "
+        "failure_timestamp, retry_count) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            episode_id,
+            f"Episode {episode_id}",
+            f"https://example.com/{episode_id}.mp3",
+            status,
+            failure.get("reason"),
+            failure.get("timestamp"),
+            failure.get("retry_count", 0),
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+def retry_state(db_path, episode_id):
+    conn = get_connection(db_path, validate_schema=False)
+    row = conn.execute(
+        "SELECT status, retry_count, failure_category, "
+        "(julianday(next_retry_at) - julianday('now')) * 86400 "
+        "FROM episodes WHERE episode_id = ?",
+        (episode_id,),
+    ).fetchone()
+    conn.close()
+    return row
+
+
+def make_due(db_path):
+    conn = get_connection(db_path, validate_schema=False)
+    conn.execute(
+        "UPDATE episodes SET next_retry_at = datetime('now', '-1 seconds') "
+        "WHERE next_retry_at IS NOT NULL"
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestRetryState:
+    def test_failure_sets_category_and_backoff(self, db_path):
+        manager = FailureManager(db_path)
+        add_episode(db_path, "ep1")
+
+        manager.log_episode_failure("ep1", "Connection reset", "download")
+        status, retries, category, due_in = retry_state(db_path, "ep1")
+        assert (status, retries, category) == ("pre-download", 1, "download")
+        assert due_in == pytest.approx(300, abs=5)
+
+        manager.log_episode_failure("ep1", "Connection reset", "download")
+        assert retry_state(db_path, "ep1")[3] == pytest.approx(600, abs=5)
+
+        # Third download failure uses up max_retries
+        manager.log_episode_failure("ep1", "Connection reset", "download")
+        assert retry_state(db_path, "ep1") == ("failed", 3, "download", None)
+
+    def test_uncategorized_failure_is_classified_once(self, db_path):
+        add_episode(db_path, "ep1", status="downloaded")
+
+        FailureManager(db_path).log_episode_failure("ep1", "Whisper crashed", "retry")
+
+        assert retry_state(db_path, "ep1")[2] == "transcription"
+
+    def test_candidates_are_due_episodes_via_index(self, db_path):
+        manager = FailureManager(db_path)
+        for episode_id in ("due", "later"):
+            add_episode(db_path, episode_id)
+            manager.log_episode_failure(episode_id, "Timeout", "download")
+        conn = get_connection(db_path, validate_schema=False)
+        conn.execute(
+            "UPDATE episodes SET next_retry_at = datetime('now', '-1 seconds') "
+            "WHERE episode_id = 'due'"
+        )
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM episodes "
+            "WHERE next_retry_at IS NOT NULL AND next_retry_at <= datetime('now')"
+        ).fetchall()
+        conn.commit()
+        conn.close()
+
+        candidates = manager.get_retry_candidates()
+
+        assert [c["episode_id"] for c in candidates] == ["due"]
+        assert candidates[0]["failure_category"] == "download"
+        assert "idx_episodes_next_retry" in str(plan)
+
+    def test_existing_failures_are_backfilled(self, db_path):
+        add_episode(
+            db_path,
+            "old",
+            reason="[TRANSCRIPTION] ASR failed",
+            timestamp="2025-09-01 10:00:00",
+            retry_count=1,
+        )
+        add_episode(
+            db_path,
+            "exhausted",
+            reason="[SCORING] rate limit",
+            timestamp="2025-09-01T10:00:00Z",
+            retry_count=4,
+        )
+
+        candidates = FailureManager(db_path).get_retry_candidates()
+
+        assert [c["episode_id"] for c in candidates] == ["old"]
+        assert candidates[0]["failure_category"] == "transcription"
+        assert retry_state(db_path, "exhausted")[2:] == ("scoring", None)
+
+
+class FakeProcessor:
+    """Stands in for ContentProcessor, tracking overlap per phase"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {"download": 0, "transcription": 0}
+        self.peak = {"download": 0, "transcription": 0}
+
+    def _phase(self, phase):
+        with self.lock:
+            self.active[phase] += 1
+            self.peak[phase] = max(self.peak[phase], self.active[phase])
+        time.sleep(0.05)
+        with self.lock:
+            self.active[phase] -= 1
+
+    def _download_audio(self, audio_url, episode_id):
+        self._phase("download")
+        return f"audio_cache/{episode_id}.mp3"
+
+    def _transcribe_audio(self, audio_file, episode_id):
+        self._phase("transcription")
+        return f"transcripts/{episode_id}.txt"
+
+    def _update_episode_status(self, db_id, status):
+        pass
+
+
+class TestConcurrentRetries:
+    def test_category_slots_bound_each_phase(self, db_path, monkeypatch):
+        manager = FailureManager(db_path)
+        for n in range(4):
+            add_episode(db_path, f"ep{n}")
+            manager.log_episode_failure(f"ep{n}", "Connection refused", "download")
+        make_due(db_path)
+
+        processor = RetryProcessor(db_path, max_workers=4)
+        fake = FakeProcessor()
+        monkeypatch.setattr(processor, "_get_processor", lambda: fake)
+
+        results = processor.process_retry_queue(max_retries_per_run=4)
+
+        assert (results["processed"], results["succeeded"]) == (4, 4)
+        assert fake.peak["download"] > 1
+        assert fake.peak["transcription"] == 1
+        # Recovered episodes leave the retry queue
+        assert manager.get_retry_candidates() == []
+        assert retry_state(db_path, "ep0")[2:] == (None, None)
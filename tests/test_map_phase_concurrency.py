@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent map phase in EpisodeSummaryGenerator
+Covers the global concurrency cap, streaming results and per-episode run headers
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import config
+from episode_summary_generator import EpisodeSummaryGenerator, SharedMapResults
+from openai_digest_integration import OpenAIDigestIntegration, ReduceTokenBudgeter
+from utils.db import get_connection
+
+
+@pytest.fixture
+def generator(temp_database):
+    with patch.dict(os.environ, {"MOCK_OPENAI": "1"}):
+        gen = EpisodeSummaryGenerator(cache_db_path=temp_database)
+    gen.chunk_size = 500
+    gen.chunk_overlap = 50
+    return gen
+
+
+def _transcripts(count, words=400):
+    return [
+        {
+            "episode_id": f"ep{i}",
+            "title": f"Episode {i}",
+            "published_date": "2025-09-01",
+            "source": "rss",
+            "transcript_path": f"transcripts/ep{i}.txt",
+            "content": "This is a sentence about AI models. " * words,
+            "topic_scores": {"AI News": 0.9 - i * 0.01},
+        }
+        for i in range(count)
+    ]
+
+
+class TestConcurrentMapPhase:
+    def test_global_concurrency_cap(self, generator):
+        """In-flight chunk calls never exceed max_parallel_requests across episodes"""
+        generator.max_parallel_requests = 3
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+        original = generator.generate_chunk_summary
+
+        def slow_chunk(**kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            try:
+                return original(**kwargs)
+            finally:
+                with lock:
+                    in_flight -= 1
+
+        generator.generate_chunk_summary = slow_chunk
+        summaries = generator.generate_topic_summaries(_transcripts(4), "AI News")
+
+        assert len(summaries) == 4
+        assert peak == 3
+
+    def test_summaries_stream_to_callback(self, generator):
+        """Each completed episode is handed to on_summary exactly once"""
+        streamed = []
+        summaries = generator.generate_topic_summaries(
+            _transcripts(3), "AI News", on_summary=streamed.append
+        )
+
+        assert sorted(s["episode_id"] for s in streamed) == ["ep0", "ep1", "ep2"]
+        # Returned list is ordered by relevance score
+        assert [s["episode_id"] for s in summaries] == ["ep0", "ep1", "ep2"]
+        assert all(s["status"] == "OK" for s in summaries)
+
+    def test_partial_coverage_and_run_headers(self, generator, temp_database):
+        """Failed chunks mark an episode PARTIAL and are counted in run_headers"""
+        original = generator.generate_chunk_summary
+
+        def flaky_chunk(**kwargs):
+            if kwargs["episode_id"] == "ep1" and kwargs["chunk_index"] % 2 == 0:
+                return None
+            return original(**kwargs)
+
+        generator.generate_chunk_summary = flaky_chunk
+        summaries = generator.generate_topic_summaries(_transcripts(2), "AI News")
+        by_id = {s["episode_id"]: s for s in summaries}
+
+        assert by_id["ep0"]["status"] == "OK"
+        assert by_id["ep1"]["status"] == "PARTIAL"
+        assert by_id["ep1"]["failure_count"] > 0
+
+        with get_connection(temp_database) as conn:
+            rows = dict(
+                conn.execute(
+                    "SELECT episode_id, failures FROM run_headers WHERE topic = ?",
+                    ("AI News",),
+                ).fetchall()
+            )
+        assert rows["ep0"] == 0
+        assert rows["ep1"] == by_id["ep1"]["failure_count"]
+
+
+class TestSharedMapResults:
+    def test_episode_mapped_once_across_topics(self, generator):
+        """A second topic reuses map results instead of re-summarizing chunks"""
+        transcripts = _transcripts(2)
+        for t in transcripts:
+            t["topic_scores"]["Tech News and Tech Culture"] = 0.8
+
+        calls = 0
+        original = generator.generate_chunk_summary
+
+        def counting_chunk(**kwargs):
+            nonlocal calls
+            calls += 1
+            return original(**kwargs)
+
+        generator.generate_chunk_summary = counting_chunk
+        shared_map = SharedMapResults()
+
+        first = generator.generate_topic_summaries(
+            transcripts, "AI News", shared_map=shared_map
+        )
+        calls_after_first = calls
+        second = generator.generate_topic_summaries(
+            transcripts, "Tech News and Tech Culture", shared_map=shared_map
+        )
+
+        assert calls == calls_after_first
+        assert [s["summary"] for s in first] == [s["summary"] for s in second]
+        assert second[0]["topic_score"] == 0.8
+
+        report = shared_map.report()
+        assert report["episodes_mapped"] == 2
+        assert report["episodes_reused"] == 2
+        assert report["tokens_saved"] > 0
+
+    def test_episode_digested_by_first_topic_only(
+        self, digester, temp_directory, monkeypatch
+    ):
+        """Later topics in a run do not re-digest episodes an earlier one used"""
+        monkeypatch.chdir(temp_directory)
+        transcripts = _transcripts(2)
+        for t in transcripts:
+            t["topic_scores"]["Tech News and Tech Culture"] = 0.8
+        marked = []
+        seen = {}
+        original = digester.summary_generator.generate_topic_summaries
+
+        def topic_summaries(transcripts, topic, **kwargs):
+            seen[topic] = [t["episode_id"] for t in transcripts]
+            return original(transcripts, topic, **kwargs)
+
+        topics = ["AI News", "Tech News and Tech Culture"]
+        monkeypatch.setattr(digester, "get_available_topics", lambda: topics)
+        monkeypatch.setattr(
+            digester,
+            "get_transcripts_for_analysis",
+            lambda include_youtube: transcripts,
+        )
+        monkeypatch.setattr(
+            digester.summary_generator, "generate_topic_summaries", topic_summaries
+        )
+        monkeypatch.setattr(
+            digester.prose_validator,
+            "ensure_prose_quality",
+            lambda content: (True, content, []),
+        )
+        monkeypatch.setattr(
+            digester,
+            "_mark_episodes_as_digested_by_ids",
+            lambda ids, topic, timestamp: marked.append((topic, sorted(ids))),
+        )
+        monkeypatch.setattr(
+            digester, "_move_transcripts_to_digested_by_paths", lambda paths: None
+        )
+
+        results = digester.generate_all_topic_digests()
+
+        assert results["AI News"][0]
+        assert marked == [("AI News", ["ep0", "ep1"])]
+        # Tech had nothing left to map once AI News took both episodes
+        assert seen == {"AI News": ["ep0", "ep1"]}
+
+
+class TestReduceTokenBudgeter:
+    def test_drops_lowest_scored_until_fit(self):
+        budgeter = ReduceTokenBudgeter("AI News", max_reduce_tokens=1000)
+        for i, score in enumerate([0.9, 0.7, 0.8, 0.6]):
+            budgeter.add({"episode_id": f"ep{i}", "topic_score": score, "tokens": 300})
+
+        kept, dropped = budgeter.fit()
+
+        assert [s["episode_id"] for s in kept] == ["ep0", "ep2"]
+        assert [s["episode_id"] for s in dropped] == ["ep3", "ep1"]
+
+    def test_keeps_at_least_two_episodes(self):
+        budgeter = ReduceTokenBudgeter("AI News", max_reduce_tokens=100)
+        for i in range(3):
+            budgeter.add({"episode_id": f"ep{i}", "topic_score": 0.9, "tokens": 500})
+
+        kept, _ = budgeter.fit()
+        assert len(kept) == 2
+
+
+@pytest.fixture
+def digester(temp_database):
+    with patch.dict(os.environ, {"MOCK_OPENAI": "1"}):
+        return OpenAIDigestIntegration(db_path=temp_database)
+
+
+def _summaries(count, tokens=300):
+    return [
+        {
+            "episode_id": f"ep{i}",
+            "title": f"Episode {i}",
+            "source": "rss",
+            "topic_score": 0.9 - i * 0.01,
+            "summary": "AI labs shipped new models this week. " * (tokens // 8),
+            "tokens": tokens,
+        }
+        for i in range(count)
+    ]
+
+
+class TestTreeReduce:
+    def test_batches_respect_fan_in_and_budget(self, digester):
+        batches = digester._make_reduce_batches(_summaries(10), fan_in=4, budget=1000)
+
+        assert [len(b) for b in batches] == [3, 3, 3, 1]
+        assert all(sum(s["tokens"] for s in b) <= 1000 for b in batches)
+
+    def test_keeps_every_episode_within_budget(self, digester):
+        summaries = _summaries(10)
+        with patch.dict(
+            config.OPENAI_SETTINGS, {"reduce_fan_in": 4, "reduce_max_depth": 2}
+        ):
+            reduced = digester._tree_reduce(summaries, "AI News", budget=1000)
+
+        assert sum(s["tokens"] for s in reduced) <= 1000
+        member_ids = [
+            member for s in reduced for member in s.get("member_ids", [s["episode_id"]])
+        ]
+        assert sorted(member_ids) == sorted(s["episode_id"] for s in summaries)
+
+    def test_depth_limit_falls_back_to_dropping(self, digester):
+        with patch.dict(
+            config.OPENAI_SETTINGS, {"reduce_fan_in": 2, "reduce_max_depth": 1}
+        ):
+            reduced = digester._tree_reduce(
+                _summaries(12, tokens=150), "AI News", budget=400
+            )
+
+        # One level of pairwise batches leaves 6 intermediates; the lowest-scored
+        # ones are dropped until the final prompt fits
+        assert 2 <= len(reduced) < 6
+        assert all(s["episode_id"].startswith("reduce-L1-") for s in reduced)
+
+    def test_only_episodes_in_the_reduce_are_marked_digested(
+        self, digester, temp_directory, monkeypatch
+    ):
+        """Episodes the fallback drops stay pending for a later digest"""
+        monkeypatch.chdir(temp_directory)
+        marked, moved = [], []
+        monkeypatch.setattr(
+            digester.prose_validator,
+            "ensure_prose_quality",
+            lambda content: (True, content, []),
+        )
+        monkeypatch.setattr(
+            digester,
+            "_mark_episodes_as_digested_by_ids",
+            lambda ids, topic, timestamp: marked.extend(ids),
+        )
+        monkeypatch.setattr(
+            digester,
+            "_move_transcripts_to_digested_by_paths",
+            lambda paths: moved.extend(p.name for p in paths),
+        )
+        settings = {
+            "reduce_mode": "tree",
+            "reduce_fan_in": 2,
+            "reduce_max_depth": 1,
+            "max_reduce_tokens": 150,
+        }
+        with patch.dict(config.OPENAI_SETTINGS, settings):
+            success, _, _ = digester.generate_topic_digest(
+                "AI News", transcripts=_transcripts(12)
+            )
+
+        # Every summary is over budget on its own, so the fallback keeps only
+        # the two best of the six relevant episodes
+        assert success
+        assert sorted(marked) == ["ep0", "ep1"]
+        assert sorted(moved) == sorted(f"{episode}.txt" for episode in marked)
+
+
+class TestIncrementalMap:
+    def _count_chunk_calls(self, generator):
+        calls = []
+        original = generator.generate_chunk_summary
+
+        def counting_chunk(**kwargs):
+            calls.append(kwargs["episode_id"])
+            return original(**kwargs)
+
+        generator.generate_chunk_summary = counting_chunk
+        return calls
+
+    def test_rerun_maps_only_new_episodes(self, generator):
+        calls = self._count_chunk_calls(generator)
+        transcripts = _transcripts(3)
+
+        generator.generate_topic_summaries(
+            transcripts[:2], "AI News", digest_date="2025-09-01"
+        )
+        first_run_calls = len(calls)
+        summaries = generator.generate_topic_summaries(
+            transcripts, "AI News", digest_date="2025-09-01"
+        )
+
+        assert len(summaries) == 3
+        assert set(calls[first_run_calls:]) == {"ep2"}
+
+        persisted = generator.load_topic_map_outputs("AI News", "2025-09-01")
+        assert sorted(persisted) == ["ep0", "ep1", "ep2"]
+
+    def test_changed_transcript_is_remapped(self, generator):
+        calls = self._count_chunk_calls(generator)
+        transcripts = _transcripts(1)
+
+        generator.generate_topic_summaries(
+            transcripts, "AI News", digest_date="2025-09-01"
+        )
+        first_run_calls = len(calls)
+        transcripts[0]["content"] += " A late correction was issued."
+        generator.generate_topic_summaries(
+            transcripts, "AI News", digest_date="2025-09-01"
+        )
+
+        assert len(calls) == 2 * first_run_calls
+
+    def test_reduce_output_reused_only_for_same_input_set(self, generator):
+        generator.save_reduce_output(
+            "AI News", "2025-09-01", "hash-a", ["ep0", "ep1"], "Digest text"
+        )
+
+        assert (
+            generator.get_reduce_output("AI News", "2025-09-01", "hash-a")
+            == "Digest text"
+        )
+        assert generator.get_reduce_output("AI News", "2025-09-01", "hash-b") is None
+
+    def test_second_digest_same_day_is_not_incremental_by_default(
+        self, digester, temp_directory, monkeypatch
+    ):
+        """With the mode off a rerun digests only the episodes still pending"""
+        monkeypatch.chdir(temp_directory)
+        with patch.dict(os.environ, {"MOCK_OPENAI": "1"}):
+            digester.summary_generator = EpisodeSummaryGenerator(
+                cache_db_path=str(temp_directory / "summaries.db")
+            )
+        marked = []
+        monkeypatch.setattr(
+            digester.prose_validator,
+            "ensure_prose_quality",
+            lambda content: (True, content, []),
+        )
+        monkeypatch.setattr(
+            digester,
+            "_mark_episodes_as_digested_by_ids",
+            lambda ids, topic, timestamp: marked.append(sorted(ids)),
+        )
+        monkeypatch.setattr(
+            digester, "_move_transcripts_to_digested_by_paths", lambda paths: None
+        )
+        transcripts = _transcripts(3)
+
+        assert not config.OPENAI_SETTINGS["incremental_digest"]
+        for batch in (transcripts[:2], transcripts[2:]):
+            success, _, _ = digester.generate_topic_digest(
+                "AI News", transcripts=batch, digest_date="2025-09-01"
+            )
+            assert success
+
+        assert marked == [["ep0", "ep1"], ["ep2"]]
+        assert (
+            digester.summary_generator.load_topic_map_outputs("AI News", "2025-09-01")
+            == {}
+        )
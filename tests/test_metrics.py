@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process metrics registry and its TelemetryManager wiring
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from telemetry_manager import TelemetryManager
+from utils.metrics import Histogram, MetricsRegistry, prometheus_name
+
+
+class TestMetricsRegistry:
+    def test_counter_aggregates_across_threads(self):
+        registry = MetricsRegistry()
+
+        def work():
+            for _ in range(1000):
+                registry.inc("jobs.count", labels={"stage": "tts"})
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert registry.get("jobs.count", {"stage": "tts"}).value == 8000
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram()
+        for value in range(1, 1001):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 1000
+        assert snapshot["min"] == 1 and snapshot["max"] == 1000
+        # Bucket interpolation: within the 500-1000 bucket for the median
+        assert 400 <= snapshot["p50"] <= 600
+        assert 900 <= snapshot["p95"] <= 1000
+        assert snapshot["p95"] <= snapshot["p99"] <= 1000
+
+    def test_single_value_quantiles_exact(self):
+        histogram = Histogram()
+        for _ in range(10):
+            histogram.observe(42.0)
+
+        assert histogram.quantile(0.5) == 42.0
+        assert histogram.quantile(0.99) == 42.0
+
+    def test_disabled_prefixes_dropped(self):
+        registry = MetricsRegistry(disabled=["debug."])
+        registry.inc("debug.noise.count")
+        registry.inc("kept.count")
+
+        assert registry.get("debug.noise.count") is None
+        assert registry.snapshot()["counters"] == {"kept.count": 1.0}
+        assert MetricsRegistry(enabled=False).is_enabled("kept.count") is False
+
+    def test_kind_conflict(self):
+        registry = MetricsRegistry()
+        registry.inc("queue.depth")
+        with pytest.raises(ValueError):
+            registry.set("queue.depth", 3, labels={"db": "rss"})
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.inc("openai.tokens.count", 500, labels={"component": "scorer"})
+        registry.set("queue.size.gauge", 25)
+        registry.observe("api.latency.ms", 3, labels={"run_id": "run_x"})
+        registry.observe("api.latency.ms", 700)
+
+        text = registry.to_prometheus()
+
+        assert "# TYPE openai_tokens_total counter" in text
+        assert 'openai_tokens_total{component="scorer"} 500' in text
+        assert "queue_size_gauge 25" in text
+        assert 'api_latency_ms_bucket{le="5"} 1' in text
+        assert 'api_latency_ms_bucket{le="+Inf"} 2' in text
+        assert "api_latency_ms_count 2" in text
+        assert "run_id" not in text
+        assert prometheus_name("rss_retries_processed", "counter") == (
+            "rss_retries_processed_total"
+        )
+
+
+class TestTelemetryMetrics:
+    def test_finalize_snapshots_and_exports(self, temp_directory):
+        tm = TelemetryManager(telemetry_dir=str(temp_directory))
+        tm.record_metric("pipeline.retries.count", 3, component="scorer")
+        tm.record_gauge("queue.size", 25)
+        for latency in (100, 200, 300):
+            tm.record_histogram("api.latency", latency, labels={"api": "openai"})
+
+        tm.finalize_run(1.0)
+
+        run = json.loads((temp_directory / f"{tm.current_run_id}.json").read_text())
+        metrics = run["metrics"]
+        assert metrics["counters"] == {'pipeline.retries.count{component="scorer"}': 3}
+        assert metrics["gauges"] == {"queue.size.gauge": 25}
+        latency = metrics["histograms"]['api.latency.ms{api="openai"}']
+        assert latency["count"] == 3
+        assert 100 <= latency["p50"] <= 300
+
+        prom = (temp_directory / "metrics.prom").read_text()
+        assert 'pipeline_retries_total{component="scorer"} 3' in prom
+
+    def test_disabled_metrics_skip_registry(self, temp_directory):
+        tm = TelemetryManager(telemetry_dir=str(temp_directory), metrics_enabled=False)
+        tm.record_metric("rss_retries_processed", 5)
+        tm.finalize_run(1.0)
+
+        # Run fields still track the legacy names
+        assert tm.current_run.total_api_calls == 5
+        assert tm.current_run.metrics == {
+            "counters": {},
+            "gauges": {},
+            "histograms": {},
+        }
+        assert not (temp_directory / "metrics.prom").exists()
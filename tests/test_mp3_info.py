@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the MP3 header scanner and metadata index
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_tts_server import FRAME_HEADER, FRAME_LENGTH, fake_audio
+from utils import mp3_info
+from utils.mp3_info import Mp3MetadataIndex, scan_mp3
+
+# MPEG-1 Layer III, 64 kbps, 44.1 kHz, joint stereo -> 208-byte frames
+FRAME_HEADER_64K = bytes([0xFF, 0xFB, 0x50, 0x64])
+FRAME_SECONDS = 1152 / 44100
+
+
+def frames(count: int, header: bytes = FRAME_HEADER, length: int = FRAME_LENGTH):
+    return (header + bytes(length - 4)) * count
+
+
+def xing_frame(frame_count: int, byte_count: int) -> bytes:
+    tag = b"Xing" + (3).to_bytes(4, "big")
+    tag += frame_count.to_bytes(4, "big") + byte_count.to_bytes(4, "big")
+    body = bytes(32) + tag
+    return FRAME_HEADER + body + bytes(FRAME_LENGTH - 4 - len(body))
+
+
+class TestScanMp3:
+    def test_cbr_duration_from_frame_walk(self, temp_directory):
+        path = temp_directory / "cbr.mp3"
+        path.write_bytes(frames(100))
+
+        info = scan_mp3(path)
+
+        assert info["method"] == "frames"
+        assert info["frames"] == 100
+        assert info["duration_seconds"] == pytest.approx(100 * FRAME_SECONDS, abs=1e-3)
+        assert info["bitrate_kbps"] == 128
+        assert info["sample_rate"] == 44100
+
+    def test_vbr_average_bitrate(self, temp_directory):
+        path = temp_directory / "vbr.mp3"
+        path.write_bytes(frames(50) + frames(50, FRAME_HEADER_64K, 208))
+
+        info = scan_mp3(path)
+
+        assert info["frames"] == 100
+        assert 90 <= info["bitrate_kbps"] <= 98
+
+    def test_xing_frame_count_used(self, temp_directory):
+        path = temp_directory / "xing.mp3"
+        path.write_bytes(xing_frame(1000, 1000 * FRAME_LENGTH) + frames(10))
+
+        info = scan_mp3(path)
+
+        assert info["method"] == "xing"
+        assert info["duration_seconds"] == pytest.approx(1000 * FRAME_SECONDS, 1e-3)
+
+    def test_skips_id3_tags(self, temp_directory):
+        id3v2 = b"ID3\x04\x00\x00\x00\x00\x00\x14" + bytes(20)
+        id3v1 = b"TAG" + bytes(125)
+        path = temp_directory / "tagged.mp3"
+        path.write_bytes(id3v2 + fake_audio("x" * 500) + id3v1)
+
+        info = scan_mp3(path)
+
+        assert info["frames"] == 11  # Info frame (no count) + 10 audio frames
+        assert info["bitrate_kbps"] == 128
+
+    def test_not_an_mp3(self, temp_directory):
+        path = temp_directory / "notes.mp3"
+        path.write_bytes(b"plain text, no frames" * 10)
+
+        assert scan_mp3(path) is None
+
+
+class TestMp3MetadataIndex:
+    def test_scans_each_content_once(self, temp_directory, monkeypatch):
+        scans = []
+        real_scan = mp3_info.scan_mp3
+        monkeypatch.setattr(
+            mp3_info, "scan_mp3", lambda path: scans.append(path) or real_scan(path)
+        )
+        episode = temp_directory / "ai_news_digest_20250910_060000.mp3"
+        episode.write_bytes(frames(200))
+        index_path = temp_directory / "index.json"
+
+        index = Mp3MetadataIndex(index_path)
+        first = index.get(episode)
+        assert index.get(episode) == first
+
+        # Same bytes under another name: found by content hash
+        copy = temp_directory / "copy.mp3"
+        shutil.copy(episode, copy)
+        assert index.get(copy) == first
+        assert len(scans) == 1
+
+        # A fresh process answers by name without the audio file
+        episode.unlink()
+        assert Mp3MetadataIndex(index_path).get(episode) == first
+        assert (
+            Mp3MetadataIndex(index_path).lookup_name(
+                "ai_news_digest_20250910_060000.mp3"
+            )["frames"]
+            == 200
+        )
+
+    def test_changed_file_rescanned(self, temp_directory):
+        episode = temp_directory / "episode.mp3"
+        episode.write_bytes(frames(10))
+        index = Mp3MetadataIndex(temp_directory / "index.json")
+        assert index.get(episode)["frames"] == 10
+
+        episode.write_bytes(frames(30))
+
+        assert index.get(episode)["frames"] == 30
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the decoded PCM music asset bank
+A stand-in ffmpeg "decodes" by copying the source bytes and counting calls
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from audio_mastering import AudioMasteringStage
+from music_asset_bank import MusicAssetBank
+
+FAKE_FFMPEG = f"""#!{sys.executable}
+import sys
+args = sys.argv[1:]
+source = args[args.index("-i") + 1]
+with open(source, "rb") as f:
+    data = f.read()
+with open(args[-1], "wb") as f:
+    f.write(data)
+with open(args[-1].rsplit("/", 1)[0] + "/../decode_calls", "a") as f:
+    f.write(source + "\\n")
+"""
+
+
+@pytest.fixture
+def bank_settings(temp_directory):
+    ffmpeg = temp_directory / "ffmpeg"
+    ffmpeg.write_text(FAKE_FFMPEG)
+    ffmpeg.chmod(ffmpeg.stat().st_mode | stat.S_IEXEC)
+    return {
+        "ffmpeg_binary": str(ffmpeg),
+        "music_pcm_dir": str(temp_directory / "music" / "pcm"),
+        "sample_rate": 44100,
+        "music_channels": 2,
+    }
+
+
+@pytest.fixture
+def intro_mp3(temp_directory):
+    path = temp_directory / "AI News_intro.mp3"
+    path.write_bytes(bytes(range(16)) * 64)
+    return path
+
+
+def decode_calls(temp_directory) -> int:
+    calls = temp_directory / "music" / "decode_calls"
+    return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+class TestMusicAssetBank:
+    def test_decodes_once_per_source(self, bank_settings, intro_mp3, temp_directory):
+        bank = MusicAssetBank(bank_settings)
+
+        first = bank.pcm_path("AI News_intro", str(intro_mp3))
+        second = bank.pcm_path("AI News_intro", str(intro_mp3))
+        reopened = MusicAssetBank(bank_settings).pcm_path(
+            "AI News_intro", str(intro_mp3)
+        )
+
+        assert first == second == reopened
+        assert first.endswith("AI_News_intro.pcm")
+        assert decode_calls(temp_directory) == 1
+
+    def test_manifest_tracks_source_hash(
+        self, bank_settings, intro_mp3, temp_directory
+    ):
+        MusicAssetBank(bank_settings).pcm_path("AI News_intro", str(intro_mp3))
+
+        # Touched without changes: hash still matches, no decode
+        os.utime(intro_mp3, (1, 1))
+        MusicAssetBank(bank_settings).pcm_path("AI News_intro", str(intro_mp3))
+        assert decode_calls(temp_directory) == 1
+
+        # New content: decoded again
+        intro_mp3.write_bytes(b"\x01\x02\x03\x04" * 100)
+        bank = MusicAssetBank(bank_settings)
+        bank.pcm_path("AI News_intro", str(intro_mp3))
+        assert decode_calls(temp_directory) == 2
+        assert bank.manifest["assets"]["AI News_intro"]["frames"] == 100
+
+    def test_load_memory_maps_frames(self, bank_settings, intro_mp3):
+        bank = MusicAssetBank(bank_settings)
+        bank.pcm_path("AI News_intro", str(intro_mp3))
+
+        samples = bank.load("AI News_intro")
+
+        assert samples.shape == (256, 2)
+        assert samples.dtype.itemsize == 2
+        assert bank.load("missing") is None
+
+    def test_decode_failure_returns_none(self, bank_settings, intro_mp3):
+        bank = MusicAssetBank({**bank_settings, "ffmpeg_binary": "no-such-ffmpeg"})
+
+        assert bank.pcm_path("AI News_intro", str(intro_mp3)) is None
+        assert not bank.manifest["assets"]
+
+    def test_mastering_reads_pcm_inputs(self, bank_settings):
+        stage = AudioMasteringStage(
+            {
+                **bank_settings,
+                "target_lufs": -16.0,
+                "true_peak_db": -1.5,
+                "loudness_range": 11.0,
+                "crossfade_seconds": 2,
+                "music_volume": 0.15,
+                "bitrate": "128k",
+                "timeout_seconds": 30,
+            }
+        )
+
+        cmd = stage.build_command("pipe:0", "out.mp3", "intro.pcm", "outro.pcm")
+
+        intro_at = cmd.index("intro.pcm")
+        assert cmd[intro_at - 7 : intro_at] == [
+            "-f",
+            "s16le",
+            "-ar",
+            "44100",
+            "-ac",
+            "2",
+            "-i",
+        ]
+        assert cmd.count("s16le") == 2
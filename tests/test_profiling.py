@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the opt-in run profiler, its report and telemetry retention
+"""
+
+import json
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from telemetry_manager import TelemetryManager
+from utils.profiling import (
+    RunProfiler,
+    load_summaries,
+    profile_run,
+    resolve_mode,
+    top_self_time,
+)
+from utils.tracing import Tracer
+
+
+def busy(seconds: float):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def run_stages(tracer: Tracer):
+    with tracer.span("pipeline.daily_workflow"):
+        with tracer.span("pipeline.digest"):
+            with tracer.span("digest.topic"):
+                busy(0.15)
+        with tracer.span("pipeline.audio_production"):
+            busy(0.1)
+
+
+class TestRunProfiler:
+    def test_resolve_mode(self, monkeypatch):
+        monkeypatch.delenv("PODCAST_PROFILE", raising=False)
+        assert resolve_mode() is None
+        monkeypatch.setenv("PODCAST_PROFILE", "1")
+        assert resolve_mode() == "sample"
+        assert resolve_mode("cprofile") == "cprofile"
+        assert resolve_mode("off") is None
+
+    def test_samples_attributed_to_stages(self, temp_directory):
+        tracer = Tracer(enabled=True)
+        profiler = RunProfiler(
+            "run_20250910_060000",
+            "pipeline",
+            mode="both",
+            interval_ms=2,
+            output_dir=temp_directory,
+            tracer=tracer,
+        ).start()
+        run_stages(tracer)
+        output_dir = profiler.stop()
+
+        assert output_dir == temp_directory / "run_20250910_060000_pipeline"
+        assert tracer.listeners == []
+        summary = json.loads((output_dir / "summary.json").read_text())
+        stages = summary["stages"]
+        # Nested digest.topic counts towards its stage at depth 1
+        assert "digest.topic" not in stages
+        assert stages["pipeline.digest"]["samples"] > 0
+        assert stages["pipeline.audio_production"]["samples"] > 0
+        assert any(
+            "busy (test_profiling.py" in function
+            for function, _, _ in stages["pipeline.digest"]["top_self"]
+        )
+
+        collapsed = (output_dir / "collapsed.txt").read_text().splitlines()
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed)
+        assert any(line.startswith("pipeline.digest;") for line in collapsed)
+
+        stats = pstats.Stats(str(output_dir / "pipeline.digest.prof"))
+        assert any(func[2] == "busy" for func in stats.stats)
+
+    def test_worker_thread_stages(self, temp_directory):
+        tracer = Tracer(enabled=True)
+        profiler = RunProfiler(
+            "run_20250910_070000",
+            "pipeline",
+            interval_ms=2,
+            output_dir=temp_directory,
+            tracer=tracer,
+        ).start()
+
+        def feed_monitor():
+            with tracer.span("pipeline.feed_monitor"):
+                busy(0.15)
+
+        with tracer.span("pipeline.daily_workflow"):
+            worker = threading.Thread(target=tracer.wrap(feed_monitor))
+            worker.start()
+            worker.join()
+        output_dir = profiler.stop()
+
+        stages = json.loads((output_dir / "summary.json").read_text())["stages"]
+        assert any(
+            "busy (test_profiling.py" in function
+            for function, _, _ in stages["pipeline.feed_monitor"]["top_self"]
+        )
+
+    def test_disabled_is_noop(self, monkeypatch):
+        monkeypatch.delenv("PODCAST_PROFILE", raising=False)
+        with profile_run("feed_monitor", run_id="run_x") as profiler:
+            assert profiler is None
+
+
+class TestProfileReport:
+    def test_top_self_time_across_runs(self, temp_directory):
+        for run_id, seconds in (
+            ("run_20250909_060000", 2.0),
+            ("run_20250910_060000", 3.0),
+            ("run_20250911_060000", 5.0),
+        ):
+            run_dir = temp_directory / f"{run_id}_pipeline"
+            run_dir.mkdir()
+            summary = {
+                "run_id": run_id,
+                "entry": "pipeline",
+                "stages": {
+                    "pipeline.digest": {
+                        "top_self": [
+                            ["read (ssl.py:1)", 10, seconds],
+                            ["loads (json:1)", 1, 0.1],
+                        ]
+                    }
+                },
+            }
+            (run_dir / "summary.json").write_text(json.dumps(summary))
+
+        summaries = load_summaries(temp_directory, runs=2)
+        report = top_self_time(summaries, top=1)
+
+        assert [s["run_id"] for s in summaries] == [
+            "run_20250911_060000",
+            "run_20250910_060000",
+        ]
+        assert report == {"pipeline.digest": [("read (ssl.py:1)", 8.0, 2)]}
+
+    def test_retention_removes_old_profiles(self, temp_directory):
+        tm = TelemetryManager(telemetry_dir=str(temp_directory))
+        old = tm.profiles_dir / "run_20200101_000000_pipeline"
+        old.mkdir(parents=True)
+        (old / "summary.json").write_text("{}")
+        current = tm.profiles_dir / f"{tm.current_run_id}_pipeline"
+        current.mkdir()
+
+        tm._cleanup_old_telemetry()
+
+        assert not old.exists()
+        assert current.exists()
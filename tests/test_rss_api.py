@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, conditional-GET RSS endpoint (api/rss.py)
+"""
+
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from functools import partial
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from api import rss
+from tests.fake_github_api import FakeGitHubAPI, fake_release
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def github():
+    server = FakeGitHubAPI().start()
+    server.set_releases([fake_release("2025-09-10"), fake_release("2025-09-09")])
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(github, clock, monkeypatch):
+    feed_cache = rss.FeedCache(
+        api_factory=partial(rss.PodcastRSSAPI, github.releases_url),
+        ttl=300,
+        stale=3600,
+        clock=clock,
+    )
+    monkeypatch.setattr(rss, "FEED_CACHE", feed_cache)
+    return feed_cache
+
+
+@pytest.fixture
+def endpoint(cache):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), rss.handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/daily-digest.xml"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(url: str, method: str = "GET", **headers):
+    """(status, headers, body) for a request to the endpoint"""
+    request = urllib.request.Request(url, method=method, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def wait_for_refresh(cache, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestRSSEndpoint:
+    def test_miss_then_hit_without_upstream_call(self, endpoint, github, cache):
+        status, headers, body = fetch(endpoint)
+        assert status == 200
+        assert headers["X-Cache"] == "MISS"
+        assert headers["ETag"].startswith('"')
+        assert headers["Last-Modified"]
+        assert "stale-while-revalidate" in headers["Cache-Control"]
+        items = ET.fromstring(body).findall("channel/item")
+        assert len(items) == 2
+
+        status, headers, second = fetch(endpoint)
+        assert headers["X-Cache"] == "HIT"
+        assert second == body
+        assert len(github.requests) == 1
+        assert cache.metrics["hit"] == 1
+        assert cache.metrics["miss"] == 1
+
+    def test_client_conditional_requests(self, endpoint, cache):
+        _, headers, _ = fetch(endpoint)
+
+        status, not_modified, body = fetch(
+            endpoint, **{"If-None-Match": headers["ETag"]}
+        )
+        assert status == 304
+        assert body == b""
+        assert not_modified["ETag"] == headers["ETag"]
+
+        status, _, _ = fetch(
+            endpoint, **{"If-Modified-Since": headers["Last-Modified"]}
+        )
+        assert status == 304
+
+        status, _, _ = fetch(endpoint, **{"If-None-Match": '"something-else"'})
+        assert status == 200
+        assert cache.metrics["client_not_modified"] == 2
+
+    def test_head_has_headers_only(self, endpoint):
+        _, get_headers, body = fetch(endpoint)
+        status, headers, head_body = fetch(endpoint, method="HEAD")
+
+        assert status == 200
+        assert head_body == b""
+        assert headers["ETag"] == get_headers["ETag"]
+        assert headers["Content-Length"] == str(len(body))
+
+    def test_stale_served_while_revalidating(self, endpoint, github, cache, clock):
+        _, headers, body = fetch(endpoint)
+        clock.now += 301
+
+        _, stale_headers, stale_body = fetch(endpoint)
+        wait_for_refresh(cache)
+
+        assert stale_headers["X-Cache"] == "STALE"
+        assert stale_body == body
+        # Revalidated with the upstream ETag and GitHub answered 304
+        assert github.requests[-1]["if_none_match"]
+        assert cache.metrics["upstream_not_modified"] == 1
+        _, fresh_headers, _ = fetch(endpoint)
+        assert fresh_headers["X-Cache"] == "HIT"
+        assert fresh_headers["ETag"] == headers["ETag"]
+
+    def test_new_release_changes_etag(self, endpoint, github, clock):
+        _, headers, _ = fetch(endpoint)
+        github.set_releases([fake_release(f"2025-09-{day:02d}") for day in (11, 10, 9)])
+        clock.now += 300 + 3600 + 1  # past the stale window: synchronous refresh
+
+        status, new_headers, body = fetch(
+            endpoint, **{"If-None-Match": headers["ETag"]}
+        )
+
+        assert status == 200
+        assert new_headers["X-Cache"] == "MISS"
+        assert new_headers["ETag"] != headers["ETag"]
+        assert len(ET.fromstring(body).findall("channel/item")) == 3
+
+    def test_upstream_failure_keeps_last_feed(self, endpoint, github, cache, clock):
+        _, headers, body = fetch(endpoint)
+        github.fail_next()
+        clock.now += 300 + 3600 + 1
+
+        status, failed_headers, failed_body = fetch(endpoint)
+
+        assert status == 200
+        assert failed_body == body
+        assert failed_headers["ETag"] == headers["ETag"]
+        assert cache.metrics["upstream_errors"] == 1
+
+    def test_cold_start_failure_uses_local_metadata(
+        self, endpoint, github, cache, temp_directory, monkeypatch
+    ):
+        monkeypatch.chdir(temp_directory)
+        github.fail_next()
+
+        status, _, body = fetch(endpoint)
+
+        assert status == 200
+        assert ET.fromstring(body).findall("channel/item") == []
+        assert cache.metrics["upstream_errors"] == 1
+
+    def test_concurrent_cold_requests_fetch_once(self, endpoint, github):
+        github.latency = 0.2
+        results = []
+
+        def request():
+            results.append(fetch(endpoint)[0])
+
+        threads = [threading.Thread(target=request) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [200] * 5
+        assert len(github.requests) == 1
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the incremental RSS feed builder
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.rss_feed_builder import ITUNES_NS, IncrementalFeedBuilder
+
+
+def channel(build_date: str) -> ET.Element:
+    rss = ET.Element("rss", version="2.0")
+    rss.set("xmlns:itunes", ITUNES_NS)
+    channel = ET.SubElement(rss, "channel")
+    ET.SubElement(channel, "title").text = "Daily Digest"
+    ET.SubElement(channel, "lastBuildDate").text = build_date
+    return rss
+
+
+class Renderer:
+    def __init__(self):
+        self.calls = []
+
+    def item(self, guid: str, title: str):
+        def render():
+            self.calls.append(guid)
+            item = ET.Element("item")
+            ET.SubElement(item, "title").text = title
+            ET.SubElement(item, "guid").text = guid
+            ET.SubElement(item, f"{{{ITUNES_NS}}}duration").text = "300"
+            return item
+
+        return render
+
+
+def build(output, renderer, episodes, build_date="Mon, 01 Sep 2025 06:00:00 +0000"):
+    builder = IncrementalFeedBuilder(output, cache_dir=output.parent / "rss_cache")
+    items = [
+        builder.item(guid, {"title": title}, renderer.item(guid, title))
+        for guid, title in episodes
+    ]
+    return builder, builder.write(channel(build_date), items)
+
+
+class TestIncrementalFeedBuilder:
+    def test_unchanged_items_not_rendered_again(self, temp_directory):
+        output = temp_directory / "feed.xml"
+        renderer = Renderer()
+        episodes = [("guid-1", "AI News"), ("guid-2", "Social Justice")]
+
+        build(output, renderer, episodes)
+        builder, _ = build(output, renderer, episodes + [("guid-3", "Tech")])
+
+        assert renderer.calls == ["guid-1", "guid-2", "guid-3"]
+        assert builder.stats == {"reused": 2, "rendered": 1}
+
+        # Changed inputs render again
+        build(output, renderer, [("guid-1", "AI News (updated)")])
+        assert renderer.calls[-1] == "guid-1"
+
+    def test_byte_stable_when_nothing_changed(self, temp_directory):
+        output = temp_directory / "feed.xml"
+        episodes = [("guid-1", "AI News")]
+        _, written = build(output, Renderer(), episodes)
+        first = output.read_bytes()
+        assert written
+
+        _, written = build(
+            output, Renderer(), episodes, build_date="Tue, 02 Sep 2025 06:00:00 +0000"
+        )
+
+        assert not written
+        assert output.read_bytes() == first
+
+    def test_new_item_updates_build_date(self, temp_directory):
+        output = temp_directory / "feed.xml"
+        build(output, Renderer(), [("guid-1", "AI News")])
+
+        _, written = build(
+            output,
+            Renderer(),
+            [("guid-2", "Tech"), ("guid-1", "AI News")],
+            build_date="Tue, 02 Sep 2025 06:00:00 +0000",
+        )
+
+        feed = output.read_text()
+        assert written
+        assert "<lastBuildDate>Tue, 02 Sep 2025 06:00:00 +0000</lastBuildDate>" in feed
+        assert feed.index("guid-2") < feed.index("guid-1")
+
+    def test_output_is_well_formed(self, temp_directory):
+        output = temp_directory / "feed.xml"
+        build(output, Renderer(), [("guid-1", "AI & News"), ("guid-2", "Tech")])
+
+        feed = output.read_text()
+        root = ET.parse(output).getroot()
+
+        assert feed.startswith('<?xml version="1.0" encoding="utf-8"?>\n<rss')
+        assert "<itunes:duration>300</itunes:duration>" in feed
+        assert "ns0" not in feed
+        assert [item.findtext("title") for item in root.iter("item")] == [
+            "AI & News",
+            "Tech",
+        ]
+
+    def test_cache_tracks_current_items(self, temp_directory):
+        output = temp_directory / "feed.xml"
+        build(output, Renderer(), [("guid-1", "AI News"), ("guid-2", "Tech")])
+
+        builder, _ = build(output, Renderer(), [("guid-2", "Tech")])
+
+        reloaded = IncrementalFeedBuilder(output, builder.cache_path.parent)
+        assert set(reloaded.cache["items"]) == {"guid-2"}
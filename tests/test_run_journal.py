@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the run journal: checkpoints, resume and per-topic digest steps
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.run_journal import RunJournal, latest_unfinished, list_runs, prune
+from utils.task_graph import TaskGraph
+
+LIMITS = {"network": 4, "cpu": 1, "llm": 2}
+
+
+class TestRunJournal:
+    def test_resume_keeps_original_inputs(self, temp_directory):
+        db_path = temp_directory / "journal.db"
+        first = RunJournal("run_20250910_060000", db_path)
+        first.begin("daily_workflow", {"weekday": "Friday", "today": "2025-09-10"})
+        first.step_started("feed_monitor", {"hours_back": 48})
+        first.step_finished("feed_monitor", outputs={"new_episodes": 3})
+        first.step_started("digest")
+
+        # Interrupted: still 'running', so it is the run to resume
+        assert latest_unfinished("daily_workflow", db_path) == "run_20250910_060000"
+
+        second = RunJournal("run_20250910_060000", db_path)
+        inputs = second.begin("daily_workflow", {"weekday": "Saturday"})
+        assert second.resumed
+        assert inputs == {"weekday": "Friday", "today": "2025-09-10"}
+        assert second.completed_steps() == {"feed_monitor": {"new_episodes": 3}}
+        assert second.is_done("feed_monitor")
+        assert not second.is_done("digest")
+
+        second.finish("completed")
+        assert latest_unfinished("daily_workflow", db_path) is None
+        assert list_runs(db_path)[0]["attempts"] == 2
+
+    def test_prune_drops_old_runs(self, temp_directory):
+        db_path = temp_directory / "journal.db"
+        journal = RunJournal("run_20250910_060000", db_path)
+        journal.begin("daily_workflow", {})
+        journal.step_finished("feed_monitor")
+
+        assert prune(30, db_path) == 0
+        assert prune(-1, db_path) == 1
+        assert list_runs(db_path) == []
+        assert journal.steps() == []
+
+
+class TestGraphResume:
+    def test_rerun_skips_completed_tasks(self, temp_directory):
+        db_path = temp_directory / "journal.db"
+        calls = []
+
+        def build(fail_audio: bool) -> TaskGraph:
+            def audio():
+                calls.append("audio")
+                if fail_audio:
+                    raise RuntimeError("TTS crashed")
+                return True
+
+            graph = TaskGraph(limits=LIMITS)
+            graph.add("feeds", lambda: calls.append("feeds") or {"new": 2})
+            graph.add("digest", lambda: calls.append("digest") or True, ("feeds",))
+            graph.add("audio", audio, ("digest",), gate=True)
+            graph.add("rss", lambda: calls.append("rss") or True, ("audio",))
+            return graph
+
+        journal = RunJournal("run_x", db_path)
+        journal.begin("daily_workflow", {})
+        with pytest.raises(RuntimeError):
+            build(fail_audio=True).run(journal=journal)
+        assert calls == ["feeds", "digest", "audio"]
+
+        calls.clear()
+        journal = RunJournal("run_x", db_path)
+        journal.begin("daily_workflow", {})
+        graph = build(fail_audio=False)
+        tasks = graph.run(journal=journal)
+
+        assert calls == ["audio", "rss"]
+        assert tasks["feeds"].resumed and tasks["feeds"].result == {"new": 2}
+        assert "(resumed)" in graph.describe()
+        steps = {step["step"]: step for step in journal.steps()}
+        assert steps["audio"]["attempts"] == 2
+        assert steps["rss"]["status"] == "done"
+
+
+class TestDigestTopicCheckpoints:
+    def test_finished_topics_are_not_regenerated(self, temp_directory, monkeypatch):
+        from openai_digest_integration import OpenAIDigestIntegration
+
+        integration = OpenAIDigestIntegration.__new__(OpenAIDigestIntegration)
+        generated = []
+
+        def generate_topic_digest(
+            topic, transcripts, shared_map, digest_date, consumed
+        ):
+            generated.append((topic, digest_date))
+            return True, f"daily_digests/{topic}.md", None
+
+        monkeypatch.setattr(integration, "get_available_topics", lambda: ["Tech"])
+        monkeypatch.setattr(
+            integration, "get_transcripts_for_analysis", lambda include_youtube: []
+        )
+        monkeypatch.setattr(integration, "generate_topic_digest", generate_topic_digest)
+
+        journal = RunJournal("run_x", temp_directory / "journal.db")
+        journal.begin("daily_workflow", {"today": "2025-09-10"})
+        journal.step_finished("digest.topic:AI News", outputs={"path": "ai.md"})
+
+        results = integration.generate_all_topic_digests(journal=journal)
+
+        # AI News episodes were already digested, yet the topic is reported
+        assert results["AI News"] == (True, "ai.md", None)
+        assert generated == [("Tech", "2025-09-10")]
+        assert journal.is_done("digest.topic:Tech")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the deadline-aware stage scheduler and its carry-over
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from telemetry_manager import TelemetryManager
+from utils.scheduler import MAX_DEFERRALS, RunScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler(temp_directory, budget=1000.0, telemetry=None, clock=None):
+    return RunScheduler(
+        budget_seconds=budget,
+        publish_reserve=0.4,
+        carryover_path=temp_directory / "carryover.json",
+        telemetry=telemetry or TelemetryManager(telemetry_dir=str(temp_directory)),
+        clock=clock or FakeClock(),
+    )
+
+
+def run_stage(scheduler, name, items, seconds_per_item, estimate=None):
+    """Process items through a stage, advancing the fake clock per item"""
+    processed = []
+    with scheduler.stage(name) as stage:
+        for item in stage.order(items):
+            if stage.admit(item, estimate):
+                scheduler.clock.now += seconds_per_item
+                stage.done(item, seconds_per_item)
+                processed.append(item)
+    return processed, stage
+
+
+class TestStageDeadlines:
+    def test_deadlines_leave_reserve_and_later_floors(self, temp_directory):
+        scheduler = make_scheduler(temp_directory)
+
+        # 60% of 1000s for work stages, minus floors of the stages after each
+        assert scheduler.stage_deadline("audio_cache") == 600 - 200
+        assert scheduler.stage_deadline("pending_episodes") == 600 - 50
+        assert scheduler.stage_deadline("scoring") == 600
+
+    def test_admits_only_what_fits(self, temp_directory):
+        scheduler = make_scheduler(temp_directory)
+        items = [f"ep{i}" for i in range(10)]
+
+        processed, stage = run_stage(
+            scheduler, "pending_episodes", items, 100, estimate=100
+        )
+
+        assert processed == items[:5]
+        assert stage.deferred == items[5:]
+
+    def test_unlimited_budget_admits_everything(self, temp_directory):
+        scheduler = make_scheduler(temp_directory, budget=0)
+
+        processed, stage = run_stage(scheduler, "scoring", ["a", "b", "c"], 1000)
+
+        assert processed == ["a", "b", "c"]
+        assert stage.remaining() is None
+        assert (
+            not (temp_directory / "carryover.json").exists()
+            or json.loads((temp_directory / "carryover.json").read_text()) == {}
+        )
+
+
+class TestCarryOver:
+    def test_deferred_items_run_first_next_time(self, temp_directory):
+        items = [f"ep{i}" for i in range(6)]
+        first = make_scheduler(temp_directory, budget=500)
+        processed, _ = run_stage(first, "scoring", items, 100, estimate=100)
+        assert processed == items[:3]
+
+        carryover = json.loads((temp_directory / "carryover.json").read_text())
+        assert sorted(carryover["scoring"]) == items[3:]
+        assert carryover["scoring"]["ep5"]["deferrals"] == 1
+
+        # Next run: carried items are boosted ahead of new work
+        second = make_scheduler(temp_directory, budget=500)
+        processed, stage = run_stage(
+            second, "scoring", ["new1"] + items[3:], 100, estimate=100
+        )
+        assert processed == ["ep3", "ep4", "ep5"]
+        assert stage.deferred == ["new1"]
+        carryover = json.loads((temp_directory / "carryover.json").read_text())
+        assert list(carryover["scoring"]) == ["new1"]
+
+    def test_starved_item_admitted_despite_prediction(self, temp_directory):
+        (temp_directory / "carryover.json").write_text(
+            json.dumps(
+                {
+                    "audio_cache": {
+                        "huge": {"deferrals": MAX_DEFERRALS, "first_deferred_at": "x"}
+                    }
+                }
+            )
+        )
+        scheduler = make_scheduler(temp_directory)
+
+        with scheduler.stage("audio_cache") as stage:
+            assert stage.admit("huge", estimate=10_000) is True
+            assert stage.admit("other", estimate=10_000) is False
+
+
+class TestHistoryPrediction:
+    def test_prediction_uses_past_runs(self, temp_directory):
+        past = TelemetryManager(telemetry_dir=str(temp_directory))
+        for seconds in (10, 12, 30):
+            past.record_histogram(
+                "pipeline.item.seconds", seconds, labels={"stage": "scoring"}
+            )
+        past.finalize_run(1.0)
+
+        current = TelemetryManager(telemetry_dir=str(temp_directory))
+        scheduler = make_scheduler(temp_directory, telemetry=current)
+        with scheduler.stage("scoring") as stage:
+            predicted = stage.predict()
+            # This run's own timings take over after a few items
+            for _ in range(3):
+                stage.done("x", 2.0)
+            assert stage.predict() == 2.0
+
+        assert 12 <= predicted <= 30
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipeline task graph and the daily workflow's publish gates
+"""
+
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.task_graph import TaskGraph
+
+LIMITS = {"network": 4, "cpu": 1, "llm": 2}
+
+
+class Recorder:
+    """Task callables that log start/end order and peak concurrency"""
+
+    def __init__(self):
+        self.events = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def task(self, name, seconds=0.02, result=True, error=None):
+        def run():
+            with self.lock:
+                self.events.append(f"start:{name}")
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(seconds)
+            with self.lock:
+                self.active -= 1
+                self.events.append(f"end:{name}")
+            if error:
+                raise error
+            return result
+
+        return run
+
+    def order(self, name):
+        return self.events.index(f"start:{name}")
+
+    def ended_before(self, first, second):
+        return self.events.index(f"end:{first}") < self.order(second)
+
+
+class TestTaskGraph:
+    def test_independent_tasks_overlap_across_resources(self):
+        barrier = threading.Barrier(3, timeout=5)
+        graph = TaskGraph(limits=LIMITS)
+        for name, resource in (("feeds", "network"), ("retry", "cpu"), ("llm", "llm")):
+            graph.add(name, barrier.wait, resource=resource)
+
+        tasks = graph.run()
+
+        # All three reached the barrier together
+        assert {task.status for task in tasks.values()} == {"done"}
+
+    def test_resource_slots_and_dependencies(self):
+        recorder = Recorder()
+        graph = TaskGraph(limits=LIMITS)
+        graph.add("a", recorder.task("a"), resource="cpu")
+        graph.add("b", recorder.task("b"), resource="cpu")
+        graph.add("c", recorder.task("c"), resource="cpu")
+        graph.add("after", recorder.task("after"), deps=("a", "b", "c"))
+
+        graph.run()
+
+        # cpu has one slot, so a/b/c never overlap and run in added order
+        assert recorder.peak == 1
+        assert recorder.order("a") < recorder.order("b") < recorder.order("c")
+        assert recorder.ended_before("c", "after")
+
+    def test_closed_gate_skips_downstream_only(self):
+        recorder = Recorder()
+        graph = TaskGraph(limits=LIMITS)
+        graph.add("digest", recorder.task("digest"), gate=True)
+        graph.add("audio", recorder.task("audio", result=False), ("digest",), gate=True)
+        graph.add("rss", recorder.task("rss"), ("audio",), gate=True)
+        graph.add("mark", recorder.task("mark"), ("rss",))
+        graph.add("other", recorder.task("other"))
+
+        tasks = graph.run()
+
+        assert [tasks[name].status for name in ("digest", "audio", "rss", "mark")] == [
+            "done",
+            "blocked",
+            "skipped",
+            "skipped",
+        ]
+        assert tasks["other"].status == "done"
+        assert "start:rss" not in recorder.events
+
+    def test_failure_reraises_and_stops_new_work(self):
+        recorder = Recorder()
+        graph = TaskGraph(limits=LIMITS, max_workers=1)
+        graph.add("boom", recorder.task("boom", error=RuntimeError("boom")))
+        graph.add("later", recorder.task("later"))
+
+        with pytest.raises(RuntimeError, match="boom"):
+            graph.run()
+
+        assert graph.tasks["boom"].status == "failed"
+        assert graph.tasks["later"].status == "skipped"
+
+    def test_optional_failure_lets_dependents_run(self):
+        recorder = Recorder()
+        graph = TaskGraph(limits=LIMITS, max_workers=1)
+        graph.add("a", recorder.task("a", error=RuntimeError("a")), optional=True)
+        graph.add("b", recorder.task("b"), ("a",), optional=True)
+        graph.add("gate", recorder.task("gate"), ("a", "b"), gate=True)
+
+        tasks = graph.run()
+
+        assert [tasks[name].status for name in ("a", "b", "gate")] == [
+            "failed",
+            "done",
+            "done",
+        ]
+
+    def test_rejects_unknown_dependencies_and_resources(self):
+        graph = TaskGraph(limits=LIMITS)
+        with pytest.raises(ValueError):
+            graph.add("a", print, deps=("missing",))
+        with pytest.raises(ValueError):
+            graph.add("a", print, resource="gpu")
+
+    def test_levels_and_visualizations(self):
+        graph = TaskGraph("demo", limits=LIMITS)
+        graph.add("feeds", print, resource="network")
+        graph.add("retry", print, resource="cpu")
+        graph.add("pending", print, deps=("feeds", "retry"), resource="cpu")
+        graph.add("publish", print, deps=("pending",), gate=True)
+
+        assert graph.levels() == [["feeds", "retry"], ["pending"], ["publish"]]
+        text = graph.describe()
+        assert "wave 2:" in text
+        assert "🔒 publish [-] <- pending" in text
+        dot = graph.to_dot()
+        assert '"feeds" -> "pending";' in dot
+        assert "shape=box" in dot
+
+
+class TestDailyWorkflowGraph:
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        import daily_podcast_pipeline
+
+        monkeypatch.setattr(daily_podcast_pipeline, "logger", logging.getLogger())
+        pipeline = daily_podcast_pipeline.DailyPodcastPipeline.__new__(
+            daily_podcast_pipeline.DailyPodcastPipeline
+        )
+        pipeline.hours_back = None
+        pipeline.journal = None
+        pipeline.openai_integration = None
+        calls = []
+        steps = {
+            "_backfill_scoring": None,
+            "_process_retry_queue": None,
+            "_monitor_rss_feeds": None,
+            "_fetch_youtube_transcripts": None,
+            "_process_audio_cache_files": None,
+            "_process_pending_episodes": None,
+            "_score_new_transcripts": None,
+            "_generate_topic_digest": {"path": "digest.md"},
+            "_generate_weekday_digest": True,
+            "_publish_audio_gate": True,
+            "_update_rss_feed": True,
+            "_mark_episodes_digested": None,
+        }
+        for method, result in steps.items():
+
+            def step(*args, method=method, result=result):
+                calls.append(method)
+                return result
+
+            monkeypatch.setattr(pipeline, method, step)
+        pipeline.calls = calls
+        return pipeline
+
+    def test_publish_gates_run_in_order_after_ingest(self, pipeline):
+        graph = pipeline.build_workflow_graph("Tuesday")
+        graph.run()
+
+        calls = pipeline.calls
+        assert calls[-4:] == [
+            "_generate_weekday_digest",
+            "_publish_audio_gate",
+            "_update_rss_feed",
+            "_mark_episodes_digested",
+        ]
+        assert calls.index("_score_new_transcripts") > calls.index(
+            "_process_pending_episodes"
+        )
+        assert set(graph.levels()[0]) == {
+            "backfill_scoring",
+            "retry_queue",
+            "feed_monitor",
+            "youtube_transcripts",
+        }
+        assert calls.index("_generate_topic_digest") > calls.index(
+            "_score_new_transcripts"
+        )
+
+    def test_failed_rss_keeps_episodes_transcribed(self, pipeline, monkeypatch):
+        monkeypatch.setattr(pipeline, "_update_rss_feed", lambda: False)
+
+        tasks = pipeline.build_workflow_graph("Tuesday").run()
+
+        assert tasks["publish.rss"].status == "blocked"
+        assert tasks["publish.mark_digested"].status == "skipped"
+        assert "_mark_episodes_digested" not in pipeline.calls
+
+    def test_failed_topic_does_not_stop_the_others(self, pipeline, monkeypatch):
+        topics = []
+
+        def generate_topic_digest(digest_run, topic):
+            topics.append(topic)
+            if topic == "AI News":
+                raise RuntimeError("reduce failed")
+            return {"path": f"{topic}.md"}
+
+        def generate_weekday_digest(utc_weekday, display_weekday, topic_digests):
+            pipeline.topic_digests = topic_digests
+            return True
+
+        monkeypatch.setattr(pipeline, "_generate_topic_digest", generate_topic_digest)
+        monkeypatch.setattr(
+            pipeline, "_generate_weekday_digest", generate_weekday_digest
+        )
+
+        tasks = pipeline.build_workflow_graph("Tuesday").run()
+
+        # Topics run one at a time in order: an episode goes to the first one
+        assert topics == sorted(topics) and len(topics) == 6
+        assert tasks["digest.topic:AI News"].status == "failed"
+        assert "AI News" not in pipeline.topic_digests
+        assert pipeline.topic_digests["Social Justice"] == "Social Justice.md"
+        assert tasks["publish.mark_digested"].status == "done"
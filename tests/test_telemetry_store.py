@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for the telemetry history store, JSON migration and report queries
+"""
+
+import json
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from telemetry_manager import TelemetryManager
+from utils.datetime_utils import now_utc
+from utils.metrics import Histogram
+from utils.telemetry_store import TelemetryStore, days_ago
+
+
+def run_dict(run_id: str, days_back: float, tokens: int, rtf_values=()) -> dict:
+    histogram = Histogram((0.05, 0.1, 0.2, 0.5, 1))
+    for value in rtf_values:
+        histogram.observe(value)
+    timestamp = (now_utc() - timedelta(days=days_back)).replace(tzinfo=None)
+    return {
+        "run_id": run_id,
+        "timestamp": timestamp.isoformat(),
+        "pipeline_type": "daily",
+        "total_tokens_used": tokens,
+        "episodes_digested": 2,
+        "total_cost_estimate": 0.5,
+        "errors": ["boom"],
+        "warnings": [],
+        "topics_processed": [
+            {"topic": "AI News", "total_tokens": tokens, "success": True},
+            {"topic": "Tech News", "total_tokens": 10, "success": False},
+        ],
+        "metrics": {
+            "counters": {'openai.tokens.count{component="scorer"}': tokens},
+            "gauges": {},
+            "histograms": (
+                {'transcribe.rtf.ratio{backend="faster_whisper"}': histogram.snapshot()}
+                if rtf_values
+                else {}
+            ),
+        },
+    }
+
+
+class TestTelemetryStore:
+    def test_range_queries(self, temp_directory):
+        store = TelemetryStore(temp_directory / "telemetry.db")
+        store.record_run(run_dict("run_a", 40, 1000))
+        store.record_run(
+            run_dict("run_b", 3, 2000, rtf_values=[0.08] * 90 + [0.4] * 10),
+            stages=[{"name": "pipeline.digest", "count": 1, "total_ms": 5000.0}],
+        )
+        store.record_run(run_dict("run_c", 1, 3000, rtf_values=[0.09] * 50))
+
+        since = days_ago(30)
+        assert [run["run_id"] for run in store.runs_since(since)] == ["run_c", "run_b"]
+
+        totals = store.run_totals(since)
+        assert totals["runs"] == 2
+        assert totals["total_tokens"] == 5000
+        assert (totals["topics"], totals["successful_topics"]) == (4, 2)
+
+        tokens = store.tokens_per_topic(days_ago(60), period="month")
+        assert sum(row["total_tokens"] for row in tokens) == 6030
+        assert {row["topic"] for row in tokens} == {"AI News", "Tech News"}
+
+        p50 = store.metric_quantile("transcribe.rtf.ratio", since, 0.5)
+        p99 = store.metric_quantile("transcribe.rtf.ratio", since, 0.99)
+        assert 0.05 <= p50 <= 0.1
+        assert 0.2 <= p99 <= 0.4
+        assert store.metric_histogram("transcribe.rtf.ratio", since).merged()[1] == 150
+        assert store.stage_durations(since)[0]["total_seconds"] == 5.0
+
+    def test_rerecord_replaces_and_prune(self, temp_directory):
+        store = TelemetryStore(temp_directory / "telemetry.db")
+        store.record_run(run_dict("run_a", 1, 1000))
+        store.record_run(run_dict("run_a", 1, 1500))
+        store.record_run(run_dict("run_old", 500, 10))
+        store.record_map_summary("ep1", "AI News", "text", 42, run_id="run_a")
+
+        assert store.run_totals(days_ago(1000))["total_tokens"] == 1510
+        assert store.run_totals(days_ago(1000))["topics"] == 4
+
+        store.prune(runs_before=days_ago(365), map_summaries_before=days_ago(-1))
+
+        assert store.run_totals(days_ago(1000))["runs"] == 1
+        assert store.recent_map_summaries() == []
+
+
+class TestJsonMigration:
+    def test_migrate_runs_traces_and_map_summaries(self, temp_directory):
+        run = run_dict("run_20250904_070644", 2, 4162)
+        (temp_directory / "run_20250904_070644.json").write_text(json.dumps(run))
+        (temp_directory / "traces").mkdir()
+        (temp_directory / "traces" / "run_20250904_070644.json").write_text(
+            json.dumps(
+                {
+                    "traceEvents": [
+                        {"name": "pipeline.digest", "ph": "X", "dur": 2_000_000},
+                        {"name": "process_name", "ph": "M"},
+                    ]
+                }
+            )
+        )
+        summaries_dir = temp_directory / "map_summaries"
+        summaries_dir.mkdir()
+        (summaries_dir / "ep1_AI News_20250904_070737.json").write_text(
+            json.dumps(
+                {
+                    "episode_id": "ep1",
+                    "topic": "AI News",
+                    "timestamp": now_utc().isoformat(),
+                    "summary": "text",
+                    "token_count": 42,
+                    "run_id": "run_20250904_070644",
+                }
+            )
+        )
+        (temp_directory / "run_broken.json").write_text("{not json")
+
+        tm = TelemetryManager(telemetry_dir=str(temp_directory))
+
+        runs = tm.get_recent_runs(days=7)
+        assert [r["run_id"] for r in runs] == ["run_20250904_070644"]
+        assert tm.store.stage_durations(days_ago(7))[0]["total_seconds"] == 2.0
+        assert tm.store.recent_map_summaries()[0]["token_count"] == 42
+        report = tm.generate_summary_report(days=7)
+        assert "Pipeline Runs: 1" in report
+        assert "1/2 topics successful" in report
+
+        # Second import finds nothing new
+        assert tm.store.migrate_json(temp_directory) == 0
+
+    def test_finalize_records_history(self, temp_directory):
+        tm = TelemetryManager(telemetry_dir=str(temp_directory))
+        tm.record_topic_processing(
+            "AI News", 5, 3, 2, 0.65, 100, 200, 0, 1.5, ["a", "b"], [], True
+        )
+        tm.record_histogram("transcribe.rtf.ratio", 0.1)
+        tm.save_map_summary("a", "AI News", "summary", 100)
+        tm.finalize_run(2.0)
+
+        assert not list((temp_directory / "map_summaries").glob("*.json"))
+        assert tm.store.recent_map_summaries()[0]["episode_id"] == "a"
+        tokens = tm.store.tokens_per_topic(days_ago(1), period="day")
+        assert [(row["topic"], row["total_tokens"]) for row in tokens] == [
+            ("AI News", 300)
+        ]
+        assert tm.store.metric_quantile("transcribe.rtf.ratio", days_ago(1)) == 0.1
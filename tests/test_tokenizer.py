@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the tokenizer service and token estimate calibration telemetry
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import utils.tokenizer as tokenizer_module
+from episode_summary_generator import EpisodeSummaryGenerator
+from telemetry_manager import TelemetryManager
+from utils.tokenizer import MESSAGE_OVERHEAD_TOKENS, TokenizerService
+
+
+class CountingEncoder:
+    """Whitespace encoder that records how often it is asked to encode"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.calls += 1
+        return text.split()
+
+
+def _service_with(encoder):
+    service = TokenizerService()
+    service._encoder = encoder
+    service._encoder_loaded = True
+    return service
+
+
+class TestTokenizerService:
+    def test_counts_are_cached_by_text(self):
+        encoder = CountingEncoder()
+        service = _service_with(encoder)
+
+        assert service.count("one two three") == 3
+        assert service.count("one two three") == 3
+        assert encoder.calls == 1
+        assert service.backend == "tiktoken:o200k_base"
+
+    def test_falls_back_to_heuristic_without_tiktoken(self):
+        with patch.object(tokenizer_module, "tiktoken", None):
+            service = TokenizerService()
+            assert service.count("x" * 40) == 10
+            assert service.backend == "heuristic"
+
+    def test_message_overhead(self):
+        service = _service_with(CountingEncoder())
+        messages = [
+            {"role": "system", "content": "be brief"},
+            {"role": "user", "content": "summarize this chunk"},
+        ]
+
+        assert service.count_messages(messages) == 5 + 2 * MESSAGE_OVERHEAD_TOKENS
+
+    def test_empty_text(self):
+        assert TokenizerService().count("") == 0
+
+
+class TestTokenCalibration:
+    def test_records_estimated_vs_actual(self, tmp_path):
+        telemetry = TelemetryManager(telemetry_dir=str(tmp_path))
+        telemetry.record_token_estimate("summary", estimated=100, actual=120)
+        telemetry.record_token_estimate("summary", estimated=100, actual=140)
+
+        calibration = telemetry.current_run.token_calibration["summary"]
+        assert calibration["calls"] == 2
+        assert calibration["estimated_tokens_in"] == 200
+        assert calibration["actual_tokens_in"] == 260
+        assert calibration["ratio"] == 1.3
+
+
+class TestStoredSummaryTokens:
+    def test_budget_uses_stored_counts(self, temp_database):
+        with patch.dict(os.environ, {"MOCK_OPENAI": "1"}):
+            generator = EpisodeSummaryGenerator(cache_db_path=temp_database)
+        for chunk_index in range(2):
+            generator._cache_chunk_summary(
+                {
+                    "episode_id": "ep1",
+                    "chunk_index": chunk_index,
+                    "char_start": 0,
+                    "char_end": 100,
+                    "summary": "A short chunk summary.",
+                    "summary_tokens": 40,
+                    "tokens_used": 50,
+                    "model": generator.model,
+                    "timestamp": "2025-09-01T00:00:00",
+                },
+                "AI News",
+            )
+
+        chunks = [generator._get_cached_chunk_summary("ep1", n) for n in range(2)]
+        with patch("episode_summary_generator.count_tokens") as count:
+            summary = generator._build_topic_summary(
+                {"episode_id": "ep1", "topic_score": 0.9, "content": "text"},
+                {
+                    "chunk_summaries": chunks,
+                    "status": "complete",
+                    "coverage_pct": 100.0,
+                    "failure_count": 0,
+                    "wall_ms": 10,
+                },
+            )
+
+        # Two stored counts plus one separator, without re-tokenizing
+        assert summary["tokens"] == 81
+        count.assert_not_called()
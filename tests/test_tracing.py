@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for pipeline tracing spans and the Chrome trace export
+"""
+
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from telemetry_manager import TelemetryManager
+from utils.tracing import NOOP_SPAN, Tracer
+
+
+@pytest.fixture
+def tracer():
+    return Tracer(enabled=True)
+
+
+def spans_by_name(tracer):
+    return {span.name: span for span in tracer.spans}
+
+
+class TestTracer:
+    def test_nested_spans_link_to_parent(self, tracer):
+        with tracer.span("pipeline.run", weekday="Tuesday") as root:
+            with tracer.span("pipeline.digest") as child:
+                child.set_attribute("topics", 3)
+            tracer.annotate(done=True)
+
+        spans = spans_by_name(tracer)
+        assert spans["pipeline.digest"].parent_id == root.span_id
+        assert spans["pipeline.run"].parent_id is None
+        assert spans["pipeline.digest"].attributes == {"topics": 3}
+        assert spans["pipeline.run"].attributes == {"weekday": "Tuesday", "done": True}
+        assert tracer.current_span() is None
+
+    def test_traced_decorator_records_errors(self, tracer):
+        @tracer.traced("openai.call")
+        def failing_call():
+            raise RuntimeError("rate limited")
+
+        with pytest.raises(RuntimeError):
+            failing_call()
+
+        span = spans_by_name(tracer)["openai.call"]
+        assert span.status == "error"
+        assert "rate limited" in span.attributes["error"]
+
+    def test_wrap_keeps_parent_in_pool_threads(self, tracer):
+        @tracer.traced("map.chunk")
+        def chunk(index):
+            return index
+
+        with tracer.span("digest.map") as parent:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(tracer.wrap(chunk), range(8)))
+
+        chunks = [span for span in tracer.spans if span.name == "map.chunk"]
+        assert len(chunks) == 8
+        assert {span.parent_id for span in chunks} == {parent.span_id}
+
+    def test_disabled_tracer_is_noop(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("pipeline.run") as span:
+            span.set_attribute("ignored", 1)
+
+        assert span is NOOP_SPAN
+        assert tracer.spans == []
+
+    def test_chrome_trace_export(self, tracer, temp_directory):
+        with tracer.span("pipeline.run"):
+            with tracer.span("pipeline.rss", items=7):
+                pass
+
+        path = tracer.export_chrome_trace(
+            temp_directory / "trace.json", metadata={"run_id": "run_x"}
+        )
+
+        trace = json.loads(path.read_text())
+        complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert [event["name"] for event in complete] == [
+            "pipeline.run",
+            "pipeline.rss",
+        ]
+        run, rss = complete
+        assert run["ts"] <= rss["ts"]
+        assert rss["ts"] + rss["dur"] <= run["ts"] + run["dur"]
+        assert rss["args"]["items"] == 7
+        assert rss["args"]["parent_id"] == run["args"]["span_id"]
+        assert trace["otherData"]["run_id"] == "run_x"
+
+
+class TestTelemetryTrace:
+    def test_finalize_writes_trace_and_resets(self, tracer, temp_directory):
+        tm = TelemetryManager(telemetry_dir=str(temp_directory), tracer=tracer)
+        with tracer.span("pipeline.daily_workflow"):
+            pass
+
+        tm.finalize_run(1.0)
+
+        trace_file = temp_directory / "traces" / f"{tm.current_run_id}.json"
+        trace = json.loads(trace_file.read_text())
+        assert any(
+            event["name"] == "pipeline.daily_workflow" for event in trace["traceEvents"]
+        )
+        assert tracer.spans == []
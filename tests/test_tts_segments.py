@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Tests for segmented TTS synthesis against the local fake TTS server
+Covers segmentation, ordered lossless concatenation, per-segment retry and the
+segment audio cache
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.fake_tts_server import FakeTTSServer, fake_audio
+from tts_segment_synthesizer import (
+    SegmentedTTSSynthesizer,
+    TTSSegmentCache,
+    split_tts_segments,
+    strip_mp3_container,
+)
+
+VOICE = {"voice_id": "voice123", "stability": 0.7, "similarity_boost": 0.8}
+
+SCRIPT = (
+    "AI News Digest ... "
+    "First story about a new open model release. It beat several benchmarks. ... "
+    "Second story about chip export rules and what they mean for labs. ... "
+    "Third story about robotics funding rounds this week."
+)
+
+
+@pytest.fixture
+def tts_server():
+    server = FakeTTSServer(latency=0.02).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def synthesizer(tts_server, temp_directory):
+    settings = {
+        "base_url": tts_server.base_url,
+        "model_id": "eleven_multilingual_v2",
+        "timeout_seconds": 5,
+        "segment_max_chars": 80,
+        "max_parallel_segments": 3,
+        "requests_per_second": 100,
+        "segment_retries": 3,
+        "segment_cache_dir": str(temp_directory / "tts_cache"),
+        "segment_cache_max_mb": 10,
+    }
+    return SegmentedTTSSynthesizer("fake-key", settings)
+
+
+class TestSegmentation:
+    def test_paragraphs_become_segments(self):
+        segments = split_tts_segments(SCRIPT, max_chars=200)
+
+        assert len(segments) == 4
+        assert segments[0] == "AI News Digest ..."
+
+    def test_long_paragraph_split_at_sentences(self):
+        paragraph = "One short sentence here. " * 10
+        segments = split_tts_segments(paragraph, max_chars=60)
+
+        assert all(len(s) <= 60 for s in segments)
+        assert " ".join(segments) == paragraph.strip()
+
+    def test_oversized_sentence_split_at_words(self):
+        segments = split_tts_segments("word " * 50, max_chars=40)
+
+        assert all(len(s) <= 40 for s in segments)
+        assert " ".join(segments).split() == ["word"] * 50
+
+
+class TestSegmentedSynthesis:
+    def test_concatenates_segments_in_order(
+        self, synthesizer, tts_server, temp_directory
+    ):
+        output = temp_directory / "digest.mp3"
+        stats = synthesizer.synthesize(SCRIPT, VOICE, output)
+
+        segments = split_tts_segments(SCRIPT, 80)
+        expected = b"".join(strip_mp3_container(fake_audio(s)) for s in segments)
+        assert output.read_bytes() == expected
+        assert stats["segments"] == len(segments)
+        assert tts_server.peak_in_flight <= 3
+        assert b"Info" not in output.read_bytes()[:417]
+
+    def test_retries_failed_segment(self, synthesizer, tts_server, temp_directory):
+        tts_server.fail_next("chip export", times=2)
+        output = temp_directory / "digest.mp3"
+
+        assert synthesizer.synthesize(SCRIPT, VOICE, output) is not None
+        chip_requests = [r for r in tts_server.requests if "chip export" in r["text"]]
+        assert len(chip_requests) == 3
+
+    def test_segment_failure_fails_topic_but_keeps_cache(
+        self, synthesizer, tts_server, temp_directory
+    ):
+        tts_server.fail_next("robotics", times=10)
+        output = temp_directory / "digest.mp3"
+
+        assert synthesizer.synthesize(SCRIPT, VOICE, output) is None
+        assert not output.exists()
+
+        # Rerun only synthesizes the segment that failed
+        tts_server.failures.clear()
+        before = len(tts_server.requests)
+        stats = synthesizer.synthesize(SCRIPT, VOICE, output)
+        assert stats["synthesized_segments"] == 1
+        assert len(tts_server.requests) == before + 1
+
+    def test_edit_only_resynthesizes_changed_paragraph(
+        self, synthesizer, tts_server, temp_directory
+    ):
+        synthesizer.synthesize(SCRIPT, VOICE, temp_directory / "v1.mp3")
+        before = len(tts_server.requests)
+
+        edited = SCRIPT.replace("robotics funding", "humanoid robotics funding")
+        stats = synthesizer.synthesize(edited, VOICE, temp_directory / "v2.mp3")
+
+        assert stats["synthesized_segments"] == 1
+        assert len(tts_server.requests) == before + 1
+        assert "humanoid" in tts_server.requests[-1]["text"]
+
+
+class TestSegmentCache:
+    def test_key_normalizes_whitespace(self):
+        settings = {"stability": 0.7}
+        assert TTSSegmentCache.key(
+            "Hello   world.\n", "v", "m", settings
+        ) == TTSSegmentCache.key("Hello world.", "v", "m", settings)
+        assert TTSSegmentCache.key(
+            "Hello world.", "v", "m", settings
+        ) != TTSSegmentCache.key("Hello world.", "v", "m", {"stability": 0.8})
+
+    def test_lru_eviction_respects_size_budget(self, temp_directory):
+        cache = TTSSegmentCache(str(temp_directory / "cache"), max_bytes=250)
+        cache.put("a", b"x" * 100)
+        cache.put("b", b"x" * 100)
+        os.utime(temp_directory / "cache" / "a.mp3", (1, 1))
+        os.utime(temp_directory / "cache" / "b.mp3", (2, 2))
+
+        assert cache.get("a") is not None  # touch: "b" is now least recent
+        cache.put("c", b"x" * 100)
+
+        assert cache.contains("a")
+        assert not cache.contains("b")
+        assert cache.contains("c")
+
+    def test_reports_hit_and_billed_characters(
+        self, synthesizer, tts_server, temp_directory
+    ):
+        first = synthesizer.synthesize(SCRIPT, VOICE, temp_directory / "v1.mp3")
+        assert first["hit_characters"] == 0
+        assert first["billed_characters"] == first["characters"]
+
+        # Same intro and sign-off, one new story in the middle
+        edited = SCRIPT.replace("Second story", "Another story")
+        second = synthesizer.synthesize(edited, VOICE, temp_directory / "v2.mp3")
+        changed = next(
+            s for s in split_tts_segments(edited, 80) if "Another story" in s
+        )
+        assert second["billed_characters"] == len(changed)
+        assert second["hit_characters"] == second["characters"] - len(changed)
+
+    def test_repeated_segment_synthesized_once(
+        self, synthesizer, tts_server, temp_directory
+    ):
+        script = "Next, headline. ... Body one. ... Next, headline. ... Body two."
+        stats = synthesizer.synthesize(script, VOICE, temp_directory / "out.mp3")
+
+        assert stats["segments"] == 4
+        assert stats["synthesized_segments"] == 3
+        assert len(tts_server.requests) == 3
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Tests for the episode work queue: pricing, fair dequeue and claims
+"""
+
+import json
+import multiprocessing
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.datetime_utils import now_utc
+from utils.db import get_connection, journal_mode_from_env
+from utils.work_queue import (
+    DEFAULT_COST_SECONDS,
+    QueueItem,
+    QueueWorker,
+    WorkQueue,
+    fair_order,
+    parse_published,
+)
+
+
+@pytest.fixture
+def db_path(temp_directory):
+    path = str(temp_directory / "episodes.db")
+    conn = get_connection(path, validate_schema=False)
+    conn.executescript(
+        """
+        CREATE TABLE feeds (id INTEGER PRIMARY KEY, title TEXT, topic_category TEXT);
+        CREATE TABLE episodes (
+            id INTEGER PRIMARY KEY,
+            feed_id INTEGER,
+            published_date TEXT,
+            status TEXT,
+            topic_relevance_json TEXT,
+            digest_date TEXT,
+            created_at TEXT
+        );
+        """
+    )
+    conn.executemany(
+        "INSERT INTO feeds VALUES (?, ?, ?)",
+        [(1, "Daily Firehose", "technology"), (2, "Weekly Deep Dive", "technology")],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def add_episodes(db_path, rows):
+    """rows of (feed_id, hours_old, status, scores, digest_date)"""
+    conn = get_connection(db_path, validate_schema=False)
+    for feed_id, hours_old, status, scores, digest_date in rows:
+        published = (now_utc() - timedelta(hours=hours_old)).isoformat() + "Z"
+        scores_json = json.dumps(scores) if scores else None
+        conn.execute(
+            "INSERT INTO episodes (feed_id, published_date, status, "
+            "topic_relevance_json, digest_date) VALUES (?, ?, ?, ?, ?)",
+            (feed_id, published, status, scores_json, digest_date),
+        )
+    conn.commit()
+    conn.close()
+
+
+def item(pk, feed_id, topic="Tech", priority=0.5, weight=0.5, cost=None):
+    return QueueItem(pk, feed_id, topic, priority, 1.0, weight, 0.5, cost)
+
+
+class TestFairOrder:
+    def test_prolific_feed_does_not_monopolize(self):
+        firehose = [item(pk, 1, priority=0.9) for pk in range(1, 11)]
+        order = fair_order(firehose + [item(99, 2, priority=0.2)])
+
+        # The single low-priority episode is served in the first round
+        assert 99 in [i.episode_pk for i in order[:2]]
+
+    def test_topics_share_before_feeds(self):
+        tech = [item(feed * 10 + n, feed, "Tech") for feed in (1, 2, 3) for n in (0, 1)]
+        order = fair_order(tech + [item(99, 4, "Culture", priority=0.1)])
+
+        assert 99 in [i.episode_pk for i in order[:2]]
+
+    def test_feed_weight_and_cost_set_the_share(self):
+        heavy = [item(pk, 1, weight=0.9) for pk in range(1, 7)]
+        light = [item(pk, 2, weight=0.3) for pk in range(11, 17)]
+        first_eight = [i.feed_id for i in fair_order(heavy + light)[:8]]
+
+        # Three times the weight: three turns for each one the light feed gets
+        assert first_eight.count(1) == 6
+
+        cheap = [item(pk, 1, cost=DEFAULT_COST_SECONDS / 4) for pk in range(1, 9)]
+        costly = [item(pk, 2, cost=DEFAULT_COST_SECONDS) for pk in range(11, 19)]
+        first_five = [i.feed_id for i in fair_order(cheap + costly)[:5]]
+        assert first_five.count(1) == 4
+
+
+class TestWorkQueue:
+    def test_sync_prices_from_feed_history(self, db_path):
+        relevant = {"AI News": 0.9, "Culture": 0.1, "confidence": 0.8}
+        add_episodes(
+            db_path,
+            [
+                (1, 200, "digested", relevant, "2025-09-01"),
+                (1, 190, "digested", relevant, "2025-09-02"),
+                (2, 200, "transcribed", {"AI News": 0.1}, None),
+                (1, 2, "pending", None, None),
+                (2, 2, "pre-download", None, None),
+            ],
+        )
+
+        queue = WorkQueue(db_path)
+        assert queue.sync() == 2
+        plan = queue.plan()
+
+        assert [i.feed_id for i in plan] == [1, 2]
+        first, second = plan
+        assert first.topic == "AI News"
+        assert first.relevance == pytest.approx(0.9)
+        assert first.feed_weight > second.feed_weight
+        assert first.priority > second.priority
+        # No processing history yet, so the scheduler keeps its own estimate
+        assert first.cost_seconds is None
+
+    def test_claim_complete_and_resync(self, db_path):
+        add_episodes(db_path, [(1, 1, "pending", None, None)] * 3)
+        queue = WorkQueue(db_path)
+        queue.sync()
+        first, second, third = [i.episode_pk for i in queue.plan()]
+
+        assert queue.claim(first)
+        assert not queue.claim(first)
+        queue.complete(first, 120.0)
+        # A worker that died mid-episode: its lease has run out
+        assert queue.claim(second, "dead:1", lease_seconds=-1)
+
+        conn = get_connection(db_path, validate_schema=False)
+        update = "UPDATE episodes SET status = ? WHERE id = ?"
+        conn.execute(update, ("transcribed", first))
+        conn.execute(update, ("failed", third))
+        conn.commit()
+        conn.close()
+
+        assert queue.sync() == 1
+        plan = queue.plan()
+        # The stale claim is back, priced with the feed's recorded cost
+        assert [i.episode_pk for i in plan] == [second]
+        assert plan[0].cost_seconds == pytest.approx(120.0)
+
+
+def transcribe(db_path, worker_id, log_path):
+    """Stand-in for process_episode in a worker process"""
+
+    def process(episode_pk):
+        time.sleep(0.02)
+        conn = get_connection(db_path, validate_schema=False)
+        conn.execute(
+            "UPDATE episodes SET status = 'transcribed' WHERE id = ?", (episode_pk,)
+        )
+        conn.commit()
+        conn.close()
+        with open(log_path, "a") as log:
+            log.write(f"{episode_pk}\n")
+        return True
+
+    QueueWorker(WorkQueue(db_path), process, worker_id).run()
+
+
+class TestLeases:
+    def test_heartbeat_and_expired_lease_requeue(self, db_path):
+        add_episodes(db_path, [(1, 1, "pending", None, None)])
+        queue = WorkQueue(db_path)
+        queue.sync()
+
+        item = queue.claim_next("box-a:1")
+        assert queue.heartbeat(item.episode_pk, "box-a:1")
+        assert not queue.heartbeat(item.episode_pk, "box-b:2")
+        assert queue.claim_next("box-b:2") is None
+        queue.release(item.episode_pk, "box-a:1")
+
+        # box-a dies holding the lease
+        queue.claim(item.episode_pk, "box-a:1", lease_seconds=-1)
+        assert queue.sync() == 1
+        taken = queue.claim_next("box-b:2")
+        assert taken.episode_pk == item.episode_pk
+        assert not queue.heartbeat(item.episode_pk, "box-a:1")
+
+    def test_complete_after_lost_lease_is_dropped(self, db_path):
+        add_episodes(db_path, [(1, 1, "pending", None, None)])
+        queue = WorkQueue(db_path)
+        queue.sync()
+
+        # box-a stalls past its lease and box-b takes the episode over
+        item = queue.claim_next("box-a:1", lease_seconds=-1)
+        queue.sync()
+        assert queue.claim_next("box-b:2").episode_pk == item.episode_pk
+
+        assert not queue.complete(item.episode_pk, 30.0, worker="box-a:1")
+        assert queue.heartbeat(item.episode_pk, "box-b:2")
+        assert queue.complete(item.episode_pk, 30.0, worker="box-b:2")
+
+    def test_claims_rotate_between_feeds(self, db_path):
+        add_episodes(
+            db_path,
+            [(1, 1, "pending", None, None)] * 5 + [(2, 30, "pending", None, None)],
+        )
+        queue = WorkQueue(db_path)
+        queue.sync()
+
+        claimed = [queue.claim_next(f"w{n}:1").feed_id for n in range(3)]
+
+        # Each claim replans, yet the older episode of feed 2 is not starved
+        assert 2 in claimed[:2]
+
+    def test_workers_in_separate_processes(self, db_path, temp_directory):
+        rows = [(feed, 1, "pending", None, None) for feed in (1, 2)]
+        add_episodes(db_path, rows * 8)
+        WorkQueue(db_path).sync()
+
+        context = multiprocessing.get_context("spawn")
+        log_path = str(temp_directory / "processed.log")
+        workers = [
+            context.Process(target=transcribe, args=(db_path, f"box:{n}", log_path))
+            for n in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+        processed = Path(log_path).read_text().split()
+        assert sorted(map(int, processed)) == list(range(1, 17))
+
+        status = {w["worker_id"]: w for w in WorkQueue(db_path).workers()}
+        assert set(status) == {"box:0", "box:1", "box:2"}
+        assert sum(worker["processed"] for worker in status.values()) == 16
+        assert not any(worker["alive"] for worker in status.values())
+
+
+class TestJournalMode:
+    def test_valid_modes_and_fallback(self, caplog):
+        assert journal_mode_from_env(None) == "WAL"
+        assert journal_mode_from_env("delete") == "DELETE"
+        assert journal_mode_from_env("WAL; DROP TABLE episodes") == "WAL"
+        assert "Invalid PODCAST_DB_JOURNAL_MODE" in caplog.text
+
+
+class TestParsePublished:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2025-09-05T03:04:14+00:00Z",
+            "2025-09-05T03:04:14Z",
+            "2025-09-05T03:04:14",
+            "Fri, 05 Sep 2025 03:04:14 +0000",
+        ],
+    )
+    def test_formats(self, value):
+        parsed = parse_published(value)
+        assert parsed.isoformat() == "2025-09-05T03:04:14+00:00"
+
+    def test_garbage(self):
+        assert parse_published("yesterday") is None
+        assert parse_published(None) is None
+
+
+class TestProcessAllPending:
+    def test_processes_queued_episodes_in_fair_order(self, db_path, monkeypatch):
+        from content_processor import ContentProcessor
+
+        add_episodes(
+            db_path,
+            [(1, 1, "pending", None, None)] * 3 + [(2, 30, "pending", None, None)],
+        )
+        processor = ContentProcessor.__new__(ContentProcessor)
+        processor.db_path = db_path
+        processed = []
+
+        def process_episode(episode_pk):
+            processed.append(episode_pk)
+            conn = get_connection(db_path, validate_schema=False)
+            conn.execute(
+                "UPDATE episodes SET status = 'transcribed' WHERE id = ?",
+                (episode_pk,),
+            )
+            conn.commit()
+            conn.close()
+            return {"id": episode_pk}
+
+        monkeypatch.setattr(processor, "process_episode", process_episode)
+
+        results = processor.process_all_pending()
+
+        assert sorted(processed) == [1, 2, 3, 4]
+        # Feed 2's older episode is served in the first round, not last
+        assert 4 in processed[:2]
+        assert [r["id"] for r in results] == processed
+        assert WorkQueue(db_path).plan() == []
+
+    def test_failed_episode_goes_back_to_the_queue(self, db_path, monkeypatch):
+        from content_processor import ContentProcessor
+
+        add_episodes(db_path, [(1, 1, "pending", None, None)])
+        processor = ContentProcessor.__new__(ContentProcessor)
+        processor.db_path = db_path
+
+        def process_episode(episode_pk):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(processor, "process_episode", process_episode)
+
+        with pytest.raises(RuntimeError):
+            processor.process_all_pending()
+
+        # Released at once, not left claimed until the lease runs out
+        assert [item.episode_pk for item in WorkQueue(db_path).plan()] == [1]
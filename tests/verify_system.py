@@ -214,25 +214,19 @@ class SystemVerificationSuite:
 
         # B.3: Per-episode summaries
         try:
-            # Check if map summaries are stored
-            summaries_dir = Path("telemetry/map_summaries")
-            if summaries_dir.exists():
-                summary_files = list(summaries_dir.glob("*.json"))
-                if summary_files:
-                    # Read a sample summary
-                    sample_file = summary_files[0]
-                    with open(sample_file) as f:
-                        sample_data = json.load(f)
-
-                    self.evidence["episode_summaries"] = {
-                        "storage_location": str(summaries_dir),
-                        "retention_days": 14,
-                        "sample_file": sample_file.name,
-                        "sample_content": sample_data,
-                        "token_count": sample_data.get("token_count", 0),
-                        "analysis": f"Map summaries stored for 14-day retention, sample has {sample_data.get('token_count', 0)} tokens",
-                    }
-                    logger.info("✅ Episode summaries storage verified")
+            # Check if map summaries are stored (telemetry history store)
+            store = telemetry.history()
+            samples = store.recent_map_summaries(limit=1)
+            if samples:
+                sample_data = samples[0]
+                self.evidence["episode_summaries"] = {
+                    "storage_location": f"{store.db_path}:map_summaries",
+                    "retention_days": 14,
+                    "sample_content": sample_data,
+                    "token_count": sample_data.get("token_count") or 0,
+                    "analysis": f"Map summaries stored for 14-day retention, sample has {sample_data.get('token_count') or 0} tokens",
+                }
+                logger.info("✅ Episode summaries storage verified")
 
         except Exception as e:
             logger.error(f"❌ Episode summaries check failed: {e}")
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Segmented TTS Synthesizer
+Splits a TTS script into paragraph/sentence segments, synthesizes them concurrently
+with ElevenLabs under a rate limit, and concatenates the MP3 frames in order
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from utils.logging_setup import configure_logging
+from utils.mp3_info import audio_start, parse_frame_header
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Paragraph boundaries survive _optimize_for_tts as "..." pause markers
+PARAGRAPH_BREAK = re.compile(r"(?<=\.\.\.)\s+")
+SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+")
+
+# HTTP statuses worth retrying for a single segment
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def split_tts_segments(text: str, max_chars: int) -> List[str]:
+    """Split a TTS script into segments of at most max_chars
+
+    Each paragraph becomes its own segment so an edit only changes the segments
+    it touches; paragraphs over the budget are packed sentence by sentence.
+    """
+    segments = []
+    for paragraph in PARAGRAPH_BREAK.split(text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+
+        current = ""
+        for sentence in SENTENCE_BREAK.split(paragraph):
+            # A single sentence over the budget is split at word boundaries
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if current:
+                    segments.append(current)
+                    current = ""
+                segments.append(sentence[:cut].strip())
+                sentence = sentence[cut:].strip()
+
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                segments.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}".strip()
+        if current:
+            segments.append(current)
+
+    return segments
+
+
+def strip_mp3_container(data: bytes) -> bytes:
+    """Return just the audio frames of an MP3 segment
+
+    Drops ID3v2/ID3v1 tags and a leading Xing/Info/VBRI frame, whose frame
+    count would describe the segment rather than the concatenated episode.
+    """
+    start = audio_start(data)
+
+    end = len(data)
+    if end - start >= 128 and data[end - 128 : end - 125] == b"TAG":
+        end -= 128
+
+    header = parse_frame_header(data, start)
+    if header:
+        first_frame = data[start : start + header["length"]]
+        if any(marker in first_frame for marker in (b"Xing", b"Info", b"VBRI")):
+            start += header["length"]
+
+    return data[start:end]
+
+
+class RateLimiter:
+    """Spaces request starts at no more than `rate` per second across threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class TTSSegmentCache:
+    """Content-addressed store of synthesized segment audio with an LRU size budget
+
+    Keys cover the normalized text, voice_id, model_id and voice_settings. File
+    mtimes track recency: hits touch the file, eviction removes the oldest.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.mp3"))
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Canonical form of a segment so equivalent text maps to one entry"""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @staticmethod
+    def key(text: str, voice_id: str, model_id: str, voice_settings: Dict) -> str:
+        payload = json.dumps(
+            [TTSSegmentCache.normalize_text(text), voice_id, model_id, voice_settings],
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.mp3"
+
+    def contains(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio and mark it recently used"""
+        path = self._path(key)
+        try:
+            audio = path.read_bytes()
+            os.utime(path)
+            return audio
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, audio: bytes):
+        """Store audio atomically, then evict least recently used entries over budget"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(audio)
+        with self._lock:
+            existed = path.exists()
+            previous = path.stat().st_size if existed else 0
+            os.replace(tmp_path, path)
+            self._total_bytes += len(audio) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry in self.cache_dir.glob("*.mp3"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        entries.sort()
+
+        self._total_bytes = sum(size for _, size, _ in entries)
+        evicted = 0
+        # Keep the newest entry even if it alone exceeds the budget
+        for _, size, entry in entries[:-1]:
+            if self._total_bytes <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            self._total_bytes -= size
+            evicted += 1
+        if evicted:
+            logger.info(
+                f"🧹 TTS cache evicted {evicted} segments "
+                f"({self._total_bytes / 1_048_576:.1f} MB kept)"
+            )
+
+
+class SegmentedTTSSynthesizer:
+    """Concurrent, cached, per-segment ElevenLabs synthesis"""
+
+    def __init__(
+        self, api_key: str, settings: Dict, cache: Optional[TTSSegmentCache] = None
+    ):
+        self.api_key = api_key
+        self.base_url = settings["base_url"].rstrip("/")
+        self.model_id = settings["model_id"]
+        self.timeout = settings["timeout_seconds"]
+        self.max_chars = settings["segment_max_chars"]
+        self.max_workers = max(1, settings["max_parallel_segments"])
+        self.max_retries = max(1, settings["segment_retries"])
+        self.rate_limiter = RateLimiter(settings["requests_per_second"])
+        # Caps in-flight requests across concurrent synthesize() calls (topics)
+        self._in_flight = threading.BoundedSemaphore(self.max_workers)
+        self.cache = cache or TTSSegmentCache(
+            settings["segment_cache_dir"],
+            settings["segment_cache_max_mb"] * 1_048_576,
+        )
+
+    def _voice_settings(self, voice_config: Dict) -> Dict:
+        return {
+            "stability": voice_config.get("stability", 0.75),
+            "similarity_boost": voice_config.get("similarity_boost", 0.75),
+            "style": voice_config.get("style", 0.20),
+            "use_speaker_boost": True,
+        }
+
+    def _synthesize_segment(
+        self, index: int, text: str, voice_id: str, voice_settings: Dict
+    ) -> bytes:
+        """Synthesize one segment, retrying transient failures"""
+        url = f"{self.base_url}/text-to-speech/{voice_id}/stream"
+        headers = {"xi-api-key": self.api_key, "Content-Type": "application/json"}
+        data = {
+            "text": text,
+            "model_id": self.model_id,
+            "voice_settings": voice_settings,
+        }
+
+        for attempt in range(1, self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                with self._in_flight:
+                    response = requests.post(
+                        url, headers=headers, json=data, timeout=self.timeout
+                    )
+                if response.status_code in RETRYABLE_STATUS:
+                    raise requests.exceptions.HTTPError(
+                        f"{response.status_code} from TTS API", response=response
+                    )
+                response.raise_for_status()
+                if not response.content:
+                    raise ValueError("empty audio response")
+                return response.content
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.HTTPError,
+                ValueError,
+            ) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                retryable = status is None or status in RETRYABLE_STATUS
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = 0.5 * (2 ** (attempt - 1)) + random.random() * 0.25
+                logger.warning(
+                    f"⚠️  TTS segment {index} failed (attempt {attempt}/{self.max_retries}): "
+                    f"{e} - retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+        raise RuntimeError(f"TTS segment {index} failed")  # Not reached
+
+    def _load_or_synthesize(
+        self, index: int, key: str, text: str, voice_id: str, voice_settings: Dict
+    ) -> bytes:
+        audio = self.cache.get(key)
+        if audio is not None:
+            return audio
+
+        audio = self._synthesize_segment(index, text, voice_id, voice_settings)
+        self.cache.put(key, audio)
+        return audio
+
+    def synthesize(
+        self, text: str, voice_config: Dict, output_path: Path
+    ) -> Optional[Dict]:
+        """Synthesize text into output_path; None if any segment failed"""
+        rendered = self.synthesize_audio(text, voice_config, output_path.name)
+        if not rendered:
+            return None
+
+        audio, stats = rendered
+        tmp_path = output_path.with_suffix(".partial")
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, output_path)
+        return {"path": str(output_path), **stats}
+
+    def synthesize_audio(
+        self, text: str, voice_config: Dict, label: str
+    ) -> Optional[Tuple[bytes, Dict]]:
+        """Synthesize text to in-memory MP3 bytes; None if any segment failed"""
+        start_time = time.time()
+        segments = [
+            TTSSegmentCache.normalize_text(segment)
+            for segment in split_tts_segments(text, self.max_chars)
+        ]
+        if not segments:
+            logger.warning(f"⚠️  No text to synthesize for {label}")
+            return None
+
+        voice_id = voice_config["voice_id"]
+        voice_settings = self._voice_settings(voice_config)
+        keys = [
+            TTSSegmentCache.key(segment, voice_id, self.model_id, voice_settings)
+            for segment in segments
+        ]
+
+        # Repeated segments (e.g. recurring headers) are synthesized once
+        unique = {}
+        for index, key in enumerate(keys):
+            unique.setdefault(key, index)
+        cached_keys = {key for key in unique if self.cache.contains(key)}
+        billed_characters = sum(
+            len(segments[index])
+            for key, index in unique.items()
+            if key not in cached_keys
+        )
+        total_characters = sum(len(segment) for segment in segments)
+        logger.info(
+            f"🎙️  Synthesizing {label}: {len(segments)} segments "
+            f"({len(unique) - len(cached_keys)} to synthesize), "
+            f"max {self.max_chars} chars, {self.max_workers} parallel"
+        )
+
+        audio_by_key: Dict[str, bytes] = {}
+        failed = []
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tts-segment"
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self._load_or_synthesize,
+                    index,
+                    key,
+                    segments[index],
+                    voice_id,
+                    voice_settings,
+                ): (key, index)
+                for key, index in unique.items()
+            }
+            for future in as_completed(futures):
+                key, index = futures[future]
+                try:
+                    audio_by_key[key] = future.result()
+                except Exception as e:
+                    logger.error(f"❌ TTS segment {index} failed for {label}: {e}")
+                    failed.append(index)
+
+        if failed:
+            # Successful segments stay cached, so a rerun only retries these
+            logger.error(
+                f"❌ {len(failed)}/{len(unique)} segments failed for {label}: "
+                f"{sorted(failed)}"
+            )
+            return None
+
+        # Frames are copied as-is (no re-encode); per-segment tags are dropped
+        audio = b"".join(strip_mp3_container(audio_by_key[key]) for key in keys)
+
+        return audio, {
+            "segments": len(segments),
+            "cached_segments": len(segments) - (len(unique) - len(cached_keys)),
+            "synthesized_segments": len(unique) - len(cached_keys),
+            "characters": total_characters,
+            "hit_characters": total_characters - billed_characters,
+            "billed_characters": billed_characters,
+            "wall_ms": int((time.time() - start_time) * 1000),
+        }
@@ -5,6 +5,7 @@ Centralized connection management with enforced foreign key integrity
 """
 
 import logging
+import os
 import sqlite3
 import threading
 from contextlib import contextmanager
@@ -16,6 +17,25 @@ logger = logging.getLogger(__name__)
 # Schema version tracking
 EXPECTED_SCHEMA_VERSION = 2
 
+# WAL needs shared memory between processes, so a database that workers on
+# several hosts open over a network filesystem must use DELETE
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+
+
+def journal_mode_from_env(value: Optional[str]) -> str:
+    """PODCAST_DB_JOURNAL_MODE as a SQLite journal mode (WAL if unset or invalid)"""
+    mode = (value or "WAL").strip().upper()
+    if mode not in JOURNAL_MODES:
+        logger.warning(
+            f"Invalid PODCAST_DB_JOURNAL_MODE '{value}', using WAL "
+            f"(expected one of {', '.join(JOURNAL_MODES)})"
+        )
+        return "WAL"
+    return mode
+
+
+JOURNAL_MODE = journal_mode_from_env(os.getenv("PODCAST_DB_JOURNAL_MODE"))
+
 
 class DatabaseConnectionFactory:
     """
@@ -91,7 +111,7 @@ class DatabaseConnectionFactory:
         conn.execute("PRAGMA foreign_keys = ON")
 
         # Performance and durability settings
-        conn.execute("PRAGMA journal_mode = WAL")  # Better concurrency
+        conn.execute(f"PRAGMA journal_mode = {JOURNAL_MODE}")  # WAL: better concurrency
         conn.execute("PRAGMA synchronous = NORMAL")  # Balance durability/performance
         conn.execute("PRAGMA busy_timeout = 30000")  # 30 seconds for concurrent access
 
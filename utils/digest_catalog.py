@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Digest Artifact Catalog
+Indexes the files in daily_digests/ (digest markdown, TTS script, MP3,
+enhanced MP3, JSON metadata) per digest so the TTS generator, deployer and
+RSS generators query a table instead of globbing and regex-matching the
+whole directory on every call.
+"""
+
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.db import get_connection
+from utils.mp3_info import get_mp3_info
+
+logger = logging.getLogger(__name__)
+
+# Kept in a subdirectory: writes to the database (and its WAL files) then
+# leave the digests directory mtime, which sync() relies on, untouched
+CATALOG_PATH = Path(".catalog") / "digest_catalog.db"
+LEGACY_TOPIC = "complete_topic"
+
+# {topic}_digest_[tts_]{timestamp}[_enhanced].{ext}
+_ARTIFACT_PATTERN = re.compile(
+    r"^([A-Za-z0-9_-]+)_digest_(tts_)?(\d{8}_\d{6})(_enhanced)?\.(md|txt|mp3|json)$"
+)
+
+# Artifact kind -> catalog column
+ARTIFACT_COLUMNS = {
+    "md": "md_file",
+    "tts_script": "tts_script_file",
+    "mp3": "mp3_file",
+    "enhanced_mp3": "enhanced_mp3_file",
+    "metadata": "metadata_file",
+}
+
+
+def classify_artifact(filename: str) -> Optional[Tuple[str, str, str]]:
+    """(topic, timestamp, kind) for a digest artifact name, else None"""
+    match = _ARTIFACT_PATTERN.match(filename)
+    if not match:
+        return None
+    topic, tts, timestamp, enhanced, ext = match.groups()
+    if tts:
+        kind = "tts_script" if ext == "txt" and not enhanced else None
+    elif ext == "mp3":
+        kind = "enhanced_mp3" if enhanced else "mp3"
+    elif enhanced or ext == "txt":
+        kind = None
+    else:
+        kind = "metadata" if ext == "json" else "md"
+    if kind is None:
+        return None
+    return topic, timestamp, kind
+
+
+class DigestCatalog:
+    """SQLite catalog of digest artifacts, one row per {topic}_{timestamp}
+
+    The catalog lives next to the digests it describes and is a rebuildable
+    cache, never the source of truth. sync() skips the directory entirely
+    while its mtime is unchanged and otherwise classifies only the names it
+    has not seen (and clears the ones that disappeared); producers call
+    record_artifact() right after writing so the row is current immediately.
+    """
+
+    def __init__(
+        self,
+        digests_dir: Union[str, Path] = "daily_digests",
+        db_path: Optional[Union[str, Path]] = None,
+    ):
+        self.digests_dir = Path(digests_dir)
+        self.db_path = Path(db_path or self.digests_dir / CATALOG_PATH)
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        if not self._schema_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_connection(str(self.db_path), validate_schema=False)
+        if not self._schema_ready:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS digest_artifacts (
+                    file_key TEXT PRIMARY KEY,
+                    topic TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    md_file TEXT,
+                    tts_script_file TEXT,
+                    mp3_file TEXT,
+                    enhanced_mp3_file TEXT,
+                    metadata_file TEXT,
+                    mp3_size INTEGER,
+                    duration_seconds REAL,
+                    deployed_release TEXT,
+                    deployed_at TEXT,
+                    updated_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_digest_artifacts_timestamp
+                    ON digest_artifacts(timestamp);
+                CREATE TABLE IF NOT EXISTS catalog_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+            self._schema_ready = True
+        return conn
+
+    def sync(self) -> int:
+        """Bring the catalog up to date with the directory; returns names changed"""
+        if not self.digests_dir.exists():
+            return 0
+
+        with self._lock:
+            dir_mtime = str(self.digests_dir.stat().st_mtime_ns)
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT value FROM catalog_state WHERE key = 'dir_mtime_ns'"
+                ).fetchone()
+                if row and row[0] == dir_mtime:
+                    return 0
+
+                with os.scandir(self.digests_dir) as entries:
+                    names = {
+                        entry.name
+                        for entry in entries
+                        if "_digest_" in entry.name and entry.is_file()
+                    }
+                known = set()
+                for row in conn.execute(
+                    f"SELECT {', '.join(ARTIFACT_COLUMNS.values())} "
+                    "FROM digest_artifacts"
+                ):
+                    known.update(name for name in row if name)
+
+                added = [name for name in names - known if self._record(conn, name)]
+                removed = known - names
+                for name in removed:
+                    self._forget(conn, name)
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO catalog_state (key, value) "
+                    "VALUES ('dir_mtime_ns', ?)",
+                    (dir_mtime,),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        if added or removed:
+            logger.debug(f"📇 Digest catalog: {len(added)} new, {len(removed)} removed")
+        return len(added) + len(removed)
+
+    def record_artifact(self, path: Union[str, Path]) -> Optional[str]:
+        """Catalog a file the caller just wrote; returns its digest key"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                file_key = self._record(conn, Path(path).name)
+                conn.commit()
+                return file_key
+            finally:
+                conn.close()
+
+    def _record(self, conn, name: str) -> Optional[str]:
+        parsed = classify_artifact(name)
+        if not parsed:
+            return None
+        topic, timestamp, kind = parsed
+        file_key = f"{topic}_{timestamp}"
+        column = ARTIFACT_COLUMNS[kind]
+
+        conn.execute(
+            "INSERT OR IGNORE INTO digest_artifacts (file_key, topic, timestamp) "
+            "VALUES (?, ?, ?)",
+            (file_key, topic, timestamp),
+        )
+        conn.execute(
+            f"UPDATE digest_artifacts SET {column} = ?, updated_at = ? "
+            "WHERE file_key = ?",
+            (name, datetime.now().isoformat(), file_key),
+        )
+        if kind in ("mp3", "enhanced_mp3"):
+            self._record_audio(conn, file_key, self.digests_dir / name)
+        return file_key
+
+    def _record_audio(self, conn, file_key: str, path: Path):
+        """Size and exact duration of the episode audio (enhanced preferred)"""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        if not path.stem.endswith("_enhanced"):
+            row = conn.execute(
+                "SELECT enhanced_mp3_file FROM digest_artifacts WHERE file_key = ?",
+                (file_key,),
+            ).fetchone()
+            if row and row[0]:
+                return
+        info = get_mp3_info(path)
+        conn.execute(
+            "UPDATE digest_artifacts SET mp3_size = ?, duration_seconds = ? "
+            "WHERE file_key = ?",
+            (size, info["duration_seconds"] if info else None, file_key),
+        )
+
+    def _forget(self, conn, name: str):
+        parsed = classify_artifact(name)
+        if not parsed:
+            return
+        topic, timestamp, kind = parsed
+        file_key = f"{topic}_{timestamp}"
+        conn.execute(
+            f"UPDATE digest_artifacts SET {ARTIFACT_COLUMNS[kind]} = NULL "
+            "WHERE file_key = ?",
+            (file_key,),
+        )
+        empty = " AND ".join(f"{col} IS NULL" for col in ARTIFACT_COLUMNS.values())
+        conn.execute(
+            f"DELETE FROM digest_artifacts WHERE file_key = ? AND {empty}", (file_key,)
+        )
+
+    def mark_deployed(self, file_key: str, release_tag: Optional[str]):
+        """Record (or with None, clear) the GitHub release holding a digest"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE digest_artifacts SET deployed_release = ?, "
+                    "deployed_at = ? WHERE file_key = ?",
+                    (
+                        release_tag,
+                        datetime.now().isoformat() if release_tag else None,
+                        file_key,
+                    ),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def entries(
+        self,
+        since: Optional[datetime] = None,
+        require_md: bool = False,
+        missing_mp3: bool = False,
+        require_audio: bool = False,
+        undeployed: bool = False,
+    ) -> List[Dict]:
+        """Catalog rows (oldest first) after syncing with the directory
+
+        Each entry carries Path objects for the artifacts it has, plus
+        "audio_file": the enhanced MP3, else the standard MP3, else the MP3
+        of a legacy complete_topic digest with the same timestamp.
+        """
+        self.sync()
+
+        conditions = []
+        params = []
+        if since:
+            conditions.append("a.timestamp >= ?")
+            params.append(since.strftime("%Y%m%d_%H%M%S"))
+        if require_md:
+            conditions.append("a.md_file IS NOT NULL")
+        if missing_mp3:
+            conditions.append("a.mp3_file IS NULL")
+        if undeployed:
+            conditions.append("a.deployed_release IS NULL")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"""
+                SELECT a.file_key, a.topic, a.timestamp, a.md_file,
+                       a.tts_script_file, a.mp3_file, a.enhanced_mp3_file,
+                       a.metadata_file, a.mp3_size, a.duration_seconds,
+                       a.deployed_release, l.enhanced_mp3_file, l.mp3_file
+                FROM digest_artifacts a
+                LEFT JOIN digest_artifacts l
+                    ON l.file_key = '{LEGACY_TOPIC}_' || a.timestamp
+                    AND a.topic != '{LEGACY_TOPIC}'
+                {where}
+                ORDER BY a.timestamp, a.topic
+                """,
+                params,
+            ).fetchall()
+        finally:
+            conn.close()
+
+        results = []
+        for row in rows:
+            try:
+                file_date = datetime.strptime(row[2], "%Y%m%d_%H%M%S")
+            except ValueError:
+                continue
+            entry = {
+                "file_key": row[0],
+                "topic": row[1],
+                "timestamp": row[2],
+                "date": file_date,
+                "mp3_size": row[8],
+                "duration_seconds": row[9],
+                "deployed_release": row[10],
+            }
+            for index, column in enumerate(ARTIFACT_COLUMNS.values(), start=3):
+                entry[column] = self.digests_dir / row[index] if row[index] else None
+            audio_name = row[6] or row[5] or row[11] or row[12]
+            entry["audio_file"] = self.digests_dir / audio_name if audio_name else None
+            if require_audio and entry["audio_file"] is None:
+                continue
+            results.append(entry)
+        return results
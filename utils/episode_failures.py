@@ -2,20 +2,34 @@
 """
 Failed Episode Lifecycle Management
 Provides comprehensive retry logic and failure tracking for podcast episodes
+
+Retry state lives in two episodes columns written at failure time:
+failure_category and next_retry_at (failure time plus the category's delay,
+doubling with each attempt). Picking retry candidates is one indexed query,
+and retries run on a small thread pool with per-category concurrency slots.
 """
 
 import logging
+import os
 import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 from utils.datetime_utils import now_utc
 from utils.db import get_connection
+from utils.tracing import tracer
 
 # Configuration - removed dependency on config module to avoid conflicts
 DB_TIMEOUT = 30  # seconds
+RETRY_MAX_WORKERS = int(os.getenv("RETRY_MAX_WORKERS", "4"))
+
+# Retry state columns on episodes, added on first use
+RETRY_COLUMNS = {"failure_category": "TEXT", "next_retry_at": "TIMESTAMP"}
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +51,66 @@ class FailureManager:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._retry_columns_ready = False
+
+    def _connect(self):
+        """Connection with the retry state columns in place"""
+        conn = get_connection(self.db_path)
+        if not self._retry_columns_ready:
+            self._ensure_retry_columns(conn)
+            self._retry_columns_ready = True
+        return conn
+
+    def _ensure_retry_columns(self, conn):
+        """Add failure_category/next_retry_at and backfill failed episodes"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(episodes)")}
+        missing = [column for column in RETRY_COLUMNS if column not in columns]
+        for column in missing:
+            conn.execute(
+                f"ALTER TABLE episodes ADD COLUMN {column} {RETRY_COLUMNS[column]}"
+            )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_episodes_next_retry
+            ON episodes(next_retry_at) WHERE next_retry_at IS NOT NULL
+        """
+        )
+        if missing:
+            # Rows that failed before the columns existed
+            rows = conn.execute(
+                """
+                SELECT id, failure_reason, retry_count FROM episodes
+                WHERE status != 'failed'
+                  AND retry_count > 0
+                  AND failure_timestamp IS NOT NULL
+            """
+            ).fetchall()
+            for db_id, failure_reason, retry_count in rows:
+                category = self._extract_failure_category(failure_reason)
+                delay = self.retry_delay(category, retry_count)
+                conn.execute(
+                    """
+                    UPDATE episodes
+                    SET failure_category = ?,
+                        next_retry_at = CASE WHEN ? IS NULL THEN NULL
+                            ELSE datetime(failure_timestamp, ?) END
+                    WHERE id = ?
+                """,
+                    (category, delay, f"+{delay} seconds", db_id),
+                )
+            self.logger.info(
+                f"✅ Added retry state columns ({len(rows)} failed episodes backfilled)"
+            )
+        conn.commit()
+
+    def retry_delay(self, category: str, retry_count: int) -> Optional[int]:
+        """Seconds until the next retry, or None when retries are used up"""
+        config = self.FAILURE_CATEGORIES.get(category, {})
+        if retry_count >= config.get("max_retries", self.MAX_RETRY_ATTEMPTS):
+            return None
+        # Exponential backoff from the category's base delay
+        delay = config.get("retry_delay", 300) * 2 ** max(retry_count - 1, 0)
+        return min(delay, self.RETRY_DELAYS[-1])
 
     def log_episode_failure(
         self,
@@ -47,7 +121,7 @@ class FailureManager:
     ) -> bool:
         """Log episode failure with categorization and retry tracking"""
         try:
-            conn = get_connection(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             # Get current failure info - using episode.id for proper FK relationship
@@ -83,6 +157,14 @@ class FailureManager:
             if current_reason:
                 full_reason = f"{current_reason}; {full_reason}"
 
+            # Retry state is decided now, so candidate selection needs no parsing
+            retry_category = failure_category
+            if retry_category not in self.FAILURE_CATEGORIES:
+                retry_category = self._extract_failure_category(full_reason)
+            delay = None
+            if final_status != "failed":
+                delay = self.retry_delay(retry_category, new_retry_count)
+
             # Update episode with failure information
             cursor.execute(
                 """
@@ -90,10 +172,21 @@ class FailureManager:
                 SET failure_reason = ?,
                     failure_timestamp = datetime('now'),
                     retry_count = ?,
-                    status = ?
+                    status = ?,
+                    failure_category = ?,
+                    next_retry_at = CASE WHEN ? IS NULL THEN NULL
+                        ELSE datetime('now', ?) END
                 WHERE id = ?
             """,
-                (full_reason, new_retry_count, final_status, db_id),
+                (
+                    full_reason,
+                    new_retry_count,
+                    final_status,
+                    retry_category,
+                    delay,
+                    f"+{delay} seconds",
+                    db_id,
+                ),
             )
 
             # Log failure to episode_failures table for detailed tracking
@@ -225,76 +318,41 @@ class FailureManager:
             "✅ Created episode_failures table with Option A schema and indexes"
         )
 
-    def get_retry_candidates(self) -> List[Dict]:
-        """Get episodes eligible for retry based on failure category and timing"""
+    def get_retry_candidates(self, limit: Optional[int] = None) -> List[Dict]:
+        """Get episodes whose next_retry_at has passed, most overdue first"""
         try:
-            conn = get_connection(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
-            retry_candidates = []
-            current_time = now_utc()
-
-            # Get episodes that failed but haven't exceeded max retries
+            # Served by idx_episodes_next_retry; exhausted episodes have no
+            # next_retry_at, so the per-category max_retries is already applied
             cursor.execute(
                 """
-                SELECT id, episode_id, title, failure_reason, failure_timestamp,
-                       retry_count, status, audio_url
+                SELECT id, episode_id, title, failure_reason, failure_category,
+                       retry_count, status, audio_url,
+                       (julianday('now') - julianday(failure_timestamp)) * 86400
                 FROM episodes
-                WHERE status != 'failed'
-                  AND retry_count > 0
-                  AND failure_timestamp IS NOT NULL
-                ORDER BY failure_timestamp DESC
-            """
+                WHERE next_retry_at IS NOT NULL
+                  AND next_retry_at <= datetime('now')
+                  AND status != 'failed'
+                ORDER BY next_retry_at
+                LIMIT ?
+            """,
+                (-1 if limit is None else limit,),
             )
 
-            for row in cursor.fetchall():
-                (
-                    db_id,
-                    episode_id,
-                    title,
-                    failure_reason,
-                    failure_timestamp,
-                    retry_count,
-                    status,
-                    audio_url,
-                ) = row
-
-                # Parse failure timestamp
-                try:
-                    failure_time = datetime.fromisoformat(
-                        failure_timestamp.replace("Z", "+00:00")
-                    )
-                except:
-                    # Fallback for different timestamp formats
-                    failure_time = datetime.strptime(
-                        failure_timestamp, "%Y-%m-%d %H:%M:%S"
-                    )
-
-                # Determine failure category and retry configuration
-                failure_category = self._extract_failure_category(failure_reason)
-                category_config = self.FAILURE_CATEGORIES.get(failure_category, {})
-                max_retries = category_config.get(
-                    "max_retries", self.MAX_RETRY_ATTEMPTS
-                )
-                retry_delay = category_config.get("retry_delay", 300)
-
-                # Check if episode is eligible for retry
-                if retry_count < max_retries:
-                    time_since_failure = (current_time - failure_time).total_seconds()
-                    if time_since_failure >= retry_delay:
-                        retry_candidates.append(
-                            {
-                                "db_id": db_id,
-                                "episode_id": episode_id,
-                                "title": title,
-                                "failure_reason": failure_reason,
-                                "failure_category": failure_category,
-                                "retry_count": retry_count,
-                                "status": status,
-                                "audio_url": audio_url,
-                                "time_since_failure": time_since_failure,
-                            }
-                        )
+            columns = (
+                "db_id",
+                "episode_id",
+                "title",
+                "failure_reason",
+                "failure_category",
+                "retry_count",
+                "status",
+                "audio_url",
+                "time_since_failure",
+            )
+            retry_candidates = [dict(zip(columns, row)) for row in cursor.fetchall()]
 
             conn.close()
 
@@ -347,7 +405,7 @@ class FailureManager:
     ) -> bool:
         """Mark episode as recovered and update failure tracking"""
         try:
-            conn = get_connection(self.db_path)
+            conn = self._connect()
             cursor = conn.cursor()
 
             # Clear failure information from episodes table
@@ -355,7 +413,9 @@ class FailureManager:
                 """
                 UPDATE episodes
                 SET failure_reason = NULL,
-                    failure_timestamp = NULL
+                    failure_timestamp = NULL,
+                    failure_category = NULL,
+                    next_retry_at = NULL
                 WHERE episode_id = ?
             """,
                 (episode_id,),
@@ -508,22 +568,52 @@ class FailureManager:
 class RetryProcessor:
     """Processes retry candidates through the appropriate pipeline stages"""
 
-    def __init__(self, db_path: str):
+    # Retries in flight per category; local ASR runs one at a time
+    CATEGORY_CONCURRENCY = {"download": 4, "transcription": 1, "scoring": 2}
+
+    def __init__(self, db_path: str, max_workers: int = RETRY_MAX_WORKERS):
         self.db_path = db_path
+        self.max_workers = max_workers
         self.failure_manager = FailureManager(db_path)
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self._slots = {
+            category: threading.BoundedSemaphore(limit)
+            for category, limit in self.CATEGORY_CONCURRENCY.items()
+        }
+        self._processor = None
+        self._processor_lock = threading.Lock()
+
+    @contextmanager
+    def _slot(self, category: str):
+        """Hold one of the category's concurrency slots"""
+        slot = self._slots.get(category)
+        if slot is None:
+            yield
+            return
+        with slot:
+            yield
+
+    def _get_processor(self):
+        """One ContentProcessor (and ASR model) shared by all retry threads"""
+        with self._processor_lock:
+            if self._processor is None:
+                # Import processors here to avoid circular imports
+                from content_processor import ContentProcessor
+
+                self._processor = ContentProcessor(self.db_path)
+            return self._processor
 
     def process_retry_queue(self, max_retries_per_run: int = 5) -> Dict:
         """Process episodes in retry queue through appropriate pipeline stages"""
-        retry_candidates = self.failure_manager.get_retry_candidates()
+        # Limit retries per run to prevent overwhelming the system
+        candidates_to_process = self.failure_manager.get_retry_candidates(
+            limit=max_retries_per_run
+        )
 
-        if not retry_candidates:
+        if not candidates_to_process:
             self.logger.info("🔄 No episodes eligible for retry")
             return {"processed": 0, "succeeded": 0, "failed": 0}
 
-        # Limit retries per run to prevent overwhelming the system
-        candidates_to_process = retry_candidates[:max_retries_per_run]
-
         results = {
             "processed": len(candidates_to_process),
             "succeeded": 0,
@@ -536,7 +626,14 @@ class RetryProcessor:
                 f"🔄 Retrying {candidate['episode_id']}: {candidate['title']}"
             )
 
-            success = self._retry_episode(candidate)
+        # Category slots bound each kind of work; the pool bounds the total
+        workers = max(1, min(self.max_workers, len(candidates_to_process)))
+        with ThreadPoolExecutor(workers, thread_name_prefix="retry") as pool:
+            outcomes = list(
+                pool.map(tracer.wrap(self._retry_episode), candidates_to_process)
+            )
+
+        for candidate, success in zip(candidates_to_process, outcomes):
             if success:
                 results["succeeded"] += 1
                 self.failure_manager.mark_episode_recovered(
@@ -564,20 +661,16 @@ class RetryProcessor:
             failure_category = candidate["failure_category"]
             current_status = candidate["status"]
 
-            # Import processors here to avoid circular imports
-            from content_processor import ContentProcessor
-
-            # Initialize processor
-            processor = ContentProcessor(self.db_path)
-
             # Route retry based on failure category and current status
             if failure_category == "download" or current_status == "pre-download":
                 # Retry download and transcription
-                return self._retry_download_and_transcription(processor, candidate)
+                return self._retry_download_and_transcription(
+                    self._get_processor(), candidate
+                )
 
             elif failure_category == "transcription" or current_status == "downloaded":
                 # Retry transcription only
-                return self._retry_transcription_only(processor, candidate)
+                return self._retry_transcription_only(self._get_processor(), candidate)
 
             elif failure_category == "scoring" or current_status == "transcribed":
                 # Retry scoring
@@ -611,7 +704,8 @@ class RetryProcessor:
                 return False
 
             # Download audio
-            audio_file = processor._download_audio(audio_url, episode_id)
+            with self._slot("download"):
+                audio_file = processor._download_audio(audio_url, episode_id)
             if not audio_file:
                 self.failure_manager.log_episode_failure(
                     episode_id, "Audio download failed on retry", "download"
@@ -622,7 +716,8 @@ class RetryProcessor:
             processor._update_episode_status(candidate["db_id"], "downloaded")
 
             # Transcribe
-            transcript_path = processor._transcribe_audio(audio_file, episode_id)
+            with self._slot("transcription"):
+                transcript_path = processor._transcribe_audio(audio_file, episode_id)
             if not transcript_path:
                 self.failure_manager.log_episode_failure(
                     episode_id, "Transcription failed on retry", "transcription"
@@ -663,7 +758,8 @@ class RetryProcessor:
                 return False
 
             # Transcribe
-            transcript_path = processor._transcribe_audio(audio_file, episode_id)
+            with self._slot("transcription"):
+                transcript_path = processor._transcribe_audio(audio_file, episode_id)
             if not transcript_path:
                 self.failure_manager.log_episode_failure(
                     episode_id, "Transcription retry failed", "transcription"
@@ -696,9 +792,10 @@ class RetryProcessor:
             scorer = OpenAITopicScorer()
 
             # Retry scoring for this episode
-            success = scorer.score_pending_in_db(
-                self.db_path, max_episodes=1, target_episode_id=episode_id
-            )
+            with self._slot("scoring"):
+                success = scorer.score_pending_in_db(
+                    self.db_path, max_episodes=1, target_episode_id=episode_id
+                )
 
             if success:
                 self.logger.info(f"✅ Successfully retried scoring for {episode_id}")
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+In-process metrics registry
+Counters, gauges and fixed-bucket histograms aggregated in memory for the
+current run, with p50/p95/p99 estimates, a JSON-ready snapshot and
+Prometheus text exposition. Writes are low-contention: each thread updates
+its own cell of a metric and readers merge the cells, so the hot path takes
+no lock once a series exists. Disabled metrics cost one dict lookup.
+"""
+
+import bisect
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Upper bounds (inclusive) per histogram unit; the last bucket is +Inf
+MS_BUCKETS: Tuple[float, ...] = (
+    1, 2, 5, 10, 25, 50, 100, 250, 500,
+    1_000, 2_500, 5_000, 10_000, 30_000, 60_000, 120_000, 300_000, 600_000,
+)  # fmt: skip
+SECONDS_BUCKETS: Tuple[float, ...] = tuple(bound / 1000 for bound in MS_BUCKETS)
+# Dimensionless ratios such as transcription real-time factor
+RATIO_BUCKETS: Tuple[float, ...] = (
+    0.01, 0.02, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 5, 10,
+)  # fmt: skip
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+# Labels that would make every run a new series
+IGNORED_LABELS = frozenset({"run_id"})
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def label_key(labels: Optional[Dict]) -> LabelKey:
+    if not labels:
+        return ()
+    return tuple(
+        sorted(
+            (str(key), str(value))
+            for key, value in labels.items()
+            if key not in IGNORED_LABELS
+        )
+    )
+
+
+def series_name(name: str, labels: LabelKey) -> str:
+    """name{key="value",...} as used in snapshots"""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+class Counter:
+    """Monotonic sum; one cell per writing thread"""
+
+    kind = "counter"
+
+    def __init__(self):
+        self._cells: Dict[int, float] = {}
+
+    def inc(self, value: float = 1.0):
+        ident = threading.get_ident()
+        # Only this thread writes this key, so the read-modify-write is safe
+        self._cells[ident] = self._cells.get(ident, 0.0) + value
+
+    @property
+    def value(self) -> float:
+        return sum(list(self._cells.values()))
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    """Last value set"""
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Fixed-bucket distribution with count, sum, min, max and quantiles"""
+
+    kind = "histogram"
+
+    def __init__(self, buckets: Iterable[float] = MS_BUCKETS):
+        self.bounds: Tuple[float, ...] = tuple(sorted(buckets))
+        # thread id -> [bucket counts..., +Inf count], [count, sum, min, max]
+        self._cells: Dict[int, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float):
+        ident = threading.get_ident()
+        cell = self._cells.get(ident)
+        if cell is None:
+            cell = ([0] * (len(self.bounds) + 1), [0, 0.0, math.inf, -math.inf])
+            self._cells[ident] = cell
+        counts, totals = cell
+        counts[bisect.bisect_left(self.bounds, value)] += 1
+        totals[0] += 1
+        totals[1] += value
+        if value < totals[2]:
+            totals[2] = value
+        if value > totals[3]:
+            totals[3] = value
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Dict]) -> "Histogram":
+        """Merge snapshot() dicts (e.g. one per run) into one histogram
+
+        Snapshots only list non-empty buckets, so the bounds are taken from
+        the standard bucket set that covers them all when there is one.
+        """
+        snapshots = [snapshot for snapshot in snapshots if snapshot.get("count")]
+        seen = {
+            float(bound)
+            for snapshot in snapshots
+            for bound in snapshot.get("buckets", {})
+            if bound != "+Inf"
+        }
+        bounds = next(
+            (
+                candidate
+                for candidate in (MS_BUCKETS, SECONDS_BUCKETS, RATIO_BUCKETS)
+                if seen <= set(candidate)
+            ),
+            sorted(seen),
+        )
+        histogram = cls(bounds)
+        counts = [0] * (len(histogram.bounds) + 1)
+        totals = [0, 0.0, math.inf, -math.inf]
+        for snapshot in snapshots:
+            for bound, bucket_count in snapshot.get("buckets", {}).items():
+                index = (
+                    len(histogram.bounds)
+                    if bound == "+Inf"
+                    else bisect.bisect_left(histogram.bounds, float(bound))
+                )
+                counts[index] += bucket_count
+            totals[0] += snapshot["count"]
+            totals[1] += snapshot.get("sum", 0.0)
+            totals[2] = min(totals[2], snapshot.get("min", math.inf))
+            totals[3] = max(totals[3], snapshot.get("max", -math.inf))
+        if snapshots:
+            histogram._cells[threading.get_ident()] = (counts, totals)
+        return histogram
+
+    def merged(self) -> Tuple[List[int], int, float, float, float]:
+        """(bucket counts, count, sum, min, max) across all threads"""
+        counts = [0] * (len(self.bounds) + 1)
+        count, total, low, high = 0, 0.0, math.inf, -math.inf
+        for cell_counts, totals in list(self._cells.values()):
+            for index, bucket_count in enumerate(cell_counts):
+                counts[index] += bucket_count
+            count += totals[0]
+            total += totals[1]
+            low = min(low, totals[2])
+            high = max(high, totals[3])
+        return counts, count, total, low, high
+
+    def quantile(self, q: float, merged=None) -> Optional[float]:
+        """Estimate by linear interpolation inside the bucket holding rank q"""
+        counts, count, _, low, high = merged or self.merged()
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else low
+                upper = self.bounds[index] if index < len(self.bounds) else high
+                lower, upper = max(lower, low), min(upper, high)
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, low), high)
+            seen += bucket_count
+        return high
+
+    def snapshot(self) -> Dict:
+        merged = self.merged()
+        counts, count, total, low, high = merged
+        if not count:
+            return {"count": 0}
+        result = {
+            "count": count,
+            "sum": round(total, 3),
+            "min": low,
+            "max": high,
+            "mean": round(total / count, 3),
+        }
+        for q in QUANTILES:
+            result[f"p{int(q * 100)}"] = round(self.quantile(q, merged), 3)
+        result["buckets"] = {
+            str(bound): bucket_count
+            for bound, bucket_count in zip(self.bounds + ("+Inf",), counts)
+            if bucket_count
+        }
+        return result
+
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+def default_buckets(name: str) -> Tuple[float, ...]:
+    """Bucket bounds implied by a histogram's unit suffix"""
+    if name.endswith("seconds"):
+        return SECONDS_BUCKETS
+    if name.endswith("ratio"):
+        return RATIO_BUCKETS
+    return MS_BUCKETS
+
+
+class MetricsRegistry:
+    """Named, labelled metric series for one process
+
+    disabled is a collection of name prefixes to drop; enabled=False drops
+    everything. Either way the decision is cached per name.
+    """
+
+    def __init__(self, enabled: bool = True, disabled: Iterable[str] = ()):
+        self.enabled = enabled
+        self.disabled_prefixes = tuple(prefix for prefix in disabled if prefix)
+        self._series: Dict[Tuple[str, LabelKey], Metric] = {}
+        self._kinds: Dict[str, str] = {}
+        self._active: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def is_enabled(self, name: str) -> bool:
+        active = self._active.get(name)
+        if active is None:
+            active = self.enabled and not name.startswith(self.disabled_prefixes)
+            self._active[name] = active
+        return active
+
+    def _get(self, name: str, labels: Optional[Dict], factory) -> Metric:
+        key = (name, label_key(labels))
+        metric = self._series.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._series.get(key)
+                if metric is None:
+                    metric = factory()
+                    kind = self._kinds.setdefault(name, metric.kind)
+                    if metric.kind != kind:
+                        raise ValueError(f"Metric {name} is already a {kind}")
+                    self._series[key] = metric
+        return metric
+
+    def inc(self, name: str, value: float = 1.0, labels: Optional[Dict] = None):
+        if self.is_enabled(name):
+            self._get(name, labels, Counter).inc(value)
+
+    def set(self, name: str, value: float, labels: Optional[Dict] = None):
+        if self.is_enabled(name):
+            self._get(name, labels, Gauge).set(value)
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict] = None,
+        buckets: Optional[Iterable[float]] = None,
+    ):
+        if self.is_enabled(name):
+            if buckets is None:
+                buckets = default_buckets(name)
+            self._get(name, labels, lambda: Histogram(buckets)).observe(value)
+
+    def get(self, name: str, labels: Optional[Dict] = None) -> Optional[Metric]:
+        return self._series.get((name, label_key(labels)))
+
+    def series(self) -> List[Tuple[str, LabelKey, Metric]]:
+        with self._lock:
+            items = list(self._series.items())
+        return [(name, labels, metric) for (name, labels), metric in sorted(items)]
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """{"counters": {...}, "gauges": {...}, "histograms": {...}} by series"""
+        result = {"counters": {}, "gauges": {}, "histograms": {}}
+        for name, labels, metric in self.series():
+            result[f"{metric.kind}s"][series_name(name, labels)] = metric.snapshot()
+        return result
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        typed = set()
+        for name, labels, metric in self.series():
+            prom_name = prometheus_name(name, metric.kind)
+            if prom_name not in typed:
+                typed.add(prom_name)
+                lines.append(f"# TYPE {prom_name} {metric.kind}")
+            if metric.kind != "histogram":
+                lines.append(
+                    f"{prom_name}{_prom_labels(labels)} {_prom_value(metric.value)}"
+                )
+                continue
+            counts, count, total, _, _ = metric.merged()
+            cumulative = 0
+            for bound, bucket_count in zip(metric.bounds + (math.inf,), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == math.inf else _prom_value(bound)
+                bucket_labels = _prom_labels(labels + (("le", le),))
+                lines.append(f"{prom_name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{prom_name}_sum{_prom_labels(labels)} {_prom_value(total)}")
+            lines.append(f"{prom_name}_count{_prom_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path: Union[str, Path]) -> Path:
+        """Atomically write the exposition (node_exporter textfile collector)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+
+def prometheus_name(name: str, kind: str) -> str:
+    """openai.tokens.count -> openai_tokens_total; x.ms stays x_ms"""
+    if kind == "counter":
+        for suffix in (".count", "_total"):
+            if name.endswith(suffix):
+                name = name[: -len(suffix)]
+                break
+    prom_name = re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+    if prom_name[:1].isdigit():
+        prom_name = f"_{prom_name}"
+    return f"{prom_name}_total" if kind == "counter" else prom_name
+
+
+def _prom_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{re.sub(r"[^a-zA-Z0-9_]", "_", key)}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _prom_value(value: float) -> str:
+    if math.isinf(value) or math.isnan(value):
+        return {math.inf: "+Inf", -math.inf: "-Inf"}.get(value, "NaN")
+    return repr(float(value)) if value != int(value) else str(int(value))
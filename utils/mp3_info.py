@@ -0,0 +1,277 @@
+"""
+MP3 header scanner and metadata index
+Computes exact duration, bitrate and sample rate from MPEG frame headers and
+Xing/Info/VBRI tags (memory-mapped, header bytes only - no decode, no ffprobe)
+and caches results in a small JSON index keyed by file content hash.
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = "mp3_metadata_index.json"
+
+# Layer III bitrates (kbps) by MPEG version family
+_BITRATES_KBPS = {
+    "mpeg1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "mpeg2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# version bits -> sample rates (Hz); 0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1
+_SAMPLE_RATES = {
+    0: [11025, 12000, 8000],
+    2: [22050, 24000, 16000],
+    3: [44100, 48000, 32000],
+}
+
+
+def parse_frame_header(data, offset: int) -> Optional[Dict]:
+    """Decode the Layer III frame header at offset, or None if there is none"""
+    if offset + 4 > len(data):
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    if data[offset] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits != 1 or sample_rate_index == 3:
+        return None
+    if bitrate_index in (0, 15):
+        return None
+
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES_KBPS["mpeg1" if mpeg1 else "mpeg2"][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    coefficient = 144 if mpeg1 else 72
+    return {
+        "mpeg1": mpeg1,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if (b3 >> 6) == 3 else 2,
+        "samples_per_frame": 1152 if mpeg1 else 576,
+        "length": coefficient * bitrate // sample_rate + padding,
+    }
+
+
+def audio_start(data) -> int:
+    """Offset just past a leading ID3v2 tag"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (
+            (data[6] & 0x7F) << 21
+            | (data[7] & 0x7F) << 14
+            | (data[8] & 0x7F) << 7
+            | (data[9] & 0x7F)
+        )
+        return 10 + size + (10 if data[5] & 0x10 else 0)
+    return 0
+
+
+def _find_first_frame(data, start: int, limit: int = 65536) -> Optional[int]:
+    """First offset holding a frame header whose successor is also a frame"""
+    end = min(len(data) - 4, start + limit)
+    offset = data.find(b"\xff", start, end)
+    while offset != -1:
+        header = parse_frame_header(data, offset)
+        if header:
+            following = offset + header["length"]
+            if following >= len(data) or parse_frame_header(data, following):
+                return offset
+        offset = data.find(b"\xff", offset + 1, end)
+    return None
+
+
+def _read_vbr_tag(data, offset: int, header: Dict) -> Optional[Dict]:
+    """Frame/byte counts from a Xing/Info or VBRI tag in the first frame"""
+    if header["mpeg1"]:
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+
+    xing = offset + 4 + side_info
+    tag = bytes(data[xing : xing + 4])
+    if tag in (b"Xing", b"Info"):
+        flags = int.from_bytes(data[xing + 4 : xing + 8], "big")
+        position = xing + 8
+        frames = audio_bytes = None
+        if flags & 0x1:
+            frames = int.from_bytes(data[position : position + 4], "big")
+            position += 4
+        if flags & 0x2:
+            audio_bytes = int.from_bytes(data[position : position + 4], "big")
+        if frames:
+            return {
+                "method": "xing" if tag == b"Xing" else "info",
+                "frames": frames,
+                "bytes": audio_bytes,
+            }
+
+    vbri = offset + 36
+    if bytes(data[vbri : vbri + 4]) == b"VBRI":
+        return {
+            "method": "vbri",
+            "bytes": int.from_bytes(data[vbri + 10 : vbri + 14], "big"),
+            "frames": int.from_bytes(data[vbri + 14 : vbri + 18], "big"),
+        }
+    return None
+
+
+def scan_mp3(path: Union[str, Path]) -> Optional[Dict]:
+    """Exact duration, average bitrate and sample rate of an MP3 file
+
+    Uses the Xing/Info/VBRI frame count when present; otherwise walks the
+    frame headers (4 bytes per frame), which is exact for CBR and VBR alike.
+    """
+    path = Path(path)
+    if not path.exists() or path.stat().st_size < 4:
+        return None
+
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        end = len(data)
+        if end >= 128 and data[end - 128 : end - 125] == b"TAG":
+            end -= 128
+
+        first = _find_first_frame(data, audio_start(data))
+        if first is None:
+            return None
+        header = parse_frame_header(data, first)
+        sample_rate = header["sample_rate"]
+        samples_per_frame = header["samples_per_frame"]
+
+        tag = _read_vbr_tag(data, first, header)
+        if tag:
+            frames = tag["frames"]
+            audio_bytes = tag["bytes"] or (end - first - header["length"])
+            method = tag["method"]
+        else:
+            frames = 0
+            offset = first
+            while offset < end:
+                frame = parse_frame_header(data, offset)
+                if not frame:
+                    break
+                frames += 1
+                offset += frame["length"]
+            audio_bytes = offset - first
+            method = "frames"
+
+    duration = frames * samples_per_frame / sample_rate
+    if duration <= 0:
+        return None
+    return {
+        "duration_seconds": round(duration, 3),
+        "bitrate_kbps": round(audio_bytes * 8 / duration / 1000),
+        "sample_rate": sample_rate,
+        "channels": header["channels"],
+        "frames": frames,
+        "method": method,
+    }
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Mp3MetadataIndex:
+    """JSON index of scanned MP3 metadata keyed by content hash
+
+    "files" maps a file name to its last seen hash, size and mtime, so an
+    unchanged file is neither hashed nor scanned again; "entries" maps the
+    hash to the scan result. Readers without the audio (the RSS API) can look
+    results up by file name alone.
+    """
+
+    def __init__(self, index_path: Union[str, Path] = DEFAULT_INDEX_PATH):
+        self.index_path = Path(index_path)
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return data
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️  Unreadable MP3 metadata index, rebuilding: {e}")
+        return {"version": INDEX_VERSION, "files": {}, "entries": {}}
+
+    def _save(self):
+        tmp_path = self.index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # Read-only deployments still get the in-memory result
+            logger.debug(f"Could not save MP3 metadata index: {e}")
+
+    def get(self, path: Union[str, Path]) -> Optional[Dict]:
+        """Metadata for a local MP3, scanning it only if its content is new"""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return self.lookup_name(path.name)
+
+        with self._lock:
+            known = self._data["files"].get(path.name)
+            if (
+                known
+                and known["size"] == stat.st_size
+                and known["mtime"] == stat.st_mtime
+                and known["sha256"] in self._data["entries"]
+            ):
+                return self._data["entries"][known["sha256"]]
+
+            content_hash = _hash_file(path)
+            entry = self._data["entries"].get(content_hash)
+            if entry is None:
+                entry = scan_mp3(path)
+                if entry is None:
+                    return None
+                self._data["entries"][content_hash] = entry
+            self._data["files"][path.name] = {
+                "sha256": content_hash,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime,
+            }
+            self._save()
+            return entry
+
+    def lookup_name(self, filename: str) -> Optional[Dict]:
+        """Metadata recorded for a file name (no local file needed)"""
+        known = self._data["files"].get(filename)
+        return self._data["entries"].get(known["sha256"]) if known else None
+
+
+_default_index: Optional[Mp3MetadataIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_mp3_info(path: Union[str, Path]) -> Optional[Dict]:
+    """Metadata for an MP3 via the shared on-disk index"""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = Mp3MetadataIndex()
+    return _default_index.get(path)
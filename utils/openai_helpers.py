@@ -16,6 +16,8 @@ from typing import Any, Dict, List, Optional
 from openai import OpenAI
 
 from utils.datetime_utils import now_utc
+from utils.tokenizer import tokenizer
+from utils.tracing import tracer
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +97,7 @@ def validate_response_safety(text: str, max_prompt_echo: int = 100) -> bool:
     return True
 
 
+@tracer.traced("openai.call")
 def call_openai_with_backoff(
     client: OpenAI,
     component: str,
@@ -125,6 +128,7 @@ def call_openai_with_backoff(
     """
     if run_id is None:
         run_id = generate_idempotency_key(str(now_utc()), component)
+    tracer.annotate(component=component, model=kwargs.get("model", "unknown"))
 
     start_time = time.time()
     last_exception = None
@@ -150,6 +154,11 @@ def call_openai_with_backoff(
 
     tokens_in = None
     tokens_out = None
+    tokens_in_estimated = (
+        tokenizer.count_messages(kwargs["input"])
+        if isinstance(kwargs.get("input"), list)
+        else tokenizer.count(str(kwargs.get("input", "")))
+    )
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
@@ -188,6 +197,7 @@ def call_openai_with_backoff(
                 "model": kwargs.get("model", "unknown"),
                 "reasoning_effort": kwargs.get("reasoning", {}).get("effort", "none"),
                 "tokens_in": tokens_in,
+                "tokens_in_estimated": tokens_in_estimated,
                 "tokens_out": tokens_out,
                 "attempt": attempt,
                 "wall_ms": wall_ms,
@@ -201,6 +211,15 @@ def call_openai_with_backoff(
                 f"tokens_in={tokens_in} tokens_out={tokens_out} retries={attempt-1} wall_ms={wall_ms}"
             )
 
+            if tokens_in:
+                _record_token_estimate(component, tokens_in_estimated, tokens_in)
+            tracer.annotate(
+                attempts=attempt,
+                tokens_in=tokens_in,
+                tokens_out=tokens_out,
+                tokens_in_estimated=tokens_in_estimated,
+            )
+
             # Persist raw response if requested
             if persist_response:
                 _persist_raw_response(run_id, component, response, raw_text, metadata)
@@ -237,6 +256,16 @@ def call_openai_with_backoff(
     )
 
 
+def _record_token_estimate(component: str, estimated: int, actual: int) -> None:
+    """Feed estimated vs actual input tokens to run telemetry for calibration"""
+    try:
+        from telemetry_manager import telemetry
+
+        telemetry.record_token_estimate(component, estimated, actual)
+    except Exception as e:
+        logger.debug(f"Failed to record token estimate for {component}: {e}")
+
+
 def _persist_raw_response(
     run_id: str, component: str, response: Any, raw_text: str, metadata: Dict[str, Any]
 ) -> None:
@@ -325,6 +354,15 @@ SCHEMAS = {
         },
         "additionalProperties": False,
     },
+    "reduce_batch": {
+        "type": "object",
+        "required": ["summary", "episode_ids"],
+        "properties": {
+            "summary": {"type": "string", "minLength": 1, "maxLength": 8000},
+            "episode_ids": {"type": "array", "items": {"type": "string"}},
+        },
+        "additionalProperties": False,
+    },
     "validator": {
         "type": "object",
         "required": ["is_valid", "error_codes", "corrected_text"],
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Opt-in run profiling
+A background thread samples every thread's stack at a fixed interval and
+counts collapsed stacks per pipeline stage; optionally cProfile runs on the
+main thread, one profile per stage. Stages come from the tracer: the span at
+stage_depth in the sampled thread's open span chain (e.g. pipeline.digest
+under pipeline.daily_workflow, even when the task graph runs the digest on a
+worker thread); threads without spans of their own count towards the main
+thread's stage. Results land in telemetry/profiles/<run_id>_<entry>/:
+
+    collapsed.txt   stage;frame;frame count (flamegraph.pl, speedscope)
+    <stage>.prof    cProfile stats (snakeviz, pstats)
+    summary.json    top self-time functions per stage
+
+Enable with PODCAST_PROFILE=sample|cprofile|both or --profile on the entry
+points. Report across recent runs:
+
+    python -m utils.profiling --runs 5 --top 10
+"""
+
+import argparse
+import atexit
+import cProfile
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.tracing import Span, Tracer
+from utils.tracing import tracer as default_tracer
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sample", "cprofile", "both")
+PROFILES_DIR = Path("telemetry") / "profiles"
+DEFAULT_INTERVAL_MS = float(os.getenv("PODCAST_PROFILE_INTERVAL_MS", "10"))
+MAX_STACK_DEPTH = 128
+TOP_FUNCTIONS = 25
+
+# Leaf frames of pool/worker threads parked waiting for work; sampling them
+# would bury real work under idle time. The main thread keeps its waits.
+_IDLE_FILES = ("threading.py", "queue.py", "selectors.py", "thread.py")
+
+
+def resolve_mode(value: Optional[str] = None) -> Optional[str]:
+    """--profile value or PODCAST_PROFILE -> sample|cprofile|both, or None"""
+    if value is None:
+        value = os.getenv("PODCAST_PROFILE", "")
+    value = value.strip().lower()
+    if value in ("", "0", "false", "off", "none"):
+        return None
+    if value in ("1", "true", "on"):
+        return "sample"
+    if value not in PROFILE_MODES:
+        logger.warning(f"⚠️  Unknown profile mode {value!r}, using 'sample'")
+        return "sample"
+    return value
+
+
+class RunProfiler:
+    """Sampling (and optional cProfile) profiler for one run"""
+
+    def __init__(
+        self,
+        run_id: str,
+        entry: str,
+        mode: str = "sample",
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        stage_depth: int = 1,
+        output_dir: Path = PROFILES_DIR,
+        tracer: Optional[Tracer] = None,
+    ):
+        self.run_id = run_id
+        self.entry = entry
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.stage_depth = stage_depth
+        self.output_dir = Path(output_dir) / f"{run_id}_{entry}"
+        self.tracer = tracer or default_tracer
+
+        self.samples: Counter = Counter()
+        self.stage = "main"
+        self._open: Dict[str, Span] = {}
+        self._stacks: Dict[int, List[Span]] = {}
+        self._thread_stages: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._labels: Dict[object, str] = {}
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._active_profile: Optional[cProfile.Profile] = None
+        self._main_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+        self.running = False
+
+    # Tracer listener: keep each thread's open spans and current stage
+
+    def span_started(self, span: Span):
+        with self._lock:
+            self._open[span.span_id] = span
+            self._stacks.setdefault(span.thread_id, []).append(span)
+            self._update_stage(span.thread_id)
+
+    def span_ended(self, span: Span):
+        with self._lock:
+            self._open.pop(span.span_id, None)
+            stack = self._stacks.get(span.thread_id, [])
+            if span in stack:
+                del stack[stack.index(span) :]
+            self._update_stage(span.thread_id)
+
+    def _update_stage(self, thread_id: int):
+        stack = self._stacks.get(thread_id)
+        if stack:
+            # Follow parents across threads back to the root span
+            chain = [stack[-1]]
+            while chain[-1].parent_id in self._open:
+                chain.append(self._open[chain[-1].parent_id])
+            chain.reverse()
+            stage = chain[min(len(chain) - 1, self.stage_depth)].name
+            self._thread_stages[thread_id] = stage
+        else:
+            self._stacks.pop(thread_id, None)
+            self._thread_stages.pop(thread_id, None)
+            stage = "main"
+        if thread_id == self._main_thread_id and stage != self.stage:
+            self.stage = stage
+            if self._active_profile is not None:
+                self._switch_profile(stage)
+
+    def _switch_profile(self, stage: str):
+        """Called on the main thread, where cProfile is attached"""
+        self._active_profile.disable()
+        profile = self._profiles.get(stage)
+        if profile is None:
+            profile = self._profiles[stage] = cProfile.Profile()
+        self._active_profile = profile
+        profile.enable()
+
+    # Sampling
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            main_stage = self.stage
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stage = self._thread_stages.get(thread_id, main_stage)
+                idle = frame.f_code.co_filename.endswith(_IDLE_FILES)
+                if idle and thread_id != self._main_thread_id:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                labels.reverse()
+                self.samples[(stage, ";".join(labels))] += 1
+
+    def start(self) -> "RunProfiler":
+        self._started = time.perf_counter()
+        self.tracer.add_listener(self)
+        if self.mode in ("cprofile", "both"):
+            self._active_profile = self._profiles[self.stage] = cProfile.Profile()
+            self._active_profile.enable()
+        if self.mode in ("sample", "both"):
+            self._thread = threading.Thread(
+                target=self._sample_loop, name="run-profiler", daemon=True
+            )
+            self._thread.start()
+        self.running = True
+        logger.info(f"🔬 Profiling {self.entry} ({self.mode}) -> {self.output_dir}")
+        return self
+
+    def stop(self) -> Optional[Path]:
+        """Stop profiling and write the outputs; safe to call twice"""
+        if not self.running:
+            return None
+        self.running = False
+        self._elapsed = time.perf_counter() - self._started
+        if self._active_profile is not None:
+            self._active_profile.disable()
+            self._active_profile = None
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+        self.tracer.remove_listener(self)
+        try:
+            return self.write()
+        except OSError as e:
+            logger.warning(f"⚠️  Could not write profile: {e}")
+            return None
+
+    # Output
+
+    def self_time(self) -> Dict[str, Counter]:
+        """stage -> Counter of leaf function -> samples"""
+        stages: Dict[str, Counter] = {}
+        for (stage, stack), count in self.samples.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            stages.setdefault(stage, Counter())[leaf] += count
+        return stages
+
+    def summary(self) -> Dict:
+        stages = {}
+        for stage, leaves in sorted(self.self_time().items()):
+            total = sum(leaves.values())
+            stages[stage] = {
+                "samples": total,
+                "seconds": round(total * self.interval, 3),
+                "top_self": [
+                    [function, count, round(count * self.interval, 3)]
+                    for function, count in leaves.most_common(TOP_FUNCTIONS)
+                ],
+            }
+        return {
+            "run_id": self.run_id,
+            "entry": self.entry,
+            "mode": self.mode,
+            "interval_ms": self.interval * 1000,
+            "duration_seconds": round(self._elapsed, 3),
+            "samples": sum(self.samples.values()),
+            "stages": stages,
+        }
+
+    def write(self) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.samples:
+            lines = [
+                f"{stage};{stack} {count}"
+                for (stage, stack), count in sorted(self.samples.items())
+            ]
+            (self.output_dir / "collapsed.txt").write_text("\n".join(lines) + "\n")
+        for stage, profile in self._profiles.items():
+            filename = re.sub(r"[^A-Za-z0-9_.-]", "_", stage)
+            profile.dump_stats(str(self.output_dir / f"{filename}.prof"))
+        with open(self.output_dir / "summary.json", "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        logger.info(
+            f"🔬 Profile saved: {self.output_dir} "
+            f"({sum(self.samples.values())} samples, {len(self._profiles)} cProfiles)"
+        )
+        return self.output_dir
+
+
+def _default_run_id() -> str:
+    from telemetry_manager import telemetry
+
+    return telemetry.current_run_id
+
+
+def start_profiling(
+    entry: str,
+    mode: Optional[str] = None,
+    run_id: Optional[str] = None,
+    stage_depth: int = 1,
+) -> Optional[RunProfiler]:
+    """Start a profiler for the rest of the process if profiling is enabled
+
+    The profile is written at interpreter exit (or on an earlier stop()),
+    so every exit() path of a CLI is covered.
+    """
+    mode = resolve_mode(mode)
+    if mode is None:
+        return None
+    profiler = RunProfiler(
+        run_id or _default_run_id(), entry, mode=mode, stage_depth=stage_depth
+    ).start()
+    atexit.register(profiler.stop)
+    return profiler
+
+
+@contextmanager
+def profile_run(
+    entry: str,
+    mode: Optional[str] = None,
+    run_id: Optional[str] = None,
+    stage_depth: int = 1,
+):
+    """Profile the enclosed block when enabled; yields the profiler or None"""
+    mode = resolve_mode(mode)
+    if mode is None:
+        yield None
+        return
+    profiler = RunProfiler(
+        run_id or _default_run_id(), entry, mode=mode, stage_depth=stage_depth
+    ).start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+
+
+def load_summaries(
+    profiles_dir: Path = PROFILES_DIR, runs: int = 5, entry: Optional[str] = None
+) -> List[Dict]:
+    """summary.json of the newest runs, newest first"""
+    summaries = []
+    summary_files = sorted(Path(profiles_dir).glob("run_*/summary.json"), reverse=True)
+    for summary_file in summary_files:
+        try:
+            with open(summary_file) as f:
+                summary = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load {summary_file}: {e}")
+            continue
+        if entry and summary.get("entry") != entry:
+            continue
+        summaries.append(summary)
+        if len(summaries) >= runs:
+            break
+    return summaries
+
+
+def top_self_time(
+    summaries: List[Dict], top: int = 10
+) -> Dict[str, List[Tuple[str, float, int]]]:
+    """stage -> [(function, self seconds, runs seen in)] summed across runs"""
+    seconds: Dict[str, Counter] = {}
+    seen: Dict[str, Counter] = {}
+    for summary in summaries:
+        for stage, data in summary.get("stages", {}).items():
+            for function, _, function_seconds in data.get("top_self", []):
+                seconds.setdefault(stage, Counter())[function] += function_seconds
+                seen.setdefault(stage, Counter())[function] += 1
+    return {
+        stage: [
+            (function, round(total, 3), seen[stage][function])
+            for function, total in functions.most_common(top)
+        ]
+        for stage, functions in sorted(
+            seconds.items(), key=lambda item: -sum(item[1].values())
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Top self-time functions per stage across recent profiled runs"
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Newest N profiled runs")
+    parser.add_argument("--top", type=int, default=10, help="Functions per stage")
+    parser.add_argument("--entry", help="Only runs of this entry point")
+    parser.add_argument("--dir", default=str(PROFILES_DIR), help="Profiles directory")
+    args = parser.parse_args()
+
+    summaries = load_summaries(Path(args.dir), args.runs, args.entry)
+    if not summaries:
+        print(f"❌ No profiles found in {args.dir} (run with PODCAST_PROFILE=sample)")
+        return 1
+
+    print(f"🔬 {len(summaries)} runs: {', '.join(s['run_id'] for s in summaries)}")
+    for stage, functions in top_self_time(summaries, args.top).items():
+        print(f"\n{stage}:")
+        for function, seconds, runs in functions:
+            print(f"  {seconds:9.2f}s  {function}  [{runs} runs]")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
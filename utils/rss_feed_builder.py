@@ -0,0 +1,174 @@
+"""
+Incremental RSS feed builder
+Caches each serialized <item> fragment by GUID and a hash of the inputs that
+produced it, so a feed rebuild only renders new or changed episodes (no
+re-reading digests or regenerating summaries) and splices the fragments into
+the freshly built channel. When nothing changed the existing feed file is
+left byte-for-byte untouched, lastBuildDate included, so ETags and CDN
+caches downstream stay valid.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = "rss_cache"
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+_PREFIXES = {ITUNES_NS: "itunes", ATOM_NS: "atom"}
+
+_BUILD_DATE_MARKER = "__BUILD_DATE__"
+
+
+def _prefix_namespaces(element: ET.Element):
+    """Rewrite {uri}tag names to prefix:tag so fragments need no xmlns"""
+    for node in element.iter():
+        if node.tag.startswith("{"):
+            uri, local = node.tag[1:].split("}", 1)
+            node.tag = f"{_PREFIXES.get(uri, uri)}:{local}"
+
+
+def serialize_fragment(element: ET.Element, level: int = 2) -> str:
+    """Indented XML for one element at the given depth, newline-terminated"""
+    _prefix_namespaces(element)
+    ET.indent(element, space="  ", level=level)
+    return "  " * level + ET.tostring(element, encoding="unicode") + "\n"
+
+
+def content_hash(fingerprint: Dict) -> str:
+    payload = json.dumps(fingerprint, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IncrementalFeedBuilder:
+    """Builds one feed file from a channel element plus cached item fragments"""
+
+    def __init__(
+        self,
+        output_file: Union[str, Path],
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+    ):
+        self.output_file = Path(output_file)
+        self.cache_path = Path(cache_dir) / f"{self.output_file.name}.json"
+        self.cache = self._load()
+        self.stats = {"reused": 0, "rendered": 0}
+        self._used = set()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                return data
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"⚠️  Unreadable RSS item cache, rebuilding: {e}")
+        return {"version": CACHE_VERSION, "items": {}}
+
+    def _save(self):
+        # Only items in this build are kept, so the cache tracks the feed
+        items = self.cache["items"]
+        self.cache["items"] = {
+            guid: items[guid] for guid in self._used if guid in items
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Could not save RSS item cache: {e}")
+
+    def item(
+        self,
+        guid: str,
+        fingerprint: Dict,
+        render: Callable[[], Optional[ET.Element]],
+    ) -> Optional[str]:
+        """Cached <item> fragment for guid, rendering it only if its inputs changed
+
+        fingerprint holds everything the item's XML depends on that is cheap to
+        obtain (titles, URLs, sizes, source file stats); render builds the
+        element and is where expensive work such as summaries belongs.
+        """
+        key = content_hash(fingerprint)
+        cached = self.cache["items"].get(guid)
+        if cached and cached["hash"] == key:
+            self._used.add(guid)
+            self.stats["reused"] += 1
+            return cached["xml"]
+
+        element = render()
+        if element is None:
+            return None
+        fragment = serialize_fragment(element)
+        self.cache["items"][guid] = {"hash": key, "xml": fragment}
+        self._used.add(guid)
+        self.stats["rendered"] += 1
+        return fragment
+
+    def _render_document(self, rss: ET.Element, items: List[str]) -> str:
+        _prefix_namespaces(rss)
+        ET.indent(rss, space="  ")
+        text = ET.tostring(rss, encoding="unicode")
+        head, tail = text.rsplit("  </channel>", 1)
+        return XML_DECLARATION + head + "".join(items) + "  </channel>" + tail + "\n"
+
+    def write(
+        self,
+        rss: ET.Element,
+        items: List[str],
+        build_date_tag: str = "lastBuildDate",
+    ) -> bool:
+        """Write the feed unless only its build date would change
+
+        rss is the <rss> element with a populated <channel> and no items.
+        Returns True when the file was (re)written, False when it was kept.
+        """
+        build_date = rss.find(f"channel/{build_date_tag}")
+        build_date_text = build_date.text if build_date is not None else None
+        if build_date is not None:
+            build_date.text = _BUILD_DATE_MARKER
+        document = self._render_document(rss, items)
+
+        try:
+            previous = self.output_file.read_text(encoding="utf-8")
+        except (FileNotFoundError, UnicodeDecodeError):
+            previous = None
+        if previous is not None:
+            marked = f"<{build_date_tag}>{_BUILD_DATE_MARKER}</{build_date_tag}>"
+            previous = re.sub(
+                rf"<{build_date_tag}>[^<]*</{build_date_tag}>",
+                marked,
+                previous,
+                count=1,
+            )
+            if previous == document:
+                self._save()
+                logger.info(f"📡 RSS feed unchanged: {self.output_file}")
+                return False
+
+        if build_date_text is not None:
+            document = document.replace(_BUILD_DATE_MARKER, build_date_text, 1)
+        tmp_path = self.output_file.with_name(f"{self.output_file.name}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(document)
+        os.replace(tmp_path, self.output_file)
+        self._save()
+        logger.info(
+            f"📡 RSS feed written: {self.output_file} "
+            f"({self.stats['rendered']} items rendered, {self.stats['reused']} reused)"
+        )
+        return True
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Run Journal
+Checkpoints for the daily workflow so an interrupted run (timeout, OOM, a
+crash in TTS) can be resumed. Every step records its inputs, outputs and
+completion in SQLite, keyed by run_id; sub-steps such as one topic's digest
+or one topic's deploy are journaled the same way. Rerunning a run_id skips
+completed steps and hands their stored outputs on, keeps the run's original
+inputs (weekday, digest date) and so reuses that date's persisted map outputs
+for topics that had not finished.
+
+    python daily_podcast_pipeline.py --resume                 # latest unfinished
+    python daily_podcast_pipeline.py --resume run_20250910_060000
+    python -m utils.run_journal list
+    python -m utils.run_journal show run_20250910_060000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from utils.datetime_utils import now_utc
+from utils.db import get_connection
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PATH = Path("telemetry") / "run_journal.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal_runs (
+    run_id TEXT PRIMARY KEY,
+    workflow TEXT NOT NULL,
+    status TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_journal_runs_started_at
+    ON journal_runs(workflow, started_at);
+CREATE TABLE IF NOT EXISTS journal_steps (
+    run_id TEXT NOT NULL,
+    step TEXT NOT NULL,
+    status TEXT NOT NULL,
+    inputs TEXT,
+    outputs TEXT,
+    error TEXT,
+    started_at TEXT,
+    finished_at TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (run_id, step)
+);
+"""
+
+# Run status: running until finish(); a run left 'running' was interrupted
+RESUMABLE = ("running", "failed")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+class RunJournal:
+    """Step checkpoints for one run"""
+
+    def __init__(self, run_id: str, db_path: Union[str, Path] = JOURNAL_PATH):
+        self.run_id = run_id
+        self.db_path = Path(db_path)
+        self.inputs: Dict[str, Any] = {}
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        if not self._schema_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_connection(str(self.db_path), validate_schema=False)
+        if not self._schema_ready:
+            conn.executescript(SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def _execute(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    return conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+
+    # Runs
+
+    def begin(self, workflow: str, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Open the run; a known run_id is resumed with its original inputs"""
+        now = now_utc().isoformat()
+        rows = self._execute(
+            "SELECT inputs, attempts FROM journal_runs WHERE run_id = ?",
+            (self.run_id,),
+        )
+        if rows:
+            self.resumed = True
+            self.inputs = json.loads(rows[0][0])
+            self._execute(
+                "UPDATE journal_runs SET status = 'running', updated_at = ?, "
+                "attempts = attempts + 1 WHERE run_id = ?",
+                (now, self.run_id),
+            )
+            done = len(self.completed_steps())
+            logger.info(
+                f"📓 Resuming {self.run_id} (attempt {rows[0][1] + 1}, "
+                f"{done} steps already completed)"
+            )
+        else:
+            self.inputs = dict(inputs)
+            self._execute(
+                "INSERT INTO journal_runs (run_id, workflow, status, inputs, "
+                "started_at, updated_at) VALUES (?, ?, 'running', ?, ?, ?)",
+                (self.run_id, workflow, _dumps(self.inputs), now, now),
+            )
+        return self.inputs
+
+    def finish(self, status: str):
+        """completed or failed; failed runs stay resumable"""
+        self._execute(
+            "UPDATE journal_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+            (status, now_utc().isoformat(), self.run_id),
+        )
+
+    # Steps
+
+    def step_started(self, step: str, inputs: Optional[Dict] = None):
+        self._execute(
+            "INSERT INTO journal_steps (run_id, step, status, inputs, started_at, "
+            "attempts) VALUES (?, ?, 'running', ?, ?, 1) "
+            "ON CONFLICT(run_id, step) DO UPDATE SET status = 'running', "
+            "inputs = excluded.inputs, started_at = excluded.started_at, "
+            "finished_at = NULL, error = NULL, attempts = attempts + 1",
+            (self.run_id, step, _dumps(inputs), now_utc().isoformat()),
+        )
+
+    def step_finished(
+        self,
+        step: str,
+        status: str = "done",
+        outputs: Any = None,
+        error: Optional[str] = None,
+    ):
+        """Record a step's outcome (done, blocked or failed) and outputs"""
+        now = now_utc().isoformat()
+        self._execute(
+            "INSERT INTO journal_steps (run_id, step, status, outputs, error, "
+            "started_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(run_id, step) DO UPDATE SET status = excluded.status, "
+            "outputs = excluded.outputs, error = excluded.error, "
+            "finished_at = excluded.finished_at",
+            (self.run_id, step, status, _dumps(outputs), error, now, now),
+        )
+
+    def completed_steps(self, prefix: str = "") -> Dict[str, Any]:
+        """step -> outputs for every completed step (optionally by prefix)"""
+        rows = self._execute(
+            "SELECT step, outputs FROM journal_steps "
+            "WHERE run_id = ? AND status = 'done' AND step LIKE ? ORDER BY step",
+            (self.run_id, f"{prefix}%"),
+        )
+        return {step: json.loads(outputs) for step, outputs in rows}
+
+    def is_done(self, step: str) -> bool:
+        return step in self.completed_steps(step)
+
+    def steps(self) -> List[Dict]:
+        rows = self._execute(
+            "SELECT step, status, outputs, error, started_at, finished_at, attempts "
+            "FROM journal_steps WHERE run_id = ? ORDER BY started_at, step",
+            (self.run_id,),
+        )
+        columns = (
+            "step",
+            "status",
+            "outputs",
+            "error",
+            "started_at",
+            "finished_at",
+            "attempts",
+        )
+        return [dict(zip(columns, row)) for row in rows]
+
+
+def list_runs(
+    db_path: Union[str, Path] = JOURNAL_PATH,
+    workflow: Optional[str] = None,
+    limit: int = 20,
+) -> List[Dict]:
+    """Most recent runs first"""
+    journal = RunJournal("", db_path)
+    rows = journal._execute(
+        "SELECT run_id, workflow, status, started_at, updated_at, attempts "
+        "FROM journal_runs WHERE ? IS NULL OR workflow = ? "
+        "ORDER BY started_at DESC LIMIT ?",
+        (workflow, workflow, limit),
+    )
+    columns = ("run_id", "workflow", "status", "started_at", "updated_at", "attempts")
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def latest_unfinished(
+    workflow: str, db_path: Union[str, Path] = JOURNAL_PATH
+) -> Optional[str]:
+    """run_id of the newest interrupted or failed run, if it is the newest run"""
+    runs = list_runs(db_path, workflow, limit=1)
+    if runs and runs[0]["status"] in RESUMABLE:
+        return runs[0]["run_id"]
+    return None
+
+
+def prune(days: int, db_path: Union[str, Path] = JOURNAL_PATH) -> int:
+    """Drop runs started more than days ago; returns how many"""
+    cutoff = (now_utc() - timedelta(days=days)).isoformat()
+    journal = RunJournal("", db_path)
+    old = [
+        run_id
+        for (run_id,) in journal._execute(
+            "SELECT run_id FROM journal_runs WHERE started_at < ?", (cutoff,)
+        )
+    ]
+    for run_id in old:
+        journal._execute("DELETE FROM journal_steps WHERE run_id = ?", (run_id,))
+        journal._execute("DELETE FROM journal_runs WHERE run_id = ?", (run_id,))
+    return len(old)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the run journal")
+    parser.add_argument("--db", default=str(JOURNAL_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_parser = sub.add_parser("list", help="Recent runs")
+    list_parser.add_argument("--limit", type=int, default=20)
+    show_parser = sub.add_parser("show", help="Steps of one run")
+    show_parser.add_argument("run_id")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for run in list_runs(args.db, limit=args.limit):
+            print(
+                f"{run['run_id']}  {run['workflow']:<16} {run['status']:<10} "
+                f"attempts={run['attempts']}  updated {run['updated_at']}"
+            )
+        return 0
+
+    journal = RunJournal(args.run_id, args.db)
+    steps = journal.steps()
+    if not steps:
+        print(f"No journal entries for {args.run_id}")
+        return 1
+    for step in steps:
+        line = f"{step['status']:<8} {step['step']:<40} attempts={step['attempts']}"
+        if step["error"]:
+            line += f"  error: {step['error']}"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Deadline-Aware Stage Scheduler
+Gives the pipeline's work-queue stages (audio cache, pending transcription,
+scoring) a share of the run's time budget so a transcription backlog cannot
+starve digest generation and publishing. A stage admits an item only while
+its predicted duration fits before the stage deadline; predictions come from
+this run's completed items, else the p90 of past runs' pipeline.item.seconds
+histograms in the telemetry history store. Deferred items carry over to the
+next run, where they are queued first (most-deferred first).
+
+Deadlines: the last PUBLISH_RESERVE of the budget belongs to digest and
+publishing; each work stage may use whatever is left before that minus the
+floors (WORK_STAGE_FLOORS) of the work stages still to come.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.datetime_utils import now_utc
+
+logger = logging.getLogger(__name__)
+
+CARRYOVER_PATH = Path("telemetry") / "scheduler_carryover.json"
+
+# Work stages in run order -> guaranteed share of the budget
+WORK_STAGE_FLOORS: Dict[str, float] = {
+    "audio_cache": 0.05,
+    "pending_episodes": 0.15,
+    "scoring": 0.05,
+}
+# Share of the budget kept for digest, audio, deploy and RSS
+PUBLISH_RESERVE = float(os.getenv("PIPELINE_PUBLISH_RESERVE", "0.4"))
+# Per-item guess (seconds) before any history exists
+DEFAULT_ITEM_SECONDS: Dict[str, float] = {
+    "audio_cache": 600.0,
+    "pending_episodes": 600.0,
+    "scoring": 20.0,
+}
+# Items deferred this many runs are admitted whenever the stage has time left
+MAX_DEFERRALS = int(os.getenv("PIPELINE_MAX_DEFERRALS", "3"))
+HISTORY_DAYS = 30
+ITEM_METRIC = "pipeline.item.seconds"
+
+
+class StageBudget:
+    """Admission control for one work stage; close() when the stage ends"""
+
+    def __init__(
+        self,
+        scheduler: "RunScheduler",
+        name: str,
+        deadline: Optional[float],
+        carried: Dict[str, Dict],
+    ):
+        self.scheduler = scheduler
+        self.name = name
+        self.deadline = deadline
+        self.carried = carried
+        self.admitted: List[str] = []
+        self.deferred: List[str] = []
+        self.durations: List[float] = []
+        self._history_seconds: Optional[float] = None
+        self._history_loaded = False
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the stage deadline (None when unlimited)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self.scheduler.clock())
+
+    def order(self, items: Iterable, key: Callable = str) -> List:
+        """Carried-over items first (most deferrals first), then the rest"""
+        items = list(items)
+        position = {id(item): index for index, item in enumerate(items)}
+
+        def rank(item):
+            carried = self.carried.get(str(key(item)))
+            deferrals = carried["deferrals"] if carried else 0
+            return (-deferrals, position[id(item)])
+
+        return sorted(items, key=rank)
+
+    def predict(self, estimate: Optional[float] = None) -> float:
+        """Predicted seconds for the next item"""
+        if estimate:
+            return estimate
+        if len(self.durations) >= 3:
+            return sum(self.durations) / len(self.durations)
+        if not self._history_loaded:
+            self._history_loaded = True
+            self._history_seconds = self.scheduler.history_seconds(self.name)
+        if self._history_seconds:
+            return self._history_seconds
+        return DEFAULT_ITEM_SECONDS.get(self.name, 60.0)
+
+    def admit(self, key, estimate: Optional[float] = None) -> bool:
+        """True to process the item now, False to defer it to the next run"""
+        key = str(key)
+        remaining = self.remaining()
+        carried = self.carried.get(key)
+        starved = carried is not None and carried["deferrals"] >= MAX_DEFERRALS
+        fits = remaining is None or self.predict(estimate) <= remaining
+        with self._lock:
+            if fits or (starved and remaining > 0):
+                self.admitted.append(key)
+                return True
+            self.deferred.append(key)
+        return False
+
+    def done(self, key, seconds: float):
+        """Record how long an admitted item took"""
+        with self._lock:
+            self.durations.append(seconds)
+        self.scheduler.record_item(self.name, seconds)
+
+    def close(self):
+        self.scheduler._close_stage(self)
+
+    def __enter__(self) -> "StageBudget":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class RunScheduler:
+    """Time budget for one pipeline run
+
+    budget_seconds of 0 (the default without PIPELINE_TIME_BUDGET) means no
+    deadline: every item is admitted, but timings are still recorded and
+    carry-over is still honoured for ordering.
+    """
+
+    def __init__(
+        self,
+        budget_seconds: Optional[float] = None,
+        publish_reserve: float = PUBLISH_RESERVE,
+        floors: Optional[Dict[str, float]] = None,
+        carryover_path: Path = CARRYOVER_PATH,
+        telemetry=None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if budget_seconds is None:
+            budget_seconds = float(os.getenv("PIPELINE_TIME_BUDGET", "0"))
+        self.budget_seconds = budget_seconds
+        self.publish_reserve = publish_reserve
+        self.floors = dict(WORK_STAGE_FLOORS if floors is None else floors)
+        self.carryover_path = Path(carryover_path)
+        self._telemetry = telemetry
+        self.clock = clock
+        self.started_at = clock()
+        self._carryover: Optional[Dict[str, Dict[str, Dict]]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def telemetry(self):
+        if self._telemetry is None:
+            from telemetry_manager import telemetry
+
+            self._telemetry = telemetry
+        return self._telemetry
+
+    def start(self, budget_seconds: Optional[float] = None):
+        """Restart the clock, e.g. at the top of the workflow"""
+        if budget_seconds is not None:
+            self.budget_seconds = budget_seconds
+        self.started_at = self.clock()
+        if self.budget_seconds:
+            logger.info(
+                f"⏳ Time budget {self.budget_seconds / 60:.1f} min, "
+                f"{self.publish_reserve:.0%} reserved for digest and publishing"
+            )
+
+    def remaining(self) -> Optional[float]:
+        if not self.budget_seconds:
+            return None
+        return max(0.0, self.started_at + self.budget_seconds - self.clock())
+
+    def stage_deadline(self, name: str) -> Optional[float]:
+        if not self.budget_seconds:
+            return None
+        deadline = self.started_at + self.budget_seconds * (1 - self.publish_reserve)
+        stages = list(self.floors)
+        if name in stages:
+            later = stages[stages.index(name) + 1 :]
+            deadline -= self.budget_seconds * sum(self.floors[s] for s in later)
+        return deadline
+
+    def stage(self, name: str) -> StageBudget:
+        stage = StageBudget(
+            self, name, self.stage_deadline(name), self._load_carryover().get(name, {})
+        )
+        remaining = stage.remaining()
+        if remaining is not None:
+            logger.info(f"⏳ Stage {name}: {remaining / 60:.1f} min available")
+        return stage
+
+    # History
+
+    def history_seconds(self, name: str) -> Optional[float]:
+        """p90 per-item seconds for the stage over recent runs"""
+        try:
+            from utils.telemetry_store import days_ago
+
+            return self.telemetry.history().metric_quantile(
+                ITEM_METRIC, days_ago(HISTORY_DAYS), 0.9, labels=f'stage="{name}"'
+            )
+        except Exception as e:
+            logger.debug(f"No item timing history for {name}: {e}")
+            return None
+
+    def record_item(self, name: str, seconds: float):
+        self.telemetry.record_histogram(ITEM_METRIC, seconds, labels={"stage": name})
+
+    # Carry-over
+
+    def _load_carryover(self) -> Dict[str, Dict[str, Dict]]:
+        with self._lock:
+            if self._carryover is None:
+                try:
+                    self._carryover = json.loads(self.carryover_path.read_text())
+                except FileNotFoundError:
+                    self._carryover = {}
+                except (OSError, ValueError) as e:
+                    logger.warning(f"⚠️  Ignoring unreadable {self.carryover_path}: {e}")
+                    self._carryover = {}
+            return self._carryover
+
+    def _close_stage(self, stage: StageBudget):
+        """Persist the stage's deferred items; admitted ones leave the carry-over"""
+        now = now_utc().isoformat()
+        carried = {}
+        for key in stage.deferred:
+            previous = stage.carried.get(key, {})
+            carried[key] = {
+                "deferrals": previous.get("deferrals", 0) + 1,
+                "first_deferred_at": previous.get("first_deferred_at", now),
+            }
+
+        carryover = self._load_carryover()
+        with self._lock:
+            if carried:
+                carryover[stage.name] = carried
+            else:
+                carryover.pop(stage.name, None)
+            try:
+                self.carryover_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.carryover_path.with_name(
+                    f"{self.carryover_path.name}.tmp"
+                )
+                tmp_path.write_text(json.dumps(carryover, indent=2, sort_keys=True))
+                os.replace(tmp_path, self.carryover_path)
+            except OSError as e:
+                logger.warning(f"⚠️  Could not save scheduler carry-over: {e}")
+
+        if stage.deferred:
+            logger.info(
+                f"⏳ {stage.name}: {len(stage.admitted)} admitted, "
+                f"{len(stage.deferred)} deferred to the next run"
+            )
+        self.telemetry.record_metric(
+            "pipeline.deferred.count", len(stage.deferred), stage=stage.name
+        )
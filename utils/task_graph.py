@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Pipeline Task Graph
+Runs a workflow as a dependency graph: each task starts as soon as its
+dependencies have finished, within a per-resource-class slot limit (network,
+cpu, llm) so independent steps overlap without oversubscribing the
+transcriber or the OpenAI quota. A gate task that returns a falsy result stops
+everything downstream of it, which keeps transactional publishing in order.
+An optional task that raises is recorded as failed without stopping the run or
+its dependents (one topic's digest failing doesn't cost the other topics).
+
+With PIPELINE_MAX_WORKERS=1 tasks run one at a time in the order they were
+added, i.e. the old sequential workflow. Given a run journal, run() records
+each task's inputs, outcome and result, and skips tasks the journal already
+has as done (their stored result stands in), which is how interrupted runs
+resume.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Concurrent tasks allowed per resource class; tasks without a class only
+# count against PIPELINE_MAX_WORKERS
+RESOURCE_LIMITS: Dict[str, int] = {
+    "network": int(os.getenv("PIPELINE_NETWORK_SLOTS", "4")),
+    "cpu": int(os.getenv("PIPELINE_CPU_SLOTS", "1")),
+    "llm": int(os.getenv("PIPELINE_LLM_SLOTS", "2")),
+}
+MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+
+@dataclass
+class Task:
+    """One step of the graph"""
+
+    name: str
+    fn: Callable[[], Any]
+    deps: Tuple[str, ...] = ()
+    resource: Optional[str] = None
+    gate: bool = False
+    inputs: Optional[Dict[str, Any]] = None
+    optional: bool = False
+    # After run(): done, failed, blocked (gate closed) or skipped (a
+    # dependency did not finish)
+    status: str = "pending"
+    result: Any = None
+    error: Optional[BaseException] = field(default=None, repr=False)
+    seconds: float = 0.0
+    resumed: bool = False
+
+
+class TaskGraph:
+    """Dependency graph of pipeline tasks with a concurrent executor"""
+
+    def __init__(
+        self,
+        name: str = "pipeline",
+        limits: Optional[Dict[str, int]] = None,
+        max_workers: int = MAX_WORKERS,
+    ):
+        self.name = name
+        self.limits = dict(RESOURCE_LIMITS if limits is None else limits)
+        self.max_workers = max(1, max_workers)
+        self.tasks: Dict[str, Task] = {}
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        deps: Tuple[str, ...] = (),
+        resource: Optional[str] = None,
+        gate: bool = False,
+        inputs: Optional[Dict[str, Any]] = None,
+        optional: bool = False,
+    ) -> Task:
+        """Add a task; its dependencies must already be in the graph"""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task: {name}")
+        missing = [dep for dep in deps if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"Task {name} depends on unknown {', '.join(missing)}")
+        if resource is not None and resource not in self.limits:
+            raise ValueError(f"Task {name} uses unknown resource class {resource}")
+        task = Task(name, fn, tuple(deps), resource, gate, inputs, optional)
+        self.tasks[name] = task
+        return task
+
+    def dependents(self, name: str) -> List[str]:
+        """Every task downstream of name"""
+        found: List[str] = []
+        for task in self.tasks.values():
+            if any(dep == name or dep in found for dep in task.deps):
+                found.append(task.name)
+        return found
+
+    # Planning
+
+    def levels(self) -> List[List[str]]:
+        """Tasks grouped by longest dependency chain: each level can overlap"""
+        depth: Dict[str, int] = {}
+        for task in self.tasks.values():
+            depth[task.name] = 1 + max((depth[dep] for dep in task.deps), default=-1)
+        levels: Dict[int, List[str]] = {}
+        for name, level in depth.items():
+            levels.setdefault(level, []).append(name)
+        return [levels[level] for level in sorted(levels)]
+
+    def describe(self) -> str:
+        """Human-readable plan for dry runs"""
+        slots = ", ".join(f"{name}={limit}" for name, limit in self.limits.items())
+        lines = [f"Task graph {self.name} ({self.max_workers} workers; slots: {slots})"]
+        for index, level in enumerate(self.levels(), 1):
+            lines.append(f"  wave {index}:")
+            for name in level:
+                task = self.tasks[name]
+                gate = "🔒 " if task.gate else ""
+                label = f"    {gate}{name} [{task.resource or '-'}]"
+                if task.deps:
+                    label += f" <- {', '.join(task.deps)}"
+                if task.resumed:
+                    label += " (resumed)"
+                elif task.status != "pending":
+                    label += f" ({task.status}, {task.seconds:.1f}s)"
+                lines.append(label)
+        return "\n".join(lines)
+
+    def to_dot(self) -> str:
+        """Graphviz DOT of the graph (gates drawn as boxes)"""
+        lines = [f'digraph "{self.name}" {{', "  rankdir=LR;"]
+        for task in self.tasks.values():
+            shape = "box" if task.gate else "ellipse"
+            label = f"{task.name}\\n[{task.resource or '-'}]"
+            lines.append(f'  "{task.name}" [label="{label}", shape={shape}];')
+            for dep in task.deps:
+                lines.append(f'  "{dep}" -> "{task.name}";')
+        lines.append("}")
+        return "\n".join(lines)
+
+    # Execution
+
+    def _settled(self, name: str) -> bool:
+        # Dependents go ahead once a dependency is done or optional and failed
+        task = self.tasks[name]
+        return task.status == "done" or (task.optional and task.status == "failed")
+
+    def _skip_unreachable(self):
+        # Tasks are stored in dependency order, so one pass settles chains
+        for task in self.tasks.values():
+            if task.status == "pending" and any(
+                self.tasks[dep].status in ("failed", "blocked", "skipped")
+                and not self._settled(dep)
+                for dep in task.deps
+            ):
+                task.status = "skipped"
+
+    def _ready(self) -> List[Task]:
+        return [
+            task
+            for task in self.tasks.values()
+            if task.status == "pending" and all(self._settled(dep) for dep in task.deps)
+        ]
+
+    def _finish(self, task: Task, future: Future) -> Optional[BaseException]:
+        task.seconds = time.perf_counter() - task.seconds
+        try:
+            task.result = future.result()
+        except Exception as e:
+            task.status = "failed"
+            task.error = e
+            logger.error(f"❌ Task {task.name} failed after {task.seconds:.1f}s: {e}")
+            return e
+
+        if task.gate and not task.result:
+            task.status = "blocked"
+            skipped = self.dependents(task.name)
+            if skipped:
+                logger.warning(
+                    f"🚧 Gate {task.name} closed; skipping {', '.join(skipped)}"
+                )
+        else:
+            task.status = "done"
+        logger.debug(f"Task {task.name} {task.status} in {task.seconds:.1f}s")
+        return None
+
+    def _resume(self, journal):
+        for name, result in journal.completed_steps().items():
+            task = self.tasks.get(name)
+            if task is not None and task.status == "pending":
+                task.status, task.result, task.resumed = "done", result, True
+                logger.info(f"⏭️  {name} already completed in {journal.run_id}")
+
+    def run(self, journal=None) -> Dict[str, Task]:
+        """Run every reachable task; re-raises the first task exception
+
+        After a failure (of a task that isn't optional) no new tasks start;
+        running ones finish first.
+        journal (a RunJournal) checkpoints tasks and skips completed ones.
+        """
+        if journal is not None:
+            self._resume(journal)
+        running: Dict[Future, Task] = {}
+        in_use: Dict[str, int] = {}
+        first_error: Optional[BaseException] = None
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipeline-task"
+        )
+        try:
+            while True:
+                if first_error is None:
+                    self._skip_unreachable()
+                    for task in self._ready():
+                        if len(running) >= self.max_workers:
+                            break
+                        resource = task.resource
+                        if resource is not None:
+                            if in_use.get(resource, 0) >= self.limits[resource]:
+                                continue
+                            in_use[resource] = in_use.get(resource, 0) + 1
+                        task.status = "running"
+                        task.seconds = time.perf_counter()
+                        if journal is not None:
+                            journal.step_started(task.name, task.inputs)
+                        running[executor.submit(tracer.wrap(task.fn))] = task
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    if task.resource is not None:
+                        in_use[task.resource] -= 1
+                    error = self._finish(task, future)
+                    if journal is not None:
+                        journal.step_finished(
+                            task.name,
+                            task.status,
+                            task.result,
+                            str(error) if error else None,
+                        )
+                    if first_error is None and not task.optional:
+                        first_error = error
+        except BaseException:
+            # Interrupted (e.g. the pipeline timeout): don't wait for tasks
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+
+        for task in self.tasks.values():
+            if task.status == "pending":
+                task.status = "skipped"
+        if first_error is not None:
+            raise first_error
+        return self.tasks
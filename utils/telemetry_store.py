@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Telemetry History Store
+Append-only SQLite store of finished runs so trend queries hit indexed rows
+instead of globbing and parsing every run_*.json. Each run is split into a
+runs row (plus the full JSON for compatibility), one row per topic, one row
+per metric series and one per span name (stage timings); map summaries live
+here too instead of one JSON file each. Existing JSON files are imported
+once by migrate_json().
+
+    python -m utils.telemetry_store migrate
+    python -m utils.telemetry_store tokens --days 30 --by week
+    python -m utils.telemetry_store quantile transcribe.rtf.ratio --days 30
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from utils.datetime_utils import now_utc, to_utc
+from utils.db import get_connection
+from utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = Path("telemetry") / "telemetry.db"
+
+# strftime() formats for tokens_per_topic() and friends
+PERIODS = {"day": "%Y-%m-%d", "week": "%Y-W%W", "month": "%Y-%m"}
+
+_RUN_COLUMNS = (
+    "pipeline_type",
+    "total_processing_time",
+    "episodes_transcribed",
+    "episodes_scored",
+    "episodes_digested",
+    "files_deployed",
+    "rss_items_generated",
+    "total_api_calls",
+    "total_tokens_used",
+    "total_cost_estimate",
+)
+_TOPIC_COLUMNS = (
+    "topic",
+    "total_candidates",
+    "above_threshold_count",
+    "selected_count",
+    "threshold_used",
+    "map_phase_tokens",
+    "reduce_phase_tokens",
+    "total_tokens",
+    "retry_count",
+    "processing_time_seconds",
+    "success",
+    "error_message",
+)
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    {", ".join(_RUN_COLUMNS)},
+    error_count INTEGER,
+    warning_count INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE TABLE IF NOT EXISTS topic_runs (
+    run_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    {", ".join(_TOPIC_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_topic_runs_started_at ON topic_runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_topic_runs_topic ON topic_runs(topic, started_at);
+CREATE TABLE IF NOT EXISTS metric_series (
+    run_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    value REAL,
+    count INTEGER,
+    p50 REAL,
+    p95 REAL,
+    p99 REAL,
+    snapshot TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_metric_series_name
+    ON metric_series(name, started_at);
+CREATE TABLE IF NOT EXISTS stage_timings (
+    run_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    stage TEXT NOT NULL,
+    span_count INTEGER,
+    total_ms REAL
+);
+CREATE INDEX IF NOT EXISTS idx_stage_timings_stage
+    ON stage_timings(stage, started_at);
+CREATE TABLE IF NOT EXISTS map_summaries (
+    episode_id TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    run_id TEXT,
+    created_at REAL NOT NULL,
+    token_count INTEGER,
+    summary TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_map_summaries_created_at
+    ON map_summaries(created_at);
+CREATE TABLE IF NOT EXISTS store_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def to_epoch(value: Union[str, datetime, float, None]) -> float:
+    """ISO timestamp (naive means UTC), datetime or epoch -> epoch seconds"""
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return to_utc(value).timestamp()
+
+
+def days_ago(days: float) -> float:
+    return (now_utc() - timedelta(days=days)).timestamp()
+
+
+def split_series(series: str) -> Tuple[str, str]:
+    """'api.latency.ms{api="openai"}' -> ('api.latency.ms', 'api="openai"')"""
+    name, _, labels = series.partition("{")
+    return name, labels.rstrip("}")
+
+
+class TelemetryStore:
+    """Indexed history of pipeline runs"""
+
+    def __init__(self, db_path: Union[str, Path] = STORE_PATH):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self):
+        if not self._schema_ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = get_connection(str(self.db_path), validate_schema=False)
+        if not self._schema_ready:
+            conn.executescript(SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    # Writes
+
+    def record_run(self, run: Dict, stages: Iterable[Dict] = ()):
+        """Store one finished run (asdict(RunMetrics)); replaces a same-id run"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    self._insert_run(conn, run, stages)
+            finally:
+                conn.close()
+
+    def _insert_run(self, conn, run: Dict, stages: Iterable[Dict]):
+        run_id = run["run_id"]
+        started_at = to_epoch(run.get("timestamp"))
+        for table in ("runs", "topic_runs", "metric_series", "stage_timings"):
+            conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+        conn.execute(
+            f"INSERT INTO runs (run_id, started_at, {', '.join(_RUN_COLUMNS)}, "
+            "error_count, warning_count, data) "
+            f"VALUES (?, ?, {', '.join('?' * len(_RUN_COLUMNS))}, ?, ?, ?)",
+            (
+                run_id,
+                started_at,
+                *(run.get(column) for column in _RUN_COLUMNS),
+                len(run.get("errors", [])),
+                len(run.get("warnings", [])),
+                json.dumps(run),
+            ),
+        )
+        conn.executemany(
+            f"INSERT INTO topic_runs (run_id, started_at, {', '.join(_TOPIC_COLUMNS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(_TOPIC_COLUMNS))})",
+            [
+                (run_id, started_at, *(topic.get(column) for column in _TOPIC_COLUMNS))
+                for topic in run.get("topics_processed", [])
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO metric_series (run_id, started_at, name, labels, kind, "
+            "value, count, p50, p95, p99, snapshot) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (run_id, started_at, *row)
+                for row in _metric_rows(run.get("metrics") or {})
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO stage_timings (run_id, started_at, stage, span_count, "
+            "total_ms) VALUES (?, ?, ?, ?, ?)",
+            [
+                (run_id, started_at, stage["name"], stage["count"], stage["total_ms"])
+                for stage in stages
+            ],
+        )
+
+    def record_map_summary(
+        self,
+        episode_id: str,
+        topic: str,
+        summary: str,
+        token_count: int,
+        run_id: Optional[str] = None,
+        created_at=None,
+    ):
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO map_summaries (episode_id, topic, run_id, "
+                        "created_at, token_count, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            episode_id,
+                            topic,
+                            run_id,
+                            to_epoch(created_at),
+                            token_count,
+                            summary,
+                        ),
+                    )
+            finally:
+                conn.close()
+
+    def prune(self, runs_before: float, map_summaries_before: Optional[float] = None):
+        """Drop history older than the cutoffs (epoch seconds)"""
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    removed = conn.execute(
+                        "DELETE FROM runs WHERE started_at < ?", (runs_before,)
+                    ).rowcount
+                    for table in ("topic_runs", "metric_series", "stage_timings"):
+                        conn.execute(
+                            f"DELETE FROM {table} WHERE started_at < ?", (runs_before,)
+                        )
+                    if map_summaries_before is not None:
+                        removed += conn.execute(
+                            "DELETE FROM map_summaries WHERE created_at < ?",
+                            (map_summaries_before,),
+                        ).rowcount
+                return removed
+            finally:
+                conn.close()
+
+    # Migration
+
+    def migrate_json(self, telemetry_dir: Union[str, Path], force: bool = False) -> int:
+        """Import JSON telemetry not yet in the store; returns records added
+
+        Run files are matched by name, so calling this on every start is
+        cheap and picks up run_*.json written elsewhere (e.g. committed by
+        CI). Legacy map_summaries/ files are imported once.
+        """
+        telemetry_dir = Path(telemetry_dir)
+        with self._lock:
+            conn = self._connect()
+            try:
+                imported = self._import_runs(conn, telemetry_dir, force)
+                done = conn.execute(
+                    "SELECT value FROM store_state WHERE key = 'map_summaries_imported'"
+                ).fetchone()
+                if force or not done:
+                    imported += self._import_map_summaries(conn, telemetry_dir)
+                    with conn:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO store_state VALUES "
+                            "('map_summaries_imported', ?)",
+                            (now_utc().isoformat(),),
+                        )
+            finally:
+                conn.close()
+        if imported:
+            logger.info(f"📊 Imported {imported} telemetry files into {self.db_path}")
+        return imported
+
+    def _import_runs(self, conn, telemetry_dir: Path, force: bool) -> int:
+        known = set()
+        if not force:
+            known = {row[0] for row in conn.execute("SELECT run_id FROM runs")}
+        imported = 0
+        for run_file in sorted(telemetry_dir.glob("run_*.json")):
+            if run_file.stem in known:
+                continue
+            try:
+                run = json.loads(run_file.read_text())
+                stages = _stages_from_trace(
+                    telemetry_dir / "traces" / f"{run['run_id']}.json"
+                )
+                with conn:
+                    self._insert_run(conn, run, stages)
+                imported += 1
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not import {run_file}: {e}")
+        return imported
+
+    def _import_map_summaries(self, conn, telemetry_dir: Path) -> int:
+        known_summaries = set(
+            conn.execute("SELECT episode_id, topic, created_at FROM map_summaries")
+        )
+        rows = []
+        for summary_file in sorted((telemetry_dir / "map_summaries").glob("*.json")):
+            try:
+                data = json.loads(summary_file.read_text())
+                key = (data["episode_id"], data["topic"], to_epoch(data["timestamp"]))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Could not import {summary_file}: {e}")
+                continue
+            if key not in known_summaries:
+                episode_id, topic, created_at = key
+                rows.append(
+                    (
+                        episode_id,
+                        topic,
+                        data.get("run_id"),
+                        created_at,
+                        data.get("token_count"),
+                        data.get("summary"),
+                    )
+                )
+        with conn:
+            conn.executemany(
+                "INSERT INTO map_summaries (episode_id, topic, run_id, created_at, "
+                "token_count, summary) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    # Queries
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def runs_since(self, since: float, limit: Optional[int] = None) -> List[Dict]:
+        """Full run dicts, newest first"""
+        sql = "SELECT data FROM runs WHERE started_at >= ? ORDER BY started_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [json.loads(row[0]) for row in self._query(sql, (since,))]
+
+    def run_totals(self, since: float) -> Dict:
+        """Aggregates over runs and topics started since the cutoff"""
+        runs, episodes, tokens, cost, errors = self._query(
+            "SELECT COUNT(*), SUM(episodes_digested), SUM(total_tokens_used), "
+            "SUM(total_cost_estimate), SUM(error_count) FROM runs "
+            "WHERE started_at >= ?",
+            (since,),
+        )[0]
+        topics, successful = self._query(
+            "SELECT COUNT(*), SUM(success) FROM topic_runs WHERE started_at >= ?",
+            (since,),
+        )[0]
+        return {
+            "runs": runs,
+            "episodes_digested": episodes or 0,
+            "total_tokens": tokens or 0,
+            "total_cost": cost or 0.0,
+            "errors": errors or 0,
+            "topics": topics,
+            "successful_topics": successful or 0,
+        }
+
+    def recent_runs(self, since: float, limit: int = 5) -> List[Dict]:
+        """run_id, started_at, pipeline_type and topic success per run"""
+        rows = self._query(
+            "SELECT r.run_id, r.started_at, r.pipeline_type, COUNT(t.run_id), "
+            "COALESCE(SUM(t.success), 0) FROM runs r "
+            "LEFT JOIN topic_runs t ON t.run_id = r.run_id "
+            "WHERE r.started_at >= ? GROUP BY r.run_id "
+            "ORDER BY r.started_at DESC LIMIT ?",
+            (since, limit),
+        )
+        return [
+            {
+                "run_id": run_id,
+                "started_at": started_at,
+                "pipeline_type": pipeline_type,
+                "topics": topics,
+                "successful_topics": successful,
+            }
+            for run_id, started_at, pipeline_type, topics, successful in rows
+        ]
+
+    def recent_map_summaries(self, limit: int = 10) -> List[Dict]:
+        columns = ("episode_id", "topic", "run_id", "created_at", "token_count")
+        rows = self._query(
+            f"SELECT {', '.join(columns)}, summary FROM map_summaries "
+            "ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        )
+        return [dict(zip(columns + ("summary",), row)) for row in rows]
+
+    def tokens_per_topic(self, since: float, period: str = "week") -> List[Dict]:
+        """Token totals per topic per day/week/month"""
+        rows = self._query(
+            f"SELECT strftime('{PERIODS[period]}', started_at, 'unixepoch'), topic, "
+            "SUM(total_tokens), SUM(map_phase_tokens), SUM(reduce_phase_tokens), "
+            "COUNT(*) FROM topic_runs WHERE started_at >= ? "
+            "GROUP BY 1, 2 ORDER BY 1, 2",
+            (since,),
+        )
+        return [
+            {
+                "period": bucket,
+                "topic": topic,
+                "total_tokens": total,
+                "map_phase_tokens": map_tokens,
+                "reduce_phase_tokens": reduce_tokens,
+                "runs": runs,
+            }
+            for bucket, topic, total, map_tokens, reduce_tokens, runs in rows
+        ]
+
+    def metric_histogram(
+        self, name: str, since: float, labels: Optional[str] = None
+    ) -> Histogram:
+        """One histogram merged from every run's snapshot of a series"""
+        sql = (
+            "SELECT snapshot FROM metric_series "
+            "WHERE name = ? AND started_at >= ? AND kind = 'histogram'"
+        )
+        params: Tuple = (name, since)
+        if labels is not None:
+            sql += " AND labels = ?"
+            params += (labels,)
+        return Histogram.from_snapshots(
+            json.loads(row[0]) for row in self._query(sql, params)
+        )
+
+    def metric_quantile(
+        self, name: str, since: float, q: float = 0.95, labels: Optional[str] = None
+    ) -> Optional[float]:
+        """e.g. metric_quantile("transcribe.rtf.ratio", days_ago(30), 0.95)"""
+        return self.metric_histogram(name, since, labels).quantile(q)
+
+    def stage_durations(self, since: float) -> List[Dict]:
+        """Per span name: runs seen, total and mean seconds per run"""
+        rows = self._query(
+            "SELECT stage, COUNT(DISTINCT run_id), SUM(total_ms) FROM stage_timings "
+            "WHERE started_at >= ? GROUP BY stage ORDER BY 3 DESC",
+            (since,),
+        )
+        return [
+            {
+                "stage": stage,
+                "runs": runs,
+                "total_seconds": round(total_ms / 1000, 3),
+                "mean_seconds": round(total_ms / 1000 / runs, 3),
+            }
+            for stage, runs, total_ms in rows
+        ]
+
+
+def _metric_rows(metrics: Dict) -> List[Tuple]:
+    """(name, labels, kind, value, count, p50, p95, p99, snapshot) per series"""
+    rows = []
+    for kind, group in (("counter", "counters"), ("gauge", "gauges")):
+        for series, value in metrics.get(group, {}).items():
+            rows.append((*split_series(series), kind, value) + (None,) * 5)
+    for series, snapshot in metrics.get("histograms", {}).items():
+        rows.append(
+            (
+                *split_series(series),
+                "histogram",
+                snapshot.get("sum"),
+                snapshot.get("count"),
+                snapshot.get("p50"),
+                snapshot.get("p95"),
+                snapshot.get("p99"),
+                json.dumps(snapshot),
+            )
+        )
+    return rows
+
+
+def _stages_from_trace(trace_file: Path) -> List[Dict]:
+    """Per span name totals from an exported Chrome trace, if there is one"""
+    if not trace_file.exists():
+        return []
+    totals: Dict[str, Dict] = {}
+    for event in json.loads(trace_file.read_text()).get("traceEvents", []):
+        if event.get("ph") != "X":
+            continue
+        entry = totals.setdefault(
+            event["name"], {"name": event["name"], "count": 0, "total_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["total_ms"] += event.get("dur", 0) / 1000
+    return list(totals.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the telemetry history store")
+    parser.add_argument("--db", default=str(STORE_PATH))
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Import existing JSON telemetry")
+    migrate.add_argument("--telemetry-dir", default="telemetry")
+    migrate.add_argument("--force", action="store_true", help="Import again")
+
+    tokens = subparsers.add_parser("tokens", help="Tokens per topic per period")
+    tokens.add_argument("--days", type=float, default=30)
+    tokens.add_argument("--by", choices=sorted(PERIODS), default="week")
+
+    quantile = subparsers.add_parser("quantile", help="Quantile of a histogram")
+    quantile.add_argument("name", help="e.g. transcribe.rtf.ratio")
+    quantile.add_argument("--days", type=float, default=30)
+    quantile.add_argument("--q", type=float, default=0.95)
+
+    stages = subparsers.add_parser("stages", help="Time per span name")
+    stages.add_argument("--days", type=float, default=30)
+
+    args = parser.parse_args()
+    store = TelemetryStore(args.db)
+
+    if args.command == "migrate":
+        imported = store.migrate_json(args.telemetry_dir, args.force)
+        print(f"📊 Imported {imported} files")
+    elif args.command == "tokens":
+        for row in store.tokens_per_topic(days_ago(args.days), args.by):
+            print(
+                f"{row['period']}  {row['topic']:<32} {row['total_tokens']:>10,} "
+                f"tokens over {row['runs']} runs"
+            )
+    elif args.command == "quantile":
+        histogram = store.metric_histogram(args.name, days_ago(args.days))
+        value = histogram.quantile(args.q)
+        if value is None:
+            print(f"❌ No observations of {args.name} in the last {args.days:g} days")
+            return 1
+        count = histogram.merged()[1]
+        print(f"{args.name} p{args.q * 100:g} = {value:.4f} ({count} observations)")
+    elif args.command == "stages":
+        for row in store.stage_durations(days_ago(args.days)):
+            print(
+                f"{row['stage']:<40} {row['mean_seconds']:>9.1f}s/run "
+                f"over {row['runs']} runs"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tokenizer Service
+Token counting for map/reduce budgeting with a cached BPE encoder and count cache
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to the chars/4 heuristic
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# GPT-5 family models use the o200k vocabulary
+DEFAULT_ENCODING = "o200k_base"
+
+# Per-message framing the Responses API adds around each input message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Number of distinct texts whose counts are kept in memory
+COUNT_CACHE_SIZE = 8192
+
+
+def heuristic_tokens(text: str) -> int:
+    """Estimate token count using simple heuristic (~4 characters per token)"""
+    return (len(text) + 3) // 4
+
+
+class TokenizerService:
+    """Counts tokens with a BPE encoder loaded once, caching counts by text hash"""
+
+    def __init__(self, encoding_name: str = DEFAULT_ENCODING):
+        self.encoding_name = encoding_name
+        self._encoder = None
+        self._encoder_loaded = False
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> str:
+        """Name of the counting backend in use (for telemetry)"""
+        return f"tiktoken:{self.encoding_name}" if self._get_encoder() else "heuristic"
+
+    def _get_encoder(self):
+        """Load the BPE encoder once; later calls reuse it (or the failed attempt)"""
+        if self._encoder_loaded:
+            return self._encoder
+
+        with self._lock:
+            if not self._encoder_loaded:
+                if tiktoken is None:
+                    logger.info("tiktoken not installed, using heuristic token counts")
+                else:
+                    try:
+                        self._encoder = tiktoken.get_encoding(self.encoding_name)
+                    except Exception as e:
+                        logger.warning(
+                            f"Could not load {self.encoding_name} encoder, "
+                            f"using heuristic token counts: {e}"
+                        )
+                self._encoder_loaded = True
+        return self._encoder
+
+    def count(self, text: Optional[str]) -> int:
+        """Count tokens in text"""
+        if not text:
+            return 0
+
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._counts.get(key)
+            if cached is not None:
+                self._counts.move_to_end(key)
+                return cached
+
+        encoder = self._get_encoder()
+        if encoder is not None:
+            tokens = len(encoder.encode(text, disallowed_special=()))
+        else:
+            tokens = heuristic_tokens(text)
+
+        with self._lock:
+            self._counts[key] = tokens
+            if len(self._counts) > COUNT_CACHE_SIZE:
+                self._counts.popitem(last=False)
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """Count tokens for a list of chat-style input messages"""
+        return sum(
+            self.count(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+            for message in messages
+        )
+
+
+# Process-wide instance so the encoder and count cache are shared
+tokenizer = TokenizerService()
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens with the shared tokenizer service"""
+    return tokenizer.count(text)
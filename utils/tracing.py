@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Lightweight tracing for pipeline runs
+Context-manager spans with parent/child relationships and attributes,
+collected in memory and exported as a Chrome trace (chrome://tracing,
+Perfetto, speedscope) so a run can be read as a flame chart. The active span
+follows contextvars, so nesting works across function calls; work handed to
+a thread pool keeps its parent through tracer.wrap().
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Spans kept per run; beyond this new spans are counted but not stored
+MAX_SPANS = 50_000
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    """One timed operation; use as a context manager or call end()"""
+
+    __slots__ = (
+        "tracer",
+        "name",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "thread_id",
+        "thread_name",
+        "status",
+        "_token",
+    )
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"], attrs):
+        self.tracer = tracer
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attrs)
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.thread_id = threading.get_ident()
+        self.thread_name = threading.current_thread().name
+        self.status = "ok"
+        self._token = _current_span.set(self)
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def record_exception(self, error: BaseException):
+        self.status = "error"
+        self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Ended from another context (e.g. a callback thread)
+            pass
+        self.tracer._finish(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.record_exception(exc)
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled"""
+
+    span_id = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def record_exception(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects finished spans for the current process/run"""
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("TRACING_ENABLED", "1") == "1"
+        self.enabled = enabled
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+        # Objects with span_started(span)/span_ended(span), e.g. the profiler
+        self.listeners: List[Any] = []
+
+    def span(self, name: str, **attributes) -> Union[Span, _NoopSpan]:
+        """Start a child of the active span: `with tracer.span("digest"):`"""
+        if not self.enabled:
+            return NOOP_SPAN
+        span = Span(self, name, _current_span.get(), attributes)
+        for listener in self.listeners:
+            listener.span_started(span)
+        return span
+
+    start_span = span
+
+    def traced(self, name: Optional[str] = None, **attributes) -> Callable:
+        """Decorator running the function inside a span"""
+
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **attributes):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def wrap(self, func: Callable) -> Callable:
+        """Bind func to the caller's context so pool threads keep the parent span"""
+        context = contextvars.copy_context()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return context.copy().run(func, *args, **kwargs)
+
+        return wrapper
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        return _current_span.get()
+
+    @staticmethod
+    def annotate(**attributes):
+        """Attach attributes to the active span, if any"""
+        span = _current_span.get()
+        if span is not None:
+            span.set_attributes(**attributes)
+
+    def add_listener(self, listener):
+        if listener not in self.listeners:
+            self.listeners = self.listeners + [listener]
+
+    def remove_listener(self, listener):
+        self.listeners = [item for item in self.listeners if item is not listener]
+
+    def _finish(self, span: Span):
+        for listener in self.listeners:
+            listener.span_ended(span)
+        with self._lock:
+            if len(self.spans) < MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+    def reset(self):
+        """Forget collected spans and start a new trace id"""
+        with self._lock:
+            self.spans = []
+            self.dropped = 0
+            self.trace_id = secrets.token_hex(16)
+
+    def to_chrome_trace(self, metadata: Optional[Dict] = None) -> Dict:
+        """Trace Event Format: one complete ("X") event per span"""
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        events = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": (metadata or {}).get("run_id", "podcast-scraper")},
+            }
+        ]
+        thread_ids: Dict[int, int] = {}
+        thread_names: Dict[int, str] = {}
+        for span in sorted(spans, key=lambda s: s.start_ns):
+            tid = thread_ids.setdefault(span.thread_id, len(thread_ids))
+            thread_names[tid] = span.thread_name
+            args = {
+                key: (
+                    value
+                    if isinstance(value, (str, int, float, bool)) or value is None
+                    else str(value)
+                )
+                for key, value in span.attributes.items()
+            }
+            args.update(span_id=span.span_id, parent_id=span.parent_id)
+            if span.status != "ok":
+                args["status"] = span.status
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": span.start_ns / 1000,
+                    "dur": (span.end_ns - span.start_ns) / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+        for tid, thread_name in thread_names.items():
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "trace_id": self.trace_id,
+                "dropped_spans": self.dropped,
+                **(metadata or {}),
+            },
+        }
+
+    def export_chrome_trace(
+        self, path: Union[str, Path], metadata: Optional[Dict] = None
+    ) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_chrome_trace(metadata), f)
+        os.replace(tmp_path, path)
+        return path
+
+    def summary(self, limit: int = 10) -> List[Dict]:
+        """Slowest span names by total time, for the run summary log"""
+        totals: Dict[str, Dict] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = totals.setdefault(span.name, {"name": span.name, "count": 0})
+            entry["count"] += 1
+            entry["total_ms"] = entry.get("total_ms", 0.0) + span.duration_ms
+        ranked = sorted(totals.values(), key=lambda e: e["total_ms"], reverse=True)
+        return ranked[:limit]
+
+
+# Process-wide tracer
+tracer = Tracer()
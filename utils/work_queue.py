@@ -0,0 +1,771 @@
+#!/usr/bin/env python3
+"""
+Episode Work Queue
+Persistent priority queue for transcription work: a work_queue table next to
+episodes. sync() enqueues every pending/pre-download episode and re-prices it
+on each run:
+
+    value    = 0.4 * recency + 0.2 * feed_weight + 0.4 * relevance
+    priority = value / sqrt(cost / DEFAULT_COST_SECONDS)
+
+recency halves every WORK_QUEUE_HALF_LIFE_HOURS since publication;
+feed_weight is the share of the feed's finished episodes that made it into a
+digest; relevance is the feed's mean best topic score (episodes are scored
+after transcription, so the feed's history is the prediction); cost is the
+feed's mean processing seconds as recorded by complete().
+
+plan() orders the queue by weighted-fair queuing over digest topics (the
+feed's dominant topic), then over feeds within a topic: flows take turns in
+proportion to their weight, each charged the predicted cost of what it was
+served, and within a feed the highest priority goes first. One prolific feed
+can no longer take the whole transcription budget while a high-relevance
+show waits.
+
+Several worker processes, on one box or on several sharing the database, can
+drain the queue together (content_processor.py --worker). claim_next() takes
+the next episode in fair order under a lease that the worker's heartbeat
+keeps extending; a worker that dies stops heartbeating and its episode is
+requeued once the lease expires. Work served in the last FAIR_WINDOW_HOURS
+counts towards each flow, so fairness holds across claims by many workers.
+Across hosts, set PODCAST_DB_JOURNAL_MODE=DELETE: WAL needs shared memory,
+which a network filesystem does not provide.
+
+    python -m utils.work_queue show --db podcast_monitor.db
+    python -m utils.work_queue workers      # liveness and throughput
+    python -m utils.work_queue requeue      # release expired leases now
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.datetime_utils import now_utc, to_utc
+from utils.db import get_connection
+from utils.scheduler import DEFAULT_ITEM_SECONDS
+
+logger = logging.getLogger(__name__)
+
+RECENCY_HALF_LIFE_HOURS = float(os.getenv("WORK_QUEUE_HALF_LIFE_HOURS", "24"))
+DEFAULT_COST_SECONDS = DEFAULT_ITEM_SECONDS["pending_episodes"]
+WEIGHTS = {"recency": 0.4, "feed_weight": 0.2, "relevance": 0.4}
+# Priors for feeds without history
+PRIOR_RELEVANCE = 0.5
+# Floor so a feed that never made a digest still gets an occasional turn
+MIN_FEED_WEIGHT = 0.1
+# Finished rows are kept this long as processing-cost history
+HISTORY_DAYS = 60
+# Claims expire unless heartbeated; heartbeats run every third of a lease
+LEASE_SECONDS = float(os.getenv("WORK_QUEUE_LEASE_SECONDS", "600"))
+# Served work this recent counts towards a flow's fair share
+FAIR_WINDOW_HOURS = 12
+
+PENDING_STATUSES = ("pending", "pre-download")
+# Keys of topic_relevance_json that are not topic scores
+_SCORE_METADATA = {"confidence", "moderation_flag"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_queue (
+    episode_pk INTEGER PRIMARY KEY,
+    feed_id INTEGER,
+    topic TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',
+    priority REAL NOT NULL DEFAULT 0,
+    recency REAL,
+    feed_weight REAL,
+    relevance REAL,
+    cost_seconds REAL,
+    enqueued_at TEXT NOT NULL,
+    claimed_at TEXT,
+    finished_at TEXT,
+    seconds REAL,
+    succeeded INTEGER,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires_at TEXT,
+    FOREIGN KEY (episode_pk) REFERENCES episodes (id) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS work_workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    current_episode INTEGER,
+    started_at TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+"""
+# Separate from SCHEMA: lease columns are added to older tables first
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_work_queue_state_priority
+    ON work_queue(state, priority DESC);
+CREATE INDEX IF NOT EXISTS idx_work_queue_feed ON work_queue(feed_id, state);
+CREATE INDEX IF NOT EXISTS idx_work_queue_lease
+    ON work_queue(state, lease_expires_at);
+CREATE INDEX IF NOT EXISTS idx_work_queue_worker ON work_queue(worker, finished_at);
+"""
+LEASE_COLUMNS = {"worker": "TEXT", "lease_expires_at": "TEXT"}
+
+
+@dataclass
+class QueueItem:
+    """One queued episode and the parts of its priority"""
+
+    episode_pk: int
+    feed_id: Optional[int]
+    topic: str
+    priority: float
+    recency: float
+    feed_weight: float
+    relevance: float
+    # Predicted seconds from the feed's history; None without history
+    cost_seconds: Optional[float]
+
+    @property
+    def cost(self) -> float:
+        return self.cost_seconds or DEFAULT_COST_SECONDS
+
+
+def parse_published(value: Optional[str]) -> Optional[datetime]:
+    """ISO (including the '+00:00Z' variant) or RFC 822 date -> aware UTC"""
+    if not value:
+        return None
+    text = str(value).strip()
+    if text.endswith("Z") and ("+" in text[10:] or text[10:].count("-")):
+        text = text[:-1]
+    elif text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        return to_utc(datetime.fromisoformat(text))
+    except ValueError:
+        pass
+    try:
+        return to_utc(parsedate_to_datetime(text))
+    except (TypeError, ValueError):
+        return None
+
+
+def topic_scores(scores_json: Optional[str]) -> Dict[str, float]:
+    """Topic -> score from topic_relevance_json, metadata keys dropped"""
+    try:
+        scores = json.loads(scores_json or "")
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(scores, dict):
+        return {}
+    return {
+        topic: float(score)
+        for topic, score in scores.items()
+        if topic not in _SCORE_METADATA
+        and isinstance(score, (int, float))
+        and not isinstance(score, bool)
+    }
+
+
+def compute_priority(recency: float, feed_weight: float, relevance: float, cost):
+    value = (
+        WEIGHTS["recency"] * recency
+        + WEIGHTS["feed_weight"] * feed_weight
+        + WEIGHTS["relevance"] * relevance
+    )
+    return value / math.sqrt((cost or DEFAULT_COST_SECONDS) / DEFAULT_COST_SECONDS)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def fair_order(
+    items: List[QueueItem], served: Optional[Dict[Tuple, float]] = None
+) -> List[QueueItem]:
+    """Weighted-fair order: topics share equally, feeds by feed_weight
+
+    served maps (topic, feed_id) to (seconds, seconds / feed weight) already
+    given to that flow, so a flow that was just served waits its turn.
+    """
+    flows: Dict[str, Dict[Optional[int], List[QueueItem]]] = {}
+    for item in sorted(items, key=lambda i: (-i.priority, i.episode_pk)):
+        flows.setdefault(item.topic, {}).setdefault(item.feed_id, []).append(item)
+
+    served = served or {}
+    topic_time = {topic: 0.0 for topic in flows}
+    feed_time = {}
+    for topic, feeds in flows.items():
+        for feed in feeds:
+            seconds, weighted = served.get((topic, feed), (0.0, 0.0))
+            topic_time[topic] += seconds
+            feed_time[(topic, feed)] = weighted
+    order = []
+    while flows:
+        # Least-served flow first; ties go to the better head item
+        topic = min(
+            flows,
+            key=lambda t: (
+                topic_time[t],
+                -max(queue[0].priority for queue in flows[t].values()),
+            ),
+        )
+        feeds = flows[topic]
+        feed = min(feeds, key=lambda f: (feed_time[(topic, f)], -feeds[f][0].priority))
+        item = feeds[feed].pop(0)
+        order.append(item)
+        topic_time[topic] += item.cost
+        feed_time[(topic, feed)] += item.cost / max(item.feed_weight, MIN_FEED_WEIGHT)
+        if not feeds[feed]:
+            del feeds[feed]
+        if not feeds:
+            del flows[topic]
+    return order
+
+
+class WorkQueue:
+    """Priority queue of episodes awaiting transcription in one database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._schema_ready = False
+
+    def _connect(self):
+        conn = get_connection(self.db_path)
+        if not self._schema_ready:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(work_queue)")}
+            for column, kind in LEASE_COLUMNS.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE work_queue ADD COLUMN {column} {kind}")
+            conn.executescript(INDEXES)
+            self._schema_ready = True
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator:
+        """Write transaction that holds the database lock from its first read"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    # Pricing
+
+    def _feed_history(self, cursor) -> Tuple[Dict, Dict, Dict]:
+        """feed_id -> digest hit rate, mean best score and dominant topic"""
+        placeholders = ", ".join("?" * len(PENDING_STATUSES))
+        cursor.execute(
+            f"""
+            SELECT feed_id,
+                   SUM(CASE WHEN status = 'digested' OR digest_date IS NOT NULL
+                       THEN 1 ELSE 0 END),
+                   COUNT(*)
+            FROM episodes
+            WHERE status NOT IN ({placeholders})
+            GROUP BY feed_id
+            """,
+            PENDING_STATUSES,
+        )
+        # Laplace-smoothed, so a feed without history starts at 0.5
+        hit_rate = {
+            feed_id: (hits + 1) / (finished + 2)
+            for feed_id, hits, finished in cursor.fetchall()
+        }
+
+        cursor.execute(
+            """
+            SELECT feed_id, topic_relevance_json FROM episodes
+            WHERE topic_relevance_json IS NOT NULL AND topic_relevance_json != ''
+            """
+        )
+        best: Dict[int, List[float]] = {}
+        totals: Dict[int, Dict[str, float]] = {}
+        for feed_id, scores_json in cursor.fetchall():
+            scores = topic_scores(scores_json)
+            if not scores:
+                continue
+            best.setdefault(feed_id, []).append(max(scores.values()))
+            feed_totals = totals.setdefault(feed_id, {})
+            for topic, score in scores.items():
+                feed_totals[topic] = feed_totals.get(topic, 0.0) + score
+        relevance = {feed_id: sum(v) / len(v) for feed_id, v in best.items()}
+        dominant = {
+            feed_id: max(feed_totals, key=feed_totals.get)
+            for feed_id, feed_totals in totals.items()
+        }
+        return hit_rate, relevance, dominant
+
+    def _feed_costs(self, cursor) -> Dict[int, float]:
+        cutoff = (now_utc() - timedelta(days=HISTORY_DAYS)).isoformat()
+        cursor.execute(
+            """
+            SELECT feed_id, AVG(seconds) FROM work_queue
+            WHERE state = 'done' AND succeeded = 1 AND finished_at >= ?
+            GROUP BY feed_id
+            """,
+            (cutoff,),
+        )
+        return {feed_id: seconds for feed_id, seconds in cursor.fetchall()}
+
+    def sync(self) -> int:
+        """Enqueue and re-price every pending episode; returns the queue size
+
+        Rows of episodes that left the pending states are dropped, claims whose
+        lease expired go back to queued, and finished rows older than
+        HISTORY_DAYS are pruned. Live leases are left alone.
+        """
+        with self._write() as conn:
+            cursor = conn.cursor()
+            hit_rate, relevance, dominant = self._feed_history(cursor)
+            costs = self._feed_costs(cursor)
+
+            placeholders = ", ".join("?" * len(PENDING_STATUSES))
+            cursor.execute(
+                f"""
+                SELECT e.id, e.feed_id, e.published_date, e.created_at,
+                       f.topic_category
+                FROM episodes e LEFT JOIN feeds f ON e.feed_id = f.id
+                WHERE e.status IN ({placeholders})
+                """,
+                PENDING_STATUSES,
+            )
+            now = now_utc()
+            rows = []
+            for pk, feed_id, published, created, category in cursor.fetchall():
+                when = parse_published(published) or parse_published(created)
+                if when is None:
+                    recency = 0.5
+                else:
+                    age_hours = max(0.0, (now - when).total_seconds() / 3600)
+                    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+                weight = hit_rate.get(feed_id, 0.5)
+                feed_relevance = relevance.get(feed_id, PRIOR_RELEVANCE)
+                cost = costs.get(feed_id)
+                priority = compute_priority(recency, weight, feed_relevance, cost)
+                rows.append(
+                    (
+                        pk,
+                        feed_id,
+                        dominant.get(feed_id) or category or "unknown",
+                        round(priority, 4),
+                        round(recency, 4),
+                        round(weight, 4),
+                        round(feed_relevance, 4),
+                        cost,
+                        now.isoformat(),
+                    )
+                )
+
+            self._requeue_expired(conn, now)
+            cursor.executemany(
+                """
+                INSERT INTO work_queue (episode_pk, feed_id, topic, priority,
+                    recency, feed_weight, relevance, cost_seconds, enqueued_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(episode_pk) DO UPDATE SET
+                    feed_id = excluded.feed_id, topic = excluded.topic,
+                    priority = excluded.priority, recency = excluded.recency,
+                    feed_weight = excluded.feed_weight,
+                    relevance = excluded.relevance,
+                    cost_seconds = excluded.cost_seconds,
+                    enqueued_at = CASE WHEN state = 'done'
+                        THEN excluded.enqueued_at ELSE enqueued_at END,
+                    state = CASE WHEN state = 'done' THEN 'queued' ELSE state END
+                """,
+                rows,
+            )
+            cursor.execute(
+                f"""
+                DELETE FROM work_queue
+                WHERE state = 'queued' AND episode_pk NOT IN (
+                    SELECT id FROM episodes WHERE status IN ({placeholders})
+                )
+                """,
+                PENDING_STATUSES,
+            )
+            cursor.execute(
+                "DELETE FROM work_queue WHERE state = 'done' AND finished_at < ?",
+                ((now - timedelta(days=HISTORY_DAYS)).isoformat(),),
+            )
+            return len(rows)
+
+    # Dequeue
+
+    def _served(self, conn) -> Dict[Tuple, Tuple[float, float]]:
+        """(topic, feed_id) -> seconds claimed within FAIR_WINDOW_HOURS"""
+        cutoff = (now_utc() - timedelta(hours=FAIR_WINDOW_HOURS)).isoformat()
+        rows = conn.execute(
+            """
+            SELECT topic, feed_id, COALESCE(seconds, cost_seconds, ?), feed_weight
+            FROM work_queue
+            WHERE state IN ('claimed', 'done') AND claimed_at >= ?
+            """,
+            (DEFAULT_COST_SECONDS, cutoff),
+        ).fetchall()
+        served: Dict[Tuple, Tuple[float, float]] = {}
+        for topic, feed_id, seconds, weight in rows:
+            total, weighted = served.get((topic, feed_id), (0.0, 0.0))
+            weighted += seconds / max(weight or 0.0, MIN_FEED_WEIGHT)
+            served[(topic, feed_id)] = (total + seconds, weighted)
+        return served
+
+    def plan(self, fair_window: bool = False) -> List[QueueItem]:
+        """Queued episodes in weighted-fair dequeue order
+
+        fair_window charges each flow for work claimed in the last
+        FAIR_WINDOW_HOURS, so repeated plans keep rotating between flows.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT episode_pk, feed_id, topic, priority, recency, feed_weight,
+                       relevance, cost_seconds
+                FROM work_queue WHERE state = 'queued'
+                ORDER BY priority DESC
+                """
+            ).fetchall()
+            served = self._served(conn) if fair_window else None
+        finally:
+            conn.close()
+        return fair_order([QueueItem(*row) for row in rows], served)
+
+    def claim(
+        self,
+        episode_pk: int,
+        worker: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS,
+    ) -> bool:
+        """Take a queued episode under a lease; False if it is already taken"""
+        now = now_utc()
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE work_queue SET state = 'claimed', claimed_at = ?, "
+                "worker = ?, lease_expires_at = ? "
+                "WHERE episode_pk = ? AND state = 'queued'",
+                (
+                    now.isoformat(),
+                    worker or default_worker_id(),
+                    (now + timedelta(seconds=lease_seconds)).isoformat(),
+                    episode_pk,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def claim_next(
+        self, worker: str, lease_seconds: float = LEASE_SECONDS
+    ) -> Optional[QueueItem]:
+        """Lease the next episode in fair order; None when nothing is queued"""
+        self.requeue_expired()
+        for item in self.plan(fair_window=True):
+            if self.claim(item.episode_pk, worker, lease_seconds):
+                return item
+        return None
+
+    def heartbeat(
+        self, episode_pk: int, worker: str, lease_seconds: float = LEASE_SECONDS
+    ) -> bool:
+        """Extend a lease; False if the worker no longer holds it"""
+        expires = (now_utc() + timedelta(seconds=lease_seconds)).isoformat()
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE work_queue SET lease_expires_at = ? "
+                "WHERE episode_pk = ? AND worker = ? AND state = 'claimed'",
+                (expires, episode_pk, worker),
+            )
+            conn.execute(
+                "UPDATE work_workers SET last_seen = ? WHERE worker_id = ?",
+                (now_utc().isoformat(), worker),
+            )
+            return cursor.rowcount == 1
+
+    def release(self, episode_pk: int, worker: str):
+        """Hand an unfinished episode back to the queue"""
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE work_queue SET state = 'queued', claimed_at = NULL, "
+                "worker = NULL, lease_expires_at = NULL "
+                "WHERE episode_pk = ? AND worker = ? AND state = 'claimed'",
+                (episode_pk, worker),
+            )
+
+    @contextmanager
+    def lease(
+        self, episode_pk: int, worker: str, lease_seconds: float = LEASE_SECONDS
+    ) -> Iterator[threading.Event]:
+        """Heartbeat a claimed episode while the block runs
+
+        Yields an event that is set if the lease was lost to another worker.
+        """
+        stop = threading.Event()
+        lost = threading.Event()
+
+        def beat():
+            while not stop.wait(lease_seconds / 3):
+                try:
+                    alive = self.heartbeat(episode_pk, worker, lease_seconds)
+                except Exception as e:
+                    logger.warning(f"⚠️ Heartbeat for episode {episode_pk} failed: {e}")
+                    continue
+                if not alive:
+                    logger.warning(f"⚠️ Lost the lease on episode {episode_pk}")
+                    lost.set()
+                    return
+
+        thread = threading.Thread(target=beat, name=f"lease-{episode_pk}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    def _requeue_expired(self, conn, now: datetime) -> int:
+        cursor = conn.execute(
+            "UPDATE work_queue SET state = 'queued', claimed_at = NULL, "
+            "worker = NULL, lease_expires_at = NULL "
+            "WHERE state = 'claimed' "
+            "AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+            (now.isoformat(),),
+        )
+        if cursor.rowcount:
+            logger.info(f"♻️ Requeued {cursor.rowcount} episodes with expired lease")
+        return cursor.rowcount
+
+    def requeue_expired(self) -> int:
+        """Return claims whose lease ran out (dead workers) to the queue"""
+        with self._write() as conn:
+            return self._requeue_expired(conn, now_utc())
+
+    def complete(
+        self,
+        episode_pk: int,
+        seconds: float,
+        succeeded: bool = True,
+        worker: Optional[str] = None,
+    ) -> bool:
+        """Finish a claimed episode; its time feeds the feed's cost estimate
+
+        False if the worker no longer holds the claim (its lease ran out and
+        the episode went back to the queue), in which case nothing changes.
+        """
+        with self._write() as conn:
+            cursor = conn.execute(
+                "UPDATE work_queue SET state = 'done', finished_at = ?, "
+                "seconds = ?, succeeded = ?, attempts = attempts + 1, "
+                "lease_expires_at = NULL "
+                "WHERE episode_pk = ? AND worker = ? AND state = 'claimed'",
+                (
+                    now_utc().isoformat(),
+                    seconds,
+                    int(succeeded),
+                    episode_pk,
+                    worker or default_worker_id(),
+                ),
+            )
+            return cursor.rowcount == 1
+
+    # Workers
+
+    def worker_seen(
+        self, worker: str, state: str, current_episode: Optional[int] = None
+    ):
+        """Register or update a worker: running, idle or stopped"""
+        host, _, pid = worker.rpartition(":")
+        now = now_utc().isoformat()
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO work_workers (worker_id, host, pid, state, "
+                "current_episode, started_at, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET state = excluded.state, "
+                "current_episode = excluded.current_episode, "
+                "last_seen = excluded.last_seen",
+                (
+                    worker,
+                    host or socket.gethostname(),
+                    int(pid) if pid.isdigit() else os.getpid(),
+                    state,
+                    current_episode,
+                    now,
+                    now,
+                ),
+            )
+
+    def workers(self, window_hours: float = 1.0) -> List[Dict]:
+        """Worker liveness and throughput over the last window_hours"""
+        now = now_utc()
+        cutoff = (now - timedelta(hours=window_hours)).isoformat()
+        stale = (now - timedelta(seconds=LEASE_SECONDS)).isoformat()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                """
+                SELECT w.worker_id, w.host, w.pid, w.state, w.current_episode,
+                       w.started_at, w.last_seen,
+                       COUNT(q.episode_pk), COALESCE(SUM(q.succeeded = 0), 0),
+                       COALESCE(SUM(q.seconds), 0)
+                FROM work_workers w
+                LEFT JOIN work_queue q ON q.worker = w.worker_id
+                    AND q.state = 'done' AND q.finished_at >= ?
+                GROUP BY w.worker_id
+                ORDER BY w.last_seen DESC
+                """,
+                (cutoff,),
+            ).fetchall()
+        finally:
+            conn.close()
+
+        workers = []
+        for row in rows:
+            worker = dict(
+                zip(
+                    (
+                        "worker_id",
+                        "host",
+                        "pid",
+                        "state",
+                        "current_episode",
+                        "started_at",
+                        "last_seen",
+                        "processed",
+                        "failed",
+                        "busy_seconds",
+                    ),
+                    row,
+                )
+            )
+            # A live worker heartbeats at least once per lease
+            worker["alive"] = (
+                worker["state"] != "stopped" and worker["last_seen"] >= stale
+            )
+            worker["per_hour"] = round(worker["processed"] / window_hours, 1)
+            workers.append(worker)
+        return workers
+
+
+class QueueWorker:
+    """Drain the work queue from one process alongside any number of others"""
+
+    def __init__(
+        self,
+        queue: WorkQueue,
+        process: Callable[[int], object],
+        worker_id: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS,
+        poll_seconds: float = 60.0,
+    ):
+        self.queue = queue
+        self.process = process
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+
+    def run(self, follow: bool = False, max_items: Optional[int] = None) -> int:
+        """Process episodes until the queue is empty; returns how many
+
+        With follow, an empty queue is polled every poll_seconds instead.
+        """
+        processed = 0
+        current = None
+        self.queue.worker_seen(self.worker_id, "idle")
+        logger.info(f"👷 Worker {self.worker_id} started")
+        try:
+            while max_items is None or processed < max_items:
+                item = self.queue.claim_next(self.worker_id, self.lease_seconds)
+                if item is None:
+                    # New pending episodes only reach the queue through sync()
+                    self.queue.sync()
+                    item = self.queue.claim_next(self.worker_id, self.lease_seconds)
+                if item is None:
+                    if not follow:
+                        break
+                    self.queue.worker_seen(self.worker_id, "idle")
+                    time.sleep(self.poll_seconds)
+                    continue
+
+                current = item.episode_pk
+                self.queue.worker_seen(self.worker_id, "running", current)
+                started = time.time()
+                with self.queue.lease(
+                    current, self.worker_id, self.lease_seconds
+                ) as lost:
+                    result = self.process(current)
+                completed = not lost.is_set() and self.queue.complete(
+                    current, time.time() - started, bool(result), self.worker_id
+                )
+                if completed:
+                    processed += 1
+                else:
+                    logger.warning(
+                        f"⚠️ Lost the claim on episode {current}, dropping the result"
+                    )
+                current = None
+        finally:
+            if current is not None:
+                self.queue.release(current, self.worker_id)
+            self.queue.worker_seen(self.worker_id, "stopped")
+            logger.info(f"👷 Worker {self.worker_id} stopped ({processed} episodes)")
+        return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the episode work queue")
+    parser.add_argument("command", choices=["show", "workers", "requeue"])
+    parser.add_argument("--db", default="podcast_monitor.db")
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument(
+        "--window", type=float, default=1.0, help="Throughput window in hours"
+    )
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.db)
+    if args.command == "requeue":
+        print(f"Requeued {queue.requeue_expired()} episodes with expired leases")
+        return 0
+
+    if args.command == "workers":
+        workers = queue.workers(args.window)
+        if not workers:
+            print("No workers have registered")
+            return 0
+        for worker in workers:
+            status = "alive" if worker["alive"] else "dead"
+            if worker["state"] == "stopped":
+                status = "stopped"
+            episode = worker["current_episode"] or "-"
+            print(
+                f"{worker['worker_id']:<32} {status:<8} {worker['state']:<8} "
+                f"episode={episode!s:<6} {worker['per_hour']}/h "
+                f"failed={worker['failed']} busy={worker['busy_seconds']:.0f}s "
+                f"last seen {worker['last_seen']}"
+            )
+        return 0
+
+    queue.sync()
+    plan = queue.plan()
+    print(f"{len(plan)} queued episodes in dequeue order")
+    for item in plan[: args.limit]:
+        cost = f"{item.cost_seconds:.0f}s" if item.cost_seconds else "-"
+        print(
+            f"{item.episode_pk:>6} feed={item.feed_id!s:<4} {item.topic:<28} "
+            f"priority={item.priority:.3f} recency={item.recency:.2f} "
+            f"feed={item.feed_weight:.2f} relevance={item.relevance:.2f} cost={cost}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())